@@ -540,11 +540,14 @@ class Command(BaseCommand):
             except Exception:
                 pass
 
-            for name, qs in models_to_clear:
-                count = qs.count()
-                if count:
-                    qs.delete()
-                    self.stdout.write(f'  Deleted {count} {name}')
+            # One rollup/heatmap rebuild per tenant instead of per-booking signal work
+            from bookings.signals import bulk_booking_changes
+            with bulk_booking_changes():
+                for name, qs in models_to_clear:
+                    count = qs.count()
+                    if count:
+                        qs.delete()
+                        self.stdout.write(f'  Deleted {count} {name}')
 
             # Delete demo users (prefixed with tenant slug)
             demo_users = User.objects.filter(username__startswith=f'{slug}-', tenant=tenant)
@@ -623,6 +626,7 @@ class Command(BaseCommand):
         import random
         import hashlib
         from bookings.models import Service, Staff as BookingStaff, Client, Booking
+        from bookings.signals import bulk_booking_changes
 
         # --- Services ---
         for name, cat, dur, price, dep in cfg['services']:
@@ -685,9 +689,10 @@ class Command(BaseCommand):
             else:
                 bs.services.set(all_services)
             booking_staff.append(bs)
-        BookingStaff.objects.filter(tenant=self.tenant, email=f'staff@{self.tenant.slug}.demo').exclude(
-            id__in=[s.id for s in booking_staff]
-        ).delete()
+        with bulk_booking_changes():  # cascades to the removed staff's bookings
+            BookingStaff.objects.filter(tenant=self.tenant, email=f'staff@{self.tenant.slug}.demo').exclude(
+                id__in=[s.id for s in booking_staff]
+            ).delete()
         self.stdout.write(f'  Booking staff: {len(booking_staff)}')
 
         # --- Demo Clients ---
@@ -712,7 +717,8 @@ class Command(BaseCommand):
         if cfg.get('skip_demo_bookings'):
             existing = Booking.objects.filter(tenant=self.tenant).count()
             if existing:
-                Booking.objects.filter(tenant=self.tenant, notes='').delete()  # only delete seed bookings (no notes)
+                with bulk_booking_changes():
+                    Booking.objects.filter(tenant=self.tenant, notes='').delete()  # only delete seed bookings (no notes)
                 remaining = Booking.objects.filter(tenant=self.tenant).count()
                 self.stdout.write(f'  Bookings: skipped (live site) — cleaned {existing - remaining} seeded, {remaining} real kept')
             else:
@@ -722,7 +728,8 @@ class Command(BaseCommand):
         # Always recreate bookings to keep demo data fresh and count controlled
         existing = Booking.objects.filter(tenant=self.tenant).count()
         if existing > 50:
-            Booking.objects.filter(tenant=self.tenant).delete()
+            with bulk_booking_changes():
+                Booking.objects.filter(tenant=self.tenant).delete()
             self.stdout.write(f'  Cleared {existing} old bookings (too many for demo)')
         elif existing >= 20:
             bk_count = existing
@@ -805,6 +812,11 @@ class Command(BaseCommand):
         # Bulk create for speed
         if bookings_to_create:
             Booking.objects.bulk_create(bookings_to_create, ignore_conflicts=True)
+            # bulk_create skips the signals that keep report rollups and heatmaps current
+            from bookings.heatmaps import rebuild_heatmaps
+            from bookings.rollups import rebuild_rollups
+            rebuild_rollups(tenant_id=self.tenant.id)
+            rebuild_heatmaps(self.tenant.id)
         bk_count = Booking.objects.filter(tenant=self.tenant).count()
         self.stdout.write(f'  Bookings: {bk_count} ({len(bookings_to_create)} generated)')
 
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.pagination import SparseFieldsMixin
 from .models import AuditEntry
 
 
-class AuditEntrySerializer(serializers.ModelSerializer):
+class AuditEntrySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AuditEntry
         fields = [
@@ -1,6 +1,6 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.response import Response
 from accounts.permissions import IsManagerOrAbove
+from core.pagination import KeysetPagination, list_response
 from .models import AuditEntry
 from .serializers import AuditEntrySerializer
 
@@ -15,6 +15,8 @@ def audit_list(request):
         user_id  — filter by user
         entity   — filter by entity_type
         limit    — max results (default 100)
+        fields   — comma-separated fields to return
+        page_size / cursor — keyset pages, newest first, instead of limit
     """
     entries = AuditEntry.objects.all()
 
@@ -30,8 +32,12 @@ def audit_list(request):
     if entity:
         entries = entries.filter(entity_type__icontains=entity)
 
-    limit = int(request.query_params.get('limit', 100))
-    entries = entries[:limit]
+    if not KeysetPagination.requested(request):
+        limit = int(request.query_params.get('limit', 100))
+        entries = entries[:limit]
 
-    serializer = AuditEntrySerializer(entries, many=True)
-    return Response(serializer.data)
+    return list_response(
+        request, entries,
+        lambda page: AuditEntrySerializer(page, many=True, context={'request': request}).data,
+        ordering=('-timestamp', '-id'),
+    )
@@ -135,8 +135,13 @@ class BookingAdmin(TenantAdminMixin, admin.ModelAdmin):
     export_bookings_csv.short_description = 'Export selected bookings to CSV'
     
     def mark_as_completed(self, request, queryset):
-        updated = queryset.update(status='completed')
-        self.message_user(request, f'{updated} booking(s) marked as completed.')
+        # save() per booking so the rollup, heatmap and report-cache signals run
+        count = 0
+        for booking in queryset.exclude(status='completed'):
+            booking.status = 'completed'
+            booking.save()
+            count += 1
+        self.message_user(request, f'{count} booking(s) marked as completed.')
     mark_as_completed.short_description = 'Mark selected as completed'
     
     def mark_as_cancelled(self, request, queryset):
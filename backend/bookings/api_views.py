@@ -3,6 +3,9 @@ from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from django.utils.decorators import method_decorator
+from core.conditional import conditional_get
+from core.pagination import KeysetPagination
 from .models import Service, Staff, Client, Booking, Session, StaffBlock, ServiceOptimisationLog
 from .serializers import ServiceSerializer, StaffSerializer, ClientSerializer, BookingSerializer, SessionSerializer
 from .utils import generate_time_slots, get_available_dates
@@ -20,6 +23,11 @@ class ServiceViewSet(viewsets.ModelViewSet):
             return qs
         return qs.filter(active=True)
 
+    # ?all=1 is the admin list (inactive services too): revalidate every time
+    @method_decorator(conditional_get('services', private=lambda request: request.GET.get('all') == '1'))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         # Support price_pence from frontend (convert to pounds)
         tenant = getattr(self.request, 'tenant', None)
@@ -144,20 +152,23 @@ class ServiceViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='optimisation-csv')
     def optimisation_csv(self, request):
-        """GET /api/services/optimisation-csv/ — Export R&D audit trail as CSV"""
-        import csv
-        from django.http import HttpResponse
-        logs = ServiceOptimisationLog.objects.select_related('service').all()[:500]
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="service_optimisation_log.csv"'
-        writer = csv.writer(response)
-        writer.writerow(['ID', 'Service', 'Previous Price', 'New Price', 'Previous Deposit',
-                        'New Deposit', 'Reason', 'AI Recommended', 'Owner Override', 'Timestamp'])
-        for l in logs:
-            writer.writerow([l.id, l.service.name, l.previous_price, l.new_price,
-                           l.previous_deposit, l.new_deposit, l.reason,
-                           l.ai_recommended, l.owner_override, l.timestamp.isoformat()])
-        return response
+        """GET /api/services/optimisation-csv/ — Export R&D audit trail as CSV (streamed)"""
+        from core.csv_export import EXPORT_CHUNK_SIZE, streaming_csv_response
+        tenant = getattr(request, 'tenant', None)
+        logs = ServiceOptimisationLog.objects.filter(service__tenant=tenant).values_list(
+            'id', 'service__name', 'previous_price', 'new_price', 'previous_deposit',
+            'new_deposit', 'reason', 'ai_recommended', 'owner_override', 'timestamp',
+        )
+        rows = (
+            [*row[:-1], row[-1].isoformat()]
+            for row in logs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return streaming_csv_response(
+            request, 'service_optimisation_log.csv',
+            ['ID', 'Service', 'Previous Price', 'New Price', 'Previous Deposit',
+             'New Deposit', 'Reason', 'AI Recommended', 'Owner Override', 'Timestamp'],
+            rows,
+        )
 
     @action(detail=True, methods=['post'], url_path='upload-brochure',
             parser_classes=[MultiPartParser, FormParser])
@@ -233,12 +244,32 @@ class ClientViewSet(viewsets.ModelViewSet):
         serializer.save(tenant=getattr(self.request, 'tenant', None))
 
 
+class BookingPagination(KeysetPagination):
+    # Seeks along booking_tenant_start_idx; id breaks ties between same-time bookings
+    ordering = ('-start_time', '-id')
+
+
 class BookingViewSet(viewsets.ModelViewSet):
     serializer_class = BookingSerializer
+    pagination_class = BookingPagination
 
     def get_queryset(self):
         tenant = getattr(self.request, 'tenant', None)
-        return Booking.objects.filter(tenant=tenant) if tenant else Booking.objects.none()
+        if not tenant:
+            return Booking.objects.none()
+        return Booking.objects.filter(tenant=tenant).select_related('client', 'service', 'staff')
+
+    def list(self, request, *args, **kwargs):
+        """Read path: one values() query with joins, rows built without the serializer."""
+        from core.pagination import pick_fields, requested_fields
+        from .serializers import booking_list_rows, booking_list_values
+
+        values = booking_list_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(values)
+        rows = pick_fields(booking_list_rows(values if page is None else page), requested_fields(request))
+        if page is None:
+            return Response(rows)
+        return self.get_paginated_response(rows)
     
     def get_permissions(self):
         if self.action in ('create', 'slots', 'available_dates'):
@@ -474,8 +505,9 @@ class BookingViewSet(viewsets.ModelViewSet):
             # Auto-create CRM lead if not exists
             try:
                 from crm.models import Lead
-                if not Lead.objects.filter(client_id=client.id).exists():
+                if not Lead.objects.filter(tenant_id=client.tenant_id, client=client).exists():
                     Lead.objects.create(
+                        tenant_id=client.tenant_id,
                         name=client.name,
                         email=client.email,
                         phone=client.phone,
@@ -483,7 +515,7 @@ class BookingViewSet(viewsets.ModelViewSet):
                         status='QUALIFIED',
                         value_pence=service.price_pence,
                         notes=f'Auto-created from booking #{booking.id}',
-                        client_id=client.id,
+                        client=client,
                     )
             except Exception:
                 pass  # CRM is optional, don't break bookings
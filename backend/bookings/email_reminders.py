@@ -16,17 +16,12 @@ from datetime import timedelta
 from django.conf import settings
 from django.utils import timezone
 
-logger = logging.getLogger(__name__)
+from core.email_templates import brand_for_tenant, register_template, render
 
+logger = logging.getLogger(__name__)
 
-def _build_reminder_html(client_name, service_name, staff_name, start_time, duration, price, booking_id, is_1h=False):
-    """Build a branded HTML reminder email."""
-    brand_name = getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
-    date_str = start_time.strftime('%A, %d %B %Y')
-    time_str = start_time.strftime('%H:%M')
-    urgency = "Your session is in 1 hour" if is_1h else "Your session is tomorrow"
 
-    return f"""<!DOCTYPE html>
+REMINDER_HTML = """<!DOCTYPE html>
 <html>
 <head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"></head>
 <body style="margin:0;padding:0;background:#f8fafc;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;">
@@ -34,24 +29,24 @@ def _build_reminder_html(client_name, service_name, staff_name, start_time, dura
 
   <!-- Header -->
   <div style="background:#0f172a;border-radius:12px 12px 0 0;padding:24px 28px;text-align:center;">
-    <h1 style="margin:0;color:#f8fafc;font-size:20px;font-weight:700;">{brand_name}</h1>
+    <h1 style="margin:0;color:#f8fafc;font-size:20px;font-weight:700;">$brand_name</h1>
     <p style="margin:6px 0 0;color:#94a3b8;font-size:13px;">Booking Reminder</p>
   </div>
 
   <!-- Body -->
   <div style="background:#ffffff;padding:28px;border-left:1px solid #e2e8f0;border-right:1px solid #e2e8f0;">
-    <p style="margin:0 0 16px;color:#334155;font-size:15px;">Dear {client_name},</p>
-    <p style="margin:0 0 20px;color:#334155;font-size:15px;"><strong style="color:#6366f1;">{urgency}</strong> — here are your booking details:</p>
+    <p style="margin:0 0 16px;color:#334155;font-size:15px;">Dear $client_name,</p>
+    <p style="margin:0 0 20px;color:#334155;font-size:15px;"><strong style="color:$brand_accent;">$urgency</strong> — here are your booking details:</p>
 
     <!-- Booking card -->
     <div style="background:#f1f5f9;border-radius:10px;padding:20px;margin:0 0 20px;">
       <table style="width:100%;border-collapse:collapse;">
-        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;width:100px;">Service</td><td style="padding:6px 0;color:#0f172a;font-size:14px;font-weight:600;">{service_name}</td></tr>
-        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">With</td><td style="padding:6px 0;color:#0f172a;font-size:14px;">{staff_name}</td></tr>
-        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Date</td><td style="padding:6px 0;color:#0f172a;font-size:14px;font-weight:600;">{date_str}</td></tr>
-        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Time</td><td style="padding:6px 0;color:#0f172a;font-size:14px;font-weight:600;">{time_str}</td></tr>
-        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Duration</td><td style="padding:6px 0;color:#0f172a;font-size:14px;">{duration} minutes</td></tr>
-        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Price</td><td style="padding:6px 0;color:#0f172a;font-size:14px;">&pound;{price}</td></tr>
+        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;width:100px;">Service</td><td style="padding:6px 0;color:#0f172a;font-size:14px;font-weight:600;">$service_name</td></tr>
+        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">With</td><td style="padding:6px 0;color:#0f172a;font-size:14px;">$staff_name</td></tr>
+        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Date</td><td style="padding:6px 0;color:#0f172a;font-size:14px;font-weight:600;">$date_str</td></tr>
+        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Time</td><td style="padding:6px 0;color:#0f172a;font-size:14px;font-weight:600;">$time_str</td></tr>
+        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Duration</td><td style="padding:6px 0;color:#0f172a;font-size:14px;">$duration minutes</td></tr>
+        <tr><td style="padding:6px 0;color:#64748b;font-size:13px;">Price</td><td style="padding:6px 0;color:#0f172a;font-size:14px;">&pound;$price</td></tr>
       </table>
     </div>
 
@@ -61,9 +56,9 @@ def _build_reminder_html(client_name, service_name, staff_name, start_time, dura
 
   <!-- Footer -->
   <div style="background:#f1f5f9;border-radius:0 0 12px 12px;padding:20px 28px;border:1px solid #e2e8f0;border-top:none;">
-    <p style="margin:0 0 6px;color:#64748b;font-size:12px;text-align:center;">{brand_name} &middot; Ref #{booking_id}</p>
+    <p style="margin:0 0 6px;color:#64748b;font-size:12px;text-align:center;">$brand_name &middot; Ref #$booking_id</p>
     <p style="margin:0;color:#94a3b8;font-size:11px;text-align:center;">
-      You are receiving this because you have an upcoming booking with {brand_name}.
+      You are receiving this because you have an upcoming booking with $brand_name.
       This is a service communication, not marketing.
     </p>
   </div>
@@ -72,36 +67,57 @@ def _build_reminder_html(client_name, service_name, staff_name, start_time, dura
 </body>
 </html>"""
 
+REMINDER_TEXT = """Dear $client_name,
 
-def _build_reminder_text(client_name, service_name, staff_name, start_time, duration, price, booking_id, is_1h=False):
-    """Build a plain-text fallback."""
-    brand_name = getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
-    date_str = start_time.strftime('%A, %d %B %Y')
-    time_str = start_time.strftime('%H:%M')
-    urgency = "Your session is in 1 hour" if is_1h else "Your session is tomorrow"
-
-    return f"""Dear {client_name},
-
-{urgency} - here are your booking details:
+$urgency - here are your booking details:
 
-Service: {service_name}
-With: {staff_name}
-Date: {date_str}
-Time: {time_str}
-Duration: {duration} minutes
-Price: £{price}
-Reference: #{booking_id}
+Service: $service_name
+With: $staff_name
+Date: $date_str
+Time: $time_str
+Duration: $duration minutes
+Price: £$price
+Reference: #$booking_id
 
 If you need to cancel or reschedule, please contact us as soon as possible.
 
 We look forward to seeing you!
 
-{brand_name}
+$brand_name
 
 ---
-You are receiving this because you have an upcoming booking with {brand_name}.
+You are receiving this because you have an upcoming booking with $brand_name.
 This is a service communication, not marketing."""
 
+register_template('booking_reminder.html', REMINDER_HTML)
+register_template('booking_reminder.txt', REMINDER_TEXT, html=False)
+
+
+def _reminder_context(client_name, service_name, staff_name, start_time, duration, price, booking_id, is_1h):
+    return {
+        'client_name': client_name,
+        'service_name': service_name,
+        'staff_name': staff_name,
+        'date_str': start_time.strftime('%A, %d %B %Y'),
+        'time_str': start_time.strftime('%H:%M'),
+        'urgency': "Your session is in 1 hour" if is_1h else "Your session is tomorrow",
+        'duration': duration,
+        'price': price,
+        'booking_id': booking_id,
+    }
+
+
+def _build_reminder_html(client_name, service_name, staff_name, start_time, duration, price, booking_id, is_1h=False, brand=None):
+    """Build a branded HTML reminder email."""
+    context = _reminder_context(client_name, service_name, staff_name, start_time, duration, price, booking_id, is_1h)
+    return render('booking_reminder.html', brand or brand_for_tenant(), **context)
+
+
+def _build_reminder_text(client_name, service_name, staff_name, start_time, duration, price, booking_id, is_1h=False, brand=None):
+    """Build a plain-text fallback."""
+    context = _reminder_context(client_name, service_name, staff_name, start_time, duration, price, booking_id, is_1h)
+    return render('booking_reminder.txt', brand or brand_for_tenant(), **context)
+
 
 def send_reminder_email(booking, is_1h=False):
     """
@@ -118,6 +134,7 @@ def send_reminder_email(booking, is_1h=False):
         return False
 
     subject = f"Reminder: {service.name} — {'1 hour' if is_1h else 'tomorrow'} at {booking.start_time.strftime('%H:%M')}"
+    brand = brand_for_tenant(booking.tenant)
 
     html_body = _build_reminder_html(
         client_name=client.name,
@@ -128,6 +145,7 @@ def send_reminder_email(booking, is_1h=False):
         price=str(service.price),
         booking_id=booking.id,
         is_1h=is_1h,
+        brand=brand,
     )
     text_body = _build_reminder_text(
         client_name=client.name,
@@ -138,10 +156,11 @@ def send_reminder_email(booking, is_1h=False):
         price=str(service.price),
         booking_id=booking.id,
         is_1h=is_1h,
+        brand=brand,
     )
 
     from_email = getattr(settings, 'REMINDER_FROM_EMAIL', '')
-    from_name = getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
+    from_name = brand.name
 
     # Try SMTP first
     smtp_password = getattr(settings, 'REMINDER_EMAIL_HOST_PASSWORD', '')
@@ -211,63 +230,219 @@ def _send_via_resend(api_key, from_name, from_email, to_email, subject, text_bod
     return True
 
 
-def process_reminders():
+# Statuses that still warrant a reminder
+ACTIVE_BOOKING_STATUSES = ('confirmed', 'pending')
+
+# How late a reminder may go out before it is no longer useful
+# (a booking made 3 hours ahead gets a 1h reminder but no 24h one)
+REMINDER_MAX_LATENESS = {
+    '24h': timedelta(hours=1),
+    '1h': timedelta(minutes=10),
+}
+REMINDER_MAX_ATTEMPTS = 3
+REMINDER_RETRY_DELAY = timedelta(minutes=5)
+# A claim older than this means the worker died between claiming and saving
+# (SMTP itself times out after 15s)
+REMINDER_CLAIM_TIMEOUT = timedelta(minutes=10)
+
+SENT_FLAGS = {'24h': 'reminder_sent_24h', '1h': 'reminder_sent_1h'}
+
+
+def schedule_booking_reminders(booking, now=None):
+    """
+    Create, re-arm or cancel the ScheduledReminder rows for a booking.
+    Called from the Booking post_save signal whenever a booking is created,
+    rescheduled or changes status. Idempotent.
+    """
+    from .models import ScheduledReminder
+
+    now = now or timezone.now()
+    active = booking.status in ACTIVE_BOOKING_STATUSES
+    existing = {r.kind: r for r in ScheduledReminder.objects.filter(booking_id=booking.pk)}
+    reset_flags = []
+
+    for kind, offset in ScheduledReminder.KIND_OFFSETS.items():
+        due_at = booking.start_time - offset
+        too_late = due_at + REMINDER_MAX_LATENESS[kind] < now
+        row = existing.get(kind)
+
+        if not active:
+            if row and row.status == 'pending':
+                row.status = 'cancelled'
+                row.save(update_fields=['status', 'updated_at'])
+            continue
+
+        if row is None:
+            if not too_late:
+                # Already reminded by the pre-scheduler loop: record it, don't resend
+                already_sent = getattr(booking, SENT_FLAGS[kind])
+                ScheduledReminder.objects.create(
+                    tenant_id=booking.tenant_id, booking_id=booking.pk, kind=kind,
+                    booking_start=booking.start_time, send_at=due_at,
+                    status='sent' if already_sent else 'pending',
+                )
+            continue
+
+        if row.booking_start != booking.start_time:
+            # Rescheduled — re-arm for the new start time
+            row.booking_start = booking.start_time
+            row.send_at = due_at
+            row.status = 'skipped' if too_late else 'pending'
+            row.attempts = 0
+            row.claimed_at = None
+            row.sent_at = None
+            row.last_error = ''
+            row.save()
+            reset_flags.append(SENT_FLAGS[kind])
+        elif row.status == 'cancelled' and not too_late:
+            # Booking reinstated
+            row.status = 'pending'
+            row.save(update_fields=['status', 'updated_at'])
+
+    if reset_flags:
+        # queryset update so the post_save signal does not re-enter
+        type(booking).objects.filter(pk=booking.pk).update(**{f: False for f in reset_flags})
+
+
+def backfill_scheduled_reminders(now=None):
+    """
+    Schedule reminders for upcoming bookings that have none yet — bookings
+    created before the scheduler existed or inserted via bulk_create (which
+    bypasses signals). Returns the number of bookings scheduled.
+    """
+    from django.db.models import Exists, OuterRef
+    from .models import Booking, ScheduledReminder
+
+    now = now or timezone.now()
+    # Bookings past every reminder's lateness window would get no rows and be
+    # selected again on every pass until they start
+    last_useful = min(
+        offset - REMINDER_MAX_LATENESS[kind] for kind, offset in ScheduledReminder.KIND_OFFSETS.items()
+    )
+    missing = Booking.objects.filter(
+        start_time__gte=now + last_useful,
+        status__in=ACTIVE_BOOKING_STATUSES,
+    ).exclude(
+        Exists(ScheduledReminder.objects.filter(booking_id=OuterRef('pk')))
+    ).only('id', 'tenant_id', 'start_time', 'status', *SENT_FLAGS.values())
+
+    count = 0
+    for booking in missing.iterator(chunk_size=500):
+        schedule_booking_reminders(booking, now=now)
+        count += 1
+    return count
+
+
+def claim_reminder(reminder_id, now=None):
+    """
+    Atomically claim a due reminder. Only one worker can flip a row from
+    pending to sending, so concurrent workers never double-send.
+    """
+    from django.db.models import F
+    from .models import ScheduledReminder
+
+    now = now or timezone.now()
+    return ScheduledReminder.objects.filter(
+        pk=reminder_id, status='pending', send_at__lte=now,
+    ).update(status='sending', claimed_at=now, attempts=F('attempts') + 1) == 1
+
+
+def release_stale_claims(now=None):
     """
-    Main entry point: find bookings needing reminders and send them.
-    Called by the management command on a schedule.
+    Recover reminders left in 'sending' by a worker that crashed or was
+    redeployed mid-send: back to pending while attempts remain, otherwise
+    failed. Returns how many rows were released.
+    """
+    from .models import ScheduledReminder
+
+    now = now or timezone.now()
+    stale = ScheduledReminder.objects.filter(status='sending', claimed_at__lt=now - REMINDER_CLAIM_TIMEOUT)
+    error = 'Reminder worker stopped before finishing'
+    failed = stale.filter(attempts__gte=REMINDER_MAX_ATTEMPTS).update(
+        status='failed', last_error=error, updated_at=now,
+    )
+    retried = stale.update(status='pending', last_error=error, updated_at=now)
+    if failed or retried:
+        logger.warning(f"[REMINDER] Released {retried} stale claims for retry, failed {failed}")
+    return failed + retried
+
+
+def send_scheduled_reminder(reminder_id, now=None):
+    """
+    Claim and send one scheduled reminder.
+    Returns 'sent', 'failed', 'retry', 'skipped' or None if it was not claimable.
+    """
+    from .models import ScheduledReminder
+
+    now = now or timezone.now()
+    if not claim_reminder(reminder_id, now=now):
+        return None
+
+    reminder = ScheduledReminder.objects.select_related(
+        'booking__tenant', 'booking__client', 'booking__service', 'booking__staff',
+    ).get(pk=reminder_id)
+    booking = reminder.booking
+    is_1h = reminder.kind == ScheduledReminder.KIND_1H
+    due_at = booking.start_time - ScheduledReminder.KIND_OFFSETS[reminder.kind]
+    deadline = due_at + REMINDER_MAX_LATENESS[reminder.kind]
+
+    if booking.status not in ACTIVE_BOOKING_STATUSES or now > deadline or not booking.client.email:
+        reminder.status = 'skipped'
+        reminder.save(update_fields=['status', 'updated_at'])
+        return 'skipped'
+
+    try:
+        success = send_reminder_email(booking, is_1h=is_1h)
+        error = '' if success else 'send_reminder_email returned False'
+    except Exception as e:
+        logger.exception(f"[REMINDER] Unexpected error sending reminder #{reminder.id}")
+        success, error = False, str(e)
+
+    if success:
+        reminder.status = 'sent'
+        reminder.sent_at = timezone.now()
+        reminder.save(update_fields=['status', 'sent_at', 'updated_at'])
+        type(booking).objects.filter(pk=booking.pk).update(**{SENT_FLAGS[reminder.kind]: True})
+        return 'sent'
+
+    reminder.last_error = error
+    retry_at = now + REMINDER_RETRY_DELAY
+    if reminder.attempts < REMINDER_MAX_ATTEMPTS and retry_at <= deadline:
+        reminder.status = 'pending'
+        reminder.send_at = retry_at
+        reminder.save(update_fields=['status', 'send_at', 'last_error', 'updated_at'])
+        return 'retry'
+    reminder.status = 'failed'
+    reminder.save(update_fields=['status', 'last_error', 'updated_at'])
+    return 'failed'
+
+
+def _tally(results, kind, outcome):
+    if outcome == 'sent':
+        results['sent_24h' if kind == '24h' else 'sent_1h'] += 1
+    elif outcome in ('failed', 'retry'):
+        results['failed'] += 1
+    elif outcome == 'skipped':
+        results['skipped'] += 1
+
+
+def process_due_reminders(now=None, limit=500):
+    """
+    Send every reminder whose send time has passed.
+    Used for one-shot/cron runs; the --loop worker uses ReminderScheduler instead.
     Returns dict with counts of sent/failed.
     """
-    from .models import Booking
+    from .models import ScheduledReminder
 
-    now = timezone.now()
+    now = now or timezone.now()
     results = {'sent_24h': 0, 'sent_1h': 0, 'failed': 0, 'skipped': 0}
+    release_stale_claims(now=now)
 
-    # ── 24-hour reminders ──
-    # Window: bookings starting between 23h and 25h from now (to handle 10-min cron intervals)
-    window_24h_start = now + timedelta(hours=23)
-    window_24h_end = now + timedelta(hours=25)
-
-    bookings_24h = Booking.objects.filter(
-        start_time__gte=window_24h_start,
-        start_time__lte=window_24h_end,
-        status__in=['confirmed', 'pending'],
-        reminder_sent_24h=False,
-    ).select_related('client', 'service', 'staff')
-
-    for booking in bookings_24h:
-        if not booking.client.email:
-            results['skipped'] += 1
-            continue
-        success = send_reminder_email(booking, is_1h=False)
-        if success:
-            booking.reminder_sent_24h = True
-            booking.save(update_fields=['reminder_sent_24h'])
-            results['sent_24h'] += 1
-        else:
-            results['failed'] += 1
-
-    # ── 1-hour reminders ──
-    # Window: bookings starting between 50min and 70min from now
-    window_1h_start = now + timedelta(minutes=50)
-    window_1h_end = now + timedelta(minutes=70)
-
-    bookings_1h = Booking.objects.filter(
-        start_time__gte=window_1h_start,
-        start_time__lte=window_1h_end,
-        status__in=['confirmed', 'pending'],
-        reminder_sent_1h=False,
-    ).select_related('client', 'service', 'staff')
-
-    for booking in bookings_1h:
-        if not booking.client.email:
-            results['skipped'] += 1
-            continue
-        success = send_reminder_email(booking, is_1h=True)
-        if success:
-            booking.reminder_sent_1h = True
-            booking.save(update_fields=['reminder_sent_1h'])
-            results['sent_1h'] += 1
-        else:
-            results['failed'] += 1
+    due = ScheduledReminder.objects.filter(
+        status='pending', send_at__lte=now,
+    ).order_by('send_at').values_list('id', 'kind')[:limit]
+
+    for reminder_id, kind in list(due):
+        _tally(results, kind, send_scheduled_reminder(reminder_id, now=now))
 
     return results
@@ -0,0 +1,160 @@
+"""
+DemandHeatmap maintenance.
+
+Booking writes move a single booking between cells with `move_booking`,
+called from bookings.signals. Each tenant's windows slide forward once a
+day: `advance_heatmaps` subtracts the bookings on days that have left
+the window instead of recounting. `tenant_heatmaps` does this lazily on
+the first read of the day, and `update_demand_index` does it nightly.
+
+`rebuild_heatmaps` recounts a tenant from raw bookings. It runs on the
+first read, after bulk inserts, and when a window was last advanced
+longer ago than its own length.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractHour, ExtractWeekDay
+from django.utils import timezone
+
+from .models import Booking
+from .models_heatmap import DemandHeatmap
+from .utils import day_range
+
+logger = logging.getLogger(__name__)
+
+HEATMAP_WINDOWS = (30, 90)
+HEATMAP_STATUSES = ('confirmed', 'completed', 'no_show')
+
+
+def heatmap_key(booking):
+    return (booking.tenant_id, booking.service_id, booking.start_time, booking.status)
+
+
+def _cell(key):
+    """Where a heatmap key is counted: (tenant, service, local date, dow, hour, no-show), or None."""
+    if key is None:
+        return None
+    tenant_id, service_id, start_time, status = key
+    if status not in HEATMAP_STATUSES or start_time is None:
+        return None
+    local = timezone.localtime(start_time)
+    # Day 0 is Sunday, matching ExtractWeekDay - 1 and the old EXTRACT(dow)
+    return (tenant_id, service_id, local.date(), local.isoweekday() % 7, local.hour, status == 'no_show')
+
+
+def _window_start(window_days, today=None):
+    return (today or timezone.localdate()) - timedelta(days=window_days)
+
+
+def _cell_counts(tenant_id, date_from, date_to=None):
+    """{(service_id, dow, hour): (bookings, no_shows)} for bookings from date_from up to (not including) date_to."""
+    qs = Booking.objects.filter(
+        tenant_id=tenant_id, status__in=HEATMAP_STATUSES, start_time__gte=day_range(date_from)[0],
+    )
+    if date_to is not None:
+        qs = qs.filter(start_time__lt=day_range(date_to)[0])
+    rows = (
+        qs.annotate(dow=ExtractWeekDay('start_time'), hour=ExtractHour('start_time'))
+        .values('service_id', 'dow', 'hour')
+        .annotate(n=Count('id'), ns=Count('id', filter=Q(status='no_show')))
+        .order_by()
+    )
+    return {(r['service_id'], r['dow'] - 1, r['hour']): (r['n'], r['ns']) for r in rows}
+
+
+def _add(row, dow, hour, bookings, no_shows):
+    row.bookings[dow][hour] = max(0, row.bookings[dow][hour] + bookings)
+    row.no_shows[dow][hour] = max(0, row.no_shows[dow][hour] + no_shows)
+
+
+def rebuild_heatmaps(tenant_id, today=None):
+    """Recount every window for one tenant from bookings. Returns rows written."""
+    today = today or timezone.localdate()
+    rows = []
+    for window in HEATMAP_WINDOWS:
+        start = _window_start(window, today)
+        grids = {None: DemandHeatmap(tenant_id=tenant_id, window_days=window, window_start=start)}
+        for (service_id, dow, hour), (n, ns) in _cell_counts(tenant_id, start).items():
+            if service_id not in grids:
+                grids[service_id] = DemandHeatmap(
+                    tenant_id=tenant_id, service_id=service_id, window_days=window, window_start=start,
+                )
+            _add(grids[service_id], dow, hour, n, ns)
+            _add(grids[None], dow, hour, n, ns)
+        rows.extend(grids.values())
+    with transaction.atomic():
+        DemandHeatmap.objects.filter(tenant_id=tenant_id).delete()
+        DemandHeatmap.objects.bulk_create(rows)
+    return len(rows)
+
+
+def move_booking(before, after):
+    """Move one booking's count from heatmap key `before` to `after`; either may be None."""
+    before, after = _cell(before), _cell(after)
+    if before == after:
+        return
+    with transaction.atomic():
+        for cell, sign in ((before, -1), (after, 1)):
+            if cell is not None:
+                _apply(cell, sign)
+
+
+def _apply(cell, sign):
+    tenant_id, service_id, day, dow, hour, no_show = cell
+    totals = list(
+        DemandHeatmap.objects.select_for_update()
+        .filter(tenant_id=tenant_id, service__isnull=True, window_start__lte=day)
+    )
+    if not totals:
+        return  # not built yet (first read rebuilds) or outside every window
+    rows = list(totals)
+    for total in totals:
+        row, _ = DemandHeatmap.objects.select_for_update().get_or_create(
+            tenant_id=tenant_id, service_id=service_id, window_days=total.window_days,
+            defaults={'window_start': total.window_start},
+        )
+        rows.append(row)
+    for row in rows:
+        _add(row, dow, hour, sign, sign if no_show else 0)
+        row.save(update_fields=['bookings', 'no_shows', 'updated_at'])
+
+
+def advance_heatmaps(tenant_id, today=None):
+    """Slide a tenant's windows forward to today, subtracting the days that left them."""
+    today = today or timezone.localdate()
+    with transaction.atomic():
+        rows = list(DemandHeatmap.objects.select_for_update().filter(tenant_id=tenant_id))
+        for window in HEATMAP_WINDOWS:
+            window_rows = [r for r in rows if r.window_days == window]
+            starts = {r.window_start for r in window_rows}
+            new_start = _window_start(window, today)
+            if len(starts) != 1 or (new_start - min(starts)).days >= window:
+                break  # missing, inconsistent or too stale to slide: recount
+            old_start = starts.pop()
+            if old_start >= new_start:
+                continue
+            dropped = _cell_counts(tenant_id, old_start, new_start)
+            by_service = {r.service_id: r for r in window_rows}
+            for (service_id, dow, hour), (n, ns) in dropped.items():
+                for key in (service_id, None):
+                    if key in by_service:
+                        _add(by_service[key], dow, hour, -n, -ns)
+            for row in window_rows:
+                row.window_start = new_start
+                row.save(update_fields=['bookings', 'no_shows', 'window_start', 'updated_at'])
+        else:
+            return
+    logger.info(f"[HEATMAP] Rebuilding heatmaps for tenant #{tenant_id}")
+    rebuild_heatmaps(tenant_id, today)
+
+
+def tenant_heatmaps(tenant_id, window_days=30):
+    """{service_id (None = all services): DemandHeatmap} for one window, advanced to today."""
+    rows = list(DemandHeatmap.objects.filter(tenant_id=tenant_id, window_days=window_days))
+    if not rows or any(r.window_start != _window_start(window_days) for r in rows):
+        advance_heatmaps(tenant_id)
+        rows = list(DemandHeatmap.objects.filter(tenant_id=tenant_id, window_days=window_days))
+    return {r.service_id: r for r in rows}
@@ -0,0 +1,77 @@
+"""
+Benchmark the booking list read path against the full BookingSerializer.
+
+Creates a throwaway tenant with synthetic bookings inside a transaction that
+is rolled back at the end, then times serialising the list both ways and
+counts the queries each one issues.
+
+Usage:
+    python manage.py benchmark_booking_list
+    python manage.py benchmark_booking_list --bookings 2000 --repeat 10
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Benchmark booking list serialisation: values() fast path vs BookingSerializer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=500, help='Synthetic bookings to list (default 500)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per path, best is reported (default 5)')
+
+    def handle(self, *args, **options):
+        from bookings.models import Booking, Client, Service, Staff
+        from bookings.serializers import BookingSerializer, booking_list_rows, booking_list_values
+        from tenants.models import TenantSettings
+
+        count, repeat = options['bookings'], options['repeat']
+        with transaction.atomic():
+            tenant = TenantSettings.objects.create(slug='benchmark-booking-list', business_name='Benchmark')
+            services = [
+                Service.objects.create(tenant=tenant, name=f'Service {n}', duration_minutes=30, price=Decimal('25.00'))
+                for n in range(5)
+            ]
+            staff = [Staff.objects.create(tenant=tenant, name=f'Staff {n}', email=f'staff{n}@benchmark.test') for n in range(5)]
+            clients = Client.objects.bulk_create([
+                Client(tenant=tenant, name=f'Client {n}', email=f'client{n}@benchmark.test', phone='0')
+                for n in range(max(count // 4, 1))
+            ])
+            start = timezone.now()
+            Booking.objects.bulk_create([
+                Booking(
+                    tenant=tenant, client=clients[n % len(clients)], service=services[n % 5], staff=staff[n % 5],
+                    start_time=start + timedelta(minutes=30 * n), end_time=start + timedelta(minutes=30 * n + 30),
+                    status='confirmed',
+                )
+                for n in range(count)
+            ], batch_size=1000)
+
+            plain = Booking.objects.filter(tenant=tenant)
+            cases = [
+                ('BookingSerializer, no select_related', lambda: BookingSerializer(plain, many=True).data),
+                ('BookingSerializer, select_related', lambda: BookingSerializer(
+                    plain.select_related('client', 'service', 'staff'), many=True).data),
+                ('booking_list_rows (values + joins)', lambda: booking_list_rows(booking_list_values(plain))),
+            ]
+
+            self.stdout.write(f'{count} bookings, best of {repeat} runs\n')
+            self.stdout.write(f"{'path':<40}{'queries':>9}{'time':>12}")
+            for label, build in cases:
+                with CaptureQueriesContext(connection) as queries:
+                    build()
+                best = float('inf')
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    build()
+                    best = min(best, time.perf_counter() - t0)
+                self.stdout.write(f'{label:<40}{len(queries):>9}{best * 1000:>9.1f} ms')
+
+            transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS('Done (synthetic data rolled back)'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from bookings.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily booking rollup table used by reports from raw bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, help='Rebuild only a specific tenant slug')
+
+    def handle(self, *args, **options):
+        from tenants.models import TenantSettings
+        slug = options.get('tenant')
+        tenant_id = None
+        if slug:
+            tenant_id = TenantSettings.objects.filter(slug=slug).values_list('id', flat=True).first()
+            if tenant_id is None:
+                raise CommandError(f'Unknown tenant "{slug}"')
+        self.stdout.write(f'Rebuilding booking rollups for {slug or "all tenants"}...')
+        written = rebuild_rollups(tenant_id=tenant_id)
+        self.stdout.write(self.style.SUCCESS(f'{written} rollup rows written.'))
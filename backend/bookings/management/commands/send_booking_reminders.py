@@ -1,12 +1,13 @@
 """
 Management command to send booking reminder emails.
-Designed to run every 10 minutes via a background loop or cron.
+
+Reminders are stored in ScheduledReminder with their exact send time. The
+loop worker sleeps until the next one is due rather than polling windows.
 
 Usage:
-    python manage.py send_booking_reminders          # Run once
-    python manage.py send_booking_reminders --loop    # Run continuously (for Railway)
+    python manage.py send_booking_reminders          # Send everything due now (cron)
+    python manage.py send_booking_reminders --loop    # Run the due-time scheduler (for Railway)
 """
-import time
 import logging
 from django.core.management.base import BaseCommand
 from django.conf import settings
@@ -24,38 +25,36 @@ class Command(BaseCommand):
             help='Run continuously in a loop (for Railway background worker)',
         )
         parser.add_argument(
-            '--interval',
+            '--refresh',
             type=int,
             default=None,
-            help='Interval in minutes between checks (default: from settings or 10)',
+            help='Seconds between scans for newly scheduled reminders (default: from settings or 60)',
         )
 
     def handle(self, *args, **options):
-        from bookings.email_reminders import process_reminders
+        from bookings.email_reminders import backfill_scheduled_reminders, process_due_reminders
+        from bookings.reminder_scheduler import ReminderScheduler
 
         loop = options['loop']
-        interval = options['interval'] or getattr(settings, 'REMINDER_INTERVAL_MINUTES', 10)
+        refresh = options['refresh'] or getattr(settings, 'REMINDER_REFRESH_SECONDS', 60)
 
         if loop:
             self.stdout.write(self.style.SUCCESS(
-                f'[REMINDER] Starting reminder loop (every {interval} minutes)'
+                f'[REMINDER] Starting reminder scheduler (refresh every {refresh}s)'
             ))
-            while True:
-                try:
-                    results = process_reminders()
-                    total = results['sent_24h'] + results['sent_1h']
-                    if total > 0 or results['failed'] > 0:
-                        self.stdout.write(self.style.SUCCESS(
-                            f"[REMINDER] 24h: {results['sent_24h']}, 1h: {results['sent_1h']}, "
-                            f"failed: {results['failed']}, skipped: {results['skipped']}"
-                        ))
-                except Exception as e:
-                    self.stderr.write(self.style.ERROR(f'[REMINDER] Error: {e}'))
-                    logger.exception('[REMINDER] Unhandled error in reminder loop')
-
-                time.sleep(interval * 60)
+
+            def report(results):
+                total = results['sent_24h'] + results['sent_1h']
+                if total > 0 or results['failed'] > 0:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"[REMINDER] 24h: {results['sent_24h']}, 1h: {results['sent_1h']}, "
+                        f"failed: {results['failed']}, skipped: {results['skipped']}"
+                    ))
+
+            ReminderScheduler(refresh_seconds=refresh).run_forever(on_results=report)
         else:
-            results = process_reminders()
+            backfill_scheduled_reminders()
+            results = process_due_reminders()
             self.stdout.write(self.style.SUCCESS(
                 f"Reminders sent — 24h: {results['sent_24h']}, 1h: {results['sent_1h']}, "
                 f"failed: {results['failed']}, skipped: {results['skipped']}"
@@ -5,7 +5,20 @@ from bookings.smart_engine import update_service_demand_index
 class Command(BaseCommand):
     help = 'Update demand index for all active services (Smart Booking Engine Phase 5)'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild-heatmaps',
+            action='store_true',
+            help='Recount demand heatmaps from raw bookings first (repairs drift)',
+        )
+
     def handle(self, *args, **options):
+        if options['rebuild_heatmaps']:
+            from bookings.heatmaps import rebuild_heatmaps
+            from tenants.models import TenantSettings
+            self.stdout.write('Rebuilding demand heatmaps...')
+            for tenant_id in TenantSettings.objects.values_list('id', flat=True):
+                rebuild_heatmaps(tenant_id)
         self.stdout.write('Updating service demand indices...')
         update_service_demand_index()
         self.stdout.write(self.style.SUCCESS('Demand indices updated.'))
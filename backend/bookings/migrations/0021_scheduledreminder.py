@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0020_service_long_description_brochure'),
+        ('tenants', '0004_tenantsettings_business_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('24h', '24 hours before'), ('1h', '1 hour before')], max_length=5)),
+                ('booking_start', models.DateTimeField(help_text='Booking start time this reminder was scheduled for')),
+                ('send_at', models.DateTimeField(help_text='Next attempt time (moves forward on retry)')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('skipped', 'Skipped'), ('cancelled', 'Cancelled')], default='pending', max_length=10)),
+                ('attempts', models.IntegerField(default=0)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_reminders', to='bookings.booking')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_reminders', to='tenants.tenantsettings')),
+            ],
+            options={
+                'ordering': ['send_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['send_at'], name='reminder_pending_send_at_idx')],
+                'constraints': [models.UniqueConstraint(fields=('booking', 'kind'), name='uniq_reminder_booking_kind')],
+            },
+        ),
+    ]
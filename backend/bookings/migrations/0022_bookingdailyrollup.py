@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:11
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0021_scheduledreminder'),
+        ('tenants', '0004_tenantsettings_business_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Local date of booking.start_time')),
+                ('status', models.CharField(max_length=20)),
+                ('booking_count', models.IntegerField(default=0)),
+                ('no_show_count', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), help_text='Sum of service price', max_digits=12)),
+                ('deposits', models.DecimalField(decimal_places=2, default=Decimal('0'), help_text='Sum of payment_amount on paid bookings', max_digits=12)),
+                ('at_risk_revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), help_text='Sum of revenue_at_risk, all risk levels', max_digits=12)),
+                ('high_risk_count', models.IntegerField(default=0)),
+                ('high_risk_revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), help_text='Sum of revenue_at_risk on HIGH/CRITICAL bookings', max_digits=12)),
+                ('risk_score_sum', models.FloatField(default=0)),
+                ('risk_score_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='bookings.service')),
+                ('staff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='bookings.staff')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_rollups', to='tenants.tenantsettings')),
+            ],
+            options={
+                'ordering': ['date'],
+                'constraints': [models.UniqueConstraint(fields=('tenant', 'date', 'service', 'staff', 'status'), name='uniq_booking_daily_rollup')],
+            },
+        ),
+    ]
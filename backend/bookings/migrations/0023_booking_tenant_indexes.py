@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0022_bookingdailyrollup'),
+        ('tenants', '0004_tenantsettings_business_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['tenant', 'start_time'], name='booking_tenant_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['tenant', 'status', 'start_time'], name='booking_tenant_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['client', 'start_time'], name='booking_client_start_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:31
+
+import bookings.models_heatmap
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0023_booking_tenant_indexes'),
+        ('tenants', '0004_tenantsettings_business_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemandHeatmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_days', models.PositiveSmallIntegerField()),
+                ('window_start', models.DateField(help_text='Bookings starting on or after this date are counted')),
+                ('bookings', models.JSONField(default=bookings.models_heatmap.empty_grid, help_text='Confirmed, completed and no-show bookings')),
+                ('no_shows', models.JSONField(default=bookings.models_heatmap.empty_grid)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('service', models.ForeignKey(blank=True, help_text='Blank for the tenant-wide heatmap', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='demand_heatmaps', to='bookings.service')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='demand_heatmaps', to='tenants.tenantsettings')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('service__isnull', False)), fields=('tenant', 'service', 'window_days'), name='uniq_demand_heatmap_service'), models.UniqueConstraint(condition=models.Q(('service__isnull', True)), fields=('tenant', 'window_days'), name='uniq_demand_heatmap_tenant')],
+            },
+        ),
+    ]
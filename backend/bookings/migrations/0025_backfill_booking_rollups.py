@@ -0,0 +1,19 @@
+"""Fill BookingDailyRollup from existing bookings; reports read only the rollup."""
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    from bookings.rollups import rebuild_rollups
+    rebuild_rollups(
+        booking_model=apps.get_model('bookings', 'Booking'),
+        rollup_model=apps.get_model('bookings', 'BookingDailyRollup'),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('bookings', '0024_demandheatmap'),
+    ]
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
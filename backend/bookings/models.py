@@ -28,6 +28,15 @@ from .models_restaurant import Table, ServiceWindow
 # Import gym models
 from .models_gym import ClassType, ClassSession
 
+# Import scheduled reminder model
+from .models_reminders import ScheduledReminder
+
+# Import daily reporting rollup
+from .models_rollup import BookingDailyRollup
+
+# Import demand heatmap store
+from .models_heatmap import DemandHeatmap
+
 class Service(models.Model):
     PAYMENT_TYPE_CHOICES = [
         ('full', 'Full Payment'),
@@ -280,6 +289,11 @@ class Booking(models.Model):
         indexes = [
             models.Index(fields=['start_time', 'staff']),
             models.Index(fields=['status']),
+            # Every tenant-scoped date-range read (reports, dashboards, timetables)
+            models.Index(fields=['tenant', 'start_time'], name='booking_tenant_start_idx'),
+            models.Index(fields=['tenant', 'status', 'start_time'], name='booking_tenant_status_idx'),
+            # Per-client booking history (reliability scoring, client quadrant)
+            models.Index(fields=['client', 'start_time'], name='booking_client_start_idx'),
         ]
 
     def __str__(self):
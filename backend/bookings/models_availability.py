@@ -264,6 +264,16 @@ TIMESHEET_SOURCE_CHOICES = [
 ]
 
 
+class TimesheetEntryQuerySet(models.QuerySet):
+    def with_hours(self):
+        """Annotate scheduled_span / actual_span: the hours properties as DB durations."""
+        from core.timesheet_hours import net_duration
+        return self.annotate(
+            scheduled_span=net_duration('scheduled_start', 'scheduled_end', 'break_minutes'),
+            actual_span=net_duration('actual_start', 'actual_end', 'break_minutes'),
+        )
+
+
 class TimesheetEntry(models.Model):
     staff_member = models.ForeignKey(
         'Staff', on_delete=models.CASCADE, related_name='timesheet_entries'
@@ -280,6 +290,8 @@ class TimesheetEntry(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TimesheetEntryQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date']
         unique_together = ['staff_member', 'date']
@@ -0,0 +1,45 @@
+"""
+Demand heatmap.
+One row per (tenant, service, window) holding a 7×24 grid of booking and
+no-show counts over the last `window_days` days (and everything booked
+ahead). The row with no service is the tenant-wide total. Maintained by
+bookings.signals and advanced daily by bookings.heatmaps.
+"""
+from django.db import models
+from django.db.models import Q
+
+
+def empty_grid():
+    """7 rows (day of week, 0 = Sunday) × 24 columns (hour)."""
+    return [[0] * 24 for _ in range(7)]
+
+
+class DemandHeatmap(models.Model):
+    tenant = models.ForeignKey(
+        'tenants.TenantSettings', on_delete=models.CASCADE, related_name='demand_heatmaps'
+    )
+    service = models.ForeignKey(
+        'Service', on_delete=models.CASCADE, null=True, blank=True, related_name='demand_heatmaps',
+        help_text='Blank for the tenant-wide heatmap',
+    )
+    window_days = models.PositiveSmallIntegerField()
+    window_start = models.DateField(help_text='Bookings starting on or after this date are counted')
+    bookings = models.JSONField(default=empty_grid, help_text='Confirmed, completed and no-show bookings')
+    no_shows = models.JSONField(default=empty_grid)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'service', 'window_days'], name='uniq_demand_heatmap_service',
+                condition=Q(service__isnull=False),
+            ),
+            models.UniqueConstraint(
+                fields=['tenant', 'window_days'], name='uniq_demand_heatmap_tenant',
+                condition=Q(service__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        scope = f"service#{self.service_id}" if self.service_id else 'all services'
+        return f"Heatmap {scope} {self.window_days}d from {self.window_start}"
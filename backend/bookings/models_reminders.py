@@ -0,0 +1,65 @@
+"""
+Scheduled reminder notifications.
+One row per (booking, kind) holding the exact send time, so the reminder
+worker can sleep until the next due item instead of polling time windows.
+"""
+from datetime import timedelta
+
+from django.db import models
+from django.db.models import Q
+
+
+class ScheduledReminder(models.Model):
+    KIND_24H = '24h'
+    KIND_1H = '1h'
+    KIND_CHOICES = [
+        (KIND_24H, '24 hours before'),
+        (KIND_1H, '1 hour before'),
+    ]
+    # Offset before booking.start_time at which each kind is sent
+    KIND_OFFSETS = {
+        KIND_24H: timedelta(hours=24),
+        KIND_1H: timedelta(hours=1),
+    }
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    tenant = models.ForeignKey(
+        'tenants.TenantSettings', on_delete=models.CASCADE, related_name='scheduled_reminders'
+    )
+    booking = models.ForeignKey(
+        'Booking', on_delete=models.CASCADE, related_name='scheduled_reminders'
+    )
+    kind = models.CharField(max_length=5, choices=KIND_CHOICES)
+    booking_start = models.DateTimeField(help_text='Booking start time this reminder was scheduled for')
+    send_at = models.DateTimeField(help_text='Next attempt time (moves forward on retry)')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['send_at']
+        constraints = [
+            models.UniqueConstraint(fields=['booking', 'kind'], name='uniq_reminder_booking_kind'),
+        ]
+        indexes = [
+            # Partial index: the worker only ever looks at pending rows
+            models.Index(
+                fields=['send_at'], name='reminder_pending_send_at_idx',
+                condition=Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Reminder {self.kind} for booking #{self.booking_id} @ {self.send_at:%Y-%m-%d %H:%M} ({self.status})"
@@ -0,0 +1,47 @@
+"""
+Daily booking rollup.
+One row per (tenant, date, service, staff, status) holding the additive
+measures the reports read, so a date range costs one row per busy
+service/staff/status/day instead of one per booking. Maintained by
+bookings.signals and rebuilt with `manage.py rebuild_booking_rollups`.
+"""
+from decimal import Decimal
+
+from django.db import models
+
+
+class BookingDailyRollup(models.Model):
+    tenant = models.ForeignKey(
+        'tenants.TenantSettings', on_delete=models.CASCADE, related_name='booking_rollups'
+    )
+    date = models.DateField(help_text='Local date of booking.start_time')
+    service = models.ForeignKey('Service', on_delete=models.CASCADE, related_name='daily_rollups')
+    staff = models.ForeignKey('Staff', on_delete=models.CASCADE, related_name='daily_rollups')
+    status = models.CharField(max_length=20)
+
+    booking_count = models.IntegerField(default=0)
+    no_show_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'),
+                                  help_text='Sum of service price')
+    deposits = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'),
+                                   help_text='Sum of payment_amount on paid bookings')
+    at_risk_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'),
+                                          help_text='Sum of revenue_at_risk, all risk levels')
+    high_risk_count = models.IntegerField(default=0)
+    high_risk_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'),
+                                            help_text='Sum of revenue_at_risk on HIGH/CRITICAL bookings')
+    risk_score_sum = models.FloatField(default=0)
+    risk_score_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            # Also serves as the (tenant, date) range index for report reads
+            models.UniqueConstraint(
+                fields=['tenant', 'date', 'service', 'staff', 'status'], name='uniq_booking_daily_rollup',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} service#{self.service_id} staff#{self.staff_id} {self.status}: {self.booking_count}"
@@ -0,0 +1,119 @@
+"""
+Due-time scheduler for booking reminders.
+
+Keeps a min-heap of (send_at, reminder_id) for pending reminders due within
+a short horizon and sleeps until the head of the heap is due. The heap is
+topped up from the partial `reminder_pending_send_at_idx` index every
+`refresh_seconds`, which picks up reminders scheduled by the web process
+and, via release_stale_claims, any left mid-send by a worker that died.
+
+Being the one long-running worker, it also rebuilds each tenant's booking
+rollups once a day (`rollup_rebuild_every`) to repair any drift.
+"""
+import heapq
+import logging
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .email_reminders import backfill_scheduled_reminders, release_stale_claims, send_scheduled_reminder, _tally
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler:
+
+    def __init__(self, refresh_seconds=60, horizon=timedelta(hours=1),
+                 backfill_every=timedelta(hours=1), rollup_rebuild_every=timedelta(days=1),
+                 clock=timezone.now, sleep=time.sleep):
+        self.refresh_seconds = refresh_seconds
+        self.horizon = horizon
+        self.backfill_every = backfill_every
+        self.rollup_rebuild_every = rollup_rebuild_every
+        self.clock = clock
+        self.sleep = sleep
+        self._heap = []
+        self._queued = set()
+        self._next_refresh = None
+        self._next_backfill = None
+        self._next_rollup_rebuild = None
+
+    def refresh(self):
+        """Push pending reminders due before now + horizon onto the heap."""
+        from .models import ScheduledReminder
+
+        now = self.clock()
+        release_stale_claims(now=now)
+        rows = ScheduledReminder.objects.filter(
+            status='pending', send_at__lte=now + self.horizon,
+        ).values_list('send_at', 'id', 'kind')
+        added = 0
+        for send_at, reminder_id, kind in rows:
+            key = (send_at, reminder_id)
+            if key in self._queued:
+                continue
+            heapq.heappush(self._heap, (send_at, reminder_id, kind))
+            self._queued.add(key)
+            added += 1
+        self._next_refresh = now + timedelta(seconds=self.refresh_seconds)
+        return added
+
+    def run_due(self):
+        """Send every heap entry whose time has come."""
+        results = {'sent_24h': 0, 'sent_1h': 0, 'failed': 0, 'skipped': 0}
+        while self._heap and self._heap[0][0] <= self.clock():
+            send_at, reminder_id, kind = heapq.heappop(self._heap)
+            self._queued.discard((send_at, reminder_id))
+            # Stale entries (rescheduled or already claimed) are not claimable
+            _tally(results, kind, send_scheduled_reminder(reminder_id, now=self.clock()))
+        return results
+
+    def seconds_until_next(self):
+        """Seconds to sleep: until the next due reminder or the next refresh."""
+        now = self.clock()
+        wake = self._next_refresh or now
+        if self._heap and self._heap[0][0] < wake:
+            wake = self._heap[0][0]
+        return max(0.0, (wake - now).total_seconds())
+
+    def tick(self):
+        """One scheduler iteration. Returns send results."""
+        now = self.clock()
+        if self._next_backfill is None or now >= self._next_backfill:
+            scheduled = backfill_scheduled_reminders(now=now)
+            if scheduled:
+                logger.info(f"[REMINDER] Backfilled reminders for {scheduled} bookings")
+            self._next_backfill = now + self.backfill_every
+        if self._next_rollup_rebuild is None:
+            # Fresh at startup (migration / rebuild_booking_rollups); first repair a period later
+            self._next_rollup_rebuild = now + self.rollup_rebuild_every
+        elif now >= self._next_rollup_rebuild:
+            self.rebuild_rollups()
+            self._next_rollup_rebuild = now + self.rollup_rebuild_every
+        if self._next_refresh is None or now >= self._next_refresh:
+            self.refresh()
+        return self.run_due()
+
+    def rebuild_rollups(self):
+        """Recount every tenant's rollup, one short transaction per tenant."""
+        from core import tenant_cache
+        from tenants.models import TenantSettings
+        from .rollups import rebuild_rollups
+
+        for tenant_id in TenantSettings.objects.values_list('id', flat=True):
+            rebuild_rollups(tenant_id=tenant_id)
+            tenant_cache.bump('reports', tenant_id)
+
+    def run_forever(self, on_results=None):
+        while True:
+            try:
+                results = self.tick()
+                if on_results:
+                    on_results(results)
+            except Exception:
+                logger.exception('[REMINDER] Unhandled error in reminder scheduler')
+                # Force a fresh view of the table after an error
+                self._heap, self._queued = [], set()
+                self._next_refresh = self.clock() + timedelta(seconds=self.refresh_seconds)
+            self.sleep(self.seconds_until_next())
@@ -0,0 +1,174 @@
+"""
+BookingDailyRollup maintenance.
+
+`booking_facts(qs)` annotates bookings with the same column names the
+rollup stores, so a report can aggregate either source with identical
+expressions — the rollup when its filters fit the rollup key, live
+bookings when they don't (e.g. filtering on risk_level).
+
+Booking writes refresh the one or two (tenant, date, service, staff)
+groups they touch via bookings.signals, one writer per group at a time;
+bulk inserts and service price changes rebuild wholesale with
+`rebuild_rollups`, which the reminder worker also runs daily to repair
+any drift.
+"""
+import logging
+import zlib
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Case, DecimalField, F, FloatField, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+HIGH_RISK_LEVELS = ['HIGH', 'CRITICAL']
+
+ROLLUP_KEY = ('tenant_id', 'date', 'service_id', 'staff_id', 'status')
+ROLLUP_MEASURES = (
+    'booking_count', 'no_show_count', 'revenue', 'deposits', 'at_risk_revenue',
+    'high_risk_count', 'high_risk_revenue', 'risk_score_sum', 'risk_score_count',
+)
+
+# Booking fields that feed a rollup key or measure; saves touching none of
+# them (e.g. notes, reminder flags) leave the rollup untouched.
+ROLLUP_FIELDS = {
+    'tenant', 'tenant_id', 'start_time', 'service', 'service_id', 'staff', 'staff_id', 'status',
+    'payment_status', 'payment_amount', 'revenue_at_risk', 'risk_level', 'risk_score',
+}
+
+_MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def booking_facts(qs):
+    """Annotate a Booking queryset with one row's worth of each rollup measure."""
+    zero = Value(Decimal('0'), output_field=_MONEY)
+    high = Q(risk_level__in=HIGH_RISK_LEVELS)
+    return qs.annotate(
+        date=TruncDate('start_time'),
+        booking_count=Value(1, output_field=IntegerField()),
+        no_show_count=Case(When(status='no_show', then=1), default=0, output_field=IntegerField()),
+        revenue=Coalesce(F('service__price'), zero, output_field=_MONEY),
+        deposits=Case(
+            When(payment_status='paid', then=Coalesce('payment_amount', zero)),
+            default=zero, output_field=_MONEY,
+        ),
+        at_risk_revenue=Coalesce('revenue_at_risk', zero, output_field=_MONEY),
+        high_risk_count=Case(When(high, then=1), default=0, output_field=IntegerField()),
+        high_risk_revenue=Case(
+            When(high, then=Coalesce('revenue_at_risk', zero)),
+            default=zero, output_field=_MONEY,
+        ),
+        risk_score_sum=Coalesce('risk_score', Value(0.0), output_field=FloatField()),
+        risk_score_count=Case(When(risk_score__isnull=False, then=1), default=0, output_field=IntegerField()),
+    )
+
+
+def _aggregate(bookings):
+    """Rollup rows (as dicts) for a Booking queryset, grouped by the rollup key."""
+    return (
+        booking_facts(bookings.order_by())
+        .values(*ROLLUP_KEY)
+        .annotate(**{f'sum_{m}': Sum(m) for m in ROLLUP_MEASURES})
+    )
+
+
+def _measures(row):
+    return {m: row[f'sum_{m}'] for m in ROLLUP_MEASURES}
+
+
+def rollup_key(booking):
+    """(tenant_id, date, service_id, staff_id) group a booking rolls up into."""
+    start = booking.start_time
+    if isinstance(start, datetime):
+        day = timezone.localdate(start) if timezone.is_aware(start) else start.date()
+    else:
+        day = start
+    return (booking.tenant_id, day, booking.service_id, booking.staff_id)
+
+
+# First key of the two-int pg_advisory_xact_lock form, so rollup locks
+# can't collide with other advisory locks
+_LOCK_CLASS = 0x524f4c4c  # 'ROLL'
+
+
+def _advisory_lock(*parts, shared=False):
+    """
+    Transaction-scoped lock on a rollup key. Unlike select_for_update it
+    also covers groups with no rollup rows yet. SQLite already serialises
+    writers, so this is a no-op there.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    key = zlib.crc32('|'.join(str(p) for p in parts).encode()) - 2**31
+    fn = 'pg_advisory_xact_lock_shared' if shared else 'pg_advisory_xact_lock'
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT {fn}(%s, %s)', [_LOCK_CLASS, key])
+
+
+def refresh_rollup(tenant_id, day, service_id, staff_id):
+    """Recompute every status row of one (tenant, date, service, staff) group from its bookings."""
+    from .models import Booking, BookingDailyRollup
+    from .utils import day_range
+
+    if None in (tenant_id, day, service_id, staff_id):
+        return
+    group = {'tenant_id': tenant_id, 'date': day, 'service_id': service_id, 'staff_id': staff_id}
+    start, end = day_range(day)
+    with transaction.atomic():
+        # One writer per group (and none during a tenant rebuild). Aggregating
+        # under the lock means a concurrent writer's booking is committed and
+        # visible by the time we count, so the last write is never stale.
+        _advisory_lock(tenant_id, shared=True)
+        _advisory_lock(tenant_id, day, service_id, staff_id)
+        rows = list(_aggregate(Booking.objects.filter(
+            tenant_id=tenant_id, service_id=service_id, staff_id=staff_id,
+            start_time__gte=start, start_time__lt=end,
+        )))
+        BookingDailyRollup.objects.filter(**group).exclude(
+            status__in=[r['status'] for r in rows],
+        ).delete()
+        for r in rows:
+            BookingDailyRollup.objects.update_or_create(**group, status=r['status'], defaults=_measures(r))
+
+
+def refresh_rollups_for(bookings):
+    """Refresh the groups touched by bookings written without signals (bulk_create)."""
+    for key in {rollup_key(b) for b in bookings}:
+        refresh_rollup(*key)
+
+
+def rebuild_rollups(tenant_id=None, service_id=None, batch_size=1000, booking_model=None, rollup_model=None):
+    """
+    Replace rollup rows from raw bookings, optionally for one tenant and/or
+    service. Returns rows written. Migrations pass their historical models.
+    """
+    from .models import Booking, BookingDailyRollup
+
+    Booking = booking_model or Booking
+    BookingDailyRollup = rollup_model or BookingDailyRollup
+    scope = {}
+    if tenant_id is not None:
+        scope['tenant_id'] = tenant_id
+    if service_id is not None:
+        scope['service_id'] = service_id
+
+    written = 0
+    with transaction.atomic():
+        if tenant_id is not None:
+            _advisory_lock(tenant_id)
+        BookingDailyRollup.objects.filter(**scope).delete()
+        batch = []
+        for r in _aggregate(Booking.objects.filter(**scope)).iterator(chunk_size=batch_size):
+            batch.append(BookingDailyRollup(**{k: r[k] for k in ROLLUP_KEY}, **_measures(r)))
+            if len(batch) >= batch_size:
+                BookingDailyRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            BookingDailyRollup.objects.bulk_create(batch)
+            written += len(batch)
+    logger.info(f"[ROLLUP] Rebuilt {written} rollup rows (scope={scope or 'all'})")
+    return written
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.pagination import SparseFieldsMixin
 from .models import Service, Staff, Client, Booking, Session
 
 
@@ -36,6 +37,8 @@ class ServiceSerializer(serializers.ModelSerializer):
                            'risk_indicator']
 
     def get_staff_ids(self, obj):
+        if 'staff_members' in getattr(obj, '_prefetched_objects_cache', {}):
+            return [staff.id for staff in obj.staff_members.all()]
         return list(obj.staff_members.values_list('id', flat=True))
 
     def get_brochure_url(self, obj):
@@ -69,7 +72,7 @@ class ClientSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'email', 'phone', 'notes', 'created_at', 'updated_at']
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     client_name = serializers.CharField(source='client.name', read_only=True)
     client_email = serializers.CharField(source='client.email', read_only=True)
     client_phone = serializers.CharField(source='client.phone', read_only=True)
@@ -158,6 +161,101 @@ class BookingSerializer(serializers.ModelSerializer):
         return data
 
 
+# Fast read path for booking lists: the same output as BookingSerializer, built
+# from one values() query (joins instead of per-row related lookups) without
+# per-field serializer machinery. Keep in step with BookingSerializer's fields.
+BOOKING_LIST_COLUMNS = (
+    'id', 'client_id', 'service_id', 'staff_id', 'start_time', 'end_time', 'status', 'notes',
+    'payment_status', 'payment_amount', 'payment_type',
+    'risk_score', 'risk_level', 'revenue_at_risk',
+    'recommended_payment_type', 'recommended_deposit_percent',
+    'recommended_price_adjustment', 'recommended_incentive',
+    'recommendation_reason', 'override_applied', 'created_at', 'updated_at',
+    'client__name', 'client__email', 'client__phone', 'client__notes',
+    'client__reliability_score', 'client__lifetime_value', 'client__total_bookings',
+    'client__completed_bookings', 'client__cancelled_bookings',
+    'client__no_show_count', 'client__consecutive_no_shows',
+    'service__name', 'service__price', 'service__deposit_pence', 'service__deposit_percentage',
+    'staff__name',
+)
+
+_datetime = serializers.DateTimeField()
+_money = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+def _opt(field, value):
+    return None if value is None else field.to_representation(value)
+
+
+def _opt_float(value):
+    return None if value is None else float(value)
+
+
+def booking_list_values(queryset):
+    """The columns booking_list_rows() needs; lazy, so it can be paginated."""
+    return queryset.values(*BOOKING_LIST_COLUMNS)
+
+
+def booking_list_rows(values):
+    """BookingSerializer(many=True).data, built from booking_list_values() rows."""
+    rows = []
+    for v in values:
+        start, end = v['start_time'], v['end_time']
+        price_pence = int(v['service__price'] * 100)
+        if v['service__deposit_percentage'] > 0:
+            deposit_pence = int(price_pence * v['service__deposit_percentage'] / 100)
+        else:
+            deposit_pence = v['service__deposit_pence']
+        rows.append({
+            'id': v['id'],
+            'client': v['client_id'],
+            'client_name': v['client__name'],
+            'client_email': v['client__email'],
+            'client_phone': v['client__phone'],
+            'client_notes': v['client__notes'],
+            'client_reliability_score': _opt_float(v['client__reliability_score']),
+            'client_lifetime_value': _opt(_money, v['client__lifetime_value']),
+            'client_total_bookings': v['client__total_bookings'],
+            'client_completed_bookings': v['client__completed_bookings'],
+            'client_cancelled_bookings': v['client__cancelled_bookings'],
+            'client_no_show_count': v['client__no_show_count'],
+            'client_consecutive_no_shows': v['client__consecutive_no_shows'],
+            'service': v['service_id'],
+            'service_name': v['service__name'],
+            'service_price': _opt(_money, v['service__price']),
+            'staff': v['staff_id'],
+            'staff_name': v['staff__name'],
+            'start_time': _opt(_datetime, start),
+            'end_time': _opt(_datetime, end),
+            'status': v['status'].upper(),
+            'notes': v['notes'],
+            'payment_status': v['payment_status'],
+            'payment_amount': _opt(_money, v['payment_amount']),
+            'payment_type': v['payment_type'],
+            'risk_score': _opt_float(v['risk_score']),
+            'risk_level': v['risk_level'],
+            'revenue_at_risk': _opt(_money, v['revenue_at_risk']),
+            'recommended_payment_type': v['recommended_payment_type'],
+            'recommended_deposit_percent': _opt_float(v['recommended_deposit_percent']),
+            'recommended_price_adjustment': _opt(_money, v['recommended_price_adjustment']),
+            'recommended_incentive': v['recommended_incentive'],
+            'recommendation_reason': v['recommendation_reason'],
+            'override_applied': v['override_applied'],
+            'customer_name': v['client__name'],
+            'customer_email': v['client__email'],
+            'customer_phone': v['client__phone'],
+            'slot_date': start.strftime('%Y-%m-%d'),
+            'slot_start': start.strftime('%H:%M'),
+            'slot_end': end.strftime('%H:%M'),
+            'price_pence': price_pence,
+            'deposit_pence': deposit_pence,
+            'assigned_staff': v['staff_id'],
+            'created_at': _opt(_datetime, v['created_at']),
+            'updated_at': _opt(_datetime, v['updated_at']),
+        })
+    return rows
+
+
 class SessionSerializer(serializers.ModelSerializer):
     service_name = serializers.CharField(source='service.name', read_only=True)
     staff_name = serializers.CharField(source='staff.name', read_only=True)
@@ -0,0 +1,222 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+# Saves touching only these fields cannot change reminder timing
+_REMINDER_FIELDS = {'start_time', 'status'}
+
+# Saves touching none of these cannot move a booking to another rollup group
+_ROLLUP_KEY_FIELDS = {'tenant', 'tenant_id', 'start_time', 'service', 'service_id', 'staff', 'staff_id'}
+
+# ...or to another demand heatmap cell
+_HEATMAP_FIELDS = {'tenant', 'tenant_id', 'start_time', 'service', 'service_id', 'status'}
+
+# Saves touching none of these change nothing the admin shows live
+_LIVE_FIELDS = {
+    'start_time', 'end_time', 'status', 'payment_status', 'client', 'client_id',
+    'service', 'service_id', 'staff', 'staff_id',
+}
+
+_bulk = threading.local()
+
+
+@contextmanager
+def bulk_booking_changes():
+    """
+    For bulk booking writes and queryset deletes (demo seeding and clearing):
+    the per-booking rollup, heatmap, report-cache and live receivers only
+    note the tenant, and each tenant touched is rebuilt once on exit.
+    Reminder scheduling still runs per booking.
+    """
+    if getattr(_bulk, 'tenants', None) is not None:
+        yield
+        return
+    _bulk.tenants = touched = set()
+    try:
+        yield
+    finally:
+        _bulk.tenants = None
+    from core import tenant_cache
+    from core.live_events import publish
+    from core.operational_events import invalidate_operational_events
+    from .heatmaps import rebuild_heatmaps
+    from .rollups import rebuild_rollups
+    for tenant_id in touched - {None}:
+        rebuild_rollups(tenant_id=tenant_id)
+        rebuild_heatmaps(tenant_id)
+        tenant_cache.bump('reports', tenant_id)
+        invalidate_operational_events(tenant_id)
+        publish(tenant_id, 'booking.bulk')
+
+
+def _in_bulk(instance):
+    """True inside bulk_booking_changes(), after noting the instance's tenant for the rebuild."""
+    tenants = getattr(_bulk, 'tenants', None)
+    if tenants is None:
+        return False
+    tenants.add(instance.tenant_id)
+    return True
+
+
+@receiver(post_save, sender='bookings.Booking')
+def schedule_reminders_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if not created and update_fields is not None and not (_REMINDER_FIELDS & set(update_fields)):
+        return
+    from .email_reminders import schedule_booking_reminders
+    schedule_booking_reminders(instance)
+
+
+@receiver(post_save, sender='bookings.Booking')
+@receiver(post_delete, sender='bookings.Booking')
+@receiver(post_save, sender='bookings.Service')
+def invalidate_report_cache(sender, instance, **kwargs):
+    if _in_bulk(instance):
+        return
+    from core import tenant_cache
+    tenant_cache.bump('reports', instance.tenant_id)
+
+
+@receiver(post_save, sender='bookings.Booking')
+@receiver(post_delete, sender='bookings.Booking')
+def invalidate_operational_events_on_booking(sender, instance, **kwargs):
+    if _in_bulk(instance):
+        return
+    from core.operational_events import invalidate_operational_events
+    invalidate_operational_events(instance.tenant_id)
+
+
+@receiver(post_save, sender='bookings.Booking')
+def publish_booking_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or _in_bulk(instance):
+        return
+    if not created and update_fields is not None and not (_LIVE_FIELDS & set(update_fields)):
+        return
+    from core.live_events import publish
+    if created:
+        topic = 'booking.created'
+    elif instance.status == 'cancelled' and getattr(instance, '_status_before', None) not in (None, 'cancelled'):
+        topic = 'booking.cancelled'
+    else:
+        topic = 'booking.updated'
+    publish(instance.tenant_id, topic, id=instance.pk, status=instance.status)
+
+
+@receiver(post_delete, sender='bookings.Booking')
+def publish_booking_delete(sender, instance, **kwargs):
+    if _in_bulk(instance):
+        return
+    from core.live_events import publish
+    publish(instance.tenant_id, 'booking.deleted', id=instance.pk)
+
+
+def _leave_tenant_id(leave):
+    from .models import Staff
+    return Staff.objects.filter(pk=leave.staff_member_id).values_list('tenant_id', flat=True).first()
+
+
+@receiver(post_save, sender='bookings.LeaveRequest')
+@receiver(post_delete, sender='bookings.LeaveRequest')
+def invalidate_operational_events_on_leave(sender, instance, **kwargs):
+    from core.operational_events import invalidate_operational_events
+    invalidate_operational_events(_leave_tenant_id(instance))
+
+
+@receiver(post_save, sender='bookings.LeaveRequest')
+def publish_leave_requested(sender, instance, created, raw=False, **kwargs):
+    if raw or not created or instance.status != 'REQUESTED':
+        return
+    from core.live_events import publish
+    publish(_leave_tenant_id(instance), 'leave.requested', id=instance.pk, staff_id=instance.staff_member_id)
+
+
+@receiver(pre_save, sender='bookings.Booking')
+def remember_rollup_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Stash the rollup group and heatmap cell a booking counted in before this save moves it."""
+    instance._rollup_key_before = None
+    instance._heatmap_key_before = None
+    instance._status_before = None
+    if raw or instance.pk is None or getattr(_bulk, 'tenants', None) is not None:
+        return
+    fields = None if update_fields is None else set(update_fields)
+    want_rollup = fields is None or bool(_ROLLUP_KEY_FIELDS & fields)
+    want_heatmap = fields is None or bool(_HEATMAP_FIELDS & fields)
+    if not (want_rollup or want_heatmap):
+        return
+    old = sender.objects.filter(pk=instance.pk).only(
+        'tenant_id', 'start_time', 'service_id', 'staff_id', 'status',
+    ).first()
+    if old is not None:
+        from .heatmaps import heatmap_key
+        from .rollups import rollup_key
+        if want_rollup:
+            instance._rollup_key_before = rollup_key(old)
+        if want_heatmap:
+            instance._heatmap_key_before = heatmap_key(old)
+            instance._status_before = old.status
+
+
+@receiver(post_save, sender='bookings.Booking')
+def refresh_rollup_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    from .rollups import ROLLUP_FIELDS, refresh_rollup, rollup_key
+    if raw or _in_bulk(instance):
+        return
+    if not created and update_fields is not None and not (ROLLUP_FIELDS & set(update_fields)):
+        return
+    keys = {rollup_key(instance)}
+    before = getattr(instance, '_rollup_key_before', None)
+    if before is not None:
+        keys.add(before)
+    # Fixed order, so two writers moving bookings between the same groups can't deadlock
+    for key in sorted(keys, key=str):
+        refresh_rollup(*key)
+
+
+@receiver(post_delete, sender='bookings.Booking')
+def refresh_rollup_on_delete(sender, instance, **kwargs):
+    if _in_bulk(instance):
+        return
+    from .rollups import refresh_rollup, rollup_key
+    refresh_rollup(*rollup_key(instance))
+
+
+@receiver(post_save, sender='bookings.Booking')
+def update_heatmap_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or _in_bulk(instance):
+        return
+    if not created and update_fields is not None and not (_HEATMAP_FIELDS & set(update_fields)):
+        return
+    from .heatmaps import heatmap_key, move_booking
+    before = None if created else getattr(instance, '_heatmap_key_before', None)
+    move_booking(before, heatmap_key(instance))
+
+
+@receiver(post_delete, sender='bookings.Booking')
+def update_heatmap_on_delete(sender, instance, **kwargs):
+    if _in_bulk(instance):
+        return
+    from .heatmaps import heatmap_key, move_booking
+    move_booking(heatmap_key(instance), None)
+
+
+@receiver(pre_save, sender='bookings.Service')
+def remember_service_price(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._price_before = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and 'price' not in update_fields:
+        return
+    instance._price_before = sender.objects.filter(pk=instance.pk).values_list('price', flat=True).first()
+
+
+@receiver(post_save, sender='bookings.Service')
+def rebuild_rollups_on_price_change(sender, instance, created, raw=False, **kwargs):
+    # Rollup revenue is priced at the service's current price, as the live reports were
+    before = getattr(instance, '_price_before', None)
+    if raw or created or before is None or before == instance.price:
+        return
+    from .rollups import rebuild_rollups
+    rebuild_rollups(tenant_id=instance.tenant_id, service_id=instance.pk)
@@ -269,8 +269,11 @@ def generate_booking_recommendation(booking):
 def update_service_demand_index():
     """
     Calculate demand index for each service based on booking frequency.
-    Should be run daily (management command or cron).
+    Should be run daily (management command or cron) — reading each
+    tenant's heatmap also slides it forward to today.
     """
+    from collections import defaultdict
+    from .heatmaps import tenant_heatmaps
     from .models import Service, Booking
 
     thirty_days_ago = timezone.now() - timedelta(days=30)
@@ -290,36 +293,36 @@ def update_service_demand_index():
     )
     counts = {d['service_id']: d['count'] for d in demand_data}
 
-    # Find max for normalisation
-    max_count = max(counts.values()) if counts else 1
-
+    by_tenant = defaultdict(list)
     for service in services:
-        count = counts.get(service.id, 0)
-        # Normalise 0-100
-        demand_index = (count / max_count) * 100 if max_count > 0 else 0
-
-        # Factor in time-of-day patterns (hour distribution)
-        hour_bookings = (
-            Booking.objects.filter(
-                service=service,
-                start_time__gte=thirty_days_ago,
-                status__in=['confirmed', 'completed']
-            )
-            .extra(select={'hour': 'EXTRACT(hour FROM start_time)'})
-            .values('hour')
-            .annotate(count=Count('id'))
-        )
-        # Peak hours: if bookings cluster in certain hours, demand is higher
-        if hour_bookings:
-            hour_counts = [h['count'] for h in hour_bookings]
-            peak_concentration = max(hour_counts) / sum(hour_counts) if sum(hour_counts) > 0 else 0
-            # Boost demand if bookings are concentrated (peak pattern)
-            demand_index = demand_index * (1 + peak_concentration * 0.3)
-
-        service.demand_index = min(100, max(0, demand_index))
-        service.save(update_fields=['demand_index'])
-
-        logger.info(f"[SBE] Demand updated: service={service.id} '{service.name}' index={service.demand_index:.1f}")
+        by_tenant[service.tenant_id].append(service)
+
+    for tenant_id, tenant_services in by_tenant.items():
+        # Normalise against the busiest service of the same business
+        max_count = max(counts.get(s.id, 0) for s in tenant_services) or 1
+        heatmaps = tenant_heatmaps(tenant_id, 30)
+
+        for service in tenant_services:
+            count = counts.get(service.id, 0)
+            # Normalise 0-100
+            demand_index = (count / max_count) * 100
+
+            # Factor in time-of-day patterns (hour distribution of attended bookings)
+            heatmap = heatmaps.get(service.id)
+            if heatmap:
+                hour_counts = [
+                    sum(heatmap.bookings[d][h] - heatmap.no_shows[d][h] for d in range(7)) for h in range(24)
+                ]
+                # Peak hours: if bookings cluster in certain hours, demand is higher
+                if sum(hour_counts) > 0:
+                    peak_concentration = max(hour_counts) / sum(hour_counts)
+                    # Boost demand if bookings are concentrated (peak pattern)
+                    demand_index = demand_index * (1 + peak_concentration * 0.3)
+
+            service.demand_index = min(100, max(0, demand_index))
+            service.save(update_fields=['demand_index'])
+
+            logger.info(f"[SBE] Demand updated: service={service.id} '{service.name}' index={service.demand_index:.1f}")
 
 
 # ============================================================
@@ -0,0 +1,66 @@
+"""
+Booking list read path — booking_list_rows() must match BookingSerializer
+field for field, and GET /api/bookings/ must not query per row.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tenants.models import TenantSettings
+from .models import Booking, Client, Service, Staff
+from .serializers import BookingSerializer, booking_list_rows, booking_list_values
+
+
+class BookingListTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='list-t', business_name='List T')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='list-t')
+        self.services = [
+            Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('20.00')),
+            Service.objects.create(tenant=self.tenant, name='Colour', duration_minutes=90, price=Decimal('84.99'),
+                                   deposit_percentage=25),
+            Service.objects.create(tenant=self.tenant, name='Trim', duration_minutes=15, price=Decimal('9.50'),
+                                   deposit_pence=300),
+        ]
+        self.staff = [Staff.objects.create(tenant=self.tenant, name=f'S{n}', email=f's{n}@list.test') for n in range(2)]
+        self.clients = [
+            Client.objects.create(tenant=self.tenant, name=f'C{n}', email=f'c{n}@list.test', phone=str(n),
+                                  notes='Allergic to ammonia' if n else '', lifetime_value=Decimal('123.4'),
+                                  reliability_score=87.5 if n else 100.0)
+            for n in range(3)
+        ]
+        start = timezone.now().replace(second=0, microsecond=0)
+        for n in range(12):
+            booking_start = start + timedelta(hours=n * 5)
+            Booking.objects.create(
+                tenant=self.tenant, client=self.clients[n % 3], service=self.services[n % 3],
+                staff=self.staff[n % 2], start_time=booking_start, end_time=booking_start + timedelta(minutes=45),
+                status=['pending', 'confirmed', 'completed', 'no_show'][n % 4],
+                payment_amount=Decimal('12.5') if n % 2 else None,
+                risk_score=41.25 if n % 3 else None, revenue_at_risk=Decimal('3') if n % 3 else None,
+                recommended_deposit_percent=20.0 if n % 2 else None, override_applied=bool(n % 5 == 0),
+            )
+
+    def test_rows_match_the_full_serializer(self):
+        qs = Booking.objects.filter(tenant=self.tenant).select_related('client', 'service', 'staff')
+        expected = [dict(row) for row in BookingSerializer(qs, many=True).data]
+        self.assertEqual(booking_list_rows(booking_list_values(qs)), expected)
+        # Same keys in the same order, so the JSON is byte-for-byte identical
+        self.assertEqual(list(booking_list_rows(booking_list_values(qs))[0]), list(expected[0]))
+
+    def test_list_is_one_query_however_many_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get('/api/bookings/')
+        self.assertEqual(len(response.json()), 12)
+        booking_queries = [q for q in queries.captured_queries if 'bookings_booking' in q['sql']]
+        self.assertEqual(len(booking_queries), 1)
+
+        page = self.api.get('/api/bookings/', {'page_size': 5, 'fields': 'id,customer_name,status'}).json()
+        self.assertEqual(len(page['results']), 5)
+        self.assertEqual(page['results'][0].keys(), {'id', 'customer_name', 'status'})
@@ -0,0 +1,104 @@
+"""
+Booking bootstrap endpoint: one response with everything the public
+booking flow needs, a bounded number of queries however many services and
+staff the tenant has, and an ETag that follows the content behind it.
+"""
+from datetime import time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tenants.models import TenantSettings
+
+from .models import BusinessHours, Service, Staff
+from .models_intake import IntakeWellbeingDisclaimer
+
+URL = '/api/bookings/bootstrap/'
+
+
+@override_settings(TENANT_CACHE_ENABLED=True)
+class BookingBootstrapTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = TenantSettings.objects.create(slug='boot-t', business_name='Boot T')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='boot-t')
+        self.cut = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('20.00'))
+        self.staff = Staff.objects.create(
+            tenant=self.tenant, name='Sam', email='sam@boot.test', phone='0123',
+            break_start=time(12, 0), break_end=time(12, 30),
+        )
+        self.staff.services.add(self.cut)
+        BusinessHours.objects.create(day_of_week=0, open_time=time(9, 0), close_time=time(17, 0))
+        IntakeWellbeingDisclaimer.objects.create(version='v1', content='Take care', active=True)
+
+    def _add(self, n):
+        for i in range(Staff.objects.count(), Staff.objects.count() + n):
+            service = Service.objects.create(tenant=self.tenant, name=f'S{i}', duration_minutes=30, price=Decimal('10.00'))
+            staff = Staff.objects.create(tenant=self.tenant, name=f'P{i}', email=f'p{i}@boot.test')
+            staff.services.add(service, self.cut)
+
+    def test_payload(self):
+        Service.objects.create(tenant=self.tenant, name='Retired', duration_minutes=30, price=Decimal('5.00'), active=False)
+        Staff.objects.create(tenant=self.tenant, name='Gone', email='gone@boot.test', active=False).services.add(self.cut)
+        data = self.api.get(URL).json()
+        self.assertEqual(data['version'], self.api.get(URL)['ETag'].strip('W/').strip('"'))
+        self.assertEqual(data['settings']['slug'], 'boot-t')
+        self.assertIn('colour_primary', data['branding'])
+        self.assertEqual([s['name'] for s in data['services']], ['Cut'])
+        self.assertEqual(data['services'][0]['staff_ids'], [self.staff.id])
+        self.assertEqual(data['staff'], [{
+            'id': self.staff.id, 'name': 'Sam', 'role': self.staff.role, 'photo_url': self.staff.photo_url,
+            'service_ids': [self.cut.id], 'break_start': '12:00:00', 'break_end': '12:30:00',
+        }])
+        self.assertEqual(data['business_hours'][0]['open_time'], '09:00:00')
+        self.assertEqual(data['disclaimer']['version'], 'v1')
+
+    def test_queries_do_not_grow_with_services_and_staff(self):
+        self._add(2)
+        cache.clear()
+        with CaptureQueriesContext(connection) as small:
+            self.api.get(URL)
+        self._add(20)
+        cache.clear()
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(len(self.api.get(URL).json()['services']), 23)
+        self.assertEqual(len(large), len(small))
+
+        # A cached version skips the build entirely
+        with CaptureQueriesContext(connection) as cached:
+            self.api.get(URL)
+        self.assertLess(len(cached), len(large))
+
+    def test_etag_follows_content(self):
+        etag = self.api.get(URL)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            again = self.api.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        # Tenant lookup plus the business hours / disclaimer hash
+        self.assertEqual(len(queries), 3)
+
+        self.cut.price = Decimal('25.00')
+        self.cut.save()
+        fresh = self.api.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.json()['services'][0]['price'], '25.00')
+
+        etag = fresh['ETag']
+        BusinessHours.objects.filter(day_of_week=0).update(close_time=time(18, 0))
+        fresh = self.api.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.json()['business_hours'][0]['close_time'], '18:00:00')
+
+    def test_tenant_isolation(self):
+        other = TenantSettings.objects.create(slug='boot-o', business_name='Boot O')
+        Service.objects.create(tenant=other, name='Other', duration_minutes=30, price=Decimal('1.00'))
+        etag = self.api.get(URL)['ETag']
+        data = APIClient(HTTP_X_TENANT_SLUG='boot-o').get(URL).json()
+        self.assertEqual([s['name'] for s in data['services']], ['Other'])
+        self.assertEqual(data['staff'], [])
+        self.assertEqual(self.api.get(URL, HTTP_IF_NONE_MATCH=etag).status_code, 304)
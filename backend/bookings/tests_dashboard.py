@@ -0,0 +1,67 @@
+"""
+Dashboard summary tests — client quadrant.
+Zones are classified in SQL, scoped to the tenant, in a fixed number of
+queries however many clients there are.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from tenants.models import TenantSettings
+from .models import Booking, Client, Service, Staff
+from .views_dashboard import _client_quadrant
+
+
+class ClientQuadrantTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='quad-t', business_name='Quad T')
+        self.service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('20.00'))
+        self.staff = Staff.objects.create(tenant=self.tenant, name='S', email='s@quad.test')
+
+    def _client(self, name, reliability, bookings=0, tenant=None, status='completed'):
+        tenant = tenant or self.tenant
+        client = Client.objects.create(
+            tenant=tenant, name=name, email=f'{name}@quad.test', phone=name, reliability_score=reliability,
+        )
+        start = timezone.now() - timedelta(days=10)
+        for _ in range(bookings):
+            Booking.objects.create(
+                tenant=tenant, client=client, service=self.service, staff=self.staff,
+                start_time=start, end_time=start + timedelta(minutes=30), status=status,
+            )
+        return client
+
+    def test_zones(self):
+        self._client('vip', 90, bookings=3)
+        self._client('stable', 80, bookings=1)
+        self._client('watch', 30, bookings=2)
+        self._client('risky', 20)
+        self._client('cancels', 90, bookings=3, status='cancelled')
+
+        points, meta = _client_quadrant(self.tenant)
+        zones = {p['name']: (p['zone'], p['frequency']) for p in points}
+        self.assertEqual(zones, {
+            'vip': ('VIP', 3), 'stable': ('Stable', 1), 'watch': ('Watch', 2),
+            'risky': ('High Risk', 0), 'cancels': ('Stable', 0),
+        })
+        self.assertEqual(meta['zones'], {'total': 5, 'vip': 1, 'stable': 2, 'watch': 1, 'high_risk': 1})
+
+    def test_tenant_scoped_constant_queries_and_paged(self):
+        other = TenantSettings.objects.create(slug='quad-o', business_name='Quad O')
+        self._client('elsewhere', 90, tenant=other)
+        for n in range(12):
+            self._client(f'c{n}', 50, bookings=n % 3)
+
+        with self.assertNumQueries(2):
+            points, meta = _client_quadrant(self.tenant, limit=5, offset=0)
+        self.assertEqual(len(points), 5)
+        self.assertEqual(meta['zones']['total'], 12)
+        self.assertEqual([p['frequency'] for p in points], [2, 2, 2, 2, 1])
+
+        rest, _ = _client_quadrant(self.tenant, limit=50, offset=5)
+        names = {p['name'] for p in points} | {p['name'] for p in rest}
+        self.assertEqual(len(names), 12)
+        self.assertNotIn('elsewhere', names)
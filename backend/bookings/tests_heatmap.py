@@ -0,0 +1,94 @@
+"""
+Demand heatmap tests.
+Incremental updates must agree with a full recount, and the daily slide
+must drop exactly the days that left the window.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from tenants.models import TenantSettings
+from .heatmaps import advance_heatmaps, rebuild_heatmaps, tenant_heatmaps
+from .models import Booking, Client, DemandHeatmap, Service, Staff
+from .smart_engine import update_service_demand_index
+from .views_dashboard import _demand_calendar
+
+
+class DemandHeatmapTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='heat-t', business_name='Heat T')
+        self.service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('20.00'))
+        self.staff = Staff.objects.create(tenant=self.tenant, name='S', email='s@heat.test')
+        self.client_obj = Client.objects.create(tenant=self.tenant, name='C', email='c@heat.test', phone='1')
+
+    def _book(self, days_ago, hour, status='confirmed', service=None):
+        day = timezone.localtime() - timedelta(days=days_ago)
+        start = day.replace(hour=hour, minute=0, second=0, microsecond=0)
+        return Booking.objects.create(
+            tenant=self.tenant, client=self.client_obj, service=service or self.service, staff=self.staff,
+            start_time=start, end_time=start + timedelta(minutes=30), status=status,
+        )
+
+    def _grids(self, window=30):
+        return {
+            sid: (row.bookings, row.no_shows) for sid, row in tenant_heatmaps(self.tenant.id, window).items()
+        }
+
+    def test_incremental_matches_rebuild(self):
+        tenant_heatmaps(self.tenant.id)  # first read builds the (empty) store
+        other = Service.objects.create(tenant=self.tenant, name='Colour', duration_minutes=60, price=Decimal('50.00'))
+        self._book(1, 10)
+        moved = self._book(2, 11, service=other)
+        gone = self._book(3, 12, status='no_show')
+        self._book(60, 9)  # in the 90-day window only
+        self._book(5, 14, status='cancelled')  # never counted
+
+        moved.status = 'no_show'
+        moved.save(update_fields=['status'])
+        moved.start_time += timedelta(hours=2)
+        moved.save()
+        gone.delete()
+
+        incremental = {w: self._grids(w) for w in (30, 90)}
+        rebuild_heatmaps(self.tenant.id)
+        self.assertEqual({w: self._grids(w) for w in (30, 90)}, incremental)
+
+        totals, no_shows = incremental[30][None]
+        self.assertEqual(sum(map(sum, totals)), 2)
+        self.assertEqual(sum(map(sum, no_shows)), 1)
+        self.assertEqual(sum(map(sum, incremental[90][None][0])), 3)
+
+    def test_advance_drops_days_that_left_the_window(self):
+        self._book(28, 10)
+        self._book(1, 10)
+        today = timezone.localdate()
+        rebuild_heatmaps(self.tenant.id, today=today)
+
+        advance_heatmaps(self.tenant.id, today=today + timedelta(days=5))
+        row = DemandHeatmap.objects.get(tenant=self.tenant, service__isnull=True, window_days=30)
+        self.assertEqual(row.window_start, today + timedelta(days=5) - timedelta(days=30))
+        self.assertEqual(sum(map(sum, row.bookings)), 1)
+
+        # Too stale to slide: recounted instead
+        advance_heatmaps(self.tenant.id, today=today + timedelta(days=200))
+        self.assertEqual(sum(map(sum, DemandHeatmap.objects.get(
+            tenant=self.tenant, service__isnull=True, window_days=90).bookings)), 0)
+
+    def test_readers(self):
+        busy = self._book(1, 10)
+        self._book(2, 10)
+        self._book(3, 10, status='no_show')
+        calendar = _demand_calendar(self.tenant)
+        dow = timezone.localtime(busy.start_time).isoweekday() % 7
+        cells = {(c['day_of_week'], c['hour']): c for c in calendar['cells']}
+        self.assertEqual(cells[(dow, 10)]['total_bookings'], 1)
+        self.assertEqual(sum(c['total_bookings'] for c in calendar['cells']), 3)
+        self.assertEqual(sum(c['no_shows'] for c in calendar['cells']), 1)
+
+        update_service_demand_index()
+        self.service.refresh_from_db()
+        # Only service of the tenant (100) with all attended bookings at one hour (+30%), capped
+        self.assertEqual(self.service.demand_index, 100)
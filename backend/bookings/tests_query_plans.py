@@ -0,0 +1,93 @@
+"""
+Query plan tests — hot booking queries must be answered from an index.
+Seeds QUERY_PLAN_SEED_ROWS bookings (default 3000; set to 1000000 for a
+production-sized check), runs ANALYZE, then inspects EXPLAIN output.
+"""
+import os
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+
+from tenants.models import TenantSettings
+from .models import Service, Staff, Client, Booking
+from .views_reports import _base_qs
+
+SEED_ROWS = int(os.environ.get('QUERY_PLAN_SEED_ROWS', '3000'))
+TABLE = Booking._meta.db_table
+
+
+class QueryPlanTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(7)
+        cls.tenants = [
+            TenantSettings.objects.create(slug=f'plan-{n}', business_name=f'Plan {n}') for n in range(4)
+        ]
+        per_tenant = {}
+        for t in cls.tenants:
+            service = Service.objects.create(tenant=t, name='Cut', duration_minutes=30, price=Decimal('25.00'))
+            staff = Staff.objects.create(tenant=t, name='S', email=f'staff@{t.slug}.test')
+            clients = [
+                Client.objects.create(tenant=t, name=f'C{i}', email=f'c{i}@{t.slug}.test', phone=str(i))
+                for i in range(20)
+            ]
+            per_tenant[t.id] = (service, staff, clients)
+        cls.client_obj = per_tenant[cls.tenants[0].id][2][0]
+
+        now = timezone.now()
+        statuses = ['completed', 'confirmed', 'pending', 'cancelled', 'no_show']
+        batch = []
+        for n in range(SEED_ROWS):
+            t = cls.tenants[n % len(cls.tenants)]
+            service, staff, clients = per_tenant[t.id]
+            start = now - timedelta(days=rng.randrange(730), minutes=rng.randrange(0, 600, 15))
+            batch.append(Booking(
+                tenant=t, client=rng.choice(clients), service=service, staff=staff,
+                start_time=start, end_time=start + timedelta(minutes=30), status=rng.choice(statuses),
+            ))
+            if len(batch) == 5000:
+                Booking.objects.bulk_create(batch)
+                batch = []
+        Booking.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, qs, index_name):
+        plan = qs.explain()
+        self.assertIn(index_name, plan, plan)
+        if connection.vendor == 'postgresql':
+            self.assertNotIn(f'Seq Scan on {TABLE}', plan, plan)
+        else:
+            self.assertIn(f'SEARCH {TABLE} USING', plan, plan)
+
+    def _report_request(self, **params):
+        request = Request(RequestFactory().get('/api/reports/daily/', params))
+        request.tenant = self.tenants[0]
+        return request
+
+    def test_report_range_uses_tenant_start_index(self):
+        qs, _, _ = _base_qs(self._report_request(date_from='2026-01-01', date_to='2026-01-31'))
+        self.assertUsesIndex(qs.values('status'), 'booking_tenant_start_idx')
+
+    def test_status_range_uses_tenant_status_index(self):
+        qs = Booking.objects.filter(
+            tenant=self.tenants[0], status='confirmed', start_time__gte=timezone.now() - timedelta(days=7),
+        )
+        self.assertUsesIndex(qs.values('id'), 'booking_tenant_status_idx')
+
+    def test_client_history_uses_client_start_index(self):
+        qs = Booking.objects.filter(client=self.client_obj, start_time__gte=timezone.now() - timedelta(days=90))
+        self.assertUsesIndex(qs.values('id'), 'booking_client_start_idx')
+
+    def test_date_cast_cannot_range_scan_start_time(self):
+        # The lookup _base_qs used to use: start_time is wrapped in a cast, so at
+        # best the tenant prefix of an index is usable
+        qs = Booking.objects.filter(tenant=self.tenants[0], start_time__date__gte=timezone.now().date())
+        plan = qs.values('id').explain()
+        self.assertNotRegex(plan, r'start_time\s*>', plan)
@@ -0,0 +1,204 @@
+"""
+Scheduled Reminder — Tests
+Covers scheduling on booking create/reschedule/cancel, atomic claiming,
+and the heap-driven ReminderScheduler.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from tenants.models import TenantSettings
+from .models import Service, Staff, Client, Booking, ScheduledReminder
+from .reminder_scheduler import ReminderScheduler
+
+
+class ReminderTestBase(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='reminders', business_name='Reminder Salon')
+        self.service = Service.objects.create(
+            tenant=self.tenant, name='Cut', duration_minutes=60, price=Decimal('40.00'),
+        )
+        self.staff = Staff.objects.create(tenant=self.tenant, name='Alice', email='alice@reminders.test')
+        self.client_obj = Client.objects.create(
+            tenant=self.tenant, name='Bob', email='bob@reminders.test', phone='07700 000000',
+        )
+        self.now = timezone.now().replace(microsecond=0)
+
+    def _booking(self, start, **kwargs):
+        defaults = dict(
+            tenant=self.tenant, client=self.client_obj, service=self.service, staff=self.staff,
+            start_time=start, status='confirmed',
+        )
+        defaults.update(kwargs)
+        return Booking.objects.create(**defaults)
+
+
+class ScheduleBookingRemindersTest(ReminderTestBase):
+
+    def test_create_schedules_exact_send_times(self):
+        start = self.now + timedelta(days=3)
+        b = self._booking(start)
+        rows = {r.kind: r for r in b.scheduled_reminders.all()}
+        self.assertEqual(rows['24h'].send_at, start - timedelta(hours=24))
+        self.assertEqual(rows['1h'].send_at, start - timedelta(hours=1))
+        self.assertTrue(all(r.status == 'pending' for r in rows.values()))
+
+    def test_short_notice_booking_skips_24h(self):
+        b = self._booking(self.now + timedelta(hours=3))
+        self.assertEqual(list(b.scheduled_reminders.values_list('kind', flat=True)), ['1h'])
+
+    def test_reschedule_rearms(self):
+        b = self._booking(self.now + timedelta(days=3))
+        new_start = self.now + timedelta(days=5)
+        b.start_time = new_start
+        b.save()
+        r = b.scheduled_reminders.get(kind='24h')
+        self.assertEqual(r.send_at, new_start - timedelta(hours=24))
+        self.assertEqual(r.status, 'pending')
+
+    def test_cancel_then_reinstate(self):
+        b = self._booking(self.now + timedelta(days=3))
+        b.status = 'cancelled'
+        b.save(update_fields=['status'])
+        self.assertEqual(set(b.scheduled_reminders.values_list('status', flat=True)), {'cancelled'})
+        b.status = 'confirmed'
+        b.save(update_fields=['status'])
+        self.assertEqual(set(b.scheduled_reminders.values_list('status', flat=True)), {'pending'})
+
+    def test_backfill_covers_bulk_created_bookings(self):
+        from .email_reminders import backfill_scheduled_reminders
+        Booking.objects.bulk_create([Booking(
+            tenant=self.tenant, client=self.client_obj, service=self.service, staff=self.staff,
+            start_time=self.now + timedelta(days=2), end_time=self.now + timedelta(days=2, hours=1),
+            status='confirmed',
+        )])
+        self.assertEqual(ScheduledReminder.objects.count(), 0)
+        self.assertEqual(backfill_scheduled_reminders(now=self.now), 1)
+        self.assertEqual(ScheduledReminder.objects.count(), 2)
+
+    def test_backfill_skips_bookings_past_every_reminder_window(self):
+        from .email_reminders import backfill_scheduled_reminders
+        start = self.now + timedelta(minutes=30)
+        Booking.objects.bulk_create([Booking(
+            tenant=self.tenant, client=self.client_obj, service=self.service, staff=self.staff,
+            start_time=start, end_time=start + timedelta(hours=1), status='confirmed',
+        )])
+        self.assertEqual(backfill_scheduled_reminders(now=self.now), 0)
+        self.assertEqual(ScheduledReminder.objects.count(), 0)
+
+    def test_backfill_does_not_resend_reminders_already_sent(self):
+        from .email_reminders import backfill_scheduled_reminders
+        start = self.now + timedelta(hours=23, minutes=30)
+        Booking.objects.bulk_create([Booking(
+            tenant=self.tenant, client=self.client_obj, service=self.service, staff=self.staff,
+            start_time=start, end_time=start + timedelta(hours=1), status='confirmed',
+            reminder_sent_24h=True,
+        )])
+        self.assertEqual(backfill_scheduled_reminders(now=self.now), 1)
+        statuses = dict(ScheduledReminder.objects.values_list('kind', 'status'))
+        self.assertEqual(statuses, {'24h': 'sent', '1h': 'pending'})
+
+
+@mock.patch('bookings.email_reminders.send_reminder_email', return_value=True)
+class SendScheduledReminderTest(ReminderTestBase):
+
+    def test_claim_is_exclusive(self, _send):
+        from .email_reminders import claim_reminder
+        b = self._booking(self.now + timedelta(days=3))
+        r = b.scheduled_reminders.get(kind='24h')
+        due = r.send_at
+        self.assertTrue(claim_reminder(r.pk, now=due))
+        self.assertFalse(claim_reminder(r.pk, now=due))
+
+    def test_not_claimable_before_due(self, _send):
+        from .email_reminders import send_scheduled_reminder
+        b = self._booking(self.now + timedelta(days=3))
+        r = b.scheduled_reminders.get(kind='24h')
+        self.assertIsNone(send_scheduled_reminder(r.pk, now=r.send_at - timedelta(seconds=1)))
+
+    def test_sent_marks_row_and_booking_flag(self, send):
+        from .email_reminders import send_scheduled_reminder
+        b = self._booking(self.now + timedelta(days=3))
+        r = b.scheduled_reminders.get(kind='1h')
+        self.assertEqual(send_scheduled_reminder(r.pk, now=r.send_at), 'sent')
+        r.refresh_from_db()
+        b.refresh_from_db()
+        self.assertEqual(r.status, 'sent')
+        self.assertTrue(b.reminder_sent_1h)
+        self.assertTrue(send.call_args.kwargs['is_1h'])
+
+    def test_failure_retries_then_fails(self, send):
+        from .email_reminders import send_scheduled_reminder, REMINDER_RETRY_DELAY
+        send.return_value = False
+        b = self._booking(self.now + timedelta(days=3))
+        r = b.scheduled_reminders.get(kind='24h')
+        due = r.send_at
+        self.assertEqual(send_scheduled_reminder(r.pk, now=due), 'retry')
+        r.refresh_from_db()
+        self.assertEqual(r.send_at, due + REMINDER_RETRY_DELAY)
+        self.assertEqual(send_scheduled_reminder(r.pk, now=r.send_at), 'retry')
+        r.refresh_from_db()
+        self.assertEqual(send_scheduled_reminder(r.pk, now=r.send_at), 'failed')
+
+    def test_stale_claim_is_released(self, send):
+        from .email_reminders import (
+            REMINDER_CLAIM_TIMEOUT, REMINDER_MAX_ATTEMPTS, claim_reminder, release_stale_claims,
+            send_scheduled_reminder,
+        )
+        b = self._booking(self.now + timedelta(days=3))
+        r = b.scheduled_reminders.get(kind='24h')
+        due = r.send_at
+        # Worker died after claiming
+        self.assertTrue(claim_reminder(r.pk, now=due))
+        self.assertEqual(release_stale_claims(now=due + timedelta(minutes=1)), 0)
+
+        later = due + REMINDER_CLAIM_TIMEOUT + timedelta(seconds=1)
+        self.assertEqual(release_stale_claims(now=later), 1)
+        r.refresh_from_db()
+        self.assertEqual(r.status, 'pending')
+        self.assertEqual(send_scheduled_reminder(r.pk, now=later), 'sent')
+
+        other = b.scheduled_reminders.get(kind='1h')
+        ScheduledReminder.objects.filter(pk=other.pk).update(
+            status='sending', claimed_at=self.now, attempts=REMINDER_MAX_ATTEMPTS,
+        )
+        release_stale_claims(now=self.now + REMINDER_CLAIM_TIMEOUT * 2)
+        other.refresh_from_db()
+        self.assertEqual(other.status, 'failed')
+
+
+@mock.patch('bookings.email_reminders.send_reminder_email', return_value=True)
+class ReminderSchedulerTest(ReminderTestBase):
+
+    def test_sleeps_until_next_due_and_sends_on_time(self, send):
+        b = self._booking(self.now + timedelta(hours=1, minutes=20))
+        due = b.start_time - timedelta(hours=1)
+        clock = mock.Mock(return_value=self.now)
+        scheduler = ReminderScheduler(refresh_seconds=3600, clock=clock)
+
+        results = scheduler.tick()
+        self.assertEqual(results['sent_1h'], 0)
+        self.assertEqual(scheduler.seconds_until_next(), (due - self.now).total_seconds())
+
+        clock.return_value = due
+        results = scheduler.tick()
+        self.assertEqual(results['sent_1h'], 1)
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(b.scheduled_reminders.get(kind='1h').status, 'sent')
+
+    def test_stale_heap_entry_after_reschedule_is_ignored(self, send):
+        b = self._booking(self.now + timedelta(hours=1, minutes=20))
+        clock = mock.Mock(return_value=self.now)
+        scheduler = ReminderScheduler(refresh_seconds=3600, clock=clock)
+        scheduler.tick()
+
+        b.start_time = self.now + timedelta(hours=6)
+        b.save()
+        clock.return_value = self.now + timedelta(minutes=20)
+        results = scheduler.tick()
+        self.assertEqual(results['sent_1h'], 0)
+        send.assert_not_called()
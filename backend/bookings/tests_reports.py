@@ -0,0 +1,87 @@
+"""
+Reports API — Tests
+Overview KPIs from conditional aggregation, and per-tenant result caching.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tenants.models import TenantSettings
+from .models import Service, Staff, Client, Booking
+
+
+@override_settings(TENANT_CACHE_ENABLED=True)
+class ReportsOverviewTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = TenantSettings.objects.create(slug='reports-t', business_name='Reports T')
+        self.other = TenantSettings.objects.create(slug='reports-o', business_name='Reports O')
+        self.service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=60, price=Decimal('40.00'))
+        self.staff = Staff.objects.create(tenant=self.tenant, name='Alice', email='alice@reports.test')
+        self.alice = Client.objects.create(tenant=self.tenant, name='A', email='a@r.test', phone='1', reliability_score=80)
+        self.bob = Client.objects.create(tenant=self.tenant, name='B', email='b@r.test', phone='2', reliability_score=60)
+        base = (timezone.now() - timedelta(days=3)).replace(hour=10, minute=0, second=0, microsecond=0)
+        self._book(self.alice, base, 'completed', payment_status='paid', payment_amount=Decimal('10.00'), risk_score=20)
+        self._book(self.alice, base + timedelta(days=1), 'confirmed', risk_level='HIGH',
+                   revenue_at_risk=Decimal('15.00'), risk_score=70)
+        self._book(self.bob, base + timedelta(days=1, hours=2), 'no_show')
+        self._book(self.bob, base + timedelta(days=2), 'cancelled')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='reports-t')
+
+    def _book(self, client, start, status, **kwargs):
+        return Booking.objects.create(
+            tenant=self.tenant, client=client, service=self.service, staff=self.staff,
+            start_time=start, status=status, **kwargs,
+        )
+
+    def test_kpis(self):
+        data = self.api.get('/api/reports/overview/').json()
+        kpi = data['kpi']
+        self.assertEqual(kpi['total_bookings'], 4)
+        self.assertEqual(kpi['completed'], 2)
+        self.assertEqual(kpi['no_shows'], 1)
+        self.assertEqual(kpi['cancelled'], 1)
+        self.assertEqual(kpi['no_show_rate'], 25.0)
+        self.assertEqual(kpi['revenue'], 80.0)
+        self.assertEqual(kpi['revenue_at_risk'], 15.0)
+        self.assertEqual(kpi['deposits'], 10.0)
+        self.assertEqual(kpi['avg_risk_score'], 45.0)
+        self.assertEqual(kpi['avg_reliability'], 70.0)
+        self.assertEqual(kpi['unique_clients'], 2)
+        self.assertEqual(kpi['repeat_client_pct'], 100.0)
+        self.assertEqual(len(data['revenue_timeline']), 2)
+        self.assertEqual([r['at_risk'] for r in data['risk_timeline']], [15.0])
+
+    def test_cached_until_booking_write(self):
+        first = self.api.get('/api/reports/overview/').json()
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.api.get('/api/reports/overview/').json()
+        self.assertEqual(first, again)
+        # Only tenant resolution hits the database on a cache hit
+        self.assertFalse([q for q in ctx.captured_queries if 'bookings_booking' in q['sql']])
+
+        self._book(self.alice, timezone.now() - timedelta(hours=5), 'completed')
+        fresh = self.api.get('/api/reports/overview/').json()
+        self.assertEqual(fresh['kpi']['total_bookings'], 5)
+
+    @override_settings(TENANT_CACHE_ENABLED=False)
+    def test_process_local_cache_is_bypassed(self):
+        self.api.get('/api/reports/overview/')
+        with CaptureQueriesContext(connection) as ctx:
+            self.api.get('/api/reports/overview/')
+        self.assertTrue([q for q in ctx.captured_queries if 'bookings_booking' in q['sql']])
+
+    def test_cache_is_per_filter_and_tenant(self):
+        all_rows = self.api.get('/api/reports/overview/').json()
+        filtered = self.api.get('/api/reports/overview/', {'payment_status': 'paid'}).json()
+        self.assertEqual(all_rows['kpi']['total_bookings'], 4)
+        self.assertEqual(filtered['kpi']['total_bookings'], 1)
+        other = APIClient(HTTP_X_TENANT_SLUG='reports-o').get('/api/reports/overview/').json()
+        self.assertEqual(other['kpi']['total_bookings'], 0)
@@ -0,0 +1,173 @@
+"""
+Daily booking rollup — Tests
+Signal-maintained rows match a full rebuild; reports read the rollup and
+fall back to live bookings for filters it can't answer.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tenants.models import TenantSettings
+from .models import Service, Staff, Client, Booking, BookingDailyRollup
+from .rollups import rebuild_rollups
+
+
+def _snapshot():
+    return sorted(
+        BookingDailyRollup.objects.values_list(
+            'tenant_id', 'date', 'service_id', 'staff_id', 'status',
+            'booking_count', 'no_show_count', 'revenue', 'deposits',
+            'at_risk_revenue', 'high_risk_count', 'high_risk_revenue',
+            'risk_score_sum', 'risk_score_count',
+        )
+    )
+
+
+class BookingDailyRollupTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = TenantSettings.objects.create(slug='rollup-t', business_name='Rollup T')
+        self.cut = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=60, price=Decimal('40.00'))
+        self.colour = Service.objects.create(tenant=self.tenant, name='Colour', duration_minutes=90, price=Decimal('90.00'))
+        self.alice = Staff.objects.create(tenant=self.tenant, name='Alice', email='alice@rollup.test')
+        self.bob = Staff.objects.create(tenant=self.tenant, name='Bob', email='bob@rollup.test')
+        self.client_obj = Client.objects.create(tenant=self.tenant, name='C', email='c@rollup.test', phone='1')
+        self.day = (timezone.now() - timedelta(days=2)).replace(hour=10, minute=0, second=0, microsecond=0)
+
+    def _book(self, start=None, status='confirmed', service=None, staff=None, **kwargs):
+        start = start or self.day
+        return Booking.objects.create(
+            tenant=self.tenant, client=self.client_obj, service=service or self.cut, staff=staff or self.alice,
+            start_time=start, end_time=start + timedelta(hours=1), status=status, **kwargs,
+        )
+
+    def assertMatchesRebuild(self):
+        maintained = _snapshot()
+        rebuild_rollups()
+        self.assertEqual(maintained, _snapshot())
+
+    def test_signals_maintain_rollup(self):
+        self._book(status='completed', payment_status='paid', payment_amount=Decimal('40.00'), risk_score=10)
+        b = self._book(risk_level='HIGH', revenue_at_risk=Decimal('25.00'), risk_score=80)
+        self._book(status='no_show', service=self.colour)
+        row = BookingDailyRollup.objects.get(service=self.cut, status='confirmed')
+        self.assertEqual(row.booking_count, 1)
+        self.assertEqual(row.revenue, Decimal('40.00'))
+        self.assertEqual(row.high_risk_revenue, Decimal('25.00'))
+        self.assertEqual(BookingDailyRollup.objects.get(status='no_show').no_show_count, 1)
+
+        b.status = 'cancelled'
+        b.save()
+        self.assertFalse(BookingDailyRollup.objects.filter(service=self.cut, status='confirmed').exists())
+        self.assertMatchesRebuild()
+
+        b.delete()
+        self.assertFalse(BookingDailyRollup.objects.filter(status='cancelled').exists())
+        self.assertMatchesRebuild()
+
+    def test_moving_a_booking_refreshes_both_groups(self):
+        b = self._book()
+        b.start_time = self.day + timedelta(days=1)
+        b.staff = self.bob
+        b.save()
+        self.assertEqual(list(BookingDailyRollup.objects.values_list('staff_id', 'date')),
+                         [(self.bob.id, (self.day + timedelta(days=1)).date())])
+        self.assertMatchesRebuild()
+
+    def test_service_price_change_reprices_rollup(self):
+        self._book(status='completed')
+        self.cut.price = Decimal('55.00')
+        self.cut.save()
+        self.assertEqual(BookingDailyRollup.objects.get().revenue, Decimal('55.00'))
+
+    def test_rebuild_command_covers_bulk_created_bookings(self):
+        Booking.objects.bulk_create([
+            Booking(tenant=self.tenant, client=self.client_obj, service=self.cut, staff=self.alice,
+                    start_time=self.day + timedelta(hours=n), end_time=self.day + timedelta(hours=n + 1),
+                    status='completed')
+            for n in range(3)
+        ])
+        self.assertFalse(BookingDailyRollup.objects.exists())
+        call_command('rebuild_booking_rollups', tenant='rollup-t', stdout=StringIO())
+        row = BookingDailyRollup.objects.get()
+        self.assertEqual(row.booking_count, 3)
+        self.assertEqual(row.revenue, Decimal('120.00'))
+
+    def test_reports_read_rollup_and_fall_back_for_booking_filters(self):
+        self._book(status='completed', payment_status='paid', payment_amount=Decimal('40.00'))
+        self._book(start=self.day + timedelta(hours=2), staff=self.bob, risk_level='CRITICAL',
+                   revenue_at_risk=Decimal('30.00'))
+        api = APIClient(HTTP_X_TENANT_SLUG='rollup-t')
+
+        with self.assertNumQueries(2):  # tenant lookup + one rollup query
+            daily = api.get('/api/reports/daily/').json()['rows']
+        self.assertEqual(daily, [{
+            'date': self.day.date().isoformat(), 'revenue': 80.0, 'deposits': 40.0, 'at_risk': 30.0,
+            'bookings': 2, 'no_shows': 0, 'cancelled': 0, 'total': 2,
+        }])
+
+        paid = api.get('/api/reports/daily/', {'payment_status': 'paid'}).json()['rows']
+        self.assertEqual(paid[0]['total'], 1)
+        self.assertEqual(paid[0]['revenue'], 40.0)
+
+        staff = {r['staff_name']: r for r in api.get('/api/reports/staff/').json()['rows']}
+        self.assertEqual(staff['Bob']['at_risk'], 30.0)
+        self.assertEqual(staff['Alice']['total'], 1)
+
+        monthly = api.get('/api/reports/monthly/').json()['rows']
+        self.assertEqual(sum(r['total'] for r in monthly), 2)
+
+    def test_insights_include_upcoming_high_risk_bookings(self):
+        self._book(start=timezone.now() + timedelta(days=3), risk_level='HIGH', revenue_at_risk=Decimal('25.00'))
+        insights = APIClient(HTTP_X_TENANT_SLUG='rollup-t').get('/api/reports/insights/').json()['insights']
+        self.assertIn('1 high-risk clients contribute £25 at risk', [i['message'] for i in insights])
+
+    def test_admin_mark_as_completed_maintains_rollup(self):
+        from django.contrib.admin.sites import site
+        from django.test import RequestFactory
+        self._book()
+        self._book(start=self.day + timedelta(hours=2), staff=self.bob)
+        admin = site._registry[Booking]
+        request = RequestFactory().post('/')
+        with mock.patch.object(admin, 'message_user'):
+            admin.mark_as_completed(request, Booking.objects.all())
+        self.assertEqual(set(BookingDailyRollup.objects.values_list('status', flat=True)), {'completed'})
+        self.assertMatchesRebuild()
+
+    def test_bulk_delete_rebuilds_once_per_tenant(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import DemandHeatmap
+        from .signals import bulk_booking_changes
+
+        def delete_all(n):
+            for h in range(n):
+                self._book(start=self.day + timedelta(hours=h), status='completed')
+            with CaptureQueriesContext(connection) as queries:
+                with bulk_booking_changes():
+                    Booking.objects.filter(tenant=self.tenant).delete()
+            return len(queries)
+
+        self.assertEqual(delete_all(2), delete_all(8))
+        self.assertFalse(BookingDailyRollup.objects.exists())
+        self.assertEqual(DemandHeatmap.objects.filter(tenant=self.tenant, service__isnull=True).count(), 2)
+
+    def test_reminder_worker_repairs_drift_daily(self):
+        from .reminder_scheduler import ReminderScheduler
+        self._book(status='completed')
+        BookingDailyRollup.objects.update(booking_count=7)
+        clock = mock.Mock(return_value=timezone.now())
+        scheduler = ReminderScheduler(clock=clock)
+        scheduler.tick()
+        self.assertEqual(BookingDailyRollup.objects.get().booking_count, 7)
+        clock.return_value += timedelta(days=1)
+        scheduler.tick()
+        self.assertEqual(BookingDailyRollup.objects.get().booking_count, 1)
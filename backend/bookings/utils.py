@@ -1,8 +1,23 @@
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from django.utils import timezone
 from .models import Booking, Staff, Service, StaffBlock
 
 
+def day_range(date_from, date_to=None):
+    """
+    Half-open [start, end) aware datetimes covering the local dates
+    date_from..date_to inclusive (just date_from if date_to is omitted).
+
+    Filter with `start_time__gte=start, start_time__lt=end` rather than
+    `start_time__date__...`: the __date lookup casts the column, which
+    stops the database using any index on start_time.
+    """
+    date_to = date_to or date_from
+    start = timezone.make_aware(datetime.combine(date_from, time.min))
+    end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+    return start, end
+
+
 def generate_time_slots(staff_id, service_id, date, business_hours_start=9, business_hours_end=17):
     """
     Generate available time slots for a given staff member, service, and date.
@@ -18,8 +33,7 @@ def generate_time_slots(staff_id, service_id, date, business_hours_start=9, busi
     target_date = datetime.strptime(date, '%Y-%m-%d').date()
     
     # Get existing bookings for this staff on this date
-    start_of_day = timezone.make_aware(datetime.combine(target_date, datetime.min.time()))
-    end_of_day = timezone.make_aware(datetime.combine(target_date, datetime.max.time()))
+    start_of_day, end_of_day = day_range(target_date)
     
     existing_bookings = Booking.objects.filter(
         staff=staff,
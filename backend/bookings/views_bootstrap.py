@@ -0,0 +1,94 @@
+"""
+Booking bootstrap — GET /api/bookings/bootstrap/
+
+Everything the public booking flow needs before the customer picks a slot,
+in one response: tenant settings and branding, active services (with the
+ids of their active staff), active staff (with their active service ids),
+business hours and the active intake disclaimer.
+
+Versioned by a content hash (core.conditional): the tenant row's
+updated_at and content_version, plus the business hours and the active
+disclaimer, which aren't tenant-scoped. A matching If-None-Match is a 304
+and the built payload is cached per tenant under that hash, so a new
+version is only ever built once.
+"""
+import hashlib
+
+from django.db.models import Prefetch
+from django.http import HttpResponseNotModified
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from core import tenant_cache
+from core.conditional import content_etag, etag_matches, set_cache_headers
+
+from .models import BusinessHours, Service, Staff
+from .models_intake import IntakeWellbeingDisclaimer
+from .serializers import ServiceSerializer
+from .serializers_schedule import BusinessHoursSerializer
+
+BOOTSTRAP_CACHE_NAMESPACE = 'booking_bootstrap'
+BOOTSTRAP_CACHE_TIMEOUT = 600
+
+
+def _shared_version():
+    """Hash of the business hours and active disclaimer (global, so not in content_version)."""
+    hours = list(BusinessHours.objects.values_list('day_of_week', 'is_open', 'open_time', 'close_time'))
+    disclaimer = list(IntakeWellbeingDisclaimer.objects.filter(active=True).values_list('id', 'version', 'content'))
+    return hashlib.md5(repr((hours, disclaimer)).encode()).hexdigest()
+
+
+def _build(request, tenant):
+    from tenants.serializers import TenantSettingsCSSVarsSerializer, TenantSettingsSerializer
+
+    services = (
+        Service.objects.filter(tenant=tenant, active=True)
+        .prefetch_related(Prefetch('staff_members', queryset=Staff.objects.filter(active=True).only('id')))
+    )
+    staff = (
+        Staff.objects.filter(tenant=tenant, active=True)
+        .prefetch_related(Prefetch('services', queryset=Service.objects.filter(active=True).only('id')))
+    )
+    disclaimer = IntakeWellbeingDisclaimer.objects.filter(active=True).first()
+    return {
+        'settings': TenantSettingsSerializer(tenant).data,
+        'branding': TenantSettingsCSSVarsSerializer(tenant).data,
+        'services': ServiceSerializer(services, many=True, context={'request': request}).data,
+        'staff': [
+            {
+                'id': s.id,
+                'name': s.name,
+                'role': s.role,
+                'photo_url': s.photo_url,
+                'service_ids': [svc.id for svc in s.services.all()],
+                'break_start': s.break_start.isoformat() if s.break_start else None,
+                'break_end': s.break_end.isoformat() if s.break_end else None,
+            }
+            for s in staff
+        ],
+        'business_hours': BusinessHoursSerializer(BusinessHours.objects.all(), many=True).data,
+        'disclaimer': (
+            {'id': disclaimer.id, 'version': disclaimer.version, 'content': disclaimer.content}
+            if disclaimer else None
+        ),
+    }
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def booking_bootstrap(request):
+    """GET /api/bookings/bootstrap/ — booking flow data for the current tenant in one request."""
+    tenant = getattr(request, 'tenant', None)
+    if not tenant:
+        return Response({'detail': 'Tenant not found'}, status=404)
+
+    etag = content_etag(request, BOOTSTRAP_CACHE_NAMESPACE, _shared_version())
+    if etag_matches(request, etag):
+        return set_cache_headers(request, HttpResponseNotModified(), etag)
+
+    payload = tenant_cache.get_or_set(
+        BOOTSTRAP_CACHE_NAMESPACE, tenant.id, {'etag': etag},
+        lambda: _build(request, tenant), timeout=BOOTSTRAP_CACHE_TIMEOUT,
+    )
+    return set_cache_headers(request, Response({'version': etag.strip('"'), **payload}), etag)
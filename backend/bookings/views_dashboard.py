@@ -6,11 +6,12 @@ POST /api/backfill-sbe/
 from datetime import timedelta
 from decimal import Decimal
 from django.utils import timezone
-from django.db.models import Sum, Count, Q, F, Avg
+from django.db.models import Sum, Count, Q, F, Avg, Case, When, Value, CharField
+from django.db.models.functions import Coalesce
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from .models import Booking, Client, Service
+from .models import Booking, BookingDailyRollup, Client, Service
 from .models_availability import TimesheetEntry, LeaveRequest
 
 
@@ -84,84 +85,97 @@ def _revenue_breakdown(today_start, week_end):
     }
 
 
-def _client_quadrant():
-    """Build client quadrant data: reliability vs booking frequency."""
+# Client quadrant thresholds and scatter-plot page size
+QUADRANT_RELIABLE = 60
+QUADRANT_FREQUENT = 2
+QUADRANT_MAX_POINTS = 500
+QUADRANT_CACHE_TIMEOUT = 120
+
+
+def _client_quadrant_qs(tenant):
+    """Clients annotated with 90-day booking frequency and quadrant zone, in one query."""
     ninety_days_ago = timezone.now() - timedelta(days=90)
-    clients = Client.objects.all()
-    points = []
-    for c in clients:
-        freq = Booking.objects.filter(
-            client=c,
-            start_time__gte=ninety_days_ago,
-            status__in=['confirmed', 'completed']
-        ).count()
-        rel = c.reliability_score or 0
-
-        if rel >= 60 and freq >= 2:
-            zone = 'VIP'
-        elif rel >= 60:
-            zone = 'Stable'
-        elif freq >= 2:
-            zone = 'Watch'
-        else:
-            zone = 'High Risk'
-
-        points.append({
-            'id': c.id,
-            'name': c.name,
-            'email': c.email,
-            'reliability': round(rel, 1),
-            'frequency': freq,
-            'zone': zone,
-            'total_bookings': c.total_bookings,
-            'no_shows': c.no_show_count,
-            'lifetime_value': float(c.lifetime_value or 0),
-        })
-    return points
+    qs = Client.objects.all()
+    if tenant:
+        qs = qs.filter(tenant=tenant)
+    return qs.annotate(
+        frequency=Count('bookings', filter=Q(
+            bookings__start_time__gte=ninety_days_ago,
+            bookings__status__in=['confirmed', 'completed'],
+        )),
+        reliability=Coalesce('reliability_score', Value(0.0)),
+    ).annotate(
+        zone=Case(
+            When(reliability__gte=QUADRANT_RELIABLE, frequency__gte=QUADRANT_FREQUENT, then=Value('VIP')),
+            When(reliability__gte=QUADRANT_RELIABLE, then=Value('Stable')),
+            When(frequency__gte=QUADRANT_FREQUENT, then=Value('Watch')),
+            default=Value('High Risk'),
+            output_field=CharField(),
+        ),
+    )
 
 
-def _demand_calendar():
-    """Build demand calendar: hour x day_of_week grid with no-show rates."""
-    now = timezone.now()
-    thirty_days_ago = now - timedelta(days=30)
-
-    # Booking counts by hour and dow
-    booking_data = (
-        Booking.objects.filter(
-            start_time__gte=thirty_days_ago,
-            status__in=['confirmed', 'completed', 'no_show']
-        )
-        .extra(select={
-            'hour': 'EXTRACT(hour FROM start_time)',
-            'dow': 'EXTRACT(dow FROM start_time)',
-        })
-        .values('hour', 'dow')
-        .annotate(
-            total=Count('id'),
-            no_shows=Count('id', filter=Q(status='no_show')),
-        )
+def _client_quadrant(tenant, limit=QUADRANT_MAX_POINTS, offset=0):
+    """
+    Build client quadrant data: reliability vs booking frequency.
+
+    Returns one page of scatter points (most frequent clients first) plus
+    per-zone totals over every client, so the chart can label zones
+    accurately without plotting them all.
+    """
+    qs = _client_quadrant_qs(tenant)
+    zones = qs.aggregate(
+        total=Count('id'),
+        **{
+            key: Count('id', filter=Q(zone=zone))
+            for key, zone in (('vip', 'VIP'), ('stable', 'Stable'), ('watch', 'Watch'), ('high_risk', 'High Risk'))
+        },
     )
+    rows = qs.order_by('-frequency', '-reliability', 'id').values(
+        'id', 'name', 'email', 'reliability', 'frequency', 'zone',
+        'total_bookings', 'no_show_count', 'lifetime_value',
+    )[offset:offset + limit]
+    points = [{
+        'id': r['id'],
+        'name': r['name'],
+        'email': r['email'],
+        'reliability': round(r['reliability'], 1),
+        'frequency': r['frequency'],
+        'zone': r['zone'],
+        'total_bookings': r['total_bookings'],
+        'no_shows': r['no_show_count'],
+        'lifetime_value': float(r['lifetime_value'] or 0),
+    } for r in rows]
+    return points, {'offset': offset, 'limit': limit, 'zones': zones}
+
+
+def _demand_calendar(tenant, window_days=30):
+    """Build demand calendar: hour x day_of_week grid with no-show rates."""
+    from .heatmaps import tenant_heatmaps
 
+    services = Service.objects.filter(active=True)
+    if tenant:
+        services = services.filter(tenant=tenant)
     # Service demand indices
-    services = list(Service.objects.filter(active=True).values('id', 'name', 'demand_index', 'off_peak_discount_allowed'))
+    services = list(services.values('id', 'name', 'demand_index', 'off_peak_discount_allowed'))
 
+    heatmap = tenant_heatmaps(tenant.id, window_days).get(None) if tenant else None
     cells = []
-    for entry in booking_data:
-        h = int(entry['hour'])
-        d = int(entry['dow'])
-        t = entry['total']
-        ns = entry['no_shows']
-        ns_rate = round(ns / t * 100, 1) if t > 0 else 0
-        cells.append({
-            'hour': h,
-            'day_of_week': d,
-            'total_bookings': t,
-            'no_shows': ns,
-            'no_show_rate': ns_rate,
-            'demand_intensity': min(100, t * 20),
-        })
-
-    return {'cells': cells, 'services': services}
+    grid = zip(heatmap.bookings, heatmap.no_shows) if heatmap else ()
+    for d, (totals, no_shows) in enumerate(grid):
+        for h, (t, ns) in enumerate(zip(totals, no_shows)):
+            if not t:
+                continue
+            cells.append({
+                'hour': h,
+                'day_of_week': d,
+                'total_bookings': t,
+                'no_shows': ns,
+                'no_show_rate': round(ns / t * 100, 1),
+                'demand_intensity': min(100, t * 20),
+            })
+
+    return {'cells': cells, 'services': services, 'window_days': window_days}
 
 
 def _generate_owner_actions(today_start, today_end):
@@ -241,21 +255,13 @@ def dashboard_summary(request):
     # Revenue breakdown
     revenue = _revenue_breakdown(today_start, week_end)
 
-    # Revenue today only
-    today_bookings = Booking.objects.filter(
-        start_time__gte=today_start,
-        start_time__lt=today_end,
-        status__in=['confirmed', 'completed']
+    # Today's revenue and high-risk count from the daily rollup
+    today = BookingDailyRollup.objects.filter(date=today_start.date()).aggregate(
+        revenue_sum=Sum('revenue', filter=Q(status__in=['confirmed', 'completed'])),
+        high_risk=Sum('high_risk_count', filter=Q(status__in=['confirmed', 'pending'])),
     )
-    revenue_today = float(today_bookings.aggregate(total=Sum('service__price'))['total'] or 0)
-
-    # High risk bookings today
-    high_risk_today = Booking.objects.filter(
-        start_time__gte=today_start,
-        start_time__lt=today_end,
-        risk_level__in=['HIGH', 'CRITICAL'],
-        status__in=['confirmed', 'pending']
-    ).count()
+    revenue_today = float(today['revenue_sum'] or 0)
+    high_risk_today = today['high_risk'] or 0
 
     # Reliability distribution
     clients = Client.objects.all()
@@ -266,18 +272,31 @@ def dashboard_summary(request):
         'poor': clients.filter(reliability_score__lt=40).count(),
     }
 
-    total_upcoming = Booking.objects.filter(
-        start_time__gte=today_start,
-        status__in=['confirmed', 'pending']
-    ).count()
+    total_upcoming = BookingDailyRollup.objects.filter(
+        date__gte=today_start.date(),
+        status__in=['confirmed', 'pending'],
+    ).aggregate(n=Sum('booking_count'))['n'] or 0
 
     avg_reliability = clients.aggregate(avg=Avg('reliability_score'))['avg'] or 0
 
-    # Client quadrant
-    client_quadrant = _client_quadrant()
+    # Client quadrant — paged for the scatter plot, cached briefly per tenant
+    from core import tenant_cache
+    tenant = getattr(request, 'tenant', None)
+    try:
+        q_limit = min(max(int(request.query_params.get('quadrant_limit', QUADRANT_MAX_POINTS)), 1), QUADRANT_MAX_POINTS)
+        q_offset = max(int(request.query_params.get('quadrant_offset', 0)), 0)
+    except ValueError:
+        q_limit, q_offset = QUADRANT_MAX_POINTS, 0
+    client_quadrant, client_quadrant_meta = tenant_cache.get_or_set(
+        'reports', tenant.id if tenant else None,
+        {'view': 'client_quadrant', 'limit': q_limit, 'offset': q_offset},
+        lambda: _client_quadrant(tenant, q_limit, q_offset),
+        timeout=QUADRANT_CACHE_TIMEOUT,
+    )
 
-    # Demand calendar
-    demand_calendar = _demand_calendar()
+    # Demand calendar (precomputed heatmap, 30- or 90-day window)
+    demand_window = 90 if request.query_params.get('demand_window') == '90' else 30
+    demand_calendar = _demand_calendar(tenant, demand_window)
 
     # Owner actions
     owner_actions = _generate_owner_actions(today_start, today_end)
@@ -288,25 +307,21 @@ def dashboard_summary(request):
     ts_qs = TimesheetEntry.objects.filter(
         date__gte=month_start,
         date__lte=now.date(),
-    ).exclude(notes__contains='avail-demo').select_related('staff_member')
-
-    staff_hours = {}
-    for entry in ts_qs:
-        sid = entry.staff_member_id
-        if sid not in staff_hours:
-            staff_hours[sid] = {
-                'staff_id': sid,
-                'staff_name': entry.staff_member.name,
-                'scheduled_hours': 0,
-                'actual_hours': 0,
-            }
-        staff_hours[sid]['scheduled_hours'] += entry.scheduled_hours or 0
-        staff_hours[sid]['actual_hours'] += entry.actual_hours or 0
-
-    staff_hours_list = sorted(staff_hours.values(), key=lambda r: r['staff_name'])
-    for r in staff_hours_list:
-        r['scheduled_hours'] = round(r['scheduled_hours'], 1)
-        r['actual_hours'] = round(r['actual_hours'], 1)
+    ).exclude(notes__contains='avail-demo')
+
+    from core.timesheet_hours import to_hours
+    staff_hours_list = [
+        {
+            'staff_id': g['staff_member_id'],
+            'staff_name': g['staff_member__name'],
+            'scheduled_hours': to_hours(g['scheduled'], 1),
+            'actual_hours': to_hours(g['actual'], 1),
+        }
+        for g in ts_qs.with_hours()
+        .values('staff_member_id', 'staff_member__name')
+        .annotate(scheduled=Sum('scheduled_span'), actual=Sum('actual_span'))
+        .order_by('staff_member__name')
+    ]
 
     total_scheduled = round(sum(r['scheduled_hours'] for r in staff_hours_list), 1)
     total_actual = round(sum(r['actual_hours'] for r in staff_hours_list), 1)
@@ -340,6 +355,7 @@ def dashboard_summary(request):
         'high_risk_bookings_today': high_risk_today,
         'reliability_distribution': reliability_dist,
         'client_quadrant': client_quadrant,
+        'client_quadrant_meta': client_quadrant_meta,
         'demand_calendar': demand_calendar,
         'owner_actions': owner_actions,
         'total_upcoming_bookings': total_upcoming,
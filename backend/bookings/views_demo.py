@@ -87,9 +87,11 @@ def demo_seed_view(request):
     """POST = seed demo data, DELETE = remove all demo data."""
 
     if request.method == 'DELETE':
-        Booking.objects.filter(data_origin='DEMO').delete()
-        Client.objects.filter(data_origin='DEMO').delete()
-        Service.objects.filter(data_origin='DEMO').delete()
+        from .signals import bulk_booking_changes
+        with bulk_booking_changes():
+            Booking.objects.filter(data_origin='DEMO').delete()
+            Client.objects.filter(data_origin='DEMO').delete()
+            Service.objects.filter(data_origin='DEMO').delete()
         has_real = Booking.objects.filter(data_origin='REAL').exists()
         return Response({'deleted': True, 'has_real': has_real})
 
@@ -131,6 +133,12 @@ def demo_seed_view(request):
     # Create demo bookings
     demo_bookings = _build_demo_bookings(seed_id, demo_services, demo_clients, staff_qs)
     Booking.objects.bulk_create(demo_bookings)
+    # bulk_create skips the signals that keep report rollups and heatmaps current
+    from .heatmaps import rebuild_heatmaps
+    from .rollups import refresh_rollups_for
+    refresh_rollups_for(demo_bookings)
+    for tenant_id in {b.tenant_id for b in demo_bookings}:
+        rebuild_heatmaps(tenant_id)
 
     demo_count = Booking.objects.filter(data_origin='DEMO').count()
     return Response({
@@ -7,10 +7,12 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Count, Q
+from django.utils import timezone
 
 from .models_gym import ClassType, ClassSession
 from .models import Booking
 from .serializers_gym import ClassTypeSerializer, ClassSessionSerializer
+from .utils import day_range
 
 
 class ClassTypeViewSet(viewsets.ModelViewSet):
@@ -89,10 +91,11 @@ def gym_timetable(request):
     ).select_related('class_type', 'instructor')
 
     # Get bookings for this week to compute spots remaining
+    week_start, week_end = day_range(monday, sunday)
     week_bookings = Booking.objects.filter(
         tenant=tenant,
-        start_time__date__gte=monday,
-        start_time__date__lte=sunday,
+        start_time__gte=week_start,
+        start_time__lt=week_end,
         status__in=['confirmed', 'pending'],
     )
 
@@ -104,8 +107,7 @@ def gym_timetable(request):
         # Count bookings for this specific session on this date
         # Match by class_type service name and time
         booked_count = week_bookings.filter(
-            start_time__date=session_date,
-            start_time__time=session.start_time,
+            start_time=timezone.make_aware(datetime.combine(session_date, session.start_time)),
             service__name=session.class_type.name,
         ).count()
 
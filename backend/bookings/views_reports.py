@@ -8,20 +8,19 @@ GET /api/reports/insights/
 GET /api/reports/staff-hours/
 GET /api/reports/staff-hours/csv/
 """
-import csv
 from datetime import timedelta, date
 from decimal import Decimal
 from collections import defaultdict
-from io import StringIO
-from django.http import HttpResponse
 from django.utils import timezone
-from django.db.models import Sum, Count, Avg, Q, F, FloatField
-from django.db.models.functions import TruncDate, TruncMonth, ExtractHour, ExtractWeekDay
+from django.db.models import Sum, Count, Avg, Max, Q, F, FloatField
+from django.db.models.functions import TruncMonth, ExtractHour, ExtractWeekDay
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from .models import Booking, Client, Service, Staff
+from .models import Booking, BookingDailyRollup, Client, Service, Staff
 from .models_availability import TimesheetEntry
+from .rollups import booking_facts
+from .utils import day_range
 
 
 def _parse_date(s, default=None):
@@ -34,6 +33,22 @@ def _parse_date(s, default=None):
         return default
 
 
+# Query params (besides the date range) that narrow report querysets
+REPORT_FILTER_PARAMS = ('staff_id', 'service_id', 'risk_level', 'payment_status')
+
+
+class ReportParams:
+    """
+    Request stand-in for running the report builders below outside a
+    request (background export jobs): a tenant plus a plain dict of the
+    same query params the endpoints accept.
+    """
+
+    def __init__(self, tenant, params=None):
+        self.tenant = tenant
+        self.query_params = params or {}
+
+
 def _base_qs(request):
     """Build base booking queryset from request filters."""
     now = timezone.now()
@@ -41,9 +56,10 @@ def _base_qs(request):
     date_to = _parse_date(request.query_params.get('date_to'), now.date())
 
     tenant = getattr(request, 'tenant', None)
+    start, end = day_range(date_from, date_to)
     qs = Booking.objects.filter(
-        start_time__date__gte=date_from,
-        start_time__date__lte=date_to,
+        start_time__gte=start,
+        start_time__lt=end,
     ).select_related('client', 'service', 'staff')
     if tenant:
         qs = qs.filter(tenant=tenant)
@@ -67,59 +83,104 @@ def _base_qs(request):
     return qs, date_from, date_to
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def reports_overview(request):
-    """GET /api/reports/overview/ — KPI summary + revenue time series + risk distribution + service breakdown"""
-    qs, date_from, date_to = _base_qs(request)
+# Filters BookingDailyRollup has no column for; requests using them
+# aggregate live bookings instead.
+NON_ROLLUP_FILTER_PARAMS = ('risk_level', 'payment_status')
 
-    total = qs.count()
-    completed = qs.filter(status__in=['completed', 'confirmed']).count()
-    no_shows = qs.filter(status='no_show').count()
-    cancelled = qs.filter(status='cancelled').count()
-    ns_rate = round(no_shows / total * 100, 1) if total > 0 else 0
+DONE_STATUSES = ['completed', 'confirmed']
+OPEN_STATUSES = ['confirmed', 'pending']
 
-    revenue = float(qs.filter(status__in=['completed', 'confirmed']).aggregate(
-        t=Sum('service__price'))['t'] or 0)
-    revenue_at_risk = float(qs.filter(
-        risk_level__in=['HIGH', 'CRITICAL'],
-        status__in=['confirmed', 'pending']
-    ).aggregate(t=Sum('revenue_at_risk'))['t'] or 0)
-
-    deposits = float(qs.filter(payment_status='paid').aggregate(
-        t=Sum('payment_amount'))['t'] or 0)
-
-    # Average reliability + risk
-    client_ids = list(qs.values_list('client_id', flat=True).distinct())
-    clients = Client.objects.filter(id__in=client_ids)
-    avg_reliability = float(clients.aggregate(a=Avg('reliability_score'))['a'] or 0)
-    avg_risk = float(qs.exclude(risk_score__isnull=True).aggregate(a=Avg('risk_score'))['a'] or 0)
-
-    # Repeat client %
-    client_booking_counts = qs.values('client_id').annotate(cnt=Count('id'))
-    repeat_clients = client_booking_counts.filter(cnt__gte=2).count()
-    unique_clients = client_booking_counts.count()
-    repeat_pct = round(repeat_clients / unique_clients * 100, 1) if unique_clients > 0 else 0
-
-    # Revenue time series (daily)
-    rev_series = list(
-        qs.filter(status__in=['completed', 'confirmed'])
-        .annotate(day=TruncDate('start_time'))
-        .values('day')
-        .annotate(revenue=Sum('service__price'), count=Count('id'))
-        .order_by('day')
+
+def _rollup_rows(tenant, date_from, date_to=None):
+    rows = BookingDailyRollup.objects.filter(date__gte=date_from)
+    if date_to:
+        rows = rows.filter(date__lte=date_to)
+    if tenant:
+        rows = rows.filter(tenant=tenant)
+    return rows
+
+
+def _report_rows(request, qs, date_from, date_to):
+    """
+    Rows to aggregate for a report. Both sources expose the rollup's columns
+    (date, service, staff, status and the summed measures), so callers use
+    the same Sum() expressions either way.
+    """
+    if any(request.query_params.get(key) for key in NON_ROLLUP_FILTER_PARAMS):
+        return booking_facts(qs)
+    rows = _rollup_rows(getattr(request, 'tenant', None), date_from, date_to)
+    staff_id = request.query_params.get('staff_id')
+    if staff_id:
+        rows = rows.filter(staff_id=staff_id)
+    service_id = request.query_params.get('service_id')
+    if service_id:
+        rows = rows.filter(service_id=service_id)
+    return rows
+
+
+def _avg(total, n):
+    return round(float(total or 0) / n, 1) if n else 0
+
+
+# Cached overview payloads live this long at most; booking/service writes
+# invalidate them immediately via bookings.signals.
+OVERVIEW_CACHE_TIMEOUT = 300
+
+
+def _overview_payload(qs, rows):
+    """
+    Compute the overview response in a fixed number of queries.
+    Totals, timelines and the service breakdown read `rows` (see
+    _report_rows); client, risk-level and hour-of-day breakdowns need
+    per-booking columns and read the booking queryset `qs`.
+    """
+    done = Q(status__in=DONE_STATUSES)
+    at_risk = Q(status__in=OPEN_STATUSES)
+
+    # KPIs — one pass over the daily rollup
+    k = rows.aggregate(
+        total=Sum('booking_count'),
+        completed=Sum('booking_count', filter=done),
+        no_shows=Sum('no_show_count'),
+        cancelled=Sum('booking_count', filter=Q(status='cancelled')),
+        revenue_sum=Sum('revenue', filter=done),
+        at_risk_sum=Sum('high_risk_revenue', filter=at_risk),
+        deposits_sum=Sum('deposits'),
+        risk_sum=Sum('risk_score_sum'),
+        risk_n=Sum('risk_score_count'),
     )
-    revenue_timeline = [{'date': r['day'].isoformat(), 'revenue': float(r['revenue'] or 0), 'count': r['count']} for r in rev_series]
-
-    # Revenue at risk time series
-    risk_series = list(
-        qs.filter(risk_level__in=['HIGH', 'CRITICAL'], status__in=['confirmed', 'pending'])
-        .annotate(day=TruncDate('start_time'))
-        .values('day')
-        .annotate(at_risk=Sum('revenue_at_risk'))
-        .order_by('day')
+    total = k['total'] or 0
+    no_shows = k['no_shows'] or 0
+    ns_rate = round(no_shows / total * 100, 1) if total > 0 else 0
+
+    # Client KPIs — per-client counts aggregated in a subquery
+    c = qs.order_by().values('client_id').annotate(
+        cnt=Count('id'), reliability=Max('client__reliability_score'),
+    ).aggregate(
+        unique=Count('client_id'),
+        repeat=Count('client_id', filter=Q(cnt__gte=2)),
+        avg_reliability=Avg('reliability'),
     )
-    risk_timeline = [{'date': r['day'].isoformat(), 'at_risk': float(r['at_risk'] or 0)} for r in risk_series]
+    unique_clients = c['unique']
+    repeat_pct = round(c['repeat'] / unique_clients * 100, 1) if unique_clients > 0 else 0
+
+    # Revenue and revenue-at-risk time series — one grouped query
+    revenue_timeline = []
+    risk_timeline = []
+    for r in (
+        rows.values('date')
+        .annotate(
+            revenue_sum=Sum('revenue', filter=done),
+            count=Sum('booking_count', filter=done),
+            at_risk=Sum('high_risk_revenue', filter=at_risk),
+            at_risk_count=Sum('high_risk_count', filter=at_risk),
+        )
+        .order_by('date')
+    ):
+        if r['count']:
+            revenue_timeline.append({'date': r['date'].isoformat(), 'revenue': float(r['revenue_sum'] or 0), 'count': r['count']})
+        if r['at_risk_count']:
+            risk_timeline.append({'date': r['date'].isoformat(), 'at_risk': float(r['at_risk'] or 0)})
 
     # Risk distribution
     risk_dist = list(
@@ -132,19 +193,19 @@ def reports_overview(request):
 
     # Service breakdown
     svc_breakdown = list(
-        qs.filter(status__in=['completed', 'confirmed'])
-        .values('service__id', 'service__name')
+        rows.filter(done)
+        .values('service_id', 'service__name')
         .annotate(
-            revenue=Sum('service__price'),
-            volume=Count('id'),
-            no_shows=Count('id', filter=Q(status='no_show')),
-            risk_exposure=Sum('revenue_at_risk'),
+            revenue_sum=Sum('revenue'),
+            volume=Sum('booking_count'),
+            no_shows=Sum('no_show_count'),
+            risk_exposure=Sum('at_risk_revenue'),
         )
-        .order_by('-revenue')
+        .order_by('-revenue_sum')
     )
     service_breakdown = [{
-        'id': s['service__id'], 'name': s['service__name'],
-        'revenue': float(s['revenue'] or 0), 'volume': s['volume'],
+        'id': s['service_id'], 'name': s['service__name'],
+        'revenue': float(s['revenue_sum'] or 0), 'volume': s['volume'],
         'no_shows': s['no_shows'], 'risk_exposure': float(s['risk_exposure'] or 0),
     } for s in svc_breakdown]
 
@@ -160,18 +221,18 @@ def reports_overview(request):
     )
     demand_heatmap = [{'hour': h['hour'], 'dow': h['dow'], 'count': h['count']} for h in heatmap_data]
 
-    return Response({
+    return {
         'kpi': {
-            'revenue': revenue,
-            'revenue_at_risk': revenue_at_risk,
-            'deposits': deposits,
+            'revenue': float(k['revenue_sum'] or 0),
+            'revenue_at_risk': float(k['at_risk_sum'] or 0),
+            'deposits': float(k['deposits_sum'] or 0),
             'total_bookings': total,
-            'completed': completed,
+            'completed': k['completed'] or 0,
             'no_shows': no_shows,
-            'cancelled': cancelled,
+            'cancelled': k['cancelled'] or 0,
             'no_show_rate': ns_rate,
-            'avg_reliability': round(avg_reliability, 1),
-            'avg_risk_score': round(avg_risk, 1),
+            'avg_reliability': round(float(c['avg_reliability'] or 0), 1),
+            'avg_risk_score': _avg(k['risk_sum'], k['risk_n']),
             'repeat_client_pct': repeat_pct,
             'unique_clients': unique_clients,
         },
@@ -180,109 +241,146 @@ def reports_overview(request):
         'risk_distribution': risk_distribution,
         'service_breakdown': service_breakdown,
         'demand_heatmap': demand_heatmap,
-    })
+    }
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def reports_daily(request):
-    """GET /api/reports/daily/ — Daily takings with no-show overlay"""
+def reports_overview(request):
+    """GET /api/reports/overview/ — KPI summary + revenue time series + risk distribution + service breakdown"""
+    from core import tenant_cache
+
+    qs, date_from, date_to = _base_qs(request)
+    tenant = getattr(request, 'tenant', None)
+    params = {'date_from': date_from, 'date_to': date_to}
+    for key in REPORT_FILTER_PARAMS:
+        params[key] = request.query_params.get(key) or ''
+
+    payload = tenant_cache.get_or_set(
+        'reports', tenant.id if tenant else None, params,
+        lambda: _overview_payload(qs, _report_rows(request, qs, date_from, date_to)),
+        timeout=OVERVIEW_CACHE_TIMEOUT,
+    )
+    return Response(payload)
+
+
+def _daily_rows(request):
     qs, date_from, date_to = _base_qs(request)
+    done = Q(status__in=DONE_STATUSES)
 
     rows = list(
-        qs.annotate(day=TruncDate('start_time'))
-        .values('day')
+        _report_rows(request, qs, date_from, date_to)
+        .values('date')
         .annotate(
-            revenue=Sum('service__price', filter=Q(status__in=['completed', 'confirmed'])),
-            deposits=Sum('payment_amount', filter=Q(payment_status='paid')),
-            at_risk=Sum('revenue_at_risk', filter=Q(risk_level__in=['HIGH', 'CRITICAL'])),
-            bookings=Count('id', filter=Q(status__in=['completed', 'confirmed'])),
-            no_shows=Count('id', filter=Q(status='no_show')),
-            cancelled=Count('id', filter=Q(status='cancelled')),
-            total=Count('id'),
+            revenue_sum=Sum('revenue', filter=done),
+            deposits_sum=Sum('deposits'),
+            at_risk=Sum('high_risk_revenue'),
+            bookings=Sum('booking_count', filter=done),
+            no_shows=Sum('no_show_count'),
+            cancelled=Sum('booking_count', filter=Q(status='cancelled')),
+            total=Sum('booking_count'),
         )
-        .order_by('day')
+        .order_by('date')
     )
 
-    return Response({
-        'rows': [{
-            'date': r['day'].isoformat(),
-            'revenue': float(r['revenue'] or 0),
-            'deposits': float(r['deposits'] or 0),
-            'at_risk': float(r['at_risk'] or 0),
-            'bookings': r['bookings'],
-            'no_shows': r['no_shows'],
-            'cancelled': r['cancelled'],
-            'total': r['total'],
-        } for r in rows],
-    })
+    return [{
+        'date': r['date'].isoformat(),
+        'revenue': float(r['revenue_sum'] or 0),
+        'deposits': float(r['deposits_sum'] or 0),
+        'at_risk': float(r['at_risk'] or 0),
+        'bookings': r['bookings'] or 0,
+        'no_shows': r['no_shows'] or 0,
+        'cancelled': r['cancelled'] or 0,
+        'total': r['total'] or 0,
+    } for r in rows]
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def reports_monthly(request):
-    """GET /api/reports/monthly/ — Monthly aggregation with MoM growth"""
+def reports_daily(request):
+    """GET /api/reports/daily/ — Daily takings with no-show overlay"""
+    return Response({'rows': _daily_rows(request)})
+
+
+def _monthly_rows(request):
     qs, date_from, date_to = _base_qs(request)
+    done = Q(status__in=DONE_STATUSES)
 
     rows = list(
-        qs.annotate(month=TruncMonth('start_time'))
+        _report_rows(request, qs, date_from, date_to)
+        .annotate(month=TruncMonth('date'))
         .values('month')
         .annotate(
-            revenue=Sum('service__price', filter=Q(status__in=['completed', 'confirmed'])),
-            deposits=Sum('payment_amount', filter=Q(payment_status='paid')),
-            at_risk=Sum('revenue_at_risk', filter=Q(risk_level__in=['HIGH', 'CRITICAL'])),
-            bookings=Count('id', filter=Q(status__in=['completed', 'confirmed'])),
-            no_shows=Count('id', filter=Q(status='no_show')),
-            total=Count('id'),
-            avg_reliability=Avg('client__reliability_score'),
-            avg_risk=Avg('risk_score'),
+            revenue_sum=Sum('revenue', filter=done),
+            deposits_sum=Sum('deposits'),
+            at_risk=Sum('high_risk_revenue'),
+            bookings=Sum('booking_count', filter=done),
+            no_shows=Sum('no_show_count'),
+            total=Sum('booking_count'),
+            risk_sum=Sum('risk_score_sum'),
+            risk_n=Sum('risk_score_count'),
         )
         .order_by('month')
     )
+    # Reliability is a live per-client score, not a daily measure, so it
+    # can't be rolled up without going stale
+    reliability = {
+        m.strftime('%Y-%m'): avg for m, avg in
+        qs.order_by().annotate(month=TruncMonth('start_time')).values('month')
+        .annotate(avg=Avg('client__reliability_score')).values_list('month', 'avg')
+    }
 
     result = []
     prev_rev = None
     for r in rows:
-        rev = float(r['revenue'] or 0)
+        rev = float(r['revenue_sum'] or 0)
+        month = r['month'].strftime('%Y-%m')
         growth = None
         if prev_rev is not None and prev_rev > 0:
             growth = round((rev - prev_rev) / prev_rev * 100, 1)
         result.append({
-            'month': r['month'].strftime('%Y-%m'),
+            'month': month,
             'revenue': rev,
-            'deposits': float(r['deposits'] or 0),
+            'deposits': float(r['deposits_sum'] or 0),
             'at_risk': float(r['at_risk'] or 0),
-            'bookings': r['bookings'],
-            'no_shows': r['no_shows'],
-            'total': r['total'],
-            'avg_reliability': round(float(r['avg_reliability'] or 0), 1),
-            'avg_risk': round(float(r['avg_risk'] or 0), 1),
+            'bookings': r['bookings'] or 0,
+            'no_shows': r['no_shows'] or 0,
+            'total': r['total'] or 0,
+            'avg_reliability': round(float(reliability.get(month) or 0), 1),
+            'avg_risk': _avg(r['risk_sum'], r['risk_n']),
             'mom_growth': growth,
         })
         prev_rev = rev
-
-    return Response({'rows': result})
+    return result
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def reports_staff(request):
-    """GET /api/reports/staff/ — Per-staff performance"""
+def reports_monthly(request):
+    """GET /api/reports/monthly/ — Monthly aggregation with MoM growth"""
+    return Response({'rows': _monthly_rows(request)})
+
+
+def _staff_rows(request):
     qs, date_from, date_to = _base_qs(request)
+    done = Q(status__in=DONE_STATUSES)
 
     rows = list(
-        qs.filter(staff__isnull=False)
-        .values('staff__id', 'staff__name')
+        _report_rows(request, qs, date_from, date_to)
+        .values('staff_id', 'staff__name')
         .annotate(
-            revenue=Sum('service__price', filter=Q(status__in=['completed', 'confirmed'])),
-            bookings=Count('id', filter=Q(status__in=['completed', 'confirmed'])),
-            no_shows=Count('id', filter=Q(status='no_show')),
-            total=Count('id'),
-            avg_reliability=Avg('client__reliability_score'),
-            avg_risk=Avg('risk_score'),
-            at_risk=Sum('revenue_at_risk', filter=Q(risk_level__in=['HIGH', 'CRITICAL'])),
+            revenue_sum=Sum('revenue', filter=done),
+            bookings=Sum('booking_count', filter=done),
+            no_shows=Sum('no_show_count'),
+            total=Sum('booking_count'),
+            risk_sum=Sum('risk_score_sum'),
+            risk_n=Sum('risk_score_count'),
+            at_risk=Sum('high_risk_revenue'),
         )
-        .order_by('-revenue')
+        .order_by('-revenue_sum')
+    )
+    reliability = dict(
+        qs.order_by().values('staff_id').annotate(avg=Avg('client__reliability_score')).values_list('staff_id', 'avg')
     )
 
     result = []
@@ -291,19 +389,25 @@ def reports_staff(request):
         ns = r['no_shows'] or 0
         ns_rate = round(ns / total * 100, 1) if total > 0 else 0
         result.append({
-            'staff_id': r['staff__id'],
+            'staff_id': r['staff_id'],
             'staff_name': r['staff__name'],
-            'revenue': float(r['revenue'] or 0),
-            'bookings': r['bookings'],
+            'revenue': float(r['revenue_sum'] or 0),
+            'bookings': r['bookings'] or 0,
             'no_shows': ns,
             'total': total,
             'no_show_rate': ns_rate,
-            'avg_reliability': round(float(r['avg_reliability'] or 0), 1),
-            'avg_risk': round(float(r['avg_risk'] or 0), 1),
+            'avg_reliability': round(float(reliability.get(r['staff_id']) or 0), 1),
+            'avg_risk': _avg(r['risk_sum'], r['risk_n']),
             'at_risk': float(r['at_risk'] or 0),
         })
+    return result
+
 
-    return Response({'rows': result})
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def reports_staff(request):
+    """GET /api/reports/staff/ — Per-staff performance"""
+    return Response({'rows': _staff_rows(request)})
 
 
 @api_view(['GET'])
@@ -319,18 +423,20 @@ def reports_insights(request):
     actions = []
 
     # 1. Day-of-week performance analysis
+    # No upper bound, as with `recent`: open-status insights cover upcoming bookings
+    recent_rows = _rollup_rows(None, thirty_days_ago.date())
     dow_data = list(
-        recent.filter(status__in=['completed', 'confirmed'])
-        .annotate(dow=ExtractWeekDay('start_time'))
+        recent_rows.filter(status__in=DONE_STATUSES)
+        .annotate(dow=ExtractWeekDay('date'))
         .values('dow')
-        .annotate(revenue=Sum('service__price'), count=Count('id'))
+        .annotate(revenue_sum=Sum('revenue'))
         .order_by('dow')
     )
     if len(dow_data) >= 3:
-        avg_rev = sum(float(d['revenue'] or 0) for d in dow_data) / len(dow_data)
+        avg_rev = sum(float(d['revenue_sum'] or 0) for d in dow_data) / len(dow_data)
         dow_names = {1: 'Sunday', 2: 'Monday', 3: 'Tuesday', 4: 'Wednesday', 5: 'Thursday', 6: 'Friday', 7: 'Saturday'}
         for d in dow_data:
-            rev = float(d['revenue'] or 0)
+            rev = float(d['revenue_sum'] or 0)
             if avg_rev > 0 and rev < avg_rev * 0.7:
                 pct = round((1 - rev / avg_rev) * 100)
                 day_name = dow_names.get(d['dow'], f"Day {d['dow']}")
@@ -349,9 +455,11 @@ def reports_insights(request):
                 })
 
     # 2. High risk client revenue exposure
-    high_risk = recent.filter(risk_level__in=['HIGH', 'CRITICAL'], status__in=['confirmed', 'pending'])
-    hr_revenue = float(high_risk.aggregate(t=Sum('revenue_at_risk'))['t'] or 0)
-    hr_count = high_risk.count()
+    high_risk = recent_rows.filter(status__in=OPEN_STATUSES).aggregate(
+        n=Sum('high_risk_count'), t=Sum('high_risk_revenue'),
+    )
+    hr_revenue = float(high_risk['t'] or 0)
+    hr_count = high_risk['n'] or 0
     if hr_count > 0:
         insights.append({
             'type': 'danger',
@@ -361,10 +469,10 @@ def reports_insights(request):
 
     # 3. Service no-show comparison
     svc_ns = list(
-        recent.values('service__name')
+        recent_rows.values('service__name')
         .annotate(
-            total=Count('id'),
-            ns=Count('id', filter=Q(status='no_show')),
+            total=Sum('booking_count'),
+            ns=Sum('no_show_count'),
         )
         .filter(total__gte=3)
         .order_by('-ns')
@@ -455,8 +563,8 @@ def reports_insights(request):
 # Staff Hours — Monthly per-staff hours summary (real-time)
 # ════════════════════════════════════════════════════════════════
 
-def _staff_hours_data(request):
-    """Build per-staff monthly hours data from TimesheetEntry records."""
+def _staff_hours_qs(request):
+    """TimesheetEntry queryset and month bounds selected by the staff-hours query params."""
     now = timezone.now()
     # Default: current month
     month_str = request.query_params.get('month')  # YYYY-MM
@@ -490,46 +598,47 @@ def _staff_hours_data(request):
     if staff_filter:
         qs = qs.filter(staff_member_id=staff_filter)
 
-    # Build per-staff summary
-    staff_map = {}
-    for entry in qs:
-        sid = entry.staff_member_id
-        if sid not in staff_map:
-            staff_map[sid] = {
-                'staff_id': sid,
-                'staff_name': entry.staff_member.name,
-                'scheduled_hours': 0,
-                'actual_hours': 0,
-                'days_worked': 0,
-                'days_absent': 0,
-                'overtime_hours': 0,
-                'entries': [],
-            }
-        row = staff_map[sid]
-        sh = entry.scheduled_hours or 0
-        ah = entry.actual_hours or 0
-        row['scheduled_hours'] += sh
-        row['actual_hours'] += ah
-        if ah > 0:
-            row['days_worked'] += 1
-        elif sh > 0 and ah == 0:
-            row['days_absent'] += 1
-        if ah > sh and sh > 0:
-            row['overtime_hours'] += round(ah - sh, 2)
-        row['entries'].append({
-            'date': entry.date.isoformat(),
-            'scheduled_hours': sh,
-            'actual_hours': ah,
-            'break_minutes': entry.break_minutes,
-            'status': entry.status,
-            'variance': entry.variance or 0,
-        })
+    return qs, month_start, month_end
 
-    rows = sorted(staff_map.values(), key=lambda r: r['staff_name'])
+
+def _staff_hours_data(request):
+    """Build per-staff monthly hours data from TimesheetEntry records."""
+    qs, month_start, month_end = _staff_hours_qs(request)
+
+    # Per-staff summary: one grouped query over the DB-side hours
+    from django.db.models import Case, When
+    from core.timesheet_hours import ZERO, to_hours
+    zero = timedelta(0)
+    grouped = (
+        qs.order_by().with_hours()
+        .values('staff_member_id', 'staff_member__name', 'staff_member__staff_profile__id')
+        .annotate(
+            scheduled=Sum('scheduled_span'),
+            actual=Sum('actual_span'),
+            days_worked=Count('id', filter=Q(actual_span__gt=zero)),
+            days_absent=Count('id', filter=Q(scheduled_span__gt=zero, actual_span=zero)),
+            overtime=Sum(Case(
+                When(scheduled_span__gt=zero, actual_span__gt=F('scheduled_span'),
+                     then=F('actual_span') - F('scheduled_span')),
+                default=ZERO,
+            )),
+        )
+    )
+    rows = sorted((
+        {
+            'staff_id': g['staff_member_id'],
+            'staff_name': g['staff_member__name'],
+            # Same person's HR record in the staff module, if linked
+            'staff_profile_id': g['staff_member__staff_profile__id'],
+            'scheduled_hours': to_hours(g['scheduled']),
+            'actual_hours': to_hours(g['actual']),
+            'days_worked': g['days_worked'],
+            'days_absent': g['days_absent'],
+            'overtime_hours': to_hours(g['overtime']),
+        }
+        for g in grouped
+    ), key=lambda r: r['staff_name'])
     for r in rows:
-        r['scheduled_hours'] = round(r['scheduled_hours'], 2)
-        r['actual_hours'] = round(r['actual_hours'], 2)
-        r['overtime_hours'] = round(r['overtime_hours'], 2)
         r['variance_hours'] = round(r['actual_hours'] - r['scheduled_hours'], 2)
 
     # Totals
@@ -556,80 +665,81 @@ def _staff_hours_data(request):
 @permission_classes([AllowAny])
 def reports_staff_hours(request):
     """GET /api/reports/staff-hours/ — Monthly per-staff hours summary"""
-    data = _staff_hours_data(request)
-    # Strip daily entries from JSON response (keep it lightweight)
-    for r in data['staff']:
-        del r['entries']
-    return Response(data)
+    return Response(_staff_hours_data(request))
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def reports_staff_hours_csv(request):
-    """GET /api/reports/staff-hours/csv/ — Download monthly staff hours as CSV for payroll"""
-    data = _staff_hours_data(request)
-    month_label = data['month']
-
-    output = StringIO()
-    writer = csv.writer(output)
+    """GET /api/reports/staff-hours/csv/ — Download monthly staff hours as CSV for payroll (streamed)"""
+    from core.csv_export import EXPORT_CHUNK_SIZE, streaming_csv_response
 
     # Summary mode (default) — one row per staff
     detail = request.query_params.get('detail', '').lower() in ('1', 'true')
 
     if detail:
-        # Detailed: one row per staff per day
-        writer.writerow([
-            'Month', 'Staff Name', 'Date', 'Scheduled Hours',
-            'Actual Hours', 'Break (min)', 'Overtime', 'Variance', 'Status',
-        ])
-        for staff_row in data['staff']:
-            for entry in staff_row['entries']:
-                sh = entry['scheduled_hours']
-                ah = entry['actual_hours']
+        # Detailed: one row per staff per day, streamed straight from the query
+        qs, month_start, _ = _staff_hours_qs(request)
+        month_label = month_start.strftime('%Y-%m')
+        entries = qs.only(
+            'date', 'scheduled_start', 'scheduled_end', 'actual_start', 'actual_end',
+            'break_minutes', 'status', 'staff_member__name',
+        ).order_by('staff_member__name', 'staff_member_id', '-date')
+
+        def rows():
+            for entry in entries.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                sh = entry.scheduled_hours or 0
+                ah = entry.actual_hours or 0
                 ot = round(max(0, ah - sh), 2) if sh > 0 else 0
-                writer.writerow([
+                yield [
                     month_label,
-                    staff_row['staff_name'],
-                    entry['date'],
+                    entry.staff_member.name,
+                    entry.date.isoformat(),
                     f"{sh:.2f}",
                     f"{ah:.2f}",
-                    entry['break_minutes'],
+                    entry.break_minutes,
                     f"{ot:.2f}",
-                    f"{entry['variance']:.2f}",
-                    entry['status'],
-                ])
+                    f"{entry.variance or 0:.2f}",
+                    entry.status,
+                ]
+
+        header = [
+            'Month', 'Staff Name', 'Date', 'Scheduled Hours',
+            'Actual Hours', 'Break (min)', 'Overtime', 'Variance', 'Status',
+        ]
     else:
-        # Summary: one row per staff
-        writer.writerow([
+        # Summary: one row per staff, plus a totals row
+        data = _staff_hours_data(request)
+        month_label = data['month']
+
+        def rows():
+            for staff_row in data['staff']:
+                yield [
+                    month_label,
+                    staff_row['staff_name'],
+                    f"{staff_row['scheduled_hours']:.2f}",
+                    f"{staff_row['actual_hours']:.2f}",
+                    f"{staff_row['overtime_hours']:.2f}",
+                    f"{staff_row['variance_hours']:.2f}",
+                    staff_row['days_worked'],
+                    staff_row['days_absent'],
+                ]
+            yield []
+            yield [
+                '', 'TOTAL',
+                f"{data['totals']['scheduled_hours']:.2f}",
+                f"{data['totals']['actual_hours']:.2f}",
+                f"{data['totals']['overtime_hours']:.2f}",
+                f"{data['totals']['variance_hours']:.2f}",
+                '', '',
+            ]
+
+        header = [
             'Month', 'Staff Name', 'Scheduled Hours', 'Actual Hours',
             'Overtime Hours', 'Variance Hours', 'Days Worked', 'Days Absent',
-        ])
-        for staff_row in data['staff']:
-            writer.writerow([
-                month_label,
-                staff_row['staff_name'],
-                f"{staff_row['scheduled_hours']:.2f}",
-                f"{staff_row['actual_hours']:.2f}",
-                f"{staff_row['overtime_hours']:.2f}",
-                f"{staff_row['variance_hours']:.2f}",
-                staff_row['days_worked'],
-                staff_row['days_absent'],
-            ])
-
-        # Totals row
-        writer.writerow([])
-        writer.writerow([
-            '', 'TOTAL',
-            f"{data['totals']['scheduled_hours']:.2f}",
-            f"{data['totals']['actual_hours']:.2f}",
-            f"{data['totals']['overtime_hours']:.2f}",
-            f"{data['totals']['variance_hours']:.2f}",
-            '', '',
-        ])
-
-    response = HttpResponse(output.getvalue(), content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="staff-hours-{month_label}.csv"'
-    return response
+        ]
+
+    return streaming_csv_response(request, f'staff-hours-{month_label}.csv', header, rows())
 
 
 # ════════════════════════════════════════════════════════════════
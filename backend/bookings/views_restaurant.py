@@ -7,10 +7,12 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Sum
+from django.utils import timezone
 
 from .models_restaurant import Table, ServiceWindow
 from .models import Booking
 from .serializers_restaurant import TableSerializer, ServiceWindowSerializer
+from .utils import day_range
 
 
 class TableViewSet(viewsets.ModelViewSet):
@@ -94,10 +96,12 @@ def restaurant_availability(request):
     if not suitable_tables.exists():
         return Response({'windows': [], 'message': 'No tables available for this party size'})
 
-    # Get existing bookings for this date (use start_time__date since Booking has no date field)
+    # Get existing bookings for this date
+    day_start, day_end = day_range(target_date)
     existing_bookings = Booking.objects.filter(
         tenant=tenant,
-        start_time__date=target_date,
+        start_time__gte=day_start,
+        start_time__lt=day_end,
         status__in=['confirmed', 'pending'],
     )
 
@@ -121,9 +125,8 @@ def restaurant_availability(request):
             # Count overlapping bookings: a booking overlaps if it starts before slot ends
             # and ends after slot starts
             overlapping_bookings = existing_bookings.filter(
-                start_time__date=target_date,
-                start_time__time__lt=slot_end_time,
-                end_time__time__gt=current_time,
+                start_time__lt=timezone.make_aware(slot_end_dt),
+                end_time__gt=timezone.make_aware(slot_start_dt),
             )
 
             # Count booked tables (each booking uses one table)
@@ -3,6 +3,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 from django.utils import timezone
 from .models import Staff, StaffSchedule
 from .models_availability import TimesheetEntry
@@ -81,58 +82,65 @@ def timesheets_generate(request):
         return Response({'error': 'Invalid date format'}, status=status.HTTP_400_BAD_REQUEST)
 
     # Get all working hour schedules
-    schedules_qs = StaffSchedule.objects.select_related('staff').filter(is_working=True)
+    schedules_qs = StaffSchedule.objects.filter(is_working=True)
     if staff_id:
         schedules_qs = schedules_qs.filter(staff_id=staff_id)
 
-    # Build lookup: staff_id -> { day_of_week -> [schedule entries] }
+    # Build lookup: staff_id -> { day_of_week -> first schedule for that day }
     schedule_map = {}
     for sched in schedules_qs:
-        sid = sched.staff_id
-        if sid not in schedule_map:
-            schedule_map[sid] = {}
-        dow = sched.day_of_week
-        if dow not in schedule_map[sid]:
-            schedule_map[sid][dow] = []
-        schedule_map[sid][dow].append(sched)
+        schedule_map.setdefault(sched.staff_id, {}).setdefault(sched.day_of_week, sched)
 
+    with transaction.atomic():
+        # Concurrent generates for the same staff queue here, so the re-count below is ours alone
+        list(Staff.objects.select_for_update().filter(id__in=schedule_map).values_list('id', flat=True))
+        created_count, skipped_count = _insert_timesheets(schedule_map, d_from, d_to)
+
+    return Response({
+        'detail': f'{created_count} timesheet entries generated.',
+        'created': created_count,
+        'skipped': skipped_count,
+    })
+
+
+def _insert_timesheets(schedule_map, d_from, d_to):
+    """Insert entries for scheduled days without one. Returns (created, skipped)."""
     # Get existing timesheet entries to avoid duplicates
     existing = set(
         TimesheetEntry.objects.filter(
-            date__gte=d_from, date__lte=d_to
+            staff_member_id__in=schedule_map, date__gte=d_from, date__lte=d_to
         ).values_list('staff_member_id', 'date')
     )
 
-    created_count = 0
+    entries = []
+    skipped_count = 0
     current = d_from
     while current <= d_to:
         dow = current.weekday()  # Monday=0
         for sid, days in schedule_map.items():
-            if dow in days:
-                for sched in days[dow]:
-                    if (sid, current) in existing:
-                        continue
-                    # Create timesheet entry
-                    sched_start = timezone.make_aware(
-                        datetime.combine(current, sched.start_time)
-                    )
-                    sched_end = timezone.make_aware(
-                        datetime.combine(current, sched.end_time)
-                    )
-                    TimesheetEntry.objects.create(
-                        staff_member_id=sid,
-                        date=current,
-                        scheduled_start=sched_start,
-                        scheduled_end=sched_end,
-                        break_minutes=sched.break_minutes,
-                        status='DRAFT',
-                        source='GENERATED_FROM_PATTERN',
-                    )
-                    created_count += 1
-                    existing.add((sid, current))
+            sched = days.get(dow)
+            if sched is None:
+                continue
+            if (sid, current) in existing:
+                skipped_count += 1
+                continue
+            entries.append(TimesheetEntry(
+                staff_member_id=sid,
+                date=current,
+                scheduled_start=timezone.make_aware(datetime.combine(current, sched.start_time)),
+                scheduled_end=timezone.make_aware(datetime.combine(current, sched.end_time)),
+                break_minutes=sched.break_minutes,
+                status='DRAFT',
+                source='GENERATED_FROM_PATTERN',
+            ))
         current += timedelta(days=1)
 
-    return Response({'detail': f'{created_count} timesheet entries generated.'})
+    # One insert instead of a round-trip per staff per day; ignore_conflicts drops
+    # rows another writer added meanwhile, so count what actually landed
+    in_range = TimesheetEntry.objects.filter(staff_member_id__in=schedule_map, date__gte=d_from, date__lte=d_to)
+    TimesheetEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    created_count = max(0, in_range.count() - len(existing))
+    return created_count, skipped_count + len(entries) - created_count
 
 
 @api_view(['GET'])
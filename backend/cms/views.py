@@ -4,6 +4,7 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
 from rest_framework import status, serializers
 from django.utils import timezone
+from core.conditional import conditional_get
 from .models import Page, PageImage, BlogPost
 
 
@@ -81,6 +82,7 @@ def page_list(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get('cms_pages')
 def public_pages(request):
     """Public: list published pages for navigation."""
     tenant = getattr(request, 'tenant', None)
@@ -92,6 +94,7 @@ def public_pages(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get('cms_page')
 def public_page_detail(request, slug):
     """Public: get a single published page by slug."""
     tenant = getattr(request, 'tenant', None)
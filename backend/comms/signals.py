@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender='comms.Message')
+def publish_message_created(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    from core.live_events import publish
+    from .models import Channel
+    tenant_id = Channel.objects.filter(pk=instance.channel_id).values_list('tenant_id', flat=True).first()
+    publish(tenant_id, 'message.created', id=instance.pk, channel_id=instance.channel_id)
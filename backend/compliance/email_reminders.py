@@ -5,7 +5,9 @@ Sends weekly digest emails to tenant owners/managers about:
 - Items due within the next 30 days
 - Upcoming renewals (expiry_date approaching)
 
-Uses the same SMTP/Resend fallback chain as booking reminders.
+Digests for all tenants are gathered in a few grouped queries, rendered
+concurrently and sent through a pooled SMTP transport (core.email_transport)
+with the same Resend fallback as booking reminders.
 """
 import logging
 import smtplib
@@ -15,124 +17,145 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from core.email_templates import EmailBrand, brand_for_tenant, register_template, render
 
 logger = logging.getLogger(__name__)
 
 
-def _build_html(tenant_name, score, overdue_items, due_soon_items, compliant_count, total_count):
-    """Build branded HTML digest email."""
-    brand = tenant_name or 'Your Business'
+LEGAL_BADGE = mark_safe('<span style="background:#dc2626;color:#fff;padding:2px 8px;border-radius:4px;font-size:12px;font-weight:700;">LEGAL</span>')
+BEST_PRACTICE_BADGE = mark_safe('<span style="background:#2563eb;color:#fff;padding:2px 8px;border-radius:4px;font-size:12px;font-weight:700;">Best Practice</span>')
 
-    overdue_rows = ''
-    for item in overdue_items:
-        badge = '<span style="background:#dc2626;color:#fff;padding:2px 8px;border-radius:4px;font-size:12px;font-weight:700;">LEGAL</span>' if item['item_type'] == 'LEGAL' else '<span style="background:#2563eb;color:#fff;padding:2px 8px;border-radius:4px;font-size:12px;font-weight:700;">Best Practice</span>'
-        overdue_rows += f'''
+DIGEST_ROW_HTML = '''
         <tr>
             <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;">
-                <strong>{item['title']}</strong><br>
-                <span style="color:#6b7280;font-size:13px;">{item['category']} · {item.get('frequency_type', 'annual')}</span>
+                <strong>$title</strong><br>
+                <span style="color:#6b7280;font-size:13px;">$category · $frequency_type</span>
             </td>
-            <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;">{badge}</td>
-            <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;color:#dc2626;font-weight:600;">
-                {item.get('days_overdue', 0)} days overdue
+            <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;">$badge</td>
+            <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;color:$status_colour;font-weight:600;">
+                $status_text
             </td>
         </tr>'''
 
-    due_soon_rows = ''
-    for item in due_soon_items:
-        badge = '<span style="background:#dc2626;color:#fff;padding:2px 8px;border-radius:4px;font-size:12px;font-weight:700;">LEGAL</span>' if item['item_type'] == 'LEGAL' else '<span style="background:#2563eb;color:#fff;padding:2px 8px;border-radius:4px;font-size:12px;font-weight:700;">Best Practice</span>'
-        due_soon_rows += f'''
-        <tr>
-            <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;">
-                <strong>{item['title']}</strong><br>
-                <span style="color:#6b7280;font-size:13px;">{item['category']} · {item.get('frequency_type', 'annual')}</span>
-            </td>
-            <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;">{badge}</td>
-            <td style="padding:10px 12px;border-bottom:1px solid #e5e7eb;color:#d97706;font-weight:600;">
-                Due in {item.get('days_until', '?')} days
-            </td>
-        </tr>'''
-
-    # Score colour
-    if score >= 80:
-        score_color = '#16a34a'
-        score_label = 'Compliant'
-    elif score >= 60:
-        score_color = '#d97706'
-        score_label = 'Attention Needed'
-    else:
-        score_color = '#dc2626'
-        score_label = 'Action Required'
-
-    overdue_section = ''
-    if overdue_rows:
-        overdue_section = f'''
-        <div style="margin-bottom:24px;">
-            <h2 style="color:#dc2626;font-size:16px;margin:0 0 12px;">⚠ Overdue Items ({len(overdue_items)})</h2>
-            <table style="width:100%;border-collapse:collapse;background:#fff;border-radius:8px;overflow:hidden;border:1px solid #e5e7eb;">
-                <thead>
-                    <tr style="background:#fef2f2;">
-                        <th style="padding:10px 12px;text-align:left;font-size:13px;color:#6b7280;">Item</th>
-                        <th style="padding:10px 12px;text-align:left;font-size:13px;color:#6b7280;">Type</th>
-                        <th style="padding:10px 12px;text-align:left;font-size:13px;color:#6b7280;">Status</th>
-                    </tr>
-                </thead>
-                <tbody>{overdue_rows}</tbody>
-            </table>
-        </div>'''
-
-    due_soon_section = ''
-    if due_soon_rows:
-        due_soon_section = f'''
+DIGEST_SECTION_HTML = '''
         <div style="margin-bottom:24px;">
-            <h2 style="color:#d97706;font-size:16px;margin:0 0 12px;">📅 Due Soon ({len(due_soon_items)})</h2>
+            <h2 style="color:$colour;font-size:16px;margin:0 0 12px;">$heading</h2>
             <table style="width:100%;border-collapse:collapse;background:#fff;border-radius:8px;overflow:hidden;border:1px solid #e5e7eb;">
                 <thead>
-                    <tr style="background:#fffbeb;">
+                    <tr style="background:$head_background;">
                         <th style="padding:10px 12px;text-align:left;font-size:13px;color:#6b7280;">Item</th>
                         <th style="padding:10px 12px;text-align:left;font-size:13px;color:#6b7280;">Type</th>
-                        <th style="padding:10px 12px;text-align:left;font-size:13px;color:#6b7280;">When</th>
+                        <th style="padding:10px 12px;text-align:left;font-size:13px;color:#6b7280;">$last_column</th>
                     </tr>
                 </thead>
-                <tbody>{due_soon_rows}</tbody>
+                <tbody>$rows</tbody>
             </table>
         </div>'''
 
-    return f'''<!DOCTYPE html>
+DIGEST_HTML = '''<!DOCTYPE html>
 <html>
 <head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"></head>
 <body style="margin:0;padding:0;background:#f3f4f6;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;">
 <div style="max-width:600px;margin:0 auto;padding:24px;">
     <div style="background:#111827;color:#fff;padding:20px 24px;border-radius:12px 12px 0 0;text-align:center;">
         <h1 style="margin:0;font-size:20px;font-weight:700;">Health &amp; Safety Compliance Digest</h1>
-        <p style="margin:6px 0 0;color:#9ca3af;font-size:14px;">{brand}</p>
+        <p style="margin:6px 0 0;color:#9ca3af;font-size:14px;">$brand_name</p>
     </div>
     <div style="background:#fff;padding:24px;border-radius:0 0 12px 12px;border:1px solid #e5e7eb;border-top:none;">
         <div style="text-align:center;margin-bottom:24px;">
-            <div style="display:inline-block;width:100px;height:100px;border-radius:50%;border:6px solid {score_color};line-height:88px;text-align:center;font-size:32px;font-weight:800;color:{score_color};">{score}</div>
-            <div style="margin-top:8px;font-size:14px;color:{score_color};font-weight:600;">{score_label}</div>
-            <div style="margin-top:4px;font-size:13px;color:#6b7280;">{compliant_count} of {total_count} items compliant</div>
+            <div style="display:inline-block;width:100px;height:100px;border-radius:50%;border:6px solid $score_colour;line-height:88px;text-align:center;font-size:32px;font-weight:800;color:$score_colour;">$score</div>
+            <div style="margin-top:8px;font-size:14px;color:$score_colour;font-weight:600;">$score_label</div>
+            <div style="margin-top:4px;font-size:13px;color:#6b7280;">$compliant_count of $total_count items compliant</div>
         </div>
 
-        {overdue_section}
-        {due_soon_section}
+        $overdue_section
+        $due_soon_section
 
         <div style="text-align:center;margin-top:24px;">
             <p style="color:#6b7280;font-size:13px;margin:0 0 12px;">Log in to your dashboard to resolve these items and keep your business compliant.</p>
         </div>
     </div>
     <div style="text-align:center;padding:16px;color:#9ca3af;font-size:12px;">
-        This is an automated compliance reminder from {brand}.<br>
+        This is an automated compliance reminder from $brand_name.<br>
         You are receiving this because you are an owner or manager.
     </div>
 </div>
 </body>
 </html>'''
 
+register_template('compliance_digest_row.html', DIGEST_ROW_HTML)
+register_template('compliance_digest_section.html', DIGEST_SECTION_HTML)
+register_template('compliance_digest.html', DIGEST_HTML)
+
+
+def _digest_brand(brand):
+    """Accept an EmailBrand or a plain tenant name (legacy callers)."""
+    if isinstance(brand, EmailBrand):
+        return brand
+    return EmailBrand(name=brand or 'Your Business')
+
+
+def _build_rows(brand, items, status_colour, status_text):
+    return mark_safe(''.join(
+        render(
+            'compliance_digest_row.html', brand,
+            title=item['title'],
+            category=item['category'],
+            frequency_type=item.get('frequency_type', 'annual'),
+            badge=LEGAL_BADGE if item['item_type'] == 'LEGAL' else BEST_PRACTICE_BADGE,
+            status_colour=status_colour,
+            status_text=status_text(item),
+        )
+        for item in items
+    ))
+
 
-def _build_text(tenant_name, score, overdue_items, due_soon_items, compliant_count, total_count):
+def _build_html(brand, score, overdue_items, due_soon_items, compliant_count, total_count):
+    """Build branded HTML digest email."""
+    brand = _digest_brand(brand)
+
+    # Score colour
+    if score >= 80:
+        score_color = '#16a34a'
+        score_label = 'Compliant'
+    elif score >= 60:
+        score_color = '#d97706'
+        score_label = 'Attention Needed'
+    else:
+        score_color = '#dc2626'
+        score_label = 'Action Required'
+
+    overdue_section = ''
+    if overdue_items:
+        overdue_section = render(
+            'compliance_digest_section.html', brand,
+            colour='#dc2626', head_background='#fef2f2', last_column='Status',
+            heading=f'⚠ Overdue Items ({len(overdue_items)})',
+            rows=_build_rows(brand, overdue_items, '#dc2626', lambda i: f"{i.get('days_overdue', 0)} days overdue"),
+        )
+
+    due_soon_section = ''
+    if due_soon_items:
+        due_soon_section = render(
+            'compliance_digest_section.html', brand,
+            colour='#d97706', head_background='#fffbeb', last_column='When',
+            heading=f'📅 Due Soon ({len(due_soon_items)})',
+            rows=_build_rows(brand, due_soon_items, '#d97706', lambda i: f"Due in {i.get('days_until', '?')} days"),
+        )
+
+    return render(
+        'compliance_digest.html', brand,
+        score=score, score_colour=score_color, score_label=score_label,
+        compliant_count=compliant_count, total_count=total_count,
+        overdue_section=overdue_section, due_soon_section=due_soon_section,
+    )
+
+
+def _build_text(brand, score, overdue_items, due_soon_items, compliant_count, total_count):
     """Build plain-text fallback."""
-    brand = tenant_name or 'Your Business'
+    brand = _digest_brand(brand).name
     lines = [
         f'Health & Safety Compliance Digest — {brand}',
         f'Peace of Mind Score: {score}%',
@@ -202,23 +225,29 @@ def _send_via_resend(api_key, from_name, from_email, to_email, subject, text_bod
     return True
 
 
-def send_compliance_digest(tenant, to_email, tenant_name, score, overdue_items, due_soon_items, compliant_count, total_count):
-    """Send a single compliance digest email."""
+def _digest_subject(overdue_items, due_soon_items, tenant_name):
     subject_parts = []
     if overdue_items:
         subject_parts.append(f'{len(overdue_items)} overdue')
     if due_soon_items:
         subject_parts.append(f'{len(due_soon_items)} due soon')
     if not subject_parts:
-        return False  # Nothing to report
+        return None  # Nothing to report
+    return f'H&S Compliance: {", ".join(subject_parts)} — {tenant_name}'
+
 
-    subject = f'H&S Compliance: {", ".join(subject_parts)} — {tenant_name}'
+def send_compliance_digest(tenant, to_email, tenant_name, score, overdue_items, due_soon_items, compliant_count, total_count):
+    """Send a single compliance digest email."""
+    subject = _digest_subject(overdue_items, due_soon_items, tenant_name)
+    if not subject:
+        return False
 
-    html_body = _build_html(tenant_name, score, overdue_items, due_soon_items, compliant_count, total_count)
-    text_body = _build_text(tenant_name, score, overdue_items, due_soon_items, compliant_count, total_count)
+    brand = brand_for_tenant(tenant, fallback_name=tenant_name) if tenant is not None else _digest_brand(tenant_name)
+    html_body = _build_html(brand, score, overdue_items, due_soon_items, compliant_count, total_count)
+    text_body = _build_text(brand, score, overdue_items, due_soon_items, compliant_count, total_count)
 
     from_email = getattr(settings, 'REMINDER_FROM_EMAIL', getattr(settings, 'DEFAULT_FROM_EMAIL', ''))
-    from_name = tenant_name or getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
+    from_name = brand.name or getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
 
     # Try SMTP first
     smtp_password = getattr(settings, 'REMINDER_EMAIL_HOST_PASSWORD', getattr(settings, 'EMAIL_HOST_PASSWORD', ''))
@@ -241,90 +270,152 @@ def send_compliance_digest(tenant, to_email, tenant_name, score, overdue_items,
     return False
 
 
-def process_compliance_reminders():
+def gather_digests(today=None):
     """
-    Main entry point: iterate all tenants, find overdue/due-soon items,
-    send digest emails to owners and managers.
-    Returns dict with counts.
+    Collect digest data for every tenant in a handful of grouped queries:
+    reportable items, per-tenant totals, scores, names and recipients.
+    Returns (tenants_checked, tenants_skipped, digests).
     """
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count, Q
     from tenants.models import TenantSettings
-    from .models import ComplianceItem, ComplianceCategory, PeaceOfMindScore
-
-    today = timezone.now().date()
-    results = {'tenants_checked': 0, 'emails_sent': 0, 'emails_failed': 0, 'tenants_skipped': 0}
-
-    for tenant in TenantSettings.objects.all():
-        results['tenants_checked'] += 1
-
-        items = list(ComplianceItem.objects.select_related('category').filter(category__tenant=tenant))
-        if not items:
-            results['tenants_skipped'] += 1
-            continue
-
-        overdue_items = []
-        due_soon_items = []
-        compliant_count = 0
-
-        for item in items:
-            effective_date = item.expiry_date or item.next_due_date
-            if item.status == 'OVERDUE':
-                days_overdue = (today - effective_date).days if effective_date and effective_date < today else 0
-                overdue_items.append({
-                    'title': item.title,
-                    'item_type': item.item_type,
-                    'category': item.category.name,
-                    'frequency_type': item.frequency_type,
-                    'days_overdue': days_overdue,
-                })
-            elif item.status == 'DUE_SOON':
-                days_until = (effective_date - today).days if effective_date else 0
-                due_soon_items.append({
-                    'title': item.title,
-                    'item_type': item.item_type,
-                    'category': item.category.name,
-                    'frequency_type': item.frequency_type,
-                    'days_until': days_until,
-                })
-            else:
-                compliant_count += 1
-
-        # Skip if nothing to report
-        if not overdue_items and not due_soon_items:
-            results['tenants_skipped'] += 1
-            continue
+    from .models import ComplianceItem, PeaceOfMindScore
+
+    today = today or timezone.now().date()
+    reportable = ('OVERDUE', 'DUE_SOON')
+
+    tenant_names = {
+        tenant_id: name or slug
+        for tenant_id, name, slug in TenantSettings.objects.values_list('id', 'business_name', 'slug')
+    }
+    totals = {
+        row['category__tenant_id']: row
+        for row in ComplianceItem.objects.values('category__tenant_id').annotate(
+            total=Count('id'),
+            reportable=Count('id', filter=Q(status__in=reportable)),
+        )
+    }
 
+    digests = {}
+    items = ComplianceItem.objects.filter(
+        status__in=reportable, category__tenant_id__in=[t for t, row in totals.items() if row['reportable']],
+    ).values_list(
+        'category__tenant_id', 'status', 'title', 'item_type', 'category__name',
+        'frequency_type', 'expiry_date', 'next_due_date',
+    )
+    for tenant_id, status, title, item_type, category, frequency_type, expiry, next_due in items:
+        digest = digests.get(tenant_id)
+        if digest is None:
+            digest = digests[tenant_id] = {'tenant_id': tenant_id, 'overdue_items': [], 'due_soon_items': []}
+        effective_date = expiry or next_due
+        row = {'title': title, 'item_type': item_type, 'category': category, 'frequency_type': frequency_type}
+        if status == 'OVERDUE':
+            row['days_overdue'] = (today - effective_date).days if effective_date and effective_date < today else 0
+            digest['overdue_items'].append(row)
+        else:
+            row['days_until'] = (effective_date - today).days if effective_date else 0
+            digest['due_soon_items'].append(row)
+
+    scores = dict(PeaceOfMindScore.objects.filter(tenant_id__in=digests).values_list('tenant_id', 'score'))
+    recipients = {}
+    User = get_user_model()
+    for tenant_id, email in User.objects.filter(
+        tenant_id__in=digests, is_active=True, role__in=['owner', 'manager'],
+    ).exclude(email='').values_list('tenant_id', 'email').distinct():
+        recipients.setdefault(tenant_id, []).append(email)
+
+    for tenant_id, digest in digests.items():
         # Sort: legal items first, then by urgency
-        overdue_items.sort(key=lambda x: (0 if x['item_type'] == 'LEGAL' else 1, -x.get('days_overdue', 0)))
-        due_soon_items.sort(key=lambda x: (0 if x['item_type'] == 'LEGAL' else 1, x.get('days_until', 999)))
+        digest['overdue_items'].sort(key=lambda x: (0 if x['item_type'] == 'LEGAL' else 1, -x.get('days_overdue', 0)))
+        digest['due_soon_items'].sort(key=lambda x: (0 if x['item_type'] == 'LEGAL' else 1, x.get('days_until', 999)))
+        total = totals[tenant_id]['total']
+        digest.update(
+            tenant_name=tenant_names.get(tenant_id),
+            score=scores.get(tenant_id, 0),
+            total_count=total,
+            compliant_count=total - totals[tenant_id]['reportable'],
+            recipients=recipients.get(tenant_id, []),
+        )
+
+    checked = len(tenant_names)
+    return checked, checked - len(digests), list(digests.values())
+
+
+def render_digest(digest, brand=None):
+    """Render subject, HTML and text bodies for one gathered digest."""
+    brand = brand or EmailBrand(name=digest['tenant_name'] or 'Your Business')
+    args = (brand, digest['score'], digest['overdue_items'], digest['due_soon_items'],
+            digest['compliant_count'], digest['total_count'])
+    return {
+        'subject': _digest_subject(digest['overdue_items'], digest['due_soon_items'], digest['tenant_name']),
+        'html': _build_html(*args),
+        'text': _build_text(*args),
+        'from_name': brand.name,
+    }
 
-        # Get score
-        score_obj = PeaceOfMindScore.objects.filter(tenant=tenant).first()
-        score = score_obj.score if score_obj else 0
 
-        tenant_name = tenant.business_name or tenant.slug
+def process_compliance_reminders(dry_run=False, max_workers=8):
+    """
+    Main entry point: gather overdue/due-soon items for all tenants, render
+    digests concurrently and send them to owners and managers through a
+    pooled SMTP transport.
+    Returns dict with counts and per-stage timings (seconds).
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from tenants.models import TenantSettings
+    from core.email_transport import reminder_smtp_pool, send_email
+
+    results = {'tenants_checked': 0, 'emails_sent': 0, 'emails_failed': 0, 'tenants_skipped': 0,
+               'emails_rendered': 0, 'timings': {}}
+    timings = results['timings']
+
+    t0 = time.perf_counter()
+    checked, skipped, digests = gather_digests()
+    results['tenants_checked'], results['tenants_skipped'] = checked, skipped
+    # Brands resolved up front so render threads never touch the ORM
+    tenants = TenantSettings.objects.in_bulk([d['tenant_id'] for d in digests])
+    timings['gather'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rendered = list(pool.map(
+            lambda d: render_digest(d, brand_for_tenant(tenants.get(d['tenant_id']), fallback_name=d['tenant_name'])),
+            digests,
+        ))
+    timings['render'] = time.perf_counter() - t0
+
+    jobs = [
+        (digest, message, email)
+        for digest, message in zip(digests, rendered)
+        for email in digest['recipients']
+    ]
+    results['emails_rendered'] = len(jobs)
+
+    t0 = time.perf_counter()
+    if not dry_run and jobs:
+        from_email = getattr(settings, 'REMINDER_FROM_EMAIL', getattr(settings, 'DEFAULT_FROM_EMAIL', ''))
+        smtp = reminder_smtp_pool(size=min(max_workers, 4))
+
+        def deliver(job):
+            digest, message, email = job
+            try:
+                return send_email(
+                    smtp, message['from_name'], from_email, email,
+                    message['subject'], message['text'], message['html'],
+                    log_prefix='[COMPLIANCE-REMINDER]',
+                )
+            except Exception as e:
+                logger.error(f"[COMPLIANCE-REMINDER] Error sending to {email} (tenant {digest['tenant_id']}): {e}")
+                return False
 
-        # Find owner/manager emails for this tenant
         try:
-            from django.contrib.auth import get_user_model
-            User = get_user_model()
-            recipients = User.objects.filter(
-                tenant=tenant,
-                is_active=True,
-                role__in=['owner', 'manager'],
-            ).exclude(email='').values_list('email', flat=True).distinct()
-
-            for email in recipients:
-                success = send_compliance_digest(
-                    tenant, email, tenant_name, score,
-                    overdue_items, due_soon_items,
-                    compliant_count, len(items),
-                )
-                if success:
-                    results['emails_sent'] += 1
-                else:
-                    results['emails_failed'] += 1
-        except Exception as e:
-            logger.error(f"[COMPLIANCE-REMINDER] Error processing tenant {tenant.slug}: {e}")
-            results['emails_failed'] += 1
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for ok in pool.map(deliver, jobs):
+                    results['emails_sent' if ok else 'emails_failed'] += 1
+        finally:
+            if smtp is not None:
+                smtp.close()
+    timings['send'] = time.perf_counter() - t0
 
     return results
@@ -5,6 +5,7 @@ Sends weekly digest to owners/managers about overdue and due-soon items.
 Usage:
     python manage.py send_compliance_reminders          # Run once
     python manage.py send_compliance_reminders --loop    # Run continuously (for Railway)
+    python manage.py send_compliance_reminders --dry-run --benchmark   # Render only, report stage timings
 """
 import time
 import logging
@@ -32,11 +33,28 @@ class Command(BaseCommand):
             default=None,
             help='Interval in minutes between checks (default: 1440 = daily)',
         )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Gather and render digests without sending',
+        )
+        parser.add_argument(
+            '--benchmark',
+            action='store_true',
+            help='Report per-stage timings (gather, render, send)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Thread pool size for rendering and sending (default: 8)',
+        )
 
     def handle(self, *args, **options):
         from compliance.email_reminders import process_compliance_reminders
 
         loop = options['loop']
+        run_kwargs = {'dry_run': options['dry_run'], 'max_workers': options['workers']}
         interval = options['interval'] or getattr(settings, 'COMPLIANCE_REMINDER_INTERVAL_MINUTES', DEFAULT_INTERVAL_MINUTES)
 
         if loop:
@@ -45,7 +63,7 @@ class Command(BaseCommand):
             ))
             while True:
                 try:
-                    results = process_compliance_reminders()
+                    results = process_compliance_reminders(**run_kwargs)
                     sent = results['emails_sent']
                     failed = results['emails_failed']
                     if sent > 0 or failed > 0:
@@ -59,9 +77,20 @@ class Command(BaseCommand):
 
                 time.sleep(interval * 60)
         else:
-            results = process_compliance_reminders()
+            results = process_compliance_reminders(**run_kwargs)
             self.stdout.write(self.style.SUCCESS(
                 f"Compliance reminders — tenants: {results['tenants_checked']}, "
                 f"sent: {results['emails_sent']}, failed: {results['emails_failed']}, "
                 f"skipped: {results['tenants_skipped']}"
+                + (' (dry run)' if options['dry_run'] else '')
             ))
+            if options['benchmark']:
+                self._report_timings(results)
+
+    def _report_timings(self, results):
+        timings = results['timings']
+        total = sum(timings.values())
+        self.stdout.write(f"Digests rendered: {results['emails_rendered']}")
+        for stage in ('gather', 'render', 'send'):
+            self.stdout.write(f"  {stage:<8}{timings.get(stage, 0) * 1000:>10.1f} ms")
+        self.stdout.write(f"  {'total':<8}{total * 1000:>10.1f} ms")
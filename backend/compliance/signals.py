@@ -1,4 +1,4 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 
 
@@ -18,3 +18,37 @@ def recalculate_score_on_delete(sender, instance, **kwargs):
         return
     tenant = getattr(instance.category, 'tenant', None) if hasattr(instance, 'category_id') and instance.category_id else None
     PeaceOfMindScore.recalculate(tenant=tenant)
+
+
+@receiver(post_save, sender='compliance.ComplianceItem')
+@receiver(post_delete, sender='compliance.ComplianceItem')
+def invalidate_operational_events_on_item(sender, instance, **kwargs):
+    from core.operational_events import invalidate_operational_events
+    invalidate_operational_events(_item_tenant_id(instance))
+
+
+def _item_tenant_id(item):
+    from .models import ComplianceCategory
+    return ComplianceCategory.objects.filter(pk=item.category_id).values_list('tenant_id', flat=True).first()
+
+
+@receiver(pre_save, sender='compliance.ComplianceItem')
+def remember_item_status(sender, instance, raw=False, **kwargs):
+    instance._status_before = None
+    if not raw and instance.pk is not None:
+        instance._status_before = sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender='compliance.ComplianceItem')
+def publish_item_overdue(sender, instance, raw=False, **kwargs):
+    if raw or instance.status != 'OVERDUE' or getattr(instance, '_status_before', None) == 'OVERDUE':
+        return
+    from core.live_events import publish
+    publish(_item_tenant_id(instance), 'compliance.overdue', id=instance.pk, title=instance.title)
+
+
+@receiver(post_save, sender='compliance.IncidentReport')
+@receiver(post_delete, sender='compliance.IncidentReport')
+def invalidate_operational_events_on_incident(sender, instance, **kwargs):
+    from core.operational_events import invalidate_operational_events
+    invalidate_operational_events(instance.tenant_id)
@@ -0,0 +1,76 @@
+"""
+Compliance digest pipeline tests.
+Gathering across tenants, dry-run rendering and pooled sending.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from tenants.models import TenantSettings
+from .email_reminders import gather_digests, process_compliance_reminders
+from .models import ComplianceCategory, ComplianceItem
+
+
+class ComplianceDigestTests(TestCase):
+
+    def setUp(self):
+        today = timezone.now().date()
+        User = get_user_model()
+        self.tenants = []
+        for n in range(3):
+            tenant = TenantSettings.objects.create(slug=f'digest-{n}', business_name=f'Digest {n}')
+            cat = ComplianceCategory.objects.create(tenant=tenant, name='Fire Safety')
+            ComplianceItem.objects.create(
+                title='Fire risk assessment', category=cat, item_type='LEGAL',
+                status='OVERDUE', next_due_date=today - timedelta(days=10),
+            )
+            ComplianceItem.objects.create(
+                title='First aid kit check', category=cat, item_type='BEST_PRACTICE',
+                status='DUE_SOON', next_due_date=today + timedelta(days=5),
+            )
+            ComplianceItem.objects.create(
+                title='Insurance', category=cat, next_due_date=today + timedelta(days=200),
+            )
+            User.objects.create_user(
+                username=f'owner{n}', email=f'owner{n}@digest.test', password='x', role='owner', tenant=tenant,
+            )
+            self.tenants.append(tenant)
+        # A tenant with nothing to report is skipped
+        quiet = TenantSettings.objects.create(slug='digest-quiet', business_name='Quiet')
+        ComplianceItem.objects.create(
+            title='Insurance', next_due_date=today + timedelta(days=200),
+            category=ComplianceCategory.objects.create(tenant=quiet, name='Insurance'),
+        )
+
+    def test_gather_is_constant_queries(self):
+        with self.assertNumQueries(5):
+            checked, skipped, digests = gather_digests()
+        self.assertEqual(checked, 4)
+        self.assertEqual(skipped, 1)
+        self.assertEqual(len(digests), 3)
+        digest = next(d for d in digests if d['tenant_id'] == self.tenants[0].id)
+        self.assertEqual(digest['overdue_items'][0]['days_overdue'], 10)
+        self.assertEqual(digest['due_soon_items'][0]['days_until'], 5)
+        self.assertEqual(digest['compliant_count'], 1)
+        self.assertEqual(digest['total_count'], 3)
+        self.assertEqual(digest['recipients'], ['owner0@digest.test'])
+
+    @mock.patch('core.email_transport.send_email')
+    def test_dry_run_renders_without_sending(self, send):
+        results = process_compliance_reminders(dry_run=True)
+        send.assert_not_called()
+        self.assertEqual(results['emails_rendered'], 3)
+        self.assertEqual(results['emails_sent'], 0)
+        self.assertEqual(set(results['timings']), {'gather', 'render', 'send'})
+
+    @mock.patch('core.email_transport.send_email', return_value=True)
+    def test_sends_one_digest_per_recipient(self, send):
+        results = process_compliance_reminders(max_workers=2)
+        self.assertEqual(results['emails_sent'], 3)
+        subjects = sorted(call.args[4] for call in send.call_args_list)
+        self.assertEqual(subjects[0], 'H&S Compliance: 1 overdue, 1 due soon — Digest 0')
+        html = send.call_args_list[0].args[6]
+        self.assertIn('Fire risk assessment', html)
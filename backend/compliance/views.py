@@ -145,7 +145,10 @@ def items_list(request):
     """
     GET /api/compliance/items/
     Optional filters: ?status=OVERDUE&type=LEGAL&category=Fire+Safety
+    ?fields= trims each item; ?page_size=/?cursor= pages by id (core.pagination).
     """
+    from core.pagination import list_response
+
     tenant = getattr(request, 'tenant', None)
     qs = ComplianceItem.objects.select_related('category').filter(category__tenant=tenant)
     if request.query_params.get('status'):
@@ -155,7 +158,7 @@ def items_list(request):
     if request.query_params.get('category'):
         qs = qs.filter(category__name=request.query_params['category'])
 
-    return Response([_serialize_item(i) for i in qs])
+    return list_response(request, qs, lambda items: [_serialize_item(i) for i in items])
 
 
 @api_view(['POST'])
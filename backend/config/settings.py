@@ -91,6 +91,8 @@ if CMS_MODULE_ENABLED:
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Outside everything that writes the body; skips WhiteNoise's precompressed files
+    "core.middleware_compression.CompressionMiddleware",
     "core.middleware_contact_cors.ContactCorsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -103,6 +105,9 @@ MIDDLEWARE = [
     "auditlog.middleware.AuditLogMiddleware",
 ]
 
+# Buffered responses smaller than this go out uncompressed
+COMPRESSION_MIN_BYTES = 1024
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -149,6 +154,34 @@ else:
     }
 
 
+# Cache
+# Shared Redis cache when REDIS_URL is set (Railway Redis plugin) so that
+# invalidation reaches every worker; otherwise a per-process local cache.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            # Culling at the default 300 entries could evict tenant_cache version keys
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# core.tenant_cache (reports, CRM revenue, dashboard, bootstrap, operational
+# events) invalidates by bumping a version in the cache, which only reaches
+# other gunicorn workers and the background workers through a shared cache.
+# Without REDIS_URL those views compute every request; set this to True only
+# for a single-process deployment.
+TENANT_CACHE_ENABLED = config('TENANT_CACHE_ENABLED', default=bool(REDIS_URL), cast=bool)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -260,7 +293,15 @@ REMINDER_EMAIL_USE_SSL = config('REMINDER_EMAIL_USE_SSL', default=True, cast=boo
 REMINDER_EMAIL_HOST_USER = config('REMINDER_EMAIL_HOST_USER', default='')
 REMINDER_EMAIL_HOST_PASSWORD = config('REMINDER_EMAIL_HOST_PASSWORD', default='')
 REMINDER_FROM_EMAIL = config('REMINDER_FROM_EMAIL', default='')
-REMINDER_INTERVAL_MINUTES = config('REMINDER_INTERVAL_MINUTES', default=10, cast=int)
+REMINDER_REFRESH_SECONDS = config('REMINDER_REFRESH_SECONDS', default=60, cast=int)
+
+# Live change notifications (/api/live/stream/): 'postgres' (LISTEN/NOTIFY, reaches
+# every process) or 'memory' (this process only). Blank: postgres on PostgreSQL.
+LIVE_EVENTS_BACKEND = config('LIVE_EVENTS_BACKEND', default='')
+# Each open stream holds a worker thread for LIVE_STREAM_SECONDS; above this many
+# per process the endpoint answers 503 so streams can't starve ordinary requests.
+# Keep it below gunicorn's --threads (start.sh: GUNICORN_THREADS).
+LIVE_STREAM_MAX_PER_PROCESS = config('LIVE_STREAM_MAX_PER_PROCESS', default=4, cast=int)
 
 # OpenAI (AI Assistant chat panel)
 import os as _os
@@ -281,6 +322,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # orjson encode/decode; same output as DRF's JSON classes (see core/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 # Simple JWT
@@ -22,6 +22,8 @@ from core.views_contact import contact_form
 from core.views_beta import beta_signup
 from core.views_feedback import feedback_submit
 from core.views_ai_assistant import ai_chat
+from core.views_exports import export_jobs, export_job_detail, export_job_download
+from core.views_live import live_stream
 
 
 def api_index(request):
@@ -80,6 +82,8 @@ urlpatterns = [
     path('api/events/log/', log_event, name='event-log'),
     path('api/events/today/', today_resolved, name='events-today'),
     path('api/events/decline/', decline_cover, name='events-decline'),
+    # Live change notifications (Server-Sent Events)
+    path('api/live/stream/', live_stream, name='live-stream'),
     # Assistant — stateless command parser
     path('api/assistant/parse/', parse_command, name='assistant-parse'),
     # Global command bar
@@ -93,6 +97,10 @@ urlpatterns = [
     path('api/beta-signup/', beta_signup, name='beta-signup'),
     # Authenticated feedback from admin panel
     path('api/feedback/', feedback_submit, name='feedback-submit'),
+    # Background report exports (CSV / XLSX / Parquet)
+    path('api/exports/', export_jobs, name='export-jobs'),
+    path('api/exports/<int:pk>/', export_job_detail, name='export-detail'),
+    path('api/exports/<int:pk>/download/', export_job_download, name='export-download'),
     # Core catch-all (health check etc.)
     path('', include('core.urls')),
 ]
@@ -108,6 +116,7 @@ if settings.BOOKINGS_MODULE_ENABLED:
     from bookings.views_dashboard import dashboard_summary, backfill_sbe
     from bookings.views_working_hours import working_hours_list, working_hours_bulk_set, working_hours_delete
     from bookings.views_timesheets import timesheets_list, timesheets_update, timesheets_generate, timesheets_summary
+    from bookings.views_bootstrap import booking_bootstrap
     from bookings.views_reports import (
         reports_overview, reports_daily, reports_monthly, reports_staff,
         reports_insights, reports_staff_hours, reports_staff_hours_csv, reports_leave,
@@ -169,6 +178,8 @@ if settings.BOOKINGS_MODULE_ENABLED:
         path('api/restaurant-available-dates/', restaurant_available_dates, name='restaurant-available-dates'),
         path('api/gym-timetable/', gym_timetable, name='gym-timetable'),
         path('api/gym-class-types/', gym_class_types, name='gym-class-types'),
+        # Public booking flow data in one request (before the router claims bookings/<pk>/)
+        path('api/bookings/bootstrap/', booking_bootstrap, name='booking-bootstrap'),
         # Aliases for frontend compatibility
         path('api/bookings/staff-slots/', BookingViewSet.as_view({'get': 'slots'}), name='booking-staff-slots-alias'),
         path('api/bookings/create/', BookingViewSet.as_view({'post': 'create'}), name='booking-create-alias'),
@@ -175,9 +175,10 @@ def _cmd_show_unassigned(tenant, text_lower, text):
     """Show unassigned bookings."""
     try:
         from bookings.models import Booking
-        today = date.today()
+        from bookings.utils import day_range
+        day_start, _ = day_range(date.today())
         unassigned = Booking.objects.filter(
-            tenant=tenant, start_time__date__gte=today, staff__isnull=True
+            tenant=tenant, start_time__gte=day_start, staff__isnull=True
         ).count()
         return {'success': True, 'message': f'{unassigned} unassigned booking(s)', 'action': 'show_unassigned', 'navigate': '/admin/bookings'}
     except Exception:
@@ -0,0 +1,81 @@
+"""
+Conditional GET for public content that changes rarely: tenant branding
+and settings, the services list and CMS pages.
+
+The ETag is a hash of the tenant's updated_at and content_version (which
+tenants.signals bumps when services, staff or CMS pages change), the
+request path and query, and anything extra the view passes in. The tenant
+row is already loaded by TenantMiddleware, so a matching If-None-Match is
+answered with 304 before the view queries or serialises anything.
+
+Responses carry Cache-Control with a short max-age plus
+stale-while-revalidate, public when the tenant was named in the request
+(X-Tenant-Slug or ?tenant=) and private otherwise. Authenticated
+requests, and admin variants a view marks with `private`, get
+`private, no-cache` instead: the browser keeps the copy but revalidates
+it by ETag every time, so an admin never sees their own edit go missing.
+
+Usage:
+    @api_view(['GET'])
+    @conditional_get('tenant_branding')
+    def tenant_branding(request): ...
+"""
+import hashlib
+from functools import wraps
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+MAX_AGE = 60
+STALE_WHILE_REVALIDATE = 600
+
+
+def content_etag(request, scope, *parts):
+    tenant = getattr(request, 'tenant', None)
+    tenant_parts = (tenant.pk, tenant.updated_at.isoformat(), tenant.content_version) if tenant else (None,)
+    key = '|'.join(str(p) for p in (scope, *tenant_parts, request.get_full_path(), *parts))
+    return '"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+
+def etag_matches(request, etag):
+    """Weak comparison against If-None-Match (compression weakens our ETags)."""
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+def set_cache_headers(request, response, etag, private=False):
+    response['ETag'] = etag
+    user = getattr(request, 'user', None)
+    if private or getattr(user, 'is_authenticated', False):
+        response['Cache-Control'] = 'private, no-cache'
+    else:
+        named = 'HTTP_X_TENANT_SLUG' in request.META or 'tenant' in request.GET
+        scope = 'public' if named else 'private'
+        response['Cache-Control'] = f'{scope}, max-age={MAX_AGE}, stale-while-revalidate={STALE_WHILE_REVALIDATE}'
+    patch_vary_headers(response, ('X-Tenant-Slug',))
+    return response
+
+
+def conditional_get(scope, extra=None, private=None):
+    """
+    ETag/304 for a GET view; `extra(request)` adds to the ETag what the tenant
+    version doesn't cover, and `private(request)` marks admin-only variants.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            etag = content_etag(request, scope, *(extra(request) if extra else ()))
+            is_private = bool(private and private(request))
+            if etag_matches(request, etag):
+                return set_cache_headers(request, HttpResponseNotModified(), etag, private=is_private)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                set_cache_headers(request, response, etag, private=is_private)
+            return response
+        return wrapped
+    return decorator
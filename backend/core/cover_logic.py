@@ -9,6 +9,8 @@ Rules:
 - Must show WHY a person is suggested
 - If declined → log COVER_DECLINED, suggest next candidate
 - Never auto-assign — owner always confirms
+- Only staff from the absent person's tenant who are not themselves off
+  today (in either the bookings or the staff module) are suggested
 """
 from datetime import timedelta
 from django.utils import timezone
@@ -26,9 +28,7 @@ def get_cover_candidates(absent_staff_id, service=None, strategy='rotation', max
         'rank': int,
     }
     """
-    from bookings.models import Staff as BookingStaff
-
-    base_qs = BookingStaff.objects.filter(active=True).exclude(id=absent_staff_id)
+    base_qs = _available_staff_qs(absent_staff_id)
 
     # Filter by service qualification if provided
     if service:
@@ -42,6 +42,17 @@ def get_cover_candidates(absent_staff_id, service=None, strategy='rotation', max
         return _rotation_candidates(base_qs, max_candidates)
 
 
+def _available_staff_qs(absent_staff_id):
+    """Active colleagues of the absent staff member who are not off today."""
+    from bookings.models import Staff as BookingStaff
+    from staff.directory import booking_staff_off
+
+    tenant_id = BookingStaff.objects.filter(id=absent_staff_id).values_list('tenant_id', flat=True).first()
+    return BookingStaff.objects.filter(tenant_id=tenant_id, active=True).exclude(
+        id__in={absent_staff_id} | booking_staff_off(tenant_id, timezone.localdate())
+    )
+
+
 def _rotation_candidates(staff_qs, max_candidates):
     """
     7-day rotation: prefer staff who haven't covered recently.
@@ -112,11 +123,7 @@ def get_next_candidate(absent_staff_id, declined_staff_ids, service=None, strate
     """
     After a decline, get the next candidate excluding already-declined staff.
     """
-    from bookings.models import Staff as BookingStaff
-
-    base_qs = BookingStaff.objects.filter(active=True).exclude(
-        id=absent_staff_id
-    ).exclude(id__in=declined_staff_ids)
+    base_qs = _available_staff_qs(absent_staff_id).exclude(id__in=declined_staff_ids)
 
     if service:
         base_qs = base_qs.filter(services=service)
@@ -0,0 +1,108 @@
+"""
+Precompiled, per-tenant email templates.
+
+Email modules register their template sources once at import time using
+string.Template syntax: `$brand_name` / `$brand_accent` are brand fields,
+every other `$placeholder` is per-message context.
+
+A template is compiled once per (template, brand) — brand fields are baked
+in and the remainder is split into literal chunks and field names — and the
+compiled form is held in an LRU cache. Because the brand tuple is part of
+the cache key, editing a tenant's branding naturally yields a new compiled
+template and the stale one ages out. Rendering is a single join.
+
+Values substituted into HTML templates are escaped unless marked safe
+(django.utils.safestring.mark_safe), so pre-rendered fragments such as
+table rows can be nested.
+"""
+from functools import lru_cache
+from string import Template
+from typing import NamedTuple
+
+from django.conf import settings
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+DEFAULT_ACCENT = '#6366f1'
+COMPILED_CACHE_SIZE = 512
+
+_SOURCES = {}
+
+
+class EmailBrand(NamedTuple):
+    name: str
+    accent: str = DEFAULT_ACCENT
+
+
+def brand_for_tenant(tenant=None, fallback_name=None):
+    """Resolve the email brand for a tenant (or the platform default)."""
+    default_name = fallback_name or getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
+    if tenant is None:
+        return EmailBrand(name=default_name)
+    name = getattr(tenant, 'business_name', '') or getattr(tenant, 'slug', '') or default_name
+    accent = getattr(tenant, 'colour_accent', '') or DEFAULT_ACCENT
+    return EmailBrand(name=name, accent=accent)
+
+
+def register_template(name, source, html=True):
+    """Register a template source. Re-registering a name replaces it."""
+    _SOURCES[name] = (source, html)
+    _compile.cache_clear()
+
+
+class CompiledTemplate:
+    __slots__ = ('literals', 'fields', 'html')
+
+    def __init__(self, literals, fields, html):
+        self.literals = literals
+        self.fields = fields
+        self.html = html
+
+    def render(self, context):
+        escape = conditional_escape if self.html else str
+        parts = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            parts.append(escape(context[field]))
+            parts.append(literal)
+        out = ''.join(parts)
+        return mark_safe(out) if self.html else out
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(name, brand):
+    source, html = _SOURCES[name]
+    escape = conditional_escape if html else str
+    brand_values = {'brand_name': escape(brand.name), 'brand_accent': escape(brand.accent)}
+
+    literals, fields, buf = [], [], []
+    pos = 0
+    for match in Template.pattern.finditer(source):
+        buf.append(source[pos:match.start()])
+        pos = match.end()
+        named = match.group('named') or match.group('braced')
+        if match.group('escaped') is not None:
+            buf.append('$')
+        elif named in brand_values:
+            buf.append(brand_values[named])
+        elif named:
+            literals.append(''.join(buf))
+            fields.append(named)
+            buf = []
+        else:
+            buf.append(match.group())
+    buf.append(source[pos:])
+    literals.append(''.join(buf))
+    return CompiledTemplate(tuple(literals), tuple(fields), html)
+
+
+def get_template(name, brand):
+    return _compile(name, brand)
+
+
+def render(name, brand, /, **context):
+    """Render a registered template for a brand with per-message context."""
+    return _compile(name, brand).render(context)
+
+
+def cache_info():
+    return _compile.cache_info()
@@ -0,0 +1,159 @@
+"""
+Pooled SMTP transport for batch email jobs.
+
+Batch senders (compliance digests, reminders) used to open, log in and tear
+down one SMTP connection per message. SMTPPool keeps up to `size`
+authenticated connections open for the lifetime of a batch and hands them
+out to worker threads, reconnecting once if the server has dropped an idle
+connection. Falls back to the Resend API per message, matching the
+SMTP → Resend chain used elsewhere.
+"""
+import logging
+import queue
+import smtplib
+import threading
+from contextlib import contextmanager
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_message(from_name, from_email, to_email, subject, text_body, html_body):
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f'{from_name} <{from_email}>'
+    msg['To'] = to_email
+    msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
+    msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+    return msg
+
+
+class SMTPPool:
+
+    def __init__(self, host, port, user, password, use_ssl=True, size=4, timeout=15):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            server.starttls()
+        server.login(self.user, self.password)
+        with self._lock:
+            self._all.append(server)
+        return server
+
+    def _discard(self, server):
+        with self._lock:
+            if server in self._all:
+                self._all.remove(server)
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                server = self._connect()
+            try:
+                yield server
+            except Exception:
+                self._discard(server)
+                raise
+            else:
+                self._idle.put(server)
+        finally:
+            self._slots.release()
+
+    def send(self, from_email, to_email, message):
+        payload = message.as_string()
+        try:
+            with self.connection() as server:
+                server.sendmail(from_email, [to_email], payload)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connection dropped by the server — retry once on a fresh one
+            with self.connection() as server:
+                server.sendmail(from_email, [to_email], payload)
+        return True
+
+    def close(self):
+        with self._lock:
+            servers, self._all = self._all, []
+        for server in servers:
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def reminder_smtp_pool(size=4):
+    """SMTPPool for the reminder SMTP credentials, or None if not configured."""
+    password = getattr(settings, 'REMINDER_EMAIL_HOST_PASSWORD', getattr(settings, 'EMAIL_HOST_PASSWORD', ''))
+    if not password:
+        return None
+    use_ssl = str(getattr(settings, 'REMINDER_EMAIL_USE_SSL', 'True')).lower() in ('true', '1', 'yes')
+    from_email = getattr(settings, 'REMINDER_FROM_EMAIL', '')
+    return SMTPPool(
+        host=getattr(settings, 'REMINDER_EMAIL_HOST', getattr(settings, 'EMAIL_HOST', 'smtp.ionos.co.uk')),
+        port=int(getattr(settings, 'REMINDER_EMAIL_PORT', getattr(settings, 'EMAIL_PORT', 465))),
+        user=getattr(settings, 'REMINDER_EMAIL_HOST_USER', getattr(settings, 'EMAIL_HOST_USER', from_email)),
+        password=password,
+        use_ssl=use_ssl,
+        size=size,
+    )
+
+
+def send_email(pool, from_name, from_email, to_email, subject, text_body, html_body, log_prefix='[EMAIL]'):
+    """Send one message through the pool, falling back to Resend. Returns True on success."""
+    if pool is not None:
+        try:
+            pool.send(from_email, to_email, build_message(from_name, from_email, to_email, subject, text_body, html_body))
+            logger.info(f"{log_prefix} Sent via pooled SMTP to {to_email}")
+            return True
+        except Exception as e:
+            logger.warning(f"{log_prefix} SMTP failed for {to_email}: {e}")
+
+    resend_key = getattr(settings, 'RESEND_API_KEY', '')
+    if resend_key:
+        try:
+            import resend
+            resend.api_key = resend_key
+            result = resend.Emails.send({
+                "from": f"{from_name} <{from_email}>",
+                "to": [to_email],
+                "subject": subject,
+                "html": html_body,
+                "text": text_body,
+            })
+            logger.info(f"{log_prefix} Sent via Resend to {to_email}, ID: {result.get('id')}")
+            return True
+        except Exception as e:
+            logger.error(f"{log_prefix} Resend also failed for {to_email}: {e}")
+            return False
+
+    logger.error(f"{log_prefix} No email credentials configured")
+    return False
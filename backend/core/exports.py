@@ -0,0 +1,324 @@
+"""
+Background report exports.
+
+An ExportJob names a report from EXPORT_REPORTS plus the filters its
+endpoint accepts. The export worker (`manage.py run_export_jobs --loop`)
+claims pending jobs and runs the same query builders as the report
+endpoints. It streams their rows into a CSV, XLSX or Parquet file in
+media storage.
+
+XLSX needs openpyxl and Parquet needs pyarrow. If a server lacks either,
+that format is refused when the job is requested, instead of failing in
+the worker.
+"""
+import logging
+import tempfile
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from importlib.util import find_spec
+from itertools import islice
+
+from django.core.files import File
+from django.utils import timezone
+
+from .csv_export import EXPORT_CHUNK_SIZE, iter_csv
+from .models_exports import ExportJob
+
+logger = logging.getLogger(__name__)
+
+# Column type drives Parquet/XLSX typing; CSV writes everything as text.
+# Types: str, int, float, decimal, date, datetime
+Column = namedtuple('Column', 'name type')
+ExportReport = namedtuple('ExportReport', 'title build')
+
+PARQUET_BATCH_ROWS = 50_000
+XLSX_MAX_ROWS = 1_048_575  # Excel's sheet limit, less the header row
+EXPORT_STALE_AFTER = timedelta(hours=1)
+EXPORT_RETENTION = timedelta(days=7)
+
+
+class ExportError(Exception):
+    pass
+
+
+# ── Reports ──────────────────────────────────────────────────────────
+
+def _report_request(job):
+    from bookings.views_reports import ReportParams
+    return ReportParams(job.tenant, job.params)
+
+
+def _date_range(job):
+    """date_from/date_to from the job params, defaulting like the report endpoints."""
+    from bookings.views_reports import _parse_date
+    today = timezone.now().date()
+    return (
+        _parse_date(job.params.get('date_from'), today - timedelta(days=30)),
+        _parse_date(job.params.get('date_to'), today),
+    )
+
+
+def _dict_rows(rows, keys):
+    return ([r[k] for k in keys] for r in rows)
+
+
+def _bookings_export(job):
+    from bookings.views_reports import _base_qs
+    qs, _, _ = _base_qs(_report_request(job))
+    columns = [
+        Column('Booking ID', 'int'), Column('Start', 'datetime'), Column('End', 'datetime'),
+        Column('Client', 'str'), Column('Client Email', 'str'), Column('Service', 'str'),
+        Column('Staff', 'str'), Column('Status', 'str'), Column('Price', 'decimal'),
+        Column('Payment Status', 'str'), Column('Amount Paid', 'decimal'),
+        Column('Risk Level', 'str'), Column('Revenue at Risk', 'decimal'),
+    ]
+    rows = qs.order_by('start_time').values_list(
+        'id', 'start_time', 'end_time', 'client__name', 'client__email', 'service__name',
+        'staff__name', 'status', 'service__price', 'payment_status', 'payment_amount',
+        'risk_level', 'revenue_at_risk',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    return columns, rows
+
+
+def _daily_export(job):
+    from bookings.views_reports import _daily_rows
+    keys = ['date', 'revenue', 'deposits', 'at_risk', 'bookings', 'no_shows', 'cancelled', 'total']
+    columns = [
+        Column('Date', 'date'), Column('Revenue', 'float'), Column('Deposits', 'float'),
+        Column('At Risk', 'float'), Column('Bookings', 'int'), Column('No Shows', 'int'),
+        Column('Cancelled', 'int'), Column('Total', 'int'),
+    ]
+    return columns, _dict_rows(_daily_rows(_report_request(job)), keys)
+
+
+def _monthly_export(job):
+    from bookings.views_reports import _monthly_rows
+    keys = ['month', 'revenue', 'deposits', 'at_risk', 'bookings', 'no_shows', 'total',
+            'avg_reliability', 'avg_risk', 'mom_growth']
+    columns = [
+        Column('Month', 'str'), Column('Revenue', 'float'), Column('Deposits', 'float'),
+        Column('At Risk', 'float'), Column('Bookings', 'int'), Column('No Shows', 'int'),
+        Column('Total', 'int'), Column('Avg Reliability', 'float'), Column('Avg Risk', 'float'),
+        Column('MoM Growth %', 'float'),
+    ]
+    return columns, _dict_rows(_monthly_rows(_report_request(job)), keys)
+
+
+def _staff_export(job):
+    from bookings.views_reports import _staff_rows
+    keys = ['staff_name', 'revenue', 'bookings', 'no_shows', 'total', 'no_show_rate',
+            'avg_reliability', 'avg_risk', 'at_risk']
+    columns = [
+        Column('Staff', 'str'), Column('Revenue', 'float'), Column('Bookings', 'int'),
+        Column('No Shows', 'int'), Column('Total', 'int'), Column('No Show Rate %', 'float'),
+        Column('Avg Reliability', 'float'), Column('Avg Risk', 'float'), Column('At Risk', 'float'),
+    ]
+    return columns, _dict_rows(_staff_rows(_report_request(job)), keys)
+
+
+def _timesheets_export(job):
+    from staff.views import TIMESHEET_EXPORT_HEADER, timesheet_export_queryset, timesheet_export_rows
+    numeric = {'Scheduled Hours', 'Actual Hours', 'Variance'}
+    columns = [Column(name, 'float' if name in numeric else 'str') for name in TIMESHEET_EXPORT_HEADER]
+    date_from, date_to = _date_range(job)
+    qs = timesheet_export_queryset(job.tenant, date_from, date_to, job.params.get('staff_id'))
+    return columns, timesheet_export_rows(qs)
+
+
+def _payroll_export(job):
+    from staff.views import payroll_summary_data
+    date_from, date_to = _date_range(job)
+    keys = ['staff_name', 'scheduled_hours', 'actual_hours', 'variance_hours', 'days_worked', 'days_absent']
+    columns = [
+        Column('Staff', 'str'), Column('Scheduled Hours', 'float'), Column('Actual Hours', 'float'),
+        Column('Variance Hours', 'float'), Column('Days Worked', 'int'), Column('Days Absent', 'int'),
+    ]
+    data = payroll_summary_data(job.tenant, date_from, date_to)
+    return columns, _dict_rows(data['staff_summaries'], keys)
+
+
+EXPORT_REPORTS = {
+    'bookings': ExportReport('Bookings', _bookings_export),
+    'daily': ExportReport('Daily takings', _daily_export),
+    'monthly': ExportReport('Monthly summary', _monthly_export),
+    'staff': ExportReport('Staff performance', _staff_export),
+    'timesheets': ExportReport('Timesheets', _timesheets_export),
+    'payroll': ExportReport('Payroll summary', _payroll_export),
+}
+
+
+# ── Writers ──────────────────────────────────────────────────────────
+
+def _coerce(value, type_):
+    """Normalise a report value (reports may hand back formatted strings) to its column type."""
+    if value is None or value == '':
+        return None
+    if type_ == 'float' and not isinstance(value, float):
+        return float(value)
+    if type_ == 'int' and not isinstance(value, int):
+        return int(value)
+    if type_ == 'decimal' and not isinstance(value, Decimal):
+        return Decimal(str(value))
+    if type_ == 'date' and isinstance(value, str):
+        return date.fromisoformat(value)
+    if type_ == 'str' and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _write_csv(columns, rows, fh):
+    for chunk in iter_csv([c.name for c in columns], rows):
+        fh.write(chunk)
+
+
+def _xlsx_value(value, type_):
+    value = _coerce(value, type_)
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        # Excel has no time zones; write local wall-clock time
+        value = timezone.localtime(value).replace(tzinfo=None)
+    return value
+
+
+def _write_xlsx(columns, rows, fh):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Export')
+    sheet.append([c.name for c in columns])
+    for n, row in enumerate(rows, 1):
+        if n > XLSX_MAX_ROWS:
+            raise ExportError(f'More than {XLSX_MAX_ROWS} rows — too many for Excel; use CSV or Parquet')
+        sheet.append([_xlsx_value(v, c.type) for v, c in zip(row, columns)])
+    workbook.save(fh)
+
+
+def _arrow_type(type_):
+    import pyarrow as pa
+    return {
+        'str': pa.string(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'decimal': pa.decimal128(12, 2),
+        'date': pa.date32(),
+        'datetime': pa.timestamp('us', tz='UTC'),
+    }[type_]
+
+
+def _write_parquet(columns, rows, fh):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.schema([(c.name, _arrow_type(c.type)) for c in columns])
+    with pq.ParquetWriter(fh, schema, compression='zstd') as writer:
+        while True:
+            batch = list(islice(rows, PARQUET_BATCH_ROWS))
+            if not batch:
+                break
+            arrays = [
+                pa.array([_coerce(row[i], c.type) for row in batch], type=schema.field(i).type)
+                for i, c in enumerate(columns)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+WRITERS = {
+    'csv': (_write_csv, None),
+    'xlsx': (_write_xlsx, 'openpyxl'),
+    'parquet': (_write_parquet, 'pyarrow'),
+}
+
+
+def format_available(fmt):
+    """True if this server can write `fmt` (its optional library is installed)."""
+    if fmt not in WRITERS:
+        return False
+    module = WRITERS[fmt][1]
+    return module is None or find_spec(module) is not None
+
+
+# ── Worker ───────────────────────────────────────────────────────────
+
+class _Counted:
+    """Iterator wrapper that counts the rows a writer consumed."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+
+def claim_job(job_id):
+    """Atomically move a job from PENDING to RUNNING. False if another worker got it first."""
+    return ExportJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING', started_at=timezone.now(),
+    ) == 1
+
+
+def run_export_job(job):
+    """Build and store one claimed job's file. Marks the job DONE or FAILED; returns the status."""
+    try:
+        report = EXPORT_REPORTS[job.report_type]
+        if not format_available(job.format):
+            raise ExportError(f'{job.get_format_display()} export is not available on this server')
+        write = WRITERS[job.format][0]
+        columns, rows = report.build(job)
+        rows = _Counted(rows)
+        with tempfile.TemporaryFile() as fh:
+            write(columns, rows, fh)
+            fh.seek(0)
+            filename = f'{job.report_type}-{job.created_at:%Y%m%d-%H%M%S}.{job.format}'
+            job.file.save(filename, File(fh), save=False)
+        job.row_count = rows.count
+        job.status = 'DONE'
+        job.error = ''
+    except Exception as e:
+        logger.exception(f"[EXPORT] Job #{job.id} failed")
+        job.status = 'FAILED'
+        job.error = f'{type(e).__name__}: {e}'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['file', 'row_count', 'status', 'error', 'finished_at'])
+    logger.info(f"[EXPORT] Job #{job.id} {job.report_type}.{job.format}: {job.status} ({job.row_count} rows)")
+    return job.status
+
+
+def fail_stale_jobs(now=None):
+    """Fail RUNNING jobs whose worker died mid-export. Returns how many."""
+    now = now or timezone.now()
+    return ExportJob.objects.filter(status='RUNNING', started_at__lt=now - EXPORT_STALE_AFTER).update(
+        status='FAILED', error='Export worker stopped before finishing', finished_at=now,
+    )
+
+
+def purge_expired_exports(now=None):
+    """Delete jobs (and their files) older than EXPORT_RETENTION. Returns how many."""
+    now = now or timezone.now()
+    expired = ExportJob.objects.filter(created_at__lt=now - EXPORT_RETENTION).exclude(status='RUNNING')
+    count = 0
+    for job in expired.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count += 1
+    return count
+
+
+def process_export_jobs(limit=10):
+    """Run up to `limit` pending jobs, oldest first. Returns {'done': n, 'failed': n}."""
+    results = {'done': 0, 'failed': 0}
+    fail_stale_jobs()
+    pending = list(
+        ExportJob.objects.filter(status='PENDING').order_by('created_at').values_list('id', flat=True)[:limit]
+    )
+    for job_id in pending:
+        if not claim_job(job_id):
+            continue
+        job = ExportJob.objects.select_related('tenant').get(pk=job_id)
+        status = run_export_job(job)
+        results['done' if status == 'DONE' else 'failed'] += 1
+    return results
@@ -0,0 +1,176 @@
+"""
+Live change notifications for the admin UI.
+
+Model signals call `publish(tenant_id, topic, **data)` once the surrounding
+transaction commits. Subscribers, i.e. the SSE stream in views_live, get
+small messages such as {'topic': 'booking.cancelled', 'data': {'id': 42}}
+and refetch only the part of the UI that changed.
+
+The "postgres" backend fans messages out across every gunicorn worker and
+background process through LISTEN/NOTIFY. The "memory" backend only
+reaches subscribers in the same process; it is the default off Postgres
+and what the tests use. Choose one with settings.LIVE_EVENTS_BACKEND.
+
+Topics:
+  booking.created / booking.cancelled / booking.updated / booking.deleted
+  booking.bulk (many bookings changed at once; refetch booking views)
+  leave.requested
+  compliance.overdue
+  event.logged
+  message.created
+"""
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Messages a slow subscriber may fall behind by before newer ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+NOTIFY_CHANNEL = 'live_events'
+
+
+class Subscription:
+    """A tenant's message feed for one client; close() when the client goes away."""
+
+    def __init__(self, hub, tenant_id):
+        self._hub = hub
+        self.tenant_id = tenant_id
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def get(self, timeout=None):
+        """Next message, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._hub.unsubscribe(self)
+
+
+class MemoryBroadcaster:
+    """Delivers messages to subscribers in this process only."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, tenant_id):
+        sub = Subscription(self, tenant_id)
+        with self._lock:
+            self._subscribers[tenant_id].add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers[sub.tenant_id].discard(sub)
+
+    def publish(self, message):
+        self.dispatch(message)
+
+    def dispatch(self, message):
+        with self._lock:
+            subs = list(self._subscribers.get(message.get('tenant_id'), ()))
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(message)
+            except queue.Full:
+                pass  # the client has stopped reading; it refetches on reconnect
+
+
+class PostgresBroadcaster(MemoryBroadcaster):
+    """
+    NOTIFY on publish; one listener thread per process LISTENs on its own
+    connection and dispatches to this process's subscribers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, message):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, json.dumps(message, default=str)])
+
+    def subscribe(self, tenant_id):
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen_forever, name='live-events', daemon=True)
+                self._listener.start()
+        return super().subscribe(tenant_id)
+
+    def _listen_forever(self):
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning(f"[LIVE] Listener connection lost: {e}; reconnecting")
+                time.sleep(5)
+
+    def _listen(self):
+        db = connections.create_connection('default')
+        try:
+            db.ensure_connection()
+            raw = db.connection
+            raw.autocommit = True
+            with raw.cursor() as cursor:
+                cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+            while True:
+                if select.select([raw], [], [], 30) == ([], [], []):
+                    continue
+                raw.poll()
+                while raw.notifies:
+                    note = raw.notifies.pop(0)
+                    try:
+                        self.dispatch(json.loads(note.payload))
+                    except ValueError:
+                        logger.warning(f"[LIVE] Ignoring malformed notification: {note.payload[:200]}")
+        finally:
+            db.close()
+
+
+BACKENDS = {
+    'memory': MemoryBroadcaster,
+    'postgres': PostgresBroadcaster,
+}
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster():
+    global _broadcaster
+    with _broadcaster_lock:
+        if _broadcaster is None:
+            default = 'postgres' if connection.vendor == 'postgresql' else 'memory'
+            _broadcaster = BACKENDS[getattr(settings, 'LIVE_EVENTS_BACKEND', '') or default]()
+        return _broadcaster
+
+
+def subscribe(tenant_id):
+    return get_broadcaster().subscribe(tenant_id)
+
+
+def publish(tenant_id, topic, **data):
+    """Notify the tenant's live clients of a change, after the current transaction commits."""
+    if tenant_id is None:
+        return
+    message = {'tenant_id': tenant_id, 'topic': topic, 'data': data}
+
+    def send():
+        try:
+            get_broadcaster().publish(message)
+        except Exception as e:
+            # Live updates are best effort; never fail the write that caused them
+            logger.warning(f"[LIVE] Publish {topic} failed: {e}")
+
+    transaction.on_commit(send)
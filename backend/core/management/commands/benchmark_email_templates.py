@@ -0,0 +1,67 @@
+"""
+Micro-benchmark for the precompiled email template layer.
+
+Reports the one-off compile cost per (template, brand) and the steady-state
+per-message render cost for each registered email, using synthetic data —
+no database access and nothing is sent.
+
+Usage:
+    python manage.py benchmark_email_templates
+    python manage.py benchmark_email_templates --iterations 20000 --brands 50
+"""
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-message render cost of the cached email templates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5000, help='Renders per template (default 5000)')
+        parser.add_argument('--brands', type=int, default=10, help='Distinct tenant brands to rotate through (default 10)')
+
+    def handle(self, *args, **options):
+        from core import email_templates
+        from core.email_templates import EmailBrand
+        from bookings.email_reminders import _build_reminder_html, _build_reminder_text
+        from compliance.email_reminders import _build_html as build_digest_html
+
+        iterations = options['iterations']
+        brands = [EmailBrand(name=f'Tenant {i}', accent='#6366f1') for i in range(options['brands'])]
+        start_time = datetime(2026, 3, 14, 10, 30)
+        overdue = [
+            {'title': f'Item {i}', 'item_type': 'LEGAL' if i % 2 else 'BEST_PRACTICE',
+             'category': 'Fire Safety', 'frequency_type': 'annual', 'days_overdue': i}
+            for i in range(5)
+        ]
+        due_soon = [dict(item, days_until=item['days_overdue']) for item in overdue]
+
+        cases = [
+            ('booking_reminder.html', lambda brand: _build_reminder_html(
+                'Jane Client', 'Cut & Finish', 'Alice', start_time, 60, '45.00', 1234, brand=brand)),
+            ('booking_reminder.txt', lambda brand: _build_reminder_text(
+                'Jane Client', 'Cut & Finish', 'Alice', start_time, 60, '45.00', 1234, brand=brand)),
+            ('compliance_digest.html (10 rows)', lambda brand: build_digest_html(
+                brand, 72, overdue, due_soon, 30, 40)),
+        ]
+
+        self.stdout.write(f'{iterations} renders per template across {len(brands)} brands\n')
+        self.stdout.write(f"{'template':<36}{'cold (first render)':>22}{'warm per message':>20}")
+        for label, build in cases:
+            email_templates._compile.cache_clear()
+            t0 = time.perf_counter()
+            for brand in brands:
+                build(brand)
+            cold_us = (time.perf_counter() - t0) / len(brands) * 1e6
+
+            t0 = time.perf_counter()
+            for i in range(iterations):
+                build(brands[i % len(brands)])
+            warm_us = (time.perf_counter() - t0) / iterations * 1e6
+            self.stdout.write(f'{label:<36}{cold_us:>19.1f} µs{warm_us:>17.1f} µs')
+
+        info = email_templates.cache_info()
+        self.stdout.write(f'\ncompiled cache: {info.currsize}/{info.maxsize} entries, '
+                          f'{info.hits} hits, {info.misses} misses')
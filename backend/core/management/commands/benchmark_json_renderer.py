@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for the orjson API renderer against DRF's JSONRenderer.
+
+Renders synthetic payloads shaped like our larger responses — a booking
+list, a reports time series with raw Decimals and dates, and a compliance
+register — and reports per-render time and payload size for each. No
+database access.
+
+Usage:
+    python manage.py benchmark_json_renderer
+    python manage.py benchmark_json_renderer --rows 2000 --iterations 50
+"""
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+
+def _booking_rows(count):
+    start = datetime(2026, 3, 2, 9, 0, tzinfo=dt_timezone.utc)
+    rows = []
+    for n in range(count):
+        slot = start + timedelta(minutes=30 * n)
+        rows.append({
+            'id': n, 'client': n % 300, 'client_name': f'Client {n % 300}', 'client_email': f'c{n % 300}@example.com',
+            'client_phone': '07700 900123', 'client_notes': '', 'client_reliability_score': 92.5,
+            'client_lifetime_value': '412.50', 'client_total_bookings': 14, 'service': n % 12,
+            'service_name': 'Cut & Finish', 'service_price': '45.00', 'staff': n % 6, 'staff_name': 'Alice',
+            'start_time': slot.isoformat().replace('+00:00', 'Z'), 'status': 'CONFIRMED', 'notes': '',
+            'payment_amount': '45.00', 'risk_score': 18.0, 'risk_level': 'LOW', 'override_applied': False,
+            'slot_date': slot.strftime('%Y-%m-%d'), 'slot_start': slot.strftime('%H:%M'),
+            'price_pence': 4500, 'deposit_pence': 1000, 'assigned_staff': n % 6,
+        })
+    return rows
+
+
+def _time_series(count):
+    return {
+        'period': {'from': date(2025, 1, 1), 'to': date(2025, 12, 31)},
+        'series': [
+            {'date': date(2025, 1, 1) + timedelta(days=n), 'bookings': n % 40,
+             'revenue': Decimal(n * 37 % 5000) / 4, 'no_show_rate': (n % 9) / 10,
+             'generated_at': datetime(2026, 1, 1, 6, 0, n % 60, tzinfo=dt_timezone.utc)}
+            for n in range(count)
+        ],
+    }
+
+
+def _compliance_register(count):
+    return [
+        {'id': n, 'uuid': uuid.UUID(int=n), 'title': f'Fire extinguisher check {n}', 'category': 'Fire Safety',
+         'item_type': 'LEGAL', 'status': 'DUE_SOON', 'next_due_date': date(2026, 4, 1) + timedelta(days=n % 90),
+         'last_completed_date': date(2025, 4, 1), 'evidence_required': True, 'notes': 'Annual service — see log'}
+        for n in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the orjson API renderer against DRF JSONRenderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per payload (default 500)')
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per payload (default 200)')
+
+    def handle(self, *args, **options):
+        from rest_framework.renderers import JSONRenderer
+        from core import renderers
+        from core.renderers import ORJSONRenderer
+
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; ORJSONRenderer falls back to the stdlib encoder'))
+
+        rows, iterations = options['rows'], options['iterations']
+        payloads = [
+            ('booking list', _booking_rows(rows)),
+            ('reports time series', _time_series(rows)),
+            ('compliance register', _compliance_register(rows)),
+        ]
+
+        self.stdout.write(f'{rows} rows per payload, {iterations} renders each\n')
+        self.stdout.write(f"{'payload':<22}{'size':>10}{'JSONRenderer':>15}{'ORJSONRenderer':>17}{'speed-up':>10}")
+        for label, data in payloads:
+            timings = []
+            for renderer in (JSONRenderer(), ORJSONRenderer()):
+                t0 = time.perf_counter()
+                for _ in range(iterations):
+                    body = renderer.render(data)
+                timings.append((time.perf_counter() - t0) / iterations * 1000)
+            self.stdout.write(
+                f'{label:<22}{len(body) / 1024:>7.0f} KB{timings[0]:>12.2f} ms{timings[1]:>14.2f} ms'
+                f'{timings[0] / timings[1]:>9.1f}x'
+            )
@@ -0,0 +1,58 @@
+"""
+Management command to run queued report exports (ExportJob).
+
+Usage:
+    python manage.py run_export_jobs          # Run everything pending now, then exit
+    python manage.py run_export_jobs --loop   # Poll for new jobs (for Railway background worker)
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Run pending report export jobs (CSV / XLSX / Parquet)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Run continuously in a loop (for Railway background worker)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=None,
+            help='Seconds between polls for new jobs (default: from settings or 10)',
+        )
+
+    def handle(self, *args, **options):
+        from core.exports import process_export_jobs, purge_expired_exports
+
+        interval = options['interval'] or getattr(settings, 'EXPORT_POLL_SECONDS', 10)
+
+        if not options['loop']:
+            results = process_export_jobs()
+            purged = purge_expired_exports()
+            self.stdout.write(self.style.SUCCESS(
+                f"Exports — done: {results['done']}, failed: {results['failed']}, purged: {purged}"
+            ))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'[EXPORT] Starting export worker (poll every {interval}s)'))
+        last_purge = 0
+        while True:
+            try:
+                results = process_export_jobs()
+                if results['done'] or results['failed']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"[EXPORT] done: {results['done']}, failed: {results['failed']}"
+                    ))
+                    continue  # more may be queued behind this batch
+                if time.monotonic() - last_purge > 3600:
+                    purge_expired_exports()
+                    last_purge = time.monotonic()
+            except Exception as e:
+                self.stderr.write(f'[EXPORT] Worker error: {e}')
+            time.sleep(interval)
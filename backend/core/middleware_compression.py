@@ -0,0 +1,191 @@
+"""
+Response compression for API payloads and streamed exports.
+
+Compresses responses whose Content-Type is in COMPRESSIBLE_TYPES with
+brotli (when the `brotli` package is installed and the client accepts
+`br`) or gzip. Buffered responses under COMPRESSION_MIN_BYTES are left
+alone, as is anything that comes out no smaller. StreamingHttpResponse
+bodies (CSV exports) are compressed chunk by chunk as they are sent.
+
+Left untouched: responses that already carry a Content-Encoding (the
+pre-gzipped CSV stream in core.csv_export, WhiteNoise's static files),
+text/event-stream (the live SSE feed must flush every event), async
+streams, Cache-Control: no-transform, and bodiless statuses.
+
+Instrumented: buffered responses get a Server-Timing entry
+(`compress;dur=<ms>;desc="gzip 48213>6120"`), and compression_stats()
+returns per-encoding totals of bytes in/out and seconds spent for this
+process (reported by /health/).
+"""
+import logging
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'text/csv', 'text/html', 'text/plain', 'text/css',
+    'text/javascript', 'application/javascript', 'application/xml', 'text/xml', 'image/svg+xml',
+}
+
+# Brotli 11 is for static assets; 5 compresses better than gzip -6 at similar speed
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+# Random bytes in the gzip header, as Django's GZipMiddleware does against BREACH
+GZIP_MAX_RANDOM_BYTES = 100
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(encoding, bytes_in, bytes_out, seconds):
+    with _stats_lock:
+        entry = _stats.setdefault(encoding, {'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0})
+        entry['responses'] += 1
+        entry['bytes_in'] += bytes_in
+        entry['bytes_out'] += bytes_out
+        entry['seconds'] += seconds
+
+
+def compression_stats():
+    """Per-encoding totals since this process started."""
+    with _stats_lock:
+        return {
+            encoding: {
+                **entry,
+                'seconds': round(entry['seconds'], 3),
+                'ratio': round(entry['bytes_out'] / entry['bytes_in'], 3) if entry['bytes_in'] else None,
+            }
+            for encoding, entry in _stats.items()
+        }
+
+
+def _accepted_codings(header):
+    """{coding: q} from an Accept-Encoding header."""
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            codings[coding.strip().lower()] = q
+    return codings
+
+
+def choose_encoding(header):
+    """'br', 'gzip' or None for the client's Accept-Encoding."""
+    codings = _accepted_codings(header or '')
+    wildcard = codings.get('*', 0)
+    if brotli is not None and codings.get('br', wildcard) > 0:
+        return 'br'
+    if codings.get('gzip', wildcard) > 0:
+        return 'gzip'
+    return None
+
+
+def _compress(encoding, content):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return compress_string(content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+
+def _stream_compressor(encoding):
+    """(compress(chunk), finish()) for one streamed response."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return compressor.compress, compressor.flush
+
+
+def _compress_stream(encoding, chunks, path):
+    compress, finish = _stream_compressor(encoding)
+    bytes_in = bytes_out = 0
+    seconds = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            t0 = time.perf_counter()
+            out = compress(chunk)
+            seconds += time.perf_counter() - t0
+            bytes_in += len(chunk)
+            if out:
+                bytes_out += len(out)
+                yield out
+        t0 = time.perf_counter()
+        out = finish()
+        seconds += time.perf_counter() - t0
+        bytes_out += len(out)
+        yield out
+    finally:
+        _record(encoding, bytes_in, bytes_out, seconds)
+        logger.debug(f'[COMPRESS] {path} {encoding} stream {bytes_in}>{bytes_out} bytes in {seconds * 1000:.1f}ms')
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_bytes = getattr(settings, 'COMPRESSION_MIN_BYTES', 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self._compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = _compress_stream(encoding, response.streaming_content, request.path)
+            # The compressed length isn't known until the stream ends
+            del response.headers['Content-Length']
+        else:
+            content = response.content
+            t0 = time.perf_counter()
+            compressed = _compress(encoding, content)
+            seconds = time.perf_counter() - t0
+            if len(compressed) >= len(content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+            _record(encoding, len(content), len(compressed), seconds)
+            timing = f'compress;dur={seconds * 1000:.2f};desc="{encoding} {len(content)}>{len(compressed)}"'
+            existing = response.get('Server-Timing')
+            response.headers['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+
+        # A strong ETag would claim byte-identity with the uncompressed body
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compressible(self, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 206, 304):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return False
+        if response.streaming:
+            return not response.is_async
+        return len(response.content) >= self.min_bytes
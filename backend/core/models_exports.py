@@ -0,0 +1,61 @@
+"""
+ExportJob — a report export queued by an owner and produced by the
+background export worker (`manage.py run_export_jobs --loop`).
+
+The finished file is written to media storage under an unguessable path
+and downloaded through the authenticated /api/exports/<id>/download/
+endpoint.
+"""
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+
+
+def export_upload_to(instance, filename):
+    return f'exports/{instance.tenant_id}/{instance.token}/{filename}'
+
+
+class ExportJob(models.Model):
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel (XLSX)'),
+        ('parquet', 'Parquet'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    tenant = models.ForeignKey('tenants.TenantSettings', on_delete=models.CASCADE, related_name='export_jobs')
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='export_jobs',
+    )
+    token = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    report_type = models.CharField(max_length=30)
+    params = models.JSONField(default=dict, blank=True, help_text='Report filters, as the report endpoint accepts them')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    file = models.FileField(upload_to=export_upload_to, max_length=255, blank=True)
+    row_count = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker only ever looks for pending jobs, oldest first
+            models.Index(
+                fields=['created_at'], name='export_pending_created_idx',
+                condition=Q(status='PENDING'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Export #{self.id} {self.report_type}.{self.format} ({self.status})"
@@ -25,32 +25,45 @@ Each event returns:
     'timestamp': str (ISO),
   }
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from decimal import Decimal
 from django.conf import settings
+from django.db import connection, connections
 from django.utils import timezone
 
+# dashboard_today is polled; a tenant's snapshot is rebuilt at most once per
+# timeout unless a Booking/LeaveRequest/ComplianceItem/IncidentReport write
+# invalidates it first (see invalidate_operational_events).
+EVENTS_CACHE_NAMESPACE = 'operational_events'
+EVENTS_CACHE_TIMEOUT = 30
 
-def get_operational_events(compliance_lookahead_days=14, tenant=None):
+
+def get_operational_events(compliance_lookahead_days=14, tenant=None, parallel=False):
     """
     Main entry point. Returns a list of operational events sorted by severity.
-    Only queries modules that are enabled.
+    Only queries modules that are enabled; with parallel=True their builders
+    run concurrently.
     """
     now = timezone.now()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     today_end = today_start + timedelta(days=1)
     tomorrow_end = today_start + timedelta(days=2)
 
-    events = []
+    builders = []
 
     if getattr(settings, 'BOOKINGS_MODULE_ENABLED', False):
-        events.extend(_booking_events(today_start, today_end, tomorrow_end, tenant))
+        builders.append(lambda: _booking_events(today_start, today_end, tomorrow_end, tenant))
 
     if getattr(settings, 'STAFF_MODULE_ENABLED', False):
-        events.extend(_staff_leave_events(today_start, today_end, tomorrow_end, tenant))
+        builders.append(lambda: _staff_leave_events(today_start, today_end, tomorrow_end, tenant))
 
     if getattr(settings, 'COMPLIANCE_MODULE_ENABLED', False):
-        events.extend(_compliance_events(today_start, compliance_lookahead_days, tenant))
+        builders.append(lambda: _compliance_events(today_start, compliance_lookahead_days, tenant))
+
+    events = []
+    for module_events in _run_builders(builders, parallel):
+        events.extend(module_events)
 
     # Sort by operational priority:
     # 1) Today's operational blockers (sick staff, unassigned bookings)
@@ -71,6 +84,41 @@ def get_operational_events(compliance_lookahead_days=14, tenant=None):
     return events
 
 
+def cached_operational_events(compliance_lookahead_days=14, tenant=None):
+    """get_operational_events via the per-tenant snapshot cache, built in parallel on a miss."""
+    from core import tenant_cache
+    params = {'lookahead': compliance_lookahead_days, 'date': timezone.now().date().isoformat()}
+    return tenant_cache.get_or_set(
+        EVENTS_CACHE_NAMESPACE, tenant.id if tenant else None, params,
+        lambda: get_operational_events(compliance_lookahead_days, tenant, parallel=True),
+        timeout=EVENTS_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_operational_events(tenant_id):
+    """Drop the cached snapshot for a tenant (and the unscoped one, which includes it)."""
+    from core import tenant_cache
+    tenant_cache.bump(EVENTS_CACHE_NAMESPACE, tenant_id)
+    if tenant_id is not None:
+        tenant_cache.bump(EVENTS_CACHE_NAMESPACE, None)
+
+
+def _run_builders(builders, parallel):
+    # Worker threads get their own DB connections, which cannot see a
+    # transaction still open on this one — build inline inside atomic blocks.
+    if not parallel or len(builders) < 2 or connection.in_atomic_block:
+        return [build() for build in builders]
+    with ThreadPoolExecutor(max_workers=len(builders)) as pool:
+        return list(pool.map(_run_in_thread, builders))
+
+
+def _run_in_thread(build):
+    try:
+        return build()
+    finally:
+        connections.close_all()  # this worker thread's connections only
+
+
 def get_dashboard_state(events):
     """
     Returns the overall dashboard state.
@@ -218,21 +266,51 @@ def _staff_leave_events(today_start, today_end, tomorrow_end, tenant=None):
     except ImportError:
         return events
 
-    # 1. Staff on sick leave today
+    t_filter = {'staff_member__tenant': tenant} if tenant else {}
+
+    # 1. Staff off sick today: bookings-module sick leave, plus sick leave and
+    # absences recorded against the linked StaffProfile in the staff module
     sick_today = LeaveRequest.objects.filter(
+        **t_filter,
         leave_type='SICK',
         start_datetime__lt=today_end,
         end_datetime__gt=today_start,
         status__in=['APPROVED', 'REQUESTED'],
     ).select_related('staff_member')
+    sick = [(lv.staff_member, 'leave_request', lv.id, lv.created_at) for lv in sick_today]
 
-    for lv in sick_today:
-        staff_name = lv.staff_member.name
+    from staff.models import AbsenceRecord, LeaveRequest as ProfileLeave
+    p_filter = {'staff__tenant': tenant} if tenant else {}
+    today = today_start.date()
+    profile_sick = list(ProfileLeave.objects.filter(
+        **p_filter,
+        staff__booking_staff__isnull=False,
+        leave_type='SICK',
+        start_date__lte=today,
+        end_date__gte=today,
+        status__in=['APPROVED', 'PENDING'],
+    ).select_related('staff__booking_staff'))
+    profile_sick += AbsenceRecord.objects.filter(
+        **p_filter,
+        staff__booking_staff__isnull=False,
+        record_type='ABSENCE',
+        date=today,
+    ).select_related('staff__booking_staff')
+    seen = {staff.id for staff, *_ in sick}
+    for record in profile_sick:
+        staff = record.staff.booking_staff
+        if staff.id not in seen:
+            seen.add(staff.id)
+            entity_type = 'absence_record' if isinstance(record, AbsenceRecord) else 'staff_leave_request'
+            sick.append((staff, entity_type, record.id, record.created_at))
+
+    for staff, entity_type, entity_id, created_at in sick:
+        staff_name = staff.name
 
         # Count affected bookings
         from bookings.models import Booking
         affected_count = Booking.objects.filter(
-            staff=lv.staff_member,
+            staff=staff,
             start_time__gte=today_start,
             start_time__lt=today_end,
             status__in=['confirmed', 'pending'],
@@ -241,7 +319,7 @@ def _staff_leave_events(today_start, today_end, tomorrow_end, tenant=None):
         # Deterministic cover suggestion via cover_logic
         from core.cover_logic import get_cover_candidates
         candidates = get_cover_candidates(
-            absent_staff_id=lv.staff_member_id,
+            absent_staff_id=staff.id,
             strategy='rotation',
             max_candidates=3,
         )
@@ -271,13 +349,14 @@ def _staff_leave_events(today_start, today_end, tomorrow_end, tenant=None):
             'detail': f'{staff_name} is off today. {affected_text}.',
             'why_it_matters': f'{affected_text}' if affected_count else 'Rota gap — may need cover',
             'actions': actions,
-            'entity_type': 'leave_request',
-            'entity_id': lv.id,
-            'timestamp': lv.created_at.isoformat(),
+            'entity_type': entity_type,
+            'entity_id': entity_id,
+            'timestamp': created_at.isoformat(),
         })
 
     # 2. Pending leave requests affecting tomorrow onwards
     pending_leave = LeaveRequest.objects.filter(
+        **t_filter,
         status='REQUESTED',
         start_datetime__lt=today_start + timedelta(days=7),
         end_datetime__gt=today_start,
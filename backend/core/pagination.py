@@ -0,0 +1,84 @@
+"""
+Keyset pagination and sparse fieldsets for list endpoints.
+
+Pagination is opt-in so existing callers keep getting a bare list: a request
+carrying ?page_size= (first page) or ?cursor= (following pages) gets
+{next, previous, results}, where next/previous are URLs with an opaque
+cursor. Pages are seeked with WHERE <ordering column> < position rather
+than OFFSET, so every ordering used here is on an indexed column and deep
+pages cost the same as the first.
+
+?fields=id,name,status trims every object to the named fields. DRF
+serializers get it by mixing in SparseFieldsMixin (unrequested fields are
+dropped before serialising, so their sources are never read); views that
+build dicts use pick_fields().
+
+Usage in a function view:
+    return list_response(request, qs, lambda rows: [_serialize(r) for r in rows], ordering=('-id',))
+"""
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+MAX_PAGE_SIZE = 500
+
+
+class KeysetPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    # Primary key: unique, always indexed, and follows creation order
+    ordering = ('-id',)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    @classmethod
+    def requested(cls, request):
+        params = request.query_params
+        return cls.cursor_query_param in params or cls.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+def requested_fields(request):
+    """The set of field names in ?fields=, or None to return every field."""
+    if request is None or request.method != 'GET':
+        return None
+    raw = request.query_params.get('fields', '')
+    fields = {name.strip() for name in raw.split(',') if name.strip()}
+    return fields or None
+
+
+def pick_fields(rows, fields):
+    """Trim serialised dicts to `fields` (unchanged when fields is None)."""
+    if fields is None:
+        return rows
+    return [{key: value for key, value in row.items() if key in fields} for row in rows]
+
+
+class SparseFieldsMixin:
+    """Serializer mixin honouring ?fields= from the request in the context."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+def list_response(request, queryset, serialize, ordering=None):
+    """Response for a list view: paginated if asked for, trimmed to ?fields=.
+
+    `serialize` turns a list of model instances into a list of dicts.
+    """
+    paginator = KeysetPagination(ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    rows = pick_fields(serialize(list(queryset) if page is None else page), requested_fields(request))
+    if page is None:
+        return Response(rows)
+    return paginator.get_paginated_response(rows)
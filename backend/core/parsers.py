@@ -0,0 +1,37 @@
+"""
+orjson-backed JSON parser, the request-side partner of core.renderers.
+
+Accepts what DRF's JSONParser accepts in strict mode (JSON with no
+NaN/Infinity) and raises the same ParseError on bad input. Falls back to
+JSONParser when orjson isn't installed or the request body isn't UTF-8.
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _is_utf8(encoding):
+    try:
+        return codecs.lookup(encoding).name == 'utf-8'
+    except LookupError:
+        return False
+
+
+class ORJSONParser(JSONParser):
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or not _is_utf8(encoding):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,44 @@
+"""
+orjson-backed JSON renderer for the API.
+
+Produces the same bytes as DRF's JSONRenderer for everything our views
+return: compact separators, UTF-8 (not ASCII-escaped), datetimes in
+ISO 8601 with a UTC offset written as "Z", dates and times as ISO strings,
+UUIDs as their canonical string, and Decimals as numbers. Decimals and
+anything else orjson doesn't know (lazy translations, querysets, IP
+addresses, timedeltas) go through DRF's own encoder. The visible
+differences: float exponents come out as 1e16 rather than 1e+16 (the same
+number), and NaN/Infinity render as null instead of raising.
+
+Falls back to DRF's stdlib encoder when orjson isn't installed, when an
+indented response is asked for (the browsable API, ?format=json with
+indent=), or when orjson refuses the data (e.g. integers beyond 64 bits).
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+            or not self.compact or self.ensure_ascii
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # As JSONRenderer: keep the output a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
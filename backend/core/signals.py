@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender='core.BusinessEvent')
+def publish_event_logged(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    from .live_events import publish
+    publish(instance.tenant_id, 'event.logged', id=instance.pk, event_type=instance.event_type)
@@ -0,0 +1,73 @@
+"""
+Per-tenant versioned caching.
+
+Cached values are keyed by (namespace, tenant, version, params). Writes
+invalidate a whole namespace for a tenant by bumping its version counter,
+so no key scanning is needed and stale entries simply expire.
+
+Bumps only reach other processes through a shared cache, so without
+settings.TENANT_CACHE_ENABLED (on by default when REDIS_URL is set)
+get_or_set just builds the value and bump does nothing.
+
+Usage:
+    payload = get_or_set('reports_overview', tenant_id, params, build, timeout=300)
+    bump('reports_overview', tenant_id)      # from a post_save/post_delete receiver
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Version counters outlive any cached value they guard
+VERSION_TIMEOUT = 60 * 60 * 24 * 30
+
+
+def enabled():
+    return getattr(settings, 'TENANT_CACHE_ENABLED', False)
+
+
+def _version_key(namespace, tenant_id):
+    return f'tcache:{namespace}:{tenant_id or "global"}:v'
+
+
+def version(namespace, tenant_id):
+    key = _version_key(namespace, tenant_id)
+    current = cache.get(key)
+    if current is None:
+        cache.add(key, 1, VERSION_TIMEOUT)
+        current = cache.get(key) or 1
+    return current
+
+
+def bump(namespace, tenant_id):
+    """Invalidate every cached value in a namespace for one tenant."""
+    if not enabled():
+        return
+    key = _version_key(namespace, tenant_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, VERSION_TIMEOUT)
+
+
+def params_hash(params):
+    encoded = json.dumps(params, sort_keys=True, default=str).encode()
+    return hashlib.md5(encoded).hexdigest()
+
+
+def make_key(namespace, tenant_id, params=None):
+    suffix = params_hash(params) if params else 'all'
+    return f'tcache:{namespace}:{tenant_id or "global"}:{version(namespace, tenant_id)}:{suffix}'
+
+
+def get_or_set(namespace, tenant_id, params, build, timeout=300):
+    """Return the cached value for (namespace, tenant, params), building it on a miss."""
+    if not enabled():
+        return build()
+    key = make_key(namespace, tenant_id, params)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
@@ -5,12 +5,27 @@ The frontend calls /api/tenant/branding/ and /api/tenant/ expecting specific fie
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from .conditional import conditional_get
 from .models import Config
 from .config_loader import config as client_config
 
 
+def _config_version(request):
+    """The branding Config rows and client.config.json both feed these views."""
+    import hashlib
+    import json
+    from django.db.models import Count, Max
+    rows = Config.objects.filter(category='branding').aggregate(changed=Max('updated_at'), count=Count('id'))
+    file_config = json.dumps(
+        [client_config.get_branding(), client_config.get_client_info(), client_config.get_features()],
+        sort_keys=True, default=str,
+    )
+    return rows['changed'], rows['count'], hashlib.md5(file_config.encode()).hexdigest()
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get('config_branding', extra=_config_version)
 def tenant_branding_view(request):
     """
     Returns branding config in the format the NBNE frontend expects:
@@ -63,6 +78,7 @@ def tenant_branding_view(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get('config_settings', extra=_config_version)
 def tenant_settings_view(request):
     """
     Returns tenant settings in the format the NBNE frontend expects.
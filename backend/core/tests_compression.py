@@ -0,0 +1,77 @@
+"""
+Response compression middleware: large JSON and streamed CSV are
+compressed for clients that accept it; small, pre-encoded and SSE
+responses pass through untouched.
+"""
+import gzip
+import json
+from unittest import mock
+
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from . import middleware_compression
+from .middleware_compression import CompressionMiddleware, choose_encoding, compression_stats
+
+
+def _big_payload():
+    return {'rows': [{'id': n, 'name': f'Client {n}', 'status': 'CONFIRMED'} for n in range(500)]}
+
+
+class CompressionMiddlewareTest(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _run(self, response, accept='gzip, deflate'):
+        request = self.factory.get('/api/x/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda r: response)(request)
+
+    @mock.patch.object(middleware_compression, 'brotli', None)
+    def test_large_json_is_gzipped_and_measured(self):
+        before = compression_stats().get('gzip', {}).get('responses', 0)
+        response = self._run(JsonResponse(_big_payload()))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), _big_payload())
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertRegex(response['Server-Timing'], r'^compress;dur=[\d.]+;desc="gzip \d+>\d+"$')
+        stats = compression_stats()['gzip']
+        self.assertEqual(stats['responses'], before + 1)
+        self.assertLess(stats['ratio'], 0.5)
+
+    def test_passes_through(self):
+        small = self._run(JsonResponse({'ok': True}))
+        self.assertFalse(small.has_header('Content-Encoding'))
+        not_accepted = self._run(JsonResponse(_big_payload()), accept='identity, gzip;q=0')
+        self.assertFalse(not_accepted.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', not_accepted['Vary'])
+        image = self._run(HttpResponse(b'\x89PNG' * 1000, content_type='image/png'))
+        self.assertFalse(image.has_header('Content-Encoding'))
+
+        events = StreamingHttpResponse(iter([b'data: {}\n\n'] * 500), content_type='text/event-stream')
+        events = self._run(events)
+        self.assertFalse(events.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(events.streaming_content), b'data: {}\n\n' * 500)
+
+        pre_encoded = StreamingHttpResponse(iter([gzip.compress(b'a,b\n')]), content_type='text/csv')
+        pre_encoded['Content-Encoding'] = 'gzip'
+        self.assertEqual(gzip.decompress(b''.join(self._run(pre_encoded).streaming_content)), b'a,b\n')
+
+    @mock.patch.object(middleware_compression, 'brotli', None)
+    def test_streamed_csv_is_compressed_chunk_by_chunk(self):
+        lines = [f'{n},Client {n},CONFIRMED\n'.encode() for n in range(5000)]
+        response = StreamingHttpResponse(iter(lines), content_type='text/csv')
+        response = self._run(response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(lines))
+
+    def test_choose_encoding(self):
+        with mock.patch.object(middleware_compression, 'brotli', None):
+            self.assertEqual(choose_encoding('gzip, deflate, br'), 'gzip')
+            self.assertIsNone(choose_encoding('br'))
+        with mock.patch.object(middleware_compression, 'brotli', object()):
+            self.assertEqual(choose_encoding('gzip, deflate, br'), 'br')
+            self.assertEqual(choose_encoding('br;q=0, *'), 'gzip')
+        self.assertIsNone(choose_encoding(''))
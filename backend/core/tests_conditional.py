@@ -0,0 +1,86 @@
+"""
+ETag / conditional GET on the public content endpoints: a repeat load with
+If-None-Match is a 304 that never reaches the view, and any change to the
+content behind the endpoint changes the ETag.
+"""
+from decimal import Decimal
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from bookings.models import Service, Staff
+from tenants.models import TenantSettings
+
+
+class ConditionalGetTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='etag-t', business_name='ETag T')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='etag-t')
+        self.service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('20.00'))
+
+    def _revalidate(self, url, etag):
+        return self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_branding_304_skips_the_serializer(self):
+        first = self.api.get('/api/tenant/branding/')
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertEqual(first['Cache-Control'], 'public, max-age=60, stale-while-revalidate=600')
+        self.assertIn('X-Tenant-Slug', first['Vary'])
+
+        with mock.patch('tenants.views.TenantSettingsCSSVarsSerializer') as serializer:
+            with CaptureQueriesContext(connection) as queries:
+                again = self._revalidate('/api/tenant/branding/', f'W/{etag}')
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], etag)
+        serializer.assert_not_called()
+        # Only TenantMiddleware's lookup
+        self.assertEqual(len(queries), 1)
+
+        self.tenant.tagline = 'New tagline'
+        self.tenant.save()
+        self.assertEqual(self._revalidate('/api/tenant/branding/', etag).status_code, 200)
+
+    def test_services_etag_follows_services_and_staff(self):
+        url = '/api/services/'
+        etag = self.api.get(url)['ETag']
+        self.assertEqual(self._revalidate(url, etag).status_code, 304)
+        self.assertNotEqual(self.api.get(url, {'all': '1'})['ETag'], etag)
+
+        staff = Staff.objects.create(tenant=self.tenant, name='S', email='s@etag.test')
+        fresh = self._revalidate(url, etag)
+        self.assertEqual(fresh.status_code, 200)
+        etag = fresh['ETag']
+        staff.services.add(self.service)
+        fresh = self._revalidate(url, etag)
+        self.assertEqual(fresh.json()[0]['staff_ids'], [staff.id])
+
+        # The admin list and authenticated requests must not be served stale
+        admin_list = self.api.get(url, {'all': '1'})
+        self.assertEqual(admin_list['Cache-Control'], 'private, no-cache')
+        self.assertEqual(self._revalidate(url + '?all=1', admin_list['ETag']).status_code, 304)
+        from accounts.models import User
+        owner = User.objects.create_user(username='etag-owner', password='x', role='owner', tenant=self.tenant)
+        signed_in = APIClient(HTTP_X_TENANT_SLUG='etag-t')
+        signed_in.force_authenticate(owner)
+        self.assertEqual(signed_in.get(url)['Cache-Control'], 'private, no-cache')
+
+        # Another tenant's changes leave this tenant's ETag alone
+        other = TenantSettings.objects.create(slug='etag-o', business_name='O')
+        Service.objects.create(tenant=other, name='Other', duration_minutes=30, price=Decimal('1.00'))
+        self.assertEqual(self._revalidate(url, fresh['ETag']).status_code, 304)
+
+    def test_cms_pages(self):
+        if not apps.is_installed('cms'):
+            self.skipTest('CMS module not enabled')
+        from cms.models import Page, PageImage
+        page = Page.objects.create(tenant=self.tenant, title='About', slug='about', is_published=True)
+        etag = self.api.get('/api/cms/public/pages/')['ETag']
+        self.assertEqual(self._revalidate('/api/cms/public/pages/', etag).status_code, 304)
+        PageImage.objects.create(page=page, image='cms/x.jpg')
+        self.assertEqual(self._revalidate('/api/cms/public/pages/', etag).status_code, 200)
@@ -0,0 +1,159 @@
+"""
+CRM tests.
+Revenue stats come from grouped aggregates and are cached per tenant until
+a lead or booking changes; syncing leads from bookings is set-based; the
+lead search index follows lead, note and message writes.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, Client, Service, Staff
+from crm.models import Lead
+from tenants.models import TenantSettings
+
+
+class CrmTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tenant = TenantSettings.objects.create(slug='crm-t', business_name='CRM T')
+        self.api = APIClient(HTTP_X_TENANT_SLUG='crm-t')
+        self.service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('20.00'))
+        self.staff = Staff.objects.create(tenant=self.tenant, name='S', email='s@crm.test')
+
+    def _client(self, name):
+        return Client.objects.create(tenant=self.tenant, name=name, email=f'{name.lower()}@crm.test', phone='1')
+
+    def _book(self, client, status='completed', amount='20.00', days_ago=3):
+        start = timezone.now() - timedelta(days=days_ago)
+        return Booking.objects.create(
+            tenant=self.tenant, client=client, service=self.service, staff=self.staff,
+            start_time=start, end_time=start + timedelta(minutes=30), status=status,
+            payment_amount=Decimal(amount),
+        )
+
+
+@override_settings(TENANT_CACHE_ENABLED=True)
+class RevenueStatsTest(CrmTestCase):
+
+    def test_stats(self):
+        ann, bob = self._client('Ann'), self._client('Bob')
+        self._book(ann, amount='30.00')
+        self._book(ann, status='confirmed', amount='12.50')
+        self._book(ann, status='cancelled', amount='99.00')
+        self._book(bob, amount='5.00')
+        Lead.objects.create(tenant=self.tenant, name='Ann', source='booking', status='CONVERTED', client_id=ann.id)
+        Lead.objects.create(tenant=self.tenant, name='Bob', source='referral', status='CONVERTED', client_id=bob.id)
+        Lead.objects.create(tenant=self.tenant, name='Cy', source='referral', status='QUALIFIED', value_pence=4000)
+        Lead.objects.create(tenant=self.tenant, name='Di', source='referral', status='LOST', value_pence=900)
+        other = TenantSettings.objects.create(slug='crm-o', business_name='CRM O')
+        Lead.objects.create(tenant=other, name='Ed', status='NEW', value_pence=100000)
+
+        data = self.api.get('/api/crm/revenue/').json()
+        self.assertEqual(data['pipeline_value_pence'], 4000)
+        self.assertEqual(data['converted_revenue_pence'], 4250 + 500)
+        self.assertEqual(data['total_leads'], 4)
+        self.assertEqual(data['overall_conversion_rate'], 50.0)
+        self.assertEqual(data['funnel']['LOST'], {'count': 1, 'value_pence': 900})
+        self.assertEqual(data['funnel']['NEW'], {'count': 0, 'value_pence': 0})
+        self.assertEqual(data['sources'], [
+            {'source': 'booking', 'leads': 1, 'converted': 1, 'conversion_rate': 100.0,
+             'revenue_pence': 4250, 'pipeline_pence': 0},
+            {'source': 'referral', 'leads': 3, 'converted': 1, 'conversion_rate': 33.3,
+             'revenue_pence': 500, 'pipeline_pence': 4000},
+        ])
+
+    def test_cached_until_lead_or_booking_write(self):
+        ann = self._client('Ann')
+        Lead.objects.create(tenant=self.tenant, name='Ann', status='CONVERTED', client_id=ann.id)
+        self.assertEqual(self.api.get('/api/crm/revenue/').json()['converted_revenue_pence'], 0)
+        with CaptureQueriesContext(connection) as queries:
+            self.api.get('/api/crm/revenue/')
+        self.assertFalse([q for q in queries.captured_queries if 'crm_lead' in q['sql']])
+
+        self._book(ann)
+        self.assertEqual(self.api.get('/api/crm/revenue/').json()['converted_revenue_pence'], 2000)
+        Lead.objects.create(tenant=self.tenant, name='New', value_pence=700)
+        self.assertEqual(self.api.get('/api/crm/revenue/').json()['pipeline_value_pence'], 700)
+
+
+class SyncFromBookingsTest(CrmTestCase):
+
+    def test_creates_missing_leads_in_a_few_queries(self):
+        ann, bob, cy = self._client('Ann'), self._client('Bob'), self._client('Cy')
+        self._book(ann)
+        self._book(ann, status='confirmed')
+        self._book(bob, status='confirmed')
+        self._book(cy, status='cancelled')
+        Lead.objects.create(tenant=self.tenant, name='Linked', client_id=ann.id)
+        # A lead for the same client id in another tenant doesn't count
+        other = TenantSettings.objects.create(slug='crm-o', business_name='CRM O')
+        Lead.objects.create(tenant=other, name='Elsewhere', client_id=bob.id)
+        for n in range(50):
+            self._client(f'Extra{n}')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.post('/api/crm/sync/')
+        self.assertEqual(response.json()['created'], 52)
+        self.assertLess(len(queries), 15)
+
+        bob_lead = Lead.objects.get(tenant=self.tenant, client_id=bob.id)
+        self.assertEqual((bob_lead.status, bob_lead.value_pence), ('QUALIFIED', 2000))
+        self.assertEqual(bob_lead.history.get().detail, '1 booking(s), £20.00')
+        self.assertEqual(Lead.objects.get(tenant=self.tenant, client_id=cy.id).status, 'NEW')
+        self.assertEqual(self.api.post('/api/crm/sync/').json()['created'], 0)
+
+
+class LeadClientTest(CrmTestCase):
+
+    def test_client_link_is_a_foreign_key(self):
+        ann = self._client('Ann')
+        lead = Lead.objects.create(tenant=self.tenant, name='Ann', client=ann)
+        self._book(ann, amount='15.00')
+        self.assertEqual(list(ann.leads.all()), [lead])
+
+        data = self.api.get(f'/api/crm/leads/{lead.id}/revenue/').json()
+        self.assertEqual((data['linked'], data['client_name'], len(data['bookings'])), (True, 'Ann', 1))
+
+        ann.delete()
+        lead.refresh_from_db()
+        self.assertIsNone(lead.client_id)
+        self.assertFalse(self.api.get(f'/api/crm/leads/{lead.id}/revenue/').json()['linked'])
+
+
+class LeadSearchTest(CrmTestCase):
+
+    def test_ranked_search_over_leads_notes_and_messages(self):
+        from crm.models import LeadMessage, LeadNote
+        smith = Lead.objects.create(tenant=self.tenant, name='Jo Smith', email='jo@smith.test', phone='07700 900123')
+        note_hit = Lead.objects.create(tenant=self.tenant, name='Al Brown')
+        LeadNote.objects.create(lead=note_hit, text='Mrs Smith asked about a wedding quote')
+        msg = Lead.objects.create(tenant=self.tenant, name='Cy Green')
+        LeadMessage.objects.create(lead=msg, subject='Balayage', body='Can I book a balayage on Friday?')
+        other = TenantSettings.objects.create(slug='crm-o', business_name='CRM O')
+        Lead.objects.create(tenant=other, name='Jo Smith')
+
+        data = self.api.get('/api/crm/search/', {'q': 'smith'}).json()
+        self.assertEqual(data['count'], 2)
+        # A name match outranks a word in a note
+        self.assertEqual([r['id'] for r in data['results']], [smith.id, note_hit.id])
+        self.assertEqual(self.api.get('/api/crm/search/', {'q': 'smith', 'offset': 1}).json()['results'][0]['id'],
+                         note_hit.id)
+
+        self.assertEqual([r['id'] for r in self.api.get('/api/crm/search/', {'q': 'balayage friday'}).json()['results']],
+                         [msg.id])
+        self.assertEqual(self.api.get('/api/crm/search/', {'q': '07700'}).json()['count'], 1)
+
+        smith.name = 'Jo Jones'
+        smith.email = 'jo@jones.test'
+        smith.save()
+        note_hit.delete()
+        self.assertEqual(self.api.get('/api/crm/search/', {'q': 'smith'}).json()['count'], 0)
+        self.assertEqual(self.api.get('/api/crm/search/', {'q': ''}).json()['results'], [])
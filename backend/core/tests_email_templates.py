@@ -0,0 +1,64 @@
+"""
+Tests for the precompiled email template layer.
+"""
+from datetime import datetime
+
+from django.test import SimpleTestCase, TestCase
+
+from core import email_templates
+from core.email_templates import EmailBrand, brand_for_tenant, register_template, render
+
+
+class EmailTemplateRenderTests(SimpleTestCase):
+
+    def setUp(self):
+        register_template('test.html', '<h1>$brand_name</h1><p style="color:$brand_accent">Hi $name, $$5 off</p>')
+        register_template('test.txt', 'Hi $name from $brand_name', html=False)
+
+    def test_brand_baked_in_and_context_substituted(self):
+        brand = EmailBrand(name='Salon X', accent='#ff0000')
+        html = render('test.html', brand, name='Jo')
+        self.assertEqual(html, '<h1>Salon X</h1><p style="color:#ff0000">Hi Jo, $5 off</p>')
+
+    def test_html_values_escaped_text_values_not(self):
+        brand = EmailBrand(name='Fish & Chips')
+        self.assertIn('Fish &amp; Chips', render('test.html', brand, name='<b>'))
+        self.assertIn('&lt;b&gt;', render('test.html', brand, name='<b>'))
+        self.assertEqual(render('test.txt', brand, name='<b>'), 'Hi <b> from Fish & Chips')
+
+    def test_dollar_in_brand_name_is_literal(self):
+        brand = EmailBrand(name='Cash$mart')
+        self.assertEqual(render('test.txt', brand, name='Jo'), 'Hi Jo from Cash$mart')
+
+    def test_compiled_once_per_brand(self):
+        email_templates._compile.cache_clear()
+        brand = EmailBrand(name='A')
+        for _ in range(3):
+            render('test.txt', brand, name='x')
+        render('test.txt', EmailBrand(name='B'), name='x')
+        info = email_templates.cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 2)
+
+    def test_booking_reminder_uses_brand(self):
+        from bookings.email_reminders import _build_reminder_html, _build_reminder_text
+        brand = EmailBrand(name='The Mind Department')
+        start = datetime(2026, 3, 14, 10, 30)
+        html = _build_reminder_html('Jane', 'Massage', 'Alice', start, 60, '45.00', 7, is_1h=True, brand=brand)
+        text = _build_reminder_text('Jane', 'Massage', 'Alice', start, 60, '45.00', 7, brand=brand)
+        self.assertIn('The Mind Department', html)
+        self.assertIn('Your session is in 1 hour', html)
+        self.assertIn('Saturday, 14 March 2026', text)
+        self.assertIn('Your session is tomorrow', text)
+
+
+class BrandForTenantTests(TestCase):
+
+    def test_tenant_branding(self):
+        from tenants.models import TenantSettings
+        tenant = TenantSettings.objects.create(slug='brand-t', business_name='Brand T', colour_accent='#123456')
+        self.assertEqual(brand_for_tenant(tenant), EmailBrand(name='Brand T', accent='#123456'))
+
+    def test_platform_default_without_tenant(self):
+        with self.settings(EMAIL_BRAND_NAME='Platform'):
+            self.assertEqual(brand_for_tenant(None).name, 'Platform')
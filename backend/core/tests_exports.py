@@ -0,0 +1,139 @@
+"""
+Background export job tests.
+Queue via the API, run the worker, check the stored file and the download.
+XLSX/Parquet tests run only where openpyxl/pyarrow are installed.
+"""
+import csv
+import io
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from bookings.models import Booking, Client, Service, Staff
+from tenants.models import TenantSettings
+from .exports import format_available, process_export_jobs, purge_expired_exports
+from .models_exports import ExportJob
+
+MEDIA_DIR = tempfile.mkdtemp(prefix='export-tests-')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_DIR)
+class ExportJobTest(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_DIR, ignore_errors=True)
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='exp-t', business_name='Export T')
+        self.owner = User.objects.create_user(
+            username='exp-owner', email='owner@exp.test', password='x', role='owner', tenant=self.tenant,
+        )
+        self.api = APIClient(HTTP_X_TENANT_SLUG='exp-t')
+        self.api.force_authenticate(self.owner)
+
+        service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('25.00'))
+        staff = Staff.objects.create(tenant=self.tenant, name='Sam', email='sam@exp.test')
+        client = Client.objects.create(tenant=self.tenant, name='Ann', email='ann@exp.test', phone='1')
+        start = timezone.now() - timedelta(days=2)
+        for status in ('completed', 'completed', 'no_show'):
+            Booking.objects.create(
+                tenant=self.tenant, client=client, service=service, staff=staff,
+                start_time=start, end_time=start + timedelta(minutes=30), status=status,
+            )
+
+    def _queue(self, report_type, fmt='csv', **params):
+        response = self.api.post(
+            '/api/exports/', {'report_type': report_type, 'format': fmt, 'params': params}, format='json',
+        )
+        self.assertEqual(response.status_code, 202, response.content)
+        return response.json()['id']
+
+    def test_csv_export_end_to_end(self):
+        job_id = self._queue('bookings')
+        self.assertEqual(self.api.get(f'/api/exports/{job_id}/').json()['status'], 'PENDING')
+
+        self.assertEqual(process_export_jobs(), {'done': 1, 'failed': 0})
+
+        detail = self.api.get(f'/api/exports/{job_id}/').json()
+        self.assertEqual(detail['status'], 'DONE')
+        self.assertEqual(detail['row_count'], 3)
+        self.assertTrue(detail['download_url'].endswith(f'/api/exports/{job_id}/download/'))
+
+        response = self.api.get(f'/api/exports/{job_id}/download/')
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+        self.assertEqual(rows[0][:3], ['Booking ID', 'Start', 'End'])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(sorted(r[7] for r in rows[1:]), ['completed', 'completed', 'no_show'])
+
+    def test_staff_report_export_matches_endpoint(self):
+        job_id = self._queue('staff')
+        process_export_jobs()
+        job = ExportJob.objects.get(pk=job_id)
+        with job.file.open('rb') as fh:
+            rows = list(csv.reader(io.StringIO(fh.read().decode('utf-8'))))
+        endpoint = self.api.get('/api/reports/staff/').json()['rows']
+        self.assertEqual([r[0] for r in rows[1:]], [r['staff_name'] for r in endpoint])
+        self.assertEqual(rows[1][2], str(endpoint[0]['bookings']))
+
+    def test_validation_and_tenant_scoping(self):
+        self.assertEqual(self.api.post('/api/exports/', {'report_type': 'nope'}, format='json').status_code, 400)
+        bad_date = self.api.post(
+            '/api/exports/', {'report_type': 'daily', 'params': {'date_from': 'yesterday'}}, format='json',
+        )
+        self.assertEqual(bad_date.status_code, 400)
+
+        other = TenantSettings.objects.create(slug='exp-other', business_name='Other')
+        foreign = ExportJob.objects.create(tenant=other, report_type='daily')
+        self.assertEqual(self.api.get(f'/api/exports/{foreign.id}/').status_code, 404)
+        self.assertEqual(self.api.get(f'/api/exports/{foreign.id}/download/').status_code, 404)
+
+    def test_download_before_done_and_purge(self):
+        job_id = self._queue('daily')
+        self.assertEqual(self.api.get(f'/api/exports/{job_id}/download/').status_code, 409)
+        process_export_jobs()
+        job = ExportJob.objects.get(pk=job_id)
+        path = job.file.path
+        self.assertEqual(purge_expired_exports(now=timezone.now() + timedelta(days=30)), 1)
+        self.assertFalse(ExportJob.objects.filter(pk=job_id).exists())
+        self.assertFalse(job.file.storage.exists(path))
+
+    @unittest.skipUnless(format_available('xlsx'), 'openpyxl not installed')
+    def test_xlsx_export(self):
+        from openpyxl import load_workbook
+        job_id = self._queue('bookings', 'xlsx')
+        process_export_jobs()
+        job = ExportJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, 'DONE', job.error)
+        with job.file.open('rb') as fh:
+            sheet = load_workbook(fh, read_only=True).active
+            rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][8], 25)
+
+    @unittest.skipUnless(format_available('parquet'), 'pyarrow not installed')
+    def test_parquet_export(self):
+        import pyarrow.parquet as pq
+        job_id = self._queue('daily', 'parquet')
+        process_export_jobs()
+        job = ExportJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, 'DONE', job.error)
+        with job.file.open('rb') as fh:
+            table = pq.read_table(fh)
+        self.assertEqual(str(table.schema.field('Date').type), 'date32[day]')
+        self.assertEqual(sum(table.column('Bookings').to_pylist()), 2)
+
+    def test_unavailable_format_refused(self):
+        if format_available('parquet'):
+            self.skipTest('pyarrow installed')
+        response = self.api.post('/api/exports/', {'report_type': 'daily', 'format': 'parquet'}, format='json')
+        self.assertEqual(response.status_code, 400)
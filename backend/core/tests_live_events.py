@@ -0,0 +1,122 @@
+"""
+Live events tests — signals publish on commit to the tenant's subscribers
+(in-memory broadcaster), and the SSE endpoint relays them.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from bookings.models import Booking, Client, Service, Staff
+from bookings.models_availability import LeaveRequest
+from tenants.models import TenantSettings
+from .live_events import subscribe
+from .views_live import open_stream_count
+
+
+class LiveEventsTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='live-t', business_name='Live T')
+        self.service = Service.objects.create(tenant=self.tenant, name='Cut', duration_minutes=30, price=Decimal('20.00'))
+        self.staff = Staff.objects.create(tenant=self.tenant, name='Sam', email='sam@live.test')
+        self.client_obj = Client.objects.create(tenant=self.tenant, name='Ann', email='ann@live.test', phone='1')
+
+    def _book(self):
+        start = timezone.now() + timedelta(days=1)
+        return Booking.objects.create(
+            tenant=self.tenant, client=self.client_obj, service=self.service, staff=self.staff,
+            start_time=start, end_time=start + timedelta(minutes=30), status='confirmed',
+        )
+
+    def _drain(self, sub):
+        topics = []
+        while (message := sub.get(timeout=0)) is not None:
+            topics.append(message['topic'])
+        return topics
+
+    def test_signals_publish_after_commit(self):
+        sub = subscribe(self.tenant.id)
+        other = TenantSettings.objects.create(slug='live-o', business_name='Live O')
+        other_sub = subscribe(other.id)
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                booking = self._book()
+            self.assertEqual(self._drain(sub), ['booking.created'])
+
+            with self.captureOnCommitCallbacks(execute=True):
+                booking.notes = 'internal'
+                booking.save(update_fields=['notes'])
+                booking.status = 'cancelled'
+                booking.save(update_fields=['status'])
+                LeaveRequest.objects.create(
+                    staff_member=self.staff, leave_type='ANNUAL', start_datetime=timezone.now(),
+                    end_datetime=timezone.now() + timedelta(days=1),
+                )
+            self.assertEqual(self._drain(sub), ['booking.cancelled', 'leave.requested'])
+            self.assertEqual(self._drain(other_sub), [])
+        finally:
+            sub.close()
+            other_sub.close()
+
+    def test_nothing_published_on_rollback(self):
+        sub = subscribe(self.tenant.id)
+        try:
+            self._book()  # on_commit callbacks of the test transaction never run
+            self.assertEqual(self._drain(sub), [])
+        finally:
+            sub.close()
+
+    def test_sse_stream(self):
+        owner = User.objects.create_user(
+            username='live-owner', email='owner@live.test', password='x', role='owner', tenant=self.tenant,
+        )
+        api = APIClient(HTTP_X_TENANT_SLUG='live-t')
+        api.force_authenticate(owner)
+        response = api.get('/api/live/stream/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = iter(response.streaming_content)
+        try:
+            self.assertEqual(next(chunks), b'retry: 3000\n\n')
+            self.assertEqual(next(chunks), b'event: ready\ndata: {}\n\n')
+            with self.captureOnCommitCallbacks(execute=True):
+                booking = self._book()
+            self.assertEqual(
+                next(chunks),
+                f'event: booking.created\ndata: {{"id": {booking.id}, "status": "confirmed"}}\n\n'.encode(),
+            )
+        finally:
+            response.close()
+
+        self.assertEqual(APIClient(HTTP_X_TENANT_SLUG='live-t').get('/api/live/stream/').status_code, 401)
+
+    @override_settings(LIVE_STREAM_MAX_PER_PROCESS=1)
+    def test_streams_per_process_are_capped(self):
+        from .live_events import get_broadcaster
+        owner = User.objects.create_user(
+            username='live-cap', email='cap@live.test', password='x', role='owner', tenant=self.tenant,
+        )
+        api = APIClient(HTTP_X_TENANT_SLUG='live-t')
+        api.force_authenticate(owner)
+        subscribers = get_broadcaster()._subscribers[self.tenant.id]
+        first = api.get('/api/live/stream/')
+        try:
+            self.assertEqual(open_stream_count(), 1)
+            self.assertEqual(len(subscribers), 1)
+            # Over the cap: still a 200 event stream, so EventSource reconnects later
+            busy = api.get('/api/live/stream/')
+            self.assertEqual(busy.status_code, 200)
+            self.assertEqual(busy['Content-Type'], 'text/event-stream')
+            self.assertEqual(b''.join(busy.streaming_content), b'retry: 30000\n\nevent: busy\ndata: {}\n\n')
+            self.assertEqual(open_stream_count(), 1)
+        finally:
+            # Never iterated: closing the response still unsubscribes and frees the slot
+            first.close()
+        self.assertEqual(open_stream_count(), 0)
+        self.assertEqual(len(subscribers), 0)
+        third = api.get('/api/live/stream/')
+        self.assertEqual(next(iter(third.streaming_content)), b'retry: 3000\n\n')
+        third.close()
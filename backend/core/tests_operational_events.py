@@ -4,7 +4,7 @@ Verifies event detection for bookings, staff leave, and compliance deltas.
 """
 from datetime import timedelta
 from decimal import Decimal
-from django.test import TestCase, override_settings
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.utils import timezone
 
 
@@ -250,3 +250,58 @@ class OperationalEventsDisabledModulesTest(TestCase):
         self.assertEqual(len(events), 0)
         state = get_dashboard_state(events)
         self.assertEqual(state['state'], 'sorted')
+
+
+@override_settings(
+    BOOKINGS_MODULE_ENABLED=True,
+    STAFF_MODULE_ENABLED=True,
+    COMPLIANCE_MODULE_ENABLED=True,
+)
+class OperationalEventsSnapshotTest(TransactionTestCase):
+    """Cached snapshot, invalidated by writes; builders run in threads outside transactions."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from bookings.models import Service, Staff, Client
+        from tenants.models import TenantSettings
+        cache.clear()
+        self.tenant = TenantSettings.objects.create(slug='ops-t', business_name='Ops T')
+        self.service = Service.objects.create(
+            tenant=self.tenant, name='Cut', duration_minutes=60, price=Decimal('40.00'),
+        )
+        self.staff = Staff.objects.create(tenant=self.tenant, name='Alice', email='alice@ops.test')
+        self.client_obj = Client.objects.create(tenant=self.tenant, name='Bob', email='bob@ops.test', phone='1')
+
+    def _book(self, **kwargs):
+        from bookings.models import Booking
+        start = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        return Booking.objects.create(
+            tenant=self.tenant, client=self.client_obj, service=self.service, staff=self.staff,
+            start_time=start, end_time=start + timedelta(hours=1), **kwargs,
+        )
+
+    def test_parallel_build_matches_sequential(self):
+        from core.operational_events import get_operational_events
+        self._book(status='cancelled')
+        self._book(status='confirmed', payment_status='pending')
+        sequential = get_operational_events(tenant=self.tenant)
+        parallel = get_operational_events(tenant=self.tenant, parallel=True)
+        self.assertEqual(parallel, sequential)
+        self.assertTrue(sequential)
+
+    def test_snapshot_cached_until_a_write(self):
+        from core.operational_events import cached_operational_events
+        from compliance.models import IncidentReport
+        self.assertEqual(cached_operational_events(tenant=self.tenant), [])
+        with self.assertNumQueries(0):
+            cached_operational_events(tenant=self.tenant)
+
+        self._book(status='cancelled')
+        types = [e['event_type'] for e in cached_operational_events(tenant=self.tenant)]
+        self.assertIn('booking_cancelled', types)
+
+        IncidentReport.objects.create(
+            tenant=self.tenant, title='Spill', description='Wet floor', severity='HIGH', incident_date=timezone.now(),
+        )
+        types = [e['event_type'] for e in cached_operational_events(tenant=self.tenant)]
+        self.assertIn('incident_open', types)
@@ -0,0 +1,80 @@
+"""
+orjson renderer and parser — byte-for-byte the same output as DRF's
+JSONRenderer, and the same errors from the parser.
+"""
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import skipIf
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from . import parsers, renderers
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+
+LONDON = ZoneInfo('Europe/London')
+
+
+@skipIf(renderers.orjson is None, 'orjson not installed')
+class ORJSONRendererTest(SimpleTestCase):
+
+    def assertSameAsDrf(self, data, **kwargs):
+        self.assertEqual(ORJSONRenderer().render(data, **kwargs), JSONRenderer().render(data, **kwargs))
+
+    def test_matches_drf_output(self):
+        self.assertSameAsDrf({
+            'id': 7, 'name': 'Zoë — “Cut & Finish”', 'active': True, 'notes': None,
+            'start_time': datetime(2026, 3, 14, 10, 30, tzinfo=dt_timezone.utc),
+            'created_at': datetime(2026, 3, 14, 10, 30, 5, 123456, tzinfo=dt_timezone.utc),
+            'winter': datetime(2026, 1, 5, 9, 0, tzinfo=LONDON),
+            'summer': datetime(2026, 7, 5, 9, 0, tzinfo=LONDON),
+            'naive': datetime(2026, 7, 5, 9, 0),
+            'date': date(2026, 3, 14), 'time': time(9, 15, 0, 500),
+            'revenue': Decimal('1234.50'), 'rate': 12.5, 'ratio': 0.1,
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'duration': timedelta(minutes=90), 'label': gettext_lazy('Confirmed'),
+            'series': [{'date': date(2026, 3, d), 'count': d, 'value': Decimal(d) / 4} for d in range(1, 8)],
+            1: 'integer key', 'tags': ('a', 'b'),
+        })
+
+    def test_line_separators_are_escaped(self):
+        self.assertSameAsDrf({'text': 'a\u2028b\u2029c'})
+
+    def test_falls_back_where_orjson_cannot(self):
+        self.assertSameAsDrf({'big': 2 ** 70})
+        self.assertSameAsDrf({'a': [1, {'b': 2}]}, accepted_media_type='application/json; indent=4')
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+        with self.assertRaises(ValueError):
+            ORJSONRenderer().render({'t': time(9, 0, tzinfo=dt_timezone.utc)})
+
+    def test_api_responses_use_it(self):
+        from rest_framework.settings import api_settings
+        self.assertIs(api_settings.DEFAULT_RENDERER_CLASSES[0], ORJSONRenderer)
+        self.assertIs(api_settings.DEFAULT_PARSER_CLASSES[0], ORJSONParser)
+
+
+@skipIf(parsers.orjson is None, 'orjson not installed')
+class ORJSONParserTest(SimpleTestCase):
+
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def test_matches_drf_parser(self):
+        body = '{"name": "Zoë", "n": 1.5, "ok": true, "items": [1, null]}'.encode()
+        self.assertEqual(self.parse(ORJSONParser(), body), self.parse(JSONParser(), body))
+        latin = '{"name": "Zoë"}'.encode('latin-1')
+        self.assertEqual(self.parse(ORJSONParser(), latin, 'latin-1'), {'name': 'Zoë'})
+
+    def test_rejects_what_drf_rejects(self):
+        for body in (b'{"a": ', b'{"a": NaN}', b''):
+            with self.assertRaises(ParseError):
+                self.parse(JSONParser(), body)
+            with self.assertRaises(ParseError):
+                self.parse(ORJSONParser(), body)
@@ -0,0 +1,93 @@
+"""
+Staff directory tests.
+StaffProfile.booking_staff must link the two staff records for one person,
+and cover suggestions and operational events must see absences recorded in
+either module through that link.
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from bookings.models import Staff
+from bookings.models_availability import LeaveRequest as BookingLeave
+from staff.directory import booking_staff_off, link_booking_staff
+from staff.models import AbsenceRecord, StaffProfile
+from tenants.models import TenantSettings
+from .cover_logic import get_cover_candidates
+from .operational_events import get_operational_events
+
+
+class StaffDirectoryTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='dir-t', business_name='Dir T')
+        self.other = TenantSettings.objects.create(slug='dir-o', business_name='Dir O')
+        self.alice = Staff.objects.create(tenant=self.tenant, name='Alice Smith', email='alice@dir.test')
+        self.bea = Staff.objects.create(tenant=self.tenant, name='Bea Jones', email='bea@dir.test')
+        self.cal = Staff.objects.create(tenant=self.tenant, name='Cal', email='cal@dir.test')
+        Staff.objects.create(tenant=self.other, name='Dee', email='dee@dir.test')
+
+    def _profile(self, username, email, display_name, tenant=None):
+        user = User.objects.create_user(
+            username=username, email=email, password='x', role='staff', tenant=tenant or self.tenant,
+        )
+        return StaffProfile.objects.create(tenant=tenant or self.tenant, user=user, display_name=display_name)
+
+    def test_links_by_email_then_unique_name(self):
+        by_email = self._profile('alice', 'ALICE@dir.test', 'Ali')
+        by_name = self._profile('bea', 'bea.j@home.test', 'bea jones')
+        unmatched = self._profile('zed', 'zed@dir.test', 'Alice Smith', tenant=self.other)
+        by_email.refresh_from_db()
+        by_name.refresh_from_db()
+        unmatched.refresh_from_db()
+        self.assertEqual(by_email.booking_staff, self.alice)
+        self.assertEqual(by_name.booking_staff, self.bea)
+        self.assertIsNone(unmatched.booking_staff_id)  # same name, different tenant
+        self.assertEqual(self.alice.staff_profile, by_email)
+        self.assertEqual(link_booking_staff(), 0)
+
+    def test_blank_emails_never_match(self):
+        blank = Staff.objects.create(tenant=self.tenant, name='Pat', email='')
+        profile = self._profile('kim', '', 'Kim')
+        profile.refresh_from_db()
+        self.assertIsNone(profile.booking_staff_id)
+        self.assertEqual(link_booking_staff(tenant_id=self.tenant.id), 0)
+
+        # A later bookings.Staff row links to its one existing profile
+        pat = self._profile('pat', '', 'Pat')
+        pat.refresh_from_db()
+        self.assertEqual(pat.booking_staff, blank)
+        kim = Staff.objects.create(tenant=self.tenant, name='Kim', email='kim@dir.test')
+        profile.refresh_from_db()
+        self.assertEqual(profile.booking_staff, kim)
+
+    def test_new_row_links_without_rescanning_the_tenant(self):
+        for n in range(5):
+            self._profile(f'u{n}', f'u{n}@elsewhere.test', f'Nobody {n}')
+        with self.assertNumQueries(4):
+            # user and profile inserts, one email lookup, one link update
+            cal = self._profile('cal', 'CAL@dir.test', 'Cal')
+        cal.refresh_from_db()
+        self.assertEqual(cal.booking_staff, self.cal)
+
+    def test_absence_in_either_module_takes_staff_off(self):
+        alice = self._profile('alice', 'alice@dir.test', 'Alice')
+        today = timezone.localdate()
+        AbsenceRecord.objects.create(staff=alice, date=today, record_type='ABSENCE')
+        now = timezone.now()
+        BookingLeave.objects.create(
+            staff_member=self.bea, leave_type='SICK', status='REQUESTED',
+            start_datetime=now - timedelta(hours=1), end_datetime=now + timedelta(hours=8),
+        )
+        self.assertEqual(booking_staff_off(self.tenant, today), {self.alice.id, self.bea.id})
+
+        # Neither colleague who is off, nor staff of another tenant, is offered as cover
+        self.assertEqual([c['staff_id'] for c in get_cover_candidates(self.bea.id)], [self.cal.id])
+
+        sick = [e for e in get_operational_events(tenant=self.tenant) if e['event_type'] == 'staff_sick']
+        self.assertEqual(
+            sorted((e['entity_type'], e['summary']) for e in sick),
+            [('absence_record', 'Alice Smith off sick today'), ('leave_request', 'Bea Jones off sick today')],
+        )
@@ -0,0 +1,100 @@
+"""
+Bulk timesheet generation.
+Both generate endpoints build every entry in memory and insert in batches,
+so a 90-day run for a 50-person team is a handful of queries, and a re-run
+only fills the gaps.
+"""
+from datetime import date, time, timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from bookings.models import Staff, StaffSchedule
+from bookings.models_availability import TimesheetEntry as BookingTimesheet
+from staff.models import StaffProfile, TimesheetEntry, WorkingHours
+from tenants.models import TenantSettings
+
+TEAM_SIZE = 50
+DATE_FROM = date(2026, 3, 2)  # a Monday
+DATE_TO = DATE_FROM + timedelta(days=90)
+WEEKDAYS = sum(1 for n in range(91) if (DATE_FROM + timedelta(days=n)).weekday() < 5)
+
+
+class TimesheetGenerateTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='gen-t', business_name='Gen T')
+        self.manager = User.objects.create_user(
+            username='gen-manager', email='manager@gen.test', password='x', role='manager', tenant=self.tenant,
+        )
+        self.api = APIClient(HTTP_X_TENANT_SLUG='gen-t')
+        self.api.force_authenticate(self.manager)
+
+    def _post(self, url, **body):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.post(url, {'date_from': str(DATE_FROM), 'date_to': str(DATE_TO), **body}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data, len(queries)
+
+    def test_staff_module_generate(self):
+        users = User.objects.bulk_create([
+            User(username=f'gen-{n}', email=f'{n}@gen.test', role='staff', tenant=self.tenant)
+            for n in range(TEAM_SIZE)
+        ])
+        profiles = StaffProfile.objects.bulk_create([
+            StaffProfile(tenant=self.tenant, user=u, display_name=u.username) for u in users
+        ])
+        WorkingHours.objects.bulk_create([
+            WorkingHours(staff=p, day_of_week=dow, start_time=start, end_time=end, break_minutes=15)
+            for p in profiles for dow in range(5)
+            for start, end in ((time(9), time(12)), (time(13), time(17)))  # split shift
+        ])
+        TimesheetEntry.objects.create(staff=profiles[0], date=DATE_FROM, status='WORKED')
+
+        data, queries = self._post('/api/staff-module/timesheets/generate/')
+        self.assertEqual((data['created'], data['skipped']), (TEAM_SIZE * WEEKDAYS - 1, 1))
+        self.assertLess(queries, data['created'] // 20)  # batched: not one query per entry
+        entry = TimesheetEntry.objects.get(staff=profiles[1], date=DATE_FROM)
+        self.assertEqual((entry.scheduled_start, entry.scheduled_end), (time(9), time(17)))
+        self.assertEqual(entry.scheduled_break_minutes, 15 + 15 + 60)
+        self.assertEqual(TimesheetEntry.objects.get(staff=profiles[0], date=DATE_FROM).status, 'WORKED')
+
+        data, _ = self._post('/api/staff-module/timesheets/generate/')
+        self.assertEqual((data['created'], data['skipped']), (0, TEAM_SIZE * WEEKDAYS))
+
+    def test_bookings_generate(self):
+        staff = Staff.objects.bulk_create([
+            Staff(tenant=self.tenant, name=f'S{n}', email=f's{n}@gen.test') for n in range(TEAM_SIZE)
+        ])
+        StaffSchedule.objects.bulk_create([
+            StaffSchedule(staff=s, day_of_week=dow, start_time=time(9), end_time=time(17), break_minutes=30)
+            for s in staff for dow in range(5)
+        ])
+
+        data, queries = self._post('/api/staff/timesheets/generate/')
+        self.assertEqual((data['created'], data['skipped']), (TEAM_SIZE * WEEKDAYS, 0))
+        self.assertLess(queries, data['created'] // 20)  # batched: not one query per entry
+        self.assertEqual(BookingTimesheet.objects.get(staff_member=staff[0], date=DATE_FROM).scheduled_hours, 7.5)
+
+        data, _ = self._post('/api/staff/timesheets/generate/', staff_id=staff[0].id)
+        self.assertEqual((data['created'], data['skipped']), (0, WEEKDAYS))
+
+    def test_rows_dropped_on_conflict_are_not_counted(self):
+        user = User.objects.create_user(username='gen-race', email='race@gen.test', role='staff', tenant=self.tenant)
+        profile = StaffProfile.objects.create(tenant=self.tenant, user=user, display_name='Race')
+        WorkingHours.objects.create(staff=profile, day_of_week=0, start_time=time(9), end_time=time(17))
+        bulk_create = TimesheetEntry.objects.bulk_create
+
+        def lossy_bulk_create(entries, **kwargs):
+            # As if ignore_conflicts dropped the first row
+            return bulk_create(entries[1:], **kwargs)
+
+        mondays = sum(1 for n in range(91) if (DATE_FROM + timedelta(days=n)).weekday() == 0)
+        with mock.patch.object(TimesheetEntry.objects, 'bulk_create', side_effect=lossy_bulk_create):
+            data, _ = self._post('/api/staff-module/timesheets/generate/')
+        self.assertEqual((data['created'], data['skipped']), (mondays - 1, 1))
+        self.assertEqual(TimesheetEntry.objects.filter(staff=profile).count(), data['created'])
@@ -0,0 +1,91 @@
+"""
+DB-side timesheet hours.
+with_hours() must agree with the Python hours properties on both timesheet
+models, including shifts that cross midnight and entries missing a time.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from bookings.models import Staff
+from bookings.models_availability import TimesheetEntry as BookingTimesheet
+from staff.models import StaffProfile, TimesheetEntry
+from staff.views import _compute_tally, payroll_summary_data
+from tenants.models import TenantSettings
+from .timesheet_hours import to_hours
+
+
+class TimesheetHoursTest(TestCase):
+
+    def setUp(self):
+        self.tenant = TenantSettings.objects.create(slug='hours-t', business_name='Hours T')
+        user = User.objects.create_user(
+            username='hours-staff', email='staff@hours.test', password='x', role='staff', tenant=self.tenant,
+        )
+        self.profile = StaffProfile.objects.create(
+            tenant=self.tenant, user=user, display_name='Robin', contracted_hours_per_week=14,
+        )
+        day = date(2026, 3, 2)
+        self.entries = [
+            TimesheetEntry.objects.create(
+                staff=self.profile, date=day, status='WORKED',
+                scheduled_start=time(9), scheduled_end=time(17), scheduled_break_minutes=30,
+                actual_start=time(9), actual_end=time(18, 15), actual_break_minutes=30,
+            ),
+            # Night shift past midnight
+            TimesheetEntry.objects.create(
+                staff=self.profile, date=day + timedelta(days=1), status='WORKED',
+                scheduled_start=time(22), scheduled_end=time(6), scheduled_break_minutes=0,
+                actual_start=time(22), actual_end=time(5, 50), actual_break_minutes=20,
+            ),
+            # Scheduled but never clocked
+            TimesheetEntry.objects.create(
+                staff=self.profile, date=day + timedelta(days=2), status='ABSENT',
+                scheduled_start=time(9), scheduled_end=time(12),
+            ),
+        ]
+        self.day = day
+
+    def test_staff_entries_match_properties(self):
+        rows = {e.pk: e for e in TimesheetEntry.objects.with_hours()}
+        for entry in self.entries:
+            row = rows[entry.pk]
+            self.assertAlmostEqual(to_hours(row.scheduled_span, 4), round(entry.scheduled_hours, 4))
+            self.assertAlmostEqual(to_hours(row.actual_span, 4), round(entry.actual_hours, 4))
+
+        data = payroll_summary_data(self.tenant, self.day, self.day + timedelta(days=6))
+        summary = data['staff_summaries'][0]
+        self.assertEqual(summary['scheduled_hours'], round(sum(e.scheduled_hours for e in self.entries), 2))
+        self.assertEqual(summary['actual_hours'], round(sum(e.actual_hours for e in self.entries), 2))
+        self.assertEqual((summary['days_worked'], summary['days_absent']), (2, 1))
+        # Unassigned project: actual where worked, scheduled for the absence
+        self.assertEqual(data['project_breakdown'][0]['total_hours'], 8.75 + 7.5 + 3.0)
+
+        tally = _compute_tally(self.profile, self.day, self.day + timedelta(days=6))
+        self.assertEqual(tally['actual_hours'], 16.25)
+        self.assertEqual(tally['status'], 'credit')
+
+    def test_booking_entries_match_properties(self):
+        staff = Staff.objects.create(tenant=self.tenant, name='Robin', email='robin@hours.test')
+        tz = timezone.get_current_timezone()
+        at = lambda h, m=0: datetime(2026, 3, 2, h, m, tzinfo=tz)  # noqa: E731
+        worked = BookingTimesheet.objects.create(
+            staff_member=staff, date=self.day, break_minutes=45,
+            scheduled_start=at(9), scheduled_end=at(17), actual_start=at(8, 50), actual_end=at(17, 30),
+        )
+        missing = BookingTimesheet.objects.create(
+            staff_member=staff, date=self.day + timedelta(days=1), break_minutes=30,
+            scheduled_start=at(9), scheduled_end=at(12),
+        )
+        rows = {e.pk: e for e in BookingTimesheet.objects.with_hours()}
+        for entry in (worked, missing):
+            self.assertEqual(to_hours(rows[entry.pk].scheduled_span), entry.scheduled_hours)
+            self.assertEqual(to_hours(rows[entry.pk].actual_span), entry.actual_hours or 0)
+
+        report = APIClient().get('/api/reports/staff-hours/', {'month': '2026-03'}).json()
+        row = report['staff'][0]
+        self.assertEqual((row['scheduled_hours'], row['actual_hours']), (7.25 + 2.5, 7.92))
+        self.assertEqual((row['days_worked'], row['days_absent'], row['overtime_hours']), (1, 1, 0.67))
@@ -0,0 +1,45 @@
+"""
+Timesheet hours as database expressions.
+
+Both timesheet models (staff.TimesheetEntry and bookings.TimesheetEntry)
+expose worked hours as Python properties. Reports that total hours
+annotate the same figure in SQL via `with_hours()` instead, and aggregate
+with one grouped Sum rather than looping over every entry.
+
+Durations sum to a timedelta; `to_hours` turns one into rounded hours.
+"""
+from datetime import timedelta
+
+from django.db.models import Case, DurationField, ExpressionWrapper, F, IntegerField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan, LessThan
+
+ZERO = Value(timedelta(0), output_field=DurationField())
+
+
+def net_duration(start, end, break_minutes, wrap_midnight=False):
+    """
+    end - start less break_minutes, never negative; zero when either end is
+    missing. With wrap_midnight, an end before the start is the next day
+    (for TimeFields).
+    """
+    span = ExpressionWrapper(F(end) - F(start), output_field=DurationField())
+    if wrap_midnight:
+        span = Case(
+            When(LessThan(F(end), F(start)), then=ExpressionWrapper(
+                span + Value(timedelta(days=1)), output_field=DurationField(),
+            )),
+            default=span,
+            output_field=DurationField(),
+        )
+    # Wrapped so SQLite sees duration - duration and emits plain arithmetic
+    break_span = ExpressionWrapper(
+        Cast(break_minutes, IntegerField()) * Value(timedelta(minutes=1)), output_field=DurationField(),
+    )
+    net = ExpressionWrapper(span - break_span, output_field=DurationField())
+    return Case(When(GreaterThan(net, ZERO), then=net), default=ZERO, output_field=DurationField())
+
+
+def to_hours(duration, places=2):
+    """Hours in a summed duration (None counts as zero)."""
+    return round(duration.total_seconds() / 3600, places) if duration else 0
@@ -17,11 +17,14 @@ def health_check(request):
     # Include client info in health check
     client_info = client_config.get_client_info()
     
+    from .middleware_compression import compression_stats
+
     return JsonResponse({
         'status': 'healthy' if db_status == 'connected' else 'unhealthy',
         'database': db_status,
         'client': client_info.get('name', 'Unknown'),
         'mode': client_config.get_booking_mode(),
+        'compression': compression_stats(),
     })
 
 
@@ -318,15 +318,18 @@ def tool_mark_staff_sick(tenant, args):
         if not booking_staff:
             return {"success": False, "message": f"Could not find active staff member '{staff_name}'. Check the name and try again."}
         display = booking_staff.name
-        # Try to find or create a linked StaffProfile for absence tracking
+        # Record the absence on the linked StaffProfile, creating one if the person has a login
         try:
             from staff.models import StaffProfile, AbsenceRecord
             from accounts.models import User
-            user = User.objects.filter(email=booking_staff.email).first() if booking_staff.email else None
-            if user:
-                sp, _ = StaffProfile.objects.get_or_create(
-                    user=user, defaults={'tenant': tenant, 'display_name': display}
-                )
+            sp = StaffProfile.objects.filter(booking_staff=booking_staff).first()
+            if sp is None:
+                user = User.objects.filter(email=booking_staff.email).first() if booking_staff.email else None
+                if user:
+                    sp, _ = StaffProfile.objects.get_or_create(
+                        user=user, defaults={'tenant': tenant, 'display_name': display, 'booking_staff': booking_staff}
+                    )
+            if sp:
                 _, created = AbsenceRecord.objects.get_or_create(
                     staff=sp, date=today, record_type='ABSENCE',
                     defaults={'reason': 'Sick — logged via AI assistant', 'is_authorised': True}
@@ -346,11 +349,13 @@ def tool_mark_staff_sick(tenant, args):
     # Check affected bookings
     try:
         from bookings.models import Booking
-        booking_staff = _resolve_booking_staff(tenant, staff_name)
+        from bookings.utils import day_range
+        booking_staff = staff.booking_staff if staff and staff.booking_staff_id else _resolve_booking_staff(tenant, staff_name)
         if booking_staff:
+            day_start, day_end = day_range(today)
             today_bookings = Booking.objects.filter(
                 tenant=tenant, staff=booking_staff,
-                start_time__date=today, status__in=['CONFIRMED', 'PENDING']
+                start_time__gte=day_start, start_time__lt=day_end, status__in=['CONFIRMED', 'PENDING']
             ).select_related('client', 'service')
             if today_bookings.exists():
                 affected = []
@@ -390,32 +395,28 @@ def tool_get_who_is_off(tenant, args):
 
 def tool_get_staff_list(tenant, args):
     staff_list = []
-    seen_names = set()
     try:
         from staff.models import StaffProfile
         for p in StaffProfile.objects.filter(tenant=tenant, is_active=True).select_related('user'):
             name = p.display_name or f"{p.user.first_name} {p.user.last_name}".strip()
             staff_list.append({
                 "name": name,
-                "role": p.role,
+                "role": p.user.role,
                 "email": p.user.email,
                 "source": "staff_profile",
             })
-            seen_names.add(name.lower())
     except Exception as e:
         logger.warning(f"[AI] Error getting staff profiles: {e}")
-    # Also include booking staff not already listed
+    # Also include booking staff without an active profile (linked via StaffProfile.booking_staff)
     try:
         from bookings.models import Staff as BookingStaff
-        for bs in BookingStaff.objects.filter(tenant=tenant, active=True):
-            if bs.name.lower() not in seen_names:
-                staff_list.append({
-                    "name": bs.name,
-                    "role": bs.role or 'staff',
-                    "email": bs.email or '',
-                    "source": "booking_staff",
-                })
-                seen_names.add(bs.name.lower())
+        for bs in BookingStaff.objects.filter(tenant=tenant, active=True).exclude(staff_profile__is_active=True):
+            staff_list.append({
+                "name": bs.name,
+                "role": bs.role or 'staff',
+                "email": bs.email or '',
+                "source": "booking_staff",
+            })
     except Exception as e:
         logger.warning(f"[AI] Error getting booking staff: {e}")
     return {"staff": staff_list, "count": len(staff_list)}
@@ -425,9 +426,10 @@ def tool_get_todays_bookings(tenant, args):
     bookings = []
     try:
         from bookings.models import Booking
-        today = date.today()
+        from bookings.utils import day_range
+        day_start, day_end = day_range(date.today())
         qs = Booking.objects.filter(
-            tenant=tenant, start_time__date=today
+            tenant=tenant, start_time__gte=day_start, start_time__lt=day_end
         ).select_related('client', 'service', 'staff').order_by('start_time')
         for b in qs:
             bookings.append({
@@ -446,9 +448,10 @@ def tool_get_unassigned_bookings(tenant, args):
     bookings = []
     try:
         from bookings.models import Booking
-        today = date.today()
+        from bookings.utils import day_range
+        day_start, _ = day_range(date.today())
         qs = Booking.objects.filter(
-            tenant=tenant, start_time__date__gte=today, staff__isnull=True
+            tenant=tenant, start_time__gte=day_start, staff__isnull=True
         ).select_related('client', 'service').order_by('start_time')
         for b in qs:
             bookings.append({
@@ -471,9 +474,10 @@ def tool_get_staff_bookings(tenant, args):
     bookings = []
     try:
         from bookings.models import Booking
-        today = date.today()
+        from bookings.utils import day_range
+        day_start, day_end = day_range(date.today())
         qs = Booking.objects.filter(
-            tenant=tenant, staff=booking_staff, start_time__date=today
+            tenant=tenant, staff=booking_staff, start_time__gte=day_start, start_time__lt=day_end
         ).select_related('client', 'service').order_by('start_time')
         for b in qs:
             bookings.append({
@@ -597,12 +601,13 @@ def tool_get_todays_overview(tenant, args):
     }
     try:
         from bookings.models import Booking
-        today = date.today()
+        from bookings.utils import day_range
+        day_start, day_end = day_range(date.today())
         overview["bookings_today"] = Booking.objects.filter(
-            tenant=tenant, start_time__date=today
+            tenant=tenant, start_time__gte=day_start, start_time__lt=day_end
         ).count()
         overview["unassigned_bookings"] = Booking.objects.filter(
-            tenant=tenant, start_time__date=today, staff__isnull=True
+            tenant=tenant, start_time__gte=day_start, start_time__lt=day_end, staff__isnull=True
         ).count()
     except Exception:
         pass
@@ -635,35 +640,30 @@ def tool_get_todays_overview(tenant, args):
 def tool_get_available_staff(tenant, args):
     available = []
     try:
+        from django.db.models import Q
+        from bookings.models import Staff as BookingStaff
+        from staff.directory import booking_staff_off
         from staff.models import StaffProfile, AbsenceRecord, LeaveRequest
         today = date.today()
-        sick_ids = set(AbsenceRecord.objects.filter(
-            staff__tenant=tenant, date=today
-        ).values_list('staff_id', flat=True))
-        leave_ids = set(LeaveRequest.objects.filter(
+        booking_off = booking_staff_off(tenant, today)
+        sick_ids = AbsenceRecord.objects.filter(staff__tenant=tenant, date=today).values('staff_id')
+        leave_ids = LeaveRequest.objects.filter(
             staff__tenant=tenant, status='APPROVED',
             start_date__lte=today, end_date__gte=today
-        ).values_list('staff_id', flat=True))
-        off_ids = sick_ids | leave_ids
+        ).values('staff_id')
 
-        seen_names = set()
-        for p in StaffProfile.objects.filter(tenant=tenant, is_active=True).select_related('user'):
-            if p.id not in off_ids:
-                name = p.display_name or f"{p.user.first_name} {p.user.last_name}".strip()
-                available.append({"name": name, "role": p.role})
-                seen_names.add(name.lower())
+        for p in StaffProfile.objects.filter(tenant=tenant, is_active=True).exclude(
+            Q(id__in=sick_ids) | Q(id__in=leave_ids) | Q(booking_staff_id__in=booking_off)
+        ).select_related('user'):
+            name = p.display_name or f"{p.user.first_name} {p.user.last_name}".strip()
+            available.append({"name": name, "role": p.user.role})
+        # Also include booking staff without an active profile
+        for bs in BookingStaff.objects.filter(tenant=tenant, active=True).exclude(
+            staff_profile__is_active=True
+        ).exclude(id__in=booking_off):
+            available.append({"name": bs.name, "role": bs.role or 'staff'})
     except Exception as e:
         logger.warning(f"[AI] Error getting available staff: {e}")
-        seen_names = set()
-    # Also include booking staff not already listed
-    try:
-        from bookings.models import Staff as BookingStaff
-        for bs in BookingStaff.objects.filter(tenant=tenant, active=True):
-            if bs.name.lower() not in seen_names:
-                available.append({"name": bs.name, "role": bs.role or 'staff'})
-                seen_names.add(bs.name.lower())
-    except Exception:
-        pass
     return {"available_staff": available, "count": len(available)}
 
 
@@ -13,7 +13,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from .operational_events import get_operational_events, get_dashboard_state
+from .operational_events import cached_operational_events, get_dashboard_state
 
 
 @api_view(['GET'])
@@ -31,7 +31,7 @@ def dashboard_today(request):
 
     lookahead = int(request.query_params.get('compliance_days', 14))
     tenant = getattr(request, 'tenant', None)
-    events = get_operational_events(compliance_lookahead_days=lookahead, tenant=tenant)
+    events = cached_operational_events(compliance_lookahead_days=lookahead, tenant=tenant)
     state = get_dashboard_state(events)
 
     # Summary counts for quick glance
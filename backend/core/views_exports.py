@@ -0,0 +1,119 @@
+"""
+Report export jobs — queue a report export, poll its status, download the file.
+
+POST /api/exports/                 { report_type, format, params } → 202 + job
+GET  /api/exports/                 recent jobs for this tenant
+GET  /api/exports/<id>/            job status (download_url once DONE)
+GET  /api/exports/<id>/download/   the finished file
+
+The file itself is produced by the background export worker (core/exports.py).
+"""
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from accounts.permissions import IsManagerOrAbove
+
+from .exports import EXPORT_REPORTS, format_available
+from .models_exports import ExportJob
+
+DATE_PARAMS = ('date_from', 'date_to')
+ID_PARAMS = ('staff_id', 'service_id')
+TEXT_PARAMS = ('risk_level', 'payment_status')
+
+
+def _serialize_job(job, request):
+    return {
+        'id': job.id,
+        'report_type': job.report_type,
+        'format': job.format,
+        'params': job.params,
+        'status': job.status,
+        'row_count': job.row_count,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'download_url': (
+            request.build_absolute_uri(reverse('export-download', args=[job.id]))
+            if job.status == 'DONE' and job.file else None
+        ),
+    }
+
+
+def _clean_params(raw):
+    """Keep only the filters the report builders understand. Returns (params, error)."""
+    from bookings.views_reports import _parse_date
+    if not isinstance(raw, dict):
+        return None, 'params must be an object'
+    params = {}
+    for key in DATE_PARAMS:
+        if raw.get(key):
+            if _parse_date(str(raw[key])) is None:
+                return None, f'{key} must be YYYY-MM-DD'
+            params[key] = str(raw[key])
+    for key in ID_PARAMS:
+        if raw.get(key) not in (None, ''):
+            try:
+                params[key] = str(int(raw[key]))
+            except (TypeError, ValueError):
+                return None, f'{key} must be an integer'
+    for key in TEXT_PARAMS:
+        if raw.get(key):
+            params[key] = str(raw[key])
+    return params, None
+
+
+def _tenant_job(request, pk):
+    job = ExportJob.objects.filter(pk=pk, tenant=getattr(request, 'tenant', None)).first()
+    if job is None:
+        raise Http404
+    return job
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsManagerOrAbove])
+def export_jobs(request):
+    tenant = getattr(request, 'tenant', None)
+    if tenant is None:
+        return Response({'error': 'Tenant required'}, status=400)
+
+    if request.method == 'GET':
+        jobs = ExportJob.objects.filter(tenant=tenant)[:50]
+        return Response([_serialize_job(job, request) for job in jobs])
+
+    report_type = request.data.get('report_type', '')
+    fmt = request.data.get('format', 'csv')
+    if report_type not in EXPORT_REPORTS:
+        return Response({'error': f"report_type must be one of: {', '.join(EXPORT_REPORTS)}"}, status=400)
+    if fmt not in dict(ExportJob.FORMAT_CHOICES):
+        return Response({'error': 'format must be csv, xlsx or parquet'}, status=400)
+    if not format_available(fmt):
+        return Response({'error': f'{fmt} export is not available on this server'}, status=400)
+    params, error = _clean_params(request.data.get('params') or {})
+    if error:
+        return Response({'error': error}, status=400)
+
+    job = ExportJob.objects.create(
+        tenant=tenant,
+        requested_by=request.user if request.user.is_authenticated else None,
+        report_type=report_type,
+        format=fmt,
+        params=params,
+    )
+    return Response(_serialize_job(job, request), status=202)
+
+
+@api_view(['GET'])
+@permission_classes([IsManagerOrAbove])
+def export_job_detail(request, pk):
+    return Response(_serialize_job(_tenant_job(request, pk), request))
+
+
+@api_view(['GET'])
+@permission_classes([IsManagerOrAbove])
+def export_job_download(request, pk):
+    job = _tenant_job(request, pk)
+    if job.status != 'DONE' or not job.file:
+        return Response({'error': 'Export is not ready'}, status=409)
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.file.name.rsplit('/', 1)[-1])
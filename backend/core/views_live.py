@@ -0,0 +1,130 @@
+"""
+Live updates — GET /api/live/stream/ (text/event-stream)
+
+A Server-Sent Events stream of the current tenant's change notifications
+(see core.live_events for topics). The admin refetches the affected view
+when an event arrives, instead of polling on a timer. It should also
+refetch everything on the initial `ready` event, because nothing is
+replayed across reconnects.
+
+Streams close after LIVE_STREAM_SECONDS, well inside gunicorn's worker
+timeout. EventSource then reconnects after `retry` ms.
+
+Every open stream occupies a worker thread, so this needs gunicorn's
+threaded workers (start.sh runs gthread), and each process serves at most
+LIVE_STREAM_MAX_PER_PROCESS streams at once. Beyond that the endpoint
+still answers 200 (EventSource gives up for good on any other status)
+with a `busy` event and a longer `retry`, then closes, so the browser
+reconnects later and the remaining threads stay free for ordinary API
+requests.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+
+from django.db import connection
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .live_events import subscribe
+
+LIVE_STREAM_SECONDS = 55
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000
+# Reconnect delay sent when this process is already at its stream limit
+BUSY_RETRY_MS = 30000
+
+_open_streams = 0
+_open_streams_lock = threading.Lock()
+
+
+def _acquire_stream_slot():
+    global _open_streams
+    with _open_streams_lock:
+        if _open_streams >= getattr(settings, 'LIVE_STREAM_MAX_PER_PROCESS', 4):
+            return None
+        _open_streams += 1
+    released = False
+
+    def release():
+        global _open_streams
+        nonlocal released
+        with _open_streams_lock:
+            if not released:
+                released = True
+                _open_streams -= 1
+    return release
+
+
+def open_stream_count():
+    with _open_streams_lock:
+        return _open_streams
+
+
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, default=str)}\n\n'.encode('utf-8')
+
+
+def event_stream(subscription, duration=None):
+    try:
+        # The stream itself never touches the database; don't hold a connection open
+        if not connection.in_atomic_block:
+            connection.close()
+        yield f'retry: {RETRY_MS}\n\n'.encode('utf-8')
+        yield _sse('ready', {})
+        deadline = time.monotonic() + (duration or LIVE_STREAM_SECONDS)
+        while (remaining := deadline - time.monotonic()) > 0:
+            message = subscription.get(timeout=min(HEARTBEAT_SECONDS, remaining))
+            if message is None:
+                yield b': ping\n\n'
+            else:
+                yield _sse(message['topic'], message['data'])
+    finally:
+        subscription.close()
+
+
+class LiveStream:
+    """
+    Streaming body for one client. Django calls close() when the response
+    is done, including when the client went away before the first chunk,
+    when the generator's own finally never runs.
+    """
+
+    def __init__(self, subscription, release, duration=None):
+        self.subscription = subscription
+        self.release = release
+        self._events = event_stream(subscription, duration)
+
+    def __iter__(self):
+        return self._events
+
+    def close(self):
+        self._events.close()
+        self.subscription.close()
+        self.release()
+
+
+def _busy_response():
+    body = [f'retry: {BUSY_RETRY_MS}\n\n'.encode('utf-8'), _sse('busy', {})]
+    return StreamingHttpResponse(iter(body), content_type='text/event-stream')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def live_stream(request):
+    tenant = getattr(request, 'tenant', None)
+    if tenant is None:
+        return Response({'error': 'Tenant required'}, status=400)
+    release = _acquire_stream_slot()
+    if release is None:
+        response = _busy_response()
+    else:
+        # Subscribe before returning so nothing published meanwhile is missed
+        response = StreamingHttpResponse(LiveStream(subscribe(tenant.id), release), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
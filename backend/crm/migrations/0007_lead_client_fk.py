@@ -0,0 +1,54 @@
+"""Turn Lead.client_id into a real FK to bookings.Client, with a (tenant, client) index.
+
+The column keeps its name, so the state change is a rename in place. Ids
+that point at a missing client, or at another tenant's client, are cleared
+first so the constraint can be added.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def clear_dangling_client_ids(apps, schema_editor):
+    Lead = apps.get_model('crm', 'Lead')
+    Client = apps.get_model('bookings', 'Client')
+    Lead.objects.filter(client_id__isnull=False).exclude(
+        Exists(Client.objects.filter(pk=OuterRef('client_id'), tenant_id=OuterRef('tenant_id')))
+    ).update(client_id=None)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('bookings', '0024_demandheatmap'),
+        ('crm', '0006_add_lead_message'),
+    ]
+    operations = [
+        migrations.RunPython(clear_dangling_client_ids, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.AlterField(
+                    model_name='lead',
+                    name='client_id',
+                    field=models.ForeignKey(
+                        db_column='client_id', null=True, blank=True,
+                        on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='bookings.client',
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.RemoveField(model_name='lead', name='client_id'),
+                migrations.AddField(
+                    model_name='lead',
+                    name='client',
+                    field=models.ForeignKey(
+                        blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='leads', to='bookings.client',
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['tenant', 'client'], name='lead_tenant_client_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+"""Search index for leads (see crm.search): tsvector + pg_trgm on PostgreSQL, FTS5 on SQLite."""
+from django.db import migrations
+
+PG_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'ALTER TABLE crm_lead ADD COLUMN IF NOT EXISTS search_vector tsvector',
+    'CREATE INDEX IF NOT EXISTS lead_search_vector_idx ON crm_lead USING GIN (search_vector)',
+    'CREATE INDEX IF NOT EXISTS lead_name_trgm_idx ON crm_lead USING GIN (name gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS lead_email_trgm_idx ON crm_lead USING GIN (email gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS lead_phone_trgm_idx ON crm_lead USING GIN (phone gin_trgm_ops)',
+]
+PG_REVERSE = [
+    'DROP INDEX IF EXISTS lead_phone_trgm_idx',
+    'DROP INDEX IF EXISTS lead_email_trgm_idx',
+    'DROP INDEX IF EXISTS lead_name_trgm_idx',
+    'DROP INDEX IF EXISTS lead_search_vector_idx',
+    'ALTER TABLE crm_lead DROP COLUMN IF EXISTS search_vector',
+]
+SQLITE_FORWARD = [
+    'CREATE VIRTUAL TABLE IF NOT EXISTS crm_lead_fts USING fts5('
+    'tenant_id UNINDEXED, name, email, phone, notes, activity)',
+]
+SQLITE_REVERSE = ['DROP TABLE IF EXISTS crm_lead_fts']
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def forward(apps, schema_editor):
+    from crm.search import refresh_lead_search
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, PG_FORWARD)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+    else:
+        return
+    refresh_lead_search(using=schema_editor.connection)
+
+
+def reverse(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, PG_REVERSE)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('crm', '0007_lead_client_fk'),
+    ]
+    operations = [
+        migrations.RunPython(forward, reverse),
+    ]
@@ -32,12 +32,15 @@ class Lead(models.Model):
     last_contact_date = models.DateField(null=True, blank=True)
     marketing_consent = models.BooleanField(default=False, help_text='GDPR marketing consent')
     # Link to booking client if auto-created
-    client_id = models.IntegerField(null=True, blank=True, help_text='bookings.Client FK')
+    client = models.ForeignKey(
+        'bookings.Client', on_delete=models.SET_NULL, null=True, blank=True, related_name='leads',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['tenant', 'client'], name='lead_tenant_client_idx')]
 
     def __str__(self):
         return f'{self.name} ({self.status})'
@@ -0,0 +1,116 @@
+"""
+Ranked lead search over names, contact details, notes and the activity feed.
+
+PostgreSQL: crm_lead.search_vector (tsvector; not a model field) holds the
+lead's name, email and phone (weight A), its notes and tags (B), and the
+text of its LeadNotes and LeadMessages (C). A GIN index serves @@ matches;
+pg_trgm GIN indexes on name/email/phone catch typos and partial numbers.
+Rank is ts_rank_cd plus the best trigram similarity.
+
+SQLite (local dev and tests): the same text lives in the FTS5 table
+crm_lead_fts, keyed by lead id, ranked with bm25.
+
+Both are created by migration 0008 and refreshed from crm.signals whenever a
+lead, note or message changes; bulk writes call refresh_lead_search().
+"""
+import re
+
+from django.db import connection
+
+SEARCH_MAX_LIMIT = 100
+
+# Column weights for bm25(): tenant_id, name, email, phone, notes, activity
+_FTS_WEIGHTS = '0, 10.0, 8.0, 8.0, 3.0, 1.0'
+
+_PG_REFRESH = """
+    UPDATE crm_lead l SET search_vector =
+        setweight(to_tsvector('simple', concat_ws(' ', l.name, l.email, l.phone)), 'A')
+        || setweight(to_tsvector('english', concat_ws(' ', l.notes, l.tags)), 'B')
+        || setweight(to_tsvector('english', concat_ws(' ',
+            (SELECT string_agg(n.text, ' ') FROM crm_leadnote n WHERE n.lead_id = l.id),
+            (SELECT string_agg(concat_ws(' ', m.subject, m.body), ' ') FROM crm_leadmessage m WHERE m.lead_id = l.id)
+        )), 'C')
+"""
+
+_FTS_INSERT = """
+    INSERT INTO crm_lead_fts (rowid, tenant_id, name, email, phone, notes, activity)
+    SELECT l.id, l.tenant_id, l.name, l.email, l.phone, l.notes || ' ' || l.tags,
+        coalesce((SELECT group_concat(n.text, ' ') FROM crm_leadnote n WHERE n.lead_id = l.id), '') || ' ' ||
+        coalesce((SELECT group_concat(m.subject || ' ' || m.body, ' ') FROM crm_leadmessage m WHERE m.lead_id = l.id), '')
+    FROM crm_lead l
+"""
+
+
+def refresh_lead_search(lead_ids=None, using=None):
+    """Rebuild the search text for the given leads (every lead if None)."""
+    conn = using or connection
+    if lead_ids is not None:
+        lead_ids = list(lead_ids)
+        if not lead_ids:
+            return
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            if lead_ids is None:
+                cursor.execute(_PG_REFRESH)
+            else:
+                cursor.execute(_PG_REFRESH + ' WHERE l.id = ANY(%s)', [lead_ids])
+        elif conn.vendor == 'sqlite':
+            if lead_ids is None:
+                cursor.execute('DELETE FROM crm_lead_fts')
+                cursor.execute(_FTS_INSERT)
+            else:
+                marks = ', '.join(['%s'] * len(lead_ids))
+                cursor.execute(f'DELETE FROM crm_lead_fts WHERE rowid IN ({marks})', lead_ids)
+                cursor.execute(f'{_FTS_INSERT} WHERE l.id IN ({marks})', lead_ids)
+
+
+def forget_lead(lead_id):
+    """Drop a deleted lead from the SQLite index (Postgres drops it with the row)."""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM crm_lead_fts WHERE rowid = %s', [lead_id])
+
+
+def _fts_query(text):
+    """User text as an FTS5 query: every word, as a prefix, must appear."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+def search_leads(tenant_id, text, limit=20, offset=0):
+    """(total matches, [(lead_id, rank)]) for one page of the best matches first."""
+    text = (text or '').strip()
+    if not text:
+        return 0, []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            where = """
+                FROM crm_lead l, (
+                    SELECT websearch_to_tsquery('english', %(q)s) || websearch_to_tsquery('simple', %(q)s) AS query
+                ) q
+                WHERE l.tenant_id = %(tenant)s AND (
+                    l.search_vector @@ q.query OR l.name %% %(q)s OR l.email %% %(q)s
+                    OR l.email ILIKE %(contains)s OR l.phone ILIKE %(contains)s
+                )
+            """
+            params = {'q': text, 'tenant': tenant_id, 'contains': f'%{text}%', 'limit': limit, 'offset': offset}
+            cursor.execute(f'SELECT count(*) {where}', params)
+            total = cursor.fetchone()[0]
+            cursor.execute(f"""
+                SELECT l.id, ts_rank_cd(l.search_vector, q.query)
+                    + greatest(similarity(l.name, %(q)s), similarity(l.email, %(q)s), similarity(l.phone, %(q)s)) AS rank
+                {where}
+                ORDER BY rank DESC, l.id DESC LIMIT %(limit)s OFFSET %(offset)s
+            """, params)
+        else:
+            match = _fts_query(text)
+            if not match:
+                return 0, []
+            where = 'FROM crm_lead_fts WHERE crm_lead_fts MATCH %s AND tenant_id = %s'
+            cursor.execute(f'SELECT count(*) {where}', [match, tenant_id])
+            total = cursor.fetchone()[0]
+            # bm25 is lower-is-better; negate so rank means the same on both backends
+            cursor.execute(f"""
+                SELECT rowid, -bm25(crm_lead_fts, {_FTS_WEIGHTS}) AS rank {where}
+                ORDER BY rank DESC, rowid DESC LIMIT %s OFFSET %s
+            """, [match, tenant_id, limit, offset])
+        return total, [(lead_id, float(rank)) for lead_id, rank in cursor.fetchall()]
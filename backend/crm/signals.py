@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender='crm.Lead')
+@receiver(post_delete, sender='crm.Lead')
+@receiver(post_save, sender='bookings.Booking')
+@receiver(post_delete, sender='bookings.Booking')
+def invalidate_revenue_stats(sender, instance, **kwargs):
+    from core import tenant_cache
+    from .views import REVENUE_CACHE_NAMESPACE
+    tenant_cache.bump(REVENUE_CACHE_NAMESPACE, instance.tenant_id)
+
+
+# Saves touching none of these leave the lead's search text unchanged
+_SEARCH_FIELDS = {'name', 'email', 'phone', 'notes', 'tags'}
+
+
+@receiver(post_save, sender='crm.Lead')
+def refresh_search_on_lead_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not (_SEARCH_FIELDS & set(update_fields))):
+        return
+    from .search import refresh_lead_search
+    refresh_lead_search([instance.pk])
+
+
+@receiver(post_delete, sender='crm.Lead')
+def forget_search_on_lead_delete(sender, instance, **kwargs):
+    from .search import forget_lead
+    forget_lead(instance.pk)
+
+
+@receiver(post_save, sender='crm.LeadNote')
+@receiver(post_delete, sender='crm.LeadNote')
+@receiver(post_save, sender='crm.LeadMessage')
+@receiver(post_delete, sender='crm.LeadMessage')
+def refresh_search_on_activity(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .search import refresh_lead_search
+    refresh_lead_search([instance.lead_id])
@@ -0,0 +1,73 @@
+"""
+Create CRM leads for booking clients that don't have one yet.
+
+Set-based: one anti-join query finds the clients without a lead, already
+annotated with their booking counts and value, and the new leads and their
+history rows go in with bulk_create. Used by POST /api/crm/sync/ and the
+sync_crm_leads command that runs on every boot.
+"""
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+
+from .models import Lead, LeadHistory
+
+BATCH_SIZE = 1000
+
+
+def clients_without_leads(tenant=None):
+    """Booking clients with no lead in their tenant, annotated with booking stats."""
+    from bookings.models import Client
+
+    counted = Q(bookings__status__in=['confirmed', 'completed'])
+    qs = Client.objects.all() if tenant is None else Client.objects.filter(tenant=tenant)
+    return (
+        qs.filter(~Exists(Lead.objects.filter(tenant_id=OuterRef('tenant_id'), client_id=OuterRef('pk'))))
+        .annotate(
+            booking_count=Count('bookings', filter=counted),
+            completed_count=Count('bookings', filter=Q(bookings__status='completed')),
+            confirmed_count=Count('bookings', filter=Q(bookings__status='confirmed')),
+            booking_value=Sum('bookings__service__price', filter=counted),
+        )
+        .order_by('pk')
+    )
+
+
+def sync_leads_from_bookings(tenant=None):
+    """Create a lead for every client without one (all tenants if `tenant` is None). Returns the count."""
+    leads, history = [], []
+    for client in clients_without_leads(tenant).iterator(chunk_size=BATCH_SIZE):
+        if client.completed_count:
+            lead_status = 'CONVERTED'
+        elif client.confirmed_count:
+            lead_status = 'QUALIFIED'
+        else:
+            lead_status = 'NEW'
+        lead = Lead(
+            tenant_id=client.tenant_id,
+            name=client.name,
+            email=client.email,
+            phone=client.phone,
+            source='booking',
+            status=lead_status,
+            value_pence=int((client.booking_value or 0) * 100),
+            notes=f'Auto-imported from bookings. {client.booking_count} booking(s).',
+            client_id=client.id,
+        )
+        leads.append(lead)
+        history.append(LeadHistory(
+            lead=lead, action='Synced from bookings',
+            detail=f'{client.booking_count} booking(s), £{lead.value_pence / 100:.2f}',
+        ))
+
+    # Both backends we run on return the new primary keys, so history can follow
+    Lead.objects.bulk_create(leads, batch_size=BATCH_SIZE)
+    LeadHistory.objects.bulk_create(history, batch_size=BATCH_SIZE)
+
+    # bulk_create sends no post_save, so index the leads and invalidate the revenue stats here
+    from core import tenant_cache
+    from .search import refresh_lead_search
+    from .views import REVENUE_CACHE_NAMESPACE
+    for start in range(0, len(leads), BATCH_SIZE):
+        refresh_lead_search(lead.pk for lead in leads[start:start + BATCH_SIZE])
+    for tenant_id in {lead.tenant_id for lead in leads}:
+        tenant_cache.bump(REVENUE_CACHE_NAMESPACE, tenant_id)
+    return len(leads)
@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path('leads/', views.list_leads, name='crm-leads'),
+    path('search/', views.search_leads, name='crm-search'),
     path('leads/create/', views.create_lead, name='crm-lead-create'),
     path('leads/quick-add/', views.quick_add, name='crm-quick-add'),
     path('leads/export/', views.export_leads_csv, name='crm-leads-export'),
@@ -1,6 +1,4 @@
-import csv
 from datetime import timedelta
-from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -40,15 +38,43 @@ def _serialize_lead(lead):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_leads(request):
+    """GET /api/crm/leads/ — ?status=, ?fields=; ?page_size=/?cursor= pages newest first."""
+    from core.pagination import KeysetPagination, list_response, pick_fields, requested_fields
+
     tenant = getattr(request, 'tenant', None)
     qs = Lead.objects.filter(tenant=tenant)
     status_filter = request.query_params.get('status')
     if status_filter and status_filter != 'ALL':
         qs = qs.filter(status=status_filter)
+    if KeysetPagination.requested(request):
+        # sort_priority depends on today's date, so pages follow the primary key instead
+        return list_response(request, qs, lambda page: [_serialize_lead(l) for l in page])
     leads = [_serialize_lead(l) for l in qs]
     # Default sort: most important first
     leads.sort(key=lambda x: x['sort_priority'])
-    return Response(leads)
+    return Response(pick_fields(leads, requested_fields(request)))
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search_leads(request):
+    """GET /api/crm/search/?q=&limit=20&offset=0 — Ranked search over leads, their notes and messages."""
+    from .search import SEARCH_MAX_LIMIT, search_leads as run_search
+
+    tenant = getattr(request, 'tenant', None)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), SEARCH_MAX_LIMIT)
+        offset = max(int(request.query_params.get('offset', 0)), 0)
+    except ValueError:
+        return Response({'error': 'limit and offset must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    query = request.query_params.get('q', '')
+    total, hits = run_search(tenant.id if tenant else None, query, limit=limit, offset=offset)
+    leads = Lead.objects.in_bulk([lead_id for lead_id, _ in hits])
+    results = [
+        {**_serialize_lead(leads[lead_id]), 'rank': round(rank, 4)}
+        for lead_id, rank in hits if lead_id in leads
+    ]
+    return Response({'query': query, 'count': total, 'limit': limit, 'offset': offset, 'results': results})
 
 
 @api_view(['POST'])
@@ -179,8 +205,8 @@ def action_convert(request, lead_id):
                     'notes': f'Converted from CRM lead #{lead.id}',
                 }
             )
-            lead.client_id = client.id
-            lead.save(update_fields=['client_id'])
+            lead.client = client
+            lead.save(update_fields=['client'])
             if created:
                 _log_history(lead, 'Client record created', f'Client #{client.id}')
         except Exception:
@@ -313,89 +339,111 @@ def lead_history(request, lead_id):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def export_leads_csv(request):
-    """GET /api/crm/leads/export/ — Download all leads as CSV"""
+    """GET /api/crm/leads/export/ — Download all leads as CSV (streamed)"""
+    from core.csv_export import EXPORT_CHUNK_SIZE, streaming_csv_response
+
     tenant = getattr(request, 'tenant', None)
     leads = Lead.objects.filter(tenant=tenant)
     status_filter = request.query_params.get('status')
     if status_filter and status_filter != 'ALL':
         leads = leads.filter(status=status_filter)
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="crm_leads_{timezone.now().strftime("%Y%m%d")}.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(['Name', 'Email', 'Phone', 'Value (£)', 'Status', 'Source', 'Consent', 'Follow Up', 'Notes', 'Created'])
-    for lead in leads:
-        writer.writerow([
-            lead.name,
-            lead.email,
-            lead.phone,
-            f'{lead.value_pence / 100:.2f}',
-            lead.status,
-            lead.source,
-            'Yes' if lead.marketing_consent else 'No',
-            lead.follow_up_date.isoformat() if lead.follow_up_date else '',
-            lead.notes,
-            lead.created_at.strftime('%Y-%m-%d %H:%M'),
-        ])
-    return response
+    def rows():
+        for name, email, phone, value_pence, lead_status, source, consent, follow_up, notes, created in (
+            leads.values_list(
+                'name', 'email', 'phone', 'value_pence', 'status', 'source',
+                'marketing_consent', 'follow_up_date', 'notes', 'created_at',
+            ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        ):
+            yield [
+                name,
+                email,
+                phone,
+                f'{value_pence / 100:.2f}',
+                lead_status,
+                source,
+                'Yes' if consent else 'No',
+                follow_up.isoformat() if follow_up else '',
+                notes,
+                created.strftime('%Y-%m-%d %H:%M'),
+            ]
+
+    return streaming_csv_response(
+        request, f'crm_leads_{timezone.now().strftime("%Y%m%d")}.csv',
+        ['Name', 'Email', 'Phone', 'Value (£)', 'Status', 'Source', 'Consent', 'Follow Up', 'Notes', 'Created'],
+        rows(),
+    )
 
 
 # --- Revenue Tracking ---
 
+# Lead and Booking writes bump this tenant_cache namespace (see crm.signals)
+REVENUE_CACHE_NAMESPACE = 'crm_revenue'
+REVENUE_CACHE_TIMEOUT = 300
+
+FUNNEL_STAGES = ['NEW', 'CONTACTED', 'QUALIFIED', 'CONVERTED', 'LOST']
+OPEN_STAGES = ('NEW', 'CONTACTED', 'QUALIFIED')
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def revenue_stats(request):
     """GET /api/crm/revenue/ — Pipeline forecast, source attribution, conversion funnel."""
-    from collections import defaultdict
-    from bookings.models import Client, Booking
+    from core import tenant_cache
 
     tenant = getattr(request, 'tenant', None)
-    leads = Lead.objects.filter(tenant=tenant)
+    tenant_id = tenant.id if tenant else None
+    return Response(tenant_cache.get_or_set(
+        REVENUE_CACHE_NAMESPACE, tenant_id, None, lambda: _revenue_stats(tenant), REVENUE_CACHE_TIMEOUT,
+    ))
+
+
+def _revenue_stats(tenant):
+    """One grouped query over leads by (source, status); converted leads carry
+    their client's booking revenue through a correlated aggregate."""
+    from django.db.models import Count, DecimalField, OuterRef, Q, Subquery, Sum
+    from bookings.models import Booking
 
-    # --- Per-lead revenue enrichment ---
-    client_ids = [l.client_id for l in leads if l.client_id]
-    clients_by_id = {}
-    if client_ids:
-        clients_by_id = {c.id: c for c in Client.objects.filter(id__in=client_ids, tenant=tenant)}
-
-    # Booking aggregates per client
-    booking_stats = {}
-    if client_ids:
-        from django.db.models import Sum, Count, Max, Q
-        qs = Booking.objects.filter(
-            client_id__in=client_ids, tenant=tenant
-        ).values('client_id').annotate(
-            total_bookings=Count('id'),
-            completed_bookings=Count('id', filter=Q(status='completed')),
-            total_revenue=Sum('payment_amount', filter=Q(status__in=['completed', 'confirmed'])),
-            last_booking=Max('start_time'),
+    client_revenue = (
+        Booking.objects.filter(
+            tenant=tenant, client_id=OuterRef('client_id'), status__in=['completed', 'confirmed'],
         )
-        for row in qs:
-            booking_stats[row['client_id']] = row
-
-    # --- Pipeline forecast ---
-    pipeline_value = 0
-    converted_revenue = 0
-    for l in leads:
-        if l.status in ('NEW', 'CONTACTED', 'QUALIFIED'):
-            pipeline_value += l.value_pence
-        if l.status == 'CONVERTED' and l.client_id and l.client_id in booking_stats:
-            rev = booking_stats[l.client_id].get('total_revenue') or 0
-            converted_revenue += int(float(rev) * 100)  # Decimal → pence
-
-    # --- Source attribution ---
-    source_stats = defaultdict(lambda: {'leads': 0, 'converted': 0, 'revenue_pence': 0, 'pipeline_pence': 0})
-    for l in leads:
-        s = source_stats[l.source]
-        s['leads'] += 1
-        if l.status == 'CONVERTED':
-            s['converted'] += 1
-            if l.client_id and l.client_id in booking_stats:
-                rev = booking_stats[l.client_id].get('total_revenue') or 0
-                s['revenue_pence'] += int(float(rev) * 100)
-        elif l.status != 'LOST':
-            s['pipeline_pence'] += l.value_pence
+        .order_by().values('client_id')
+        .annotate(total=Sum('payment_amount')).values('total')
+    )
+    rows = (
+        Lead.objects.filter(tenant=tenant)
+        .values('source', 'status')
+        .annotate(
+            leads=Count('id'),
+            value_pence=Sum('value_pence'),
+            revenue=Sum(
+                Subquery(client_revenue, output_field=DecimalField(max_digits=12, decimal_places=2)),
+                filter=Q(status='CONVERTED', client_id__isnull=False),
+            ),
+        )
+        .order_by()
+    )
+
+    funnel = {s: {'count': 0, 'value_pence': 0} for s in FUNNEL_STAGES}
+    source_stats = {}
+    pipeline_value = converted_revenue = 0
+    for row in rows:
+        revenue_pence = int((row['revenue'] or 0) * 100)  # Decimal → pence
+        stage = funnel.setdefault(row['status'], {'count': 0, 'value_pence': 0})
+        stage['count'] += row['leads']
+        stage['value_pence'] += row['value_pence']
+
+        src = source_stats.setdefault(row['source'], {'leads': 0, 'converted': 0, 'revenue_pence': 0, 'pipeline_pence': 0})
+        src['leads'] += row['leads']
+        if row['status'] == 'CONVERTED':
+            src['converted'] += row['leads']
+            src['revenue_pence'] += revenue_pence
+            converted_revenue += revenue_pence
+        elif row['status'] != 'LOST':
+            src['pipeline_pence'] += row['value_pence']
+        if row['status'] in OPEN_STAGES:
+            pipeline_value += row['value_pence']
 
     source_list = []
     for source, data in sorted(source_stats.items(), key=lambda x: -x[1]['revenue_pence']):
@@ -409,48 +457,39 @@ def revenue_stats(request):
             'pipeline_pence': data['pipeline_pence'],
         })
 
-    # --- Conversion funnel ---
-    funnel = {}
-    for s in ['NEW', 'CONTACTED', 'QUALIFIED', 'CONVERTED', 'LOST']:
-        stage_leads = [l for l in leads if l.status == s]
-        stage_value = sum(l.value_pence for l in stage_leads)
-        funnel[s] = {'count': len(stage_leads), 'value_pence': stage_value}
-
-    total_leads = leads.count()
+    total_leads = sum(stage['count'] for stage in funnel.values())
     converted_count = funnel['CONVERTED']['count']
     overall_conversion_rate = round((converted_count / total_leads * 100) if total_leads > 0 else 0, 1)
 
-    return Response({
+    return {
         'pipeline_value_pence': pipeline_value,
         'converted_revenue_pence': converted_revenue,
         'total_leads': total_leads,
         'overall_conversion_rate': overall_conversion_rate,
         'sources': source_list,
         'funnel': funnel,
-    })
+    }
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def lead_revenue(request, lead_id):
     """GET /api/crm/leads/<id>/revenue/ — Per-lead revenue: client stats + booking history."""
-    from bookings.models import Client, Booking
+    from bookings.models import Booking
 
     tenant = getattr(request, 'tenant', None)
     try:
-        lead = Lead.objects.get(id=lead_id, tenant=tenant)
+        lead = Lead.objects.select_related('client').get(id=lead_id, tenant=tenant)
     except Lead.DoesNotExist:
         return Response({'error': 'Lead not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    if not lead.client_id:
+    client = lead.client
+    if client is None:
         return Response({
             'linked': False,
             'message': 'No client record linked',
         })
-
-    try:
-        client = Client.objects.get(id=lead.client_id, tenant=tenant)
-    except Client.DoesNotExist:
+    if client.tenant_id != lead.tenant_id:
         return Response({'linked': False, 'message': 'Client record not found'})
 
     bookings = Booking.objects.filter(client=client, tenant=tenant).select_related('service').order_by('-start_time')
@@ -489,38 +528,12 @@ def sync_from_bookings(request):
     """POST /api/crm/sync/ — Create leads from booking clients that don't already exist"""
     import traceback
     try:
-        from bookings.models import Client, Booking
+        from .sync import sync_leads_from_bookings
 
-        created_count = 0
         tenant = getattr(request, 'tenant', None)
-        for client in Client.objects.filter(tenant=tenant):
-            if Lead.objects.filter(tenant=tenant, client_id=client.id).exists():
-                continue
-            # Calculate total booking value for this client
-            total_pence = 0
-            bookings = Booking.objects.filter(client=client, status__in=['confirmed', 'completed'])
-            for b in bookings:
-                if b.service:
-                    total_pence += b.service.price_pence
-
-            lead_status = 'CONVERTED' if bookings.filter(status='completed').exists() else 'NEW'
-            if bookings.filter(status='confirmed').exists() and lead_status == 'NEW':
-                lead_status = 'QUALIFIED'
-
-            lead = Lead.objects.create(
-                tenant=tenant,
-                name=client.name,
-                email=client.email,
-                phone=client.phone,
-                source='booking',
-                status=lead_status,
-                value_pence=total_pence,
-                notes=f'Auto-imported from bookings. {bookings.count()} booking(s).',
-                client_id=client.id,
-            )
-            _log_history(lead, 'Synced from bookings', f'{bookings.count()} booking(s), £{total_pence/100:.2f}')
-            created_count += 1
-
+        if tenant is None:
+            return Response({'error': 'Tenant required'}, status=status.HTTP_400_BAD_REQUEST)
+        created_count = sync_leads_from_bookings(tenant)
         return Response({'created': created_count, 'message': f'{created_count} leads synced from bookings'})
     except Exception as e:
         return Response({'error': str(e), 'traceback': traceback.format_exc()}, status=500)
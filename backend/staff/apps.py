@@ -5,3 +5,6 @@ class StaffConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'staff'
     verbose_name = 'Staff Management'
+
+    def ready(self):
+        import staff.signals  # noqa: F401
@@ -0,0 +1,111 @@
+"""
+One person across the bookings and staff modules.
+
+bookings.Staff (who takes appointments, with its own timesheets and leave)
+and staff.StaffProfile (HR: rota, timesheets, leave, absence) are separate
+records for the same people. StaffProfile.booking_staff links the two, so a
+cross-module question is one join rather than matching names in Python.
+
+link_booking_staff() fills the link for existing rows: by email first, then
+by a name that matches exactly one record. Blank emails and names never
+match. Signals in staff.signals link each new row with link_staff_record(),
+which applies the same rules to that one row.
+"""
+from django.apps import apps as global_apps
+from django.db.models import Q
+
+
+def link_booking_staff(tenant_id=None, apps=global_apps):
+    """Link unlinked StaffProfiles to their bookings.Staff record. Returns the number linked.
+    `apps` lets the data migration run this against historical models."""
+    StaffProfile = apps.get_model('staff', 'StaffProfile')
+    BookingStaff = apps.get_model('bookings', 'Staff')
+
+    profiles = StaffProfile.objects.filter(booking_staff__isnull=True).select_related('user')
+    staff_qs = BookingStaff.objects.filter(staff_profile__isnull=True)
+    if tenant_id is not None:
+        profiles = profiles.filter(tenant_id=tenant_id)
+        staff_qs = staff_qs.filter(tenant_id=tenant_id)
+
+    by_email, by_name = {}, {}
+    for s in staff_qs:
+        email, name = _clean(s.email), _clean(s.name)
+        if email:
+            by_email[(s.tenant_id, email)] = s
+        if name:
+            by_name.setdefault((s.tenant_id, name), []).append(s)
+
+    linked = 0
+    taken = set()
+    for profile in profiles:
+        match = None
+        email, name = _clean(profile.user.email), _clean(profile.display_name)
+        if email:
+            match = by_email.get((profile.tenant_id, email))
+        if match is None and name:
+            named = by_name.get((profile.tenant_id, name), [])
+            match = named[0] if len(named) == 1 else None
+        if match is None or match.id in taken:
+            continue
+        taken.add(match.id)
+        StaffProfile.objects.filter(pk=profile.pk).update(booking_staff=match)
+        linked += 1
+    return linked
+
+
+def _clean(value):
+    return (value or '').strip().lower()
+
+
+def link_staff_record(instance):
+    """
+    Link a just-created StaffProfile or bookings.Staff to its unlinked
+    counterpart in the same tenant, using link_booking_staff's rules but
+    querying for this one row instead of rescanning the tenant.
+    """
+    from bookings.models import Staff as BookingStaff
+    from .models import StaffProfile
+
+    unlinked_staff = BookingStaff.objects.filter(tenant_id=instance.tenant_id, staff_profile__isnull=True)
+    if isinstance(instance, StaffProfile):
+        profile = instance
+        email, name = _clean(instance.user.email), _clean(instance.display_name)
+        match = unlinked_staff.filter(email__iexact=email).first() if email else None
+        if match is None and name:
+            named = list(unlinked_staff.filter(name__iexact=name)[:2])
+            match = named[0] if len(named) == 1 else None
+    else:
+        match = instance
+        email, name = _clean(instance.email), _clean(instance.name)
+        profiles = StaffProfile.objects.filter(tenant_id=instance.tenant_id, booking_staff__isnull=True)
+        profile = profiles.filter(user__email__iexact=email).first() if email else None
+        if profile is None and name and unlinked_staff.filter(name__iexact=name).count() == 1:
+            profile = profiles.filter(display_name__iexact=name).first()
+    if match is None or profile is None:
+        return False
+    return StaffProfile.objects.filter(pk=profile.pk, booking_staff__isnull=True).update(booking_staff=match) == 1
+
+
+def booking_staff_off(tenant, day):
+    """
+    Ids of bookings.Staff who are off on `day` in either module: approved
+    leave (or sick leave not yet approved) from the bookings module, plus
+    approved leave and absences recorded against their StaffProfile.
+    """
+    from bookings.models_availability import LeaveRequest as BookingLeave
+    from bookings.utils import day_range
+    from .models import AbsenceRecord, LeaveRequest
+
+    day_start, day_end = day_range(day)
+    booking_leave = BookingLeave.objects.filter(
+        Q(status='APPROVED') | Q(leave_type='SICK', status='REQUESTED'),
+        staff_member__tenant=tenant, start_datetime__lt=day_end, end_datetime__gt=day_start,
+    ).order_by().values_list('staff_member_id')
+    profile_leave = LeaveRequest.objects.filter(
+        staff__tenant=tenant, staff__booking_staff__isnull=False,
+        status='APPROVED', start_date__lte=day, end_date__gte=day,
+    ).order_by().values_list('staff__booking_staff_id')
+    absences = AbsenceRecord.objects.filter(
+        staff__tenant=tenant, staff__booking_staff__isnull=False, record_type='ABSENCE', date=day,
+    ).order_by().values_list('staff__booking_staff_id')
+    return {sid for (sid,) in booking_leave.union(profile_leave, absences)}
@@ -7,42 +7,81 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from django.conf import settings
 
-logger = logging.getLogger(__name__)
-
+from core.email_templates import brand_for_tenant, register_template, render
 
-def send_welcome_email(user, temp_password, login_url):
-    """Send a branded welcome email to a new staff member with their login credentials."""
-    brand_name = getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
-    to_email = user.email
-    to_name = user.first_name or user.username
-    subject = f'Welcome to {brand_name} — Your Login Details'
+logger = logging.getLogger(__name__)
 
-    html = f"""<!DOCTYPE html>
+WELCOME_HTML = """<!DOCTYPE html>
 <html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"></head>
 <body style="margin:0;padding:0;background:#f8fafc;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;">
 <div style="max-width:520px;margin:0 auto;padding:20px;">
   <div style="background:#0f172a;border-radius:12px 12px 0 0;padding:24px 28px;text-align:center;">
-    <h1 style="margin:0;color:#f8fafc;font-size:20px;font-weight:700;">{brand_name}</h1>
+    <h1 style="margin:0;color:#f8fafc;font-size:20px;font-weight:700;">$brand_name</h1>
   </div>
   <div style="background:#ffffff;padding:28px;border-left:1px solid #e2e8f0;border-right:1px solid #e2e8f0;">
-    <h2 style="margin:0 0 12px;color:#0f172a;font-size:18px;">Welcome, {to_name}!</h2>
+    <h2 style="margin:0 0 12px;color:#0f172a;font-size:18px;">Welcome, $to_name!</h2>
     <p style="margin:0 0 20px;color:#334155;font-size:15px;line-height:1.6;">Your account has been created. Use the details below to log in for the first time. You will be asked to set your own password.</p>
     <div style="background:#f1f5f9;border-radius:8px;padding:16px;margin-bottom:20px;">
-      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Login URL:</strong> <a href="{login_url}" style="color:#6366f1;">{login_url}</a></p>
-      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Email:</strong> {to_email}</p>
-      <p style="margin:0;font-size:14px;color:#334155;"><strong>Temporary Password:</strong> <code style="font-size:16px;font-weight:700;color:#0f172a;">{temp_password}</code></p>
+      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Login URL:</strong> <a href="$login_url" style="color:$brand_accent;">$login_url</a></p>
+      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Email:</strong> $to_email</p>
+      <p style="margin:0;font-size:14px;color:#334155;"><strong>Temporary Password:</strong> <code style="font-size:16px;font-weight:700;color:#0f172a;">$temp_password</code></p>
     </div>
     <div style="text-align:center;margin:24px 0;">
-      <a href="{login_url}" style="display:inline-block;padding:12px 32px;background:#6366f1;color:#ffffff;text-decoration:none;border-radius:8px;font-weight:700;font-size:15px;">Log In Now</a>
+      <a href="$login_url" style="display:inline-block;padding:12px 32px;background:$brand_accent;color:#ffffff;text-decoration:none;border-radius:8px;font-weight:700;font-size:15px;">Log In Now</a>
     </div>
     <p style="margin:0;color:#94a3b8;font-size:13px;">If you have any questions, please contact your manager.</p>
   </div>
   <div style="background:#f1f5f9;border-radius:0 0 12px 12px;padding:16px 28px;border:1px solid #e2e8f0;border-top:none;">
-    <p style="margin:0;color:#94a3b8;font-size:11px;text-align:center;">{brand_name} &middot; Secure account management</p>
+    <p style="margin:0;color:#94a3b8;font-size:11px;text-align:center;">$brand_name &middot; Secure account management</p>
   </div>
 </div>
 </body></html>"""
 
+LEAVE_DECISION_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"></head>
+<body style="margin:0;padding:0;background:#f8fafc;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;">
+<div style="max-width:520px;margin:0 auto;padding:20px;">
+  <div style="background:#0f172a;border-radius:12px 12px 0 0;padding:24px 28px;text-align:center;">
+    <h1 style="margin:0;color:#f8fafc;font-size:20px;font-weight:700;">$brand_name</h1>
+  </div>
+  <div style="background:#ffffff;padding:28px;border-left:1px solid #e2e8f0;border-right:1px solid #e2e8f0;">
+    <h2 style="margin:0 0 12px;color:#0f172a;font-size:18px;">Leave Request $decision_label</h2>
+    <p style="margin:0 0 20px;color:#334155;font-size:15px;line-height:1.6;">Hi $to_name, your leave request has been <strong style="color:$decision_colour;">$decision_label_lower</strong> by $reviewer_name.</p>
+    <div style="background:#f1f5f9;border-radius:8px;padding:16px;margin-bottom:20px;">
+      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Type:</strong> $leave_type</p>
+      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Dates:</strong> $start to $end</p>
+      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Days:</strong> $days</p>
+      <p style="margin:0;font-size:14px;color:#334155;"><strong>Status:</strong> <span style="color:$decision_colour;font-weight:700;">$decision_label</span></p>
+    </div>
+    $dashboard_button
+    <p style="margin:0;color:#94a3b8;font-size:13px;">If you have any questions, please speak to your manager.</p>
+  </div>
+  <div style="background:#f1f5f9;border-radius:0 0 12px 12px;padding:16px 28px;border:1px solid #e2e8f0;border-top:none;">
+    <p style="margin:0;color:#94a3b8;font-size:11px;text-align:center;">$brand_name</p>
+  </div>
+</div>
+</body></html>"""
+
+DASHBOARD_BUTTON_HTML = '<div style="text-align:center;margin:24px 0;"><a href="$login_url" style="display:inline-block;padding:12px 32px;background:$brand_accent;color:#ffffff;text-decoration:none;border-radius:8px;font-weight:700;font-size:15px;">View in Dashboard</a></div>'
+
+register_template('staff_welcome.html', WELCOME_HTML)
+register_template('staff_leave_decision.html', LEAVE_DECISION_HTML)
+register_template('staff_dashboard_button.html', DASHBOARD_BUTTON_HTML)
+
+
+def send_welcome_email(user, temp_password, login_url):
+    """Send a branded welcome email to a new staff member with their login credentials."""
+    brand = brand_for_tenant(getattr(user, 'tenant', None))
+    brand_name = brand.name
+    to_email = user.email
+    to_name = user.first_name or user.username
+    subject = f'Welcome to {brand_name} — Your Login Details'
+
+    html = render(
+        'staff_welcome.html', brand,
+        to_name=to_name, login_url=login_url, to_email=to_email, temp_password=temp_password,
+    )
+
     text = (
         f"Welcome, {to_name}!\n\n"
         f"Your account has been created.\n\n"
@@ -114,7 +153,8 @@ def send_welcome_email(user, temp_password, login_url):
 
 def send_leave_decision_email(leave, base_url=''):
     """Notify a staff member that their leave request has been approved or declined."""
-    brand_name = getattr(settings, 'EMAIL_BRAND_NAME', 'NBNE Business Platform')
+    brand = brand_for_tenant(getattr(leave.staff, 'tenant', None))
+    brand_name = brand.name
     user = leave.staff.user
     to_email = user.email
     to_name = user.first_name or leave.staff.display_name
@@ -130,30 +170,13 @@ def send_leave_decision_email(leave, base_url=''):
 
     subject = f'Leave Request {decision_label} — {start} to {end}'
 
-    html = f"""<!DOCTYPE html>
-<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"></head>
-<body style="margin:0;padding:0;background:#f8fafc;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;">
-<div style="max-width:520px;margin:0 auto;padding:20px;">
-  <div style="background:#0f172a;border-radius:12px 12px 0 0;padding:24px 28px;text-align:center;">
-    <h1 style="margin:0;color:#f8fafc;font-size:20px;font-weight:700;">{brand_name}</h1>
-  </div>
-  <div style="background:#ffffff;padding:28px;border-left:1px solid #e2e8f0;border-right:1px solid #e2e8f0;">
-    <h2 style="margin:0 0 12px;color:#0f172a;font-size:18px;">Leave Request {decision_label}</h2>
-    <p style="margin:0 0 20px;color:#334155;font-size:15px;line-height:1.6;">Hi {to_name}, your leave request has been <strong style="color:{decision_colour};">{decision_label.lower()}</strong> by {reviewer_name}.</p>
-    <div style="background:#f1f5f9;border-radius:8px;padding:16px;margin-bottom:20px;">
-      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Type:</strong> {leave_type}</p>
-      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Dates:</strong> {start} to {end}</p>
-      <p style="margin:0 0 8px;font-size:14px;color:#334155;"><strong>Days:</strong> {days}</p>
-      <p style="margin:0;font-size:14px;color:#334155;"><strong>Status:</strong> <span style="color:{decision_colour};font-weight:700;">{decision_label}</span></p>
-    </div>
-    {f'<div style="text-align:center;margin:24px 0;"><a href="{login_url}" style="display:inline-block;padding:12px 32px;background:#6366f1;color:#ffffff;text-decoration:none;border-radius:8px;font-weight:700;font-size:15px;">View in Dashboard</a></div>' if login_url else ''}
-    <p style="margin:0;color:#94a3b8;font-size:13px;">If you have any questions, please speak to your manager.</p>
-  </div>
-  <div style="background:#f1f5f9;border-radius:0 0 12px 12px;padding:16px 28px;border:1px solid #e2e8f0;border-top:none;">
-    <p style="margin:0;color:#94a3b8;font-size:11px;text-align:center;">{brand_name}</p>
-  </div>
-</div>
-</body></html>"""
+    dashboard_button = render('staff_dashboard_button.html', brand, login_url=login_url) if login_url else ''
+    html = render(
+        'staff_leave_decision.html', brand,
+        to_name=to_name, decision_label=decision_label, decision_label_lower=decision_label.lower(),
+        decision_colour=decision_colour, reviewer_name=reviewer_name, leave_type=leave_type,
+        start=start, end=end, days=days, dashboard_button=dashboard_button,
+    )
 
     text = (
         f"Hi {to_name},\n\n"
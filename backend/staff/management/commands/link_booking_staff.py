@@ -0,0 +1,31 @@
+"""
+Link StaffProfiles to their bookings.Staff records (see staff.directory).
+
+New records are linked as they are created; run this after bulk imports
+or after fixing an email so the match can be made.
+
+Usage:
+  python manage.py link_booking_staff
+  python manage.py link_booking_staff --tenant salon-x
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from staff.directory import link_booking_staff
+from tenants.models import TenantSettings
+
+
+class Command(BaseCommand):
+    help = 'Link staff profiles to bookings staff records by email or unambiguous name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', type=str, help='Tenant slug (default: all tenants)')
+
+    def handle(self, *args, **options):
+        tenant_id = None
+        if options.get('tenant'):
+            tenant = TenantSettings.objects.filter(slug=options['tenant']).first()
+            if tenant is None:
+                raise CommandError(f"Tenant '{options['tenant']}' not found")
+            tenant_id = tenant.id
+        linked = link_booking_staff(tenant_id=tenant_id)
+        self.stdout.write(self.style.SUCCESS(f'Linked {linked} staff profile(s)'))
@@ -0,0 +1,25 @@
+"""Link each StaffProfile to its bookings.Staff record (by email, else an unambiguous name)."""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_existing(apps, schema_editor):
+    from staff.directory import link_booking_staff
+    link_booking_staff(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0024_demandheatmap'),
+        ('staff', '0007_staffprofile_payroll_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='staffprofile',
+            name='booking_staff',
+            field=models.OneToOneField(blank=True, help_text='Bookings-module staff record for this person', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='staff_profile', to='bookings.staff'),
+        ),
+        migrations.RunPython(link_existing, migrations.RunPython.noop),
+    ]
@@ -10,6 +10,11 @@ class StaffProfile(models.Model):
     ]
     tenant = models.ForeignKey('tenants.TenantSettings', on_delete=models.CASCADE, related_name='staff_profiles')
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='staff_profile')
+    # The same person in the bookings module (see staff.directory)
+    booking_staff = models.OneToOneField(
+        'bookings.Staff', on_delete=models.SET_NULL, null=True, blank=True, related_name='staff_profile',
+        help_text='Bookings-module staff record for this person',
+    )
     display_name = models.CharField(max_length=255)
     phone = models.CharField(max_length=50, blank=True, default='')
     emergency_contact_name = models.CharField(max_length=255, blank=True, default='')
@@ -212,6 +217,16 @@ class ProjectCode(models.Model):
         return f"{self.code} — {self.name}"
 
 
+class TimesheetEntryQuerySet(models.QuerySet):
+    def with_hours(self):
+        """Annotate scheduled_span / actual_span: the hours properties as DB durations."""
+        from core.timesheet_hours import net_duration
+        return self.annotate(
+            scheduled_span=net_duration('scheduled_start', 'scheduled_end', 'scheduled_break_minutes', wrap_midnight=True),
+            actual_span=net_duration('actual_start', 'actual_end', 'actual_break_minutes', wrap_midnight=True),
+        )
+
+
 class TimesheetEntry(models.Model):
     """Daily timesheet entry per staff. Auto-populated from WorkingHours, editable by managers."""
     STATUS_CHOICES = [
@@ -240,6 +255,8 @@ class TimesheetEntry(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TimesheetEntryQuerySet.as_manager()
+
     class Meta:
         db_table = 'staff_timesheet'
         ordering = ['-date', 'staff__display_name']
@@ -249,27 +266,25 @@ class TimesheetEntry(models.Model):
     def __str__(self):
         return f"{self.staff.display_name} — {self.date} ({self.get_status_display()})"
 
-    @property
-    def scheduled_hours(self):
-        if not self.scheduled_start or not self.scheduled_end:
+    @staticmethod
+    def span_hours(day, start_time, end_time, break_minutes):
+        """Hours from start_time to end_time on `day` (wrapping past midnight), less the break."""
+        if not start_time or not end_time:
             return 0
         from datetime import datetime, timedelta
-        start = datetime.combine(self.date, self.scheduled_start)
-        end = datetime.combine(self.date, self.scheduled_end)
+        start = datetime.combine(day, start_time)
+        end = datetime.combine(day, end_time)
         if end < start:
             end += timedelta(days=1)
-        return max(0, (end - start).total_seconds() / 3600 - self.scheduled_break_minutes / 60)
+        return max(0, (end - start).total_seconds() / 3600 - break_minutes / 60)
+
+    @property
+    def scheduled_hours(self):
+        return self.span_hours(self.date, self.scheduled_start, self.scheduled_end, self.scheduled_break_minutes)
 
     @property
     def actual_hours(self):
-        if not self.actual_start or not self.actual_end:
-            return 0
-        from datetime import datetime, timedelta
-        start = datetime.combine(self.date, self.actual_start)
-        end = datetime.combine(self.date, self.actual_end)
-        if end < start:
-            end += timedelta(days=1)
-        return max(0, (end - start).total_seconds() / 3600 - self.actual_break_minutes / 60)
+        return self.span_hours(self.date, self.actual_start, self.actual_end, self.actual_break_minutes)
 
     @property
     def variance_hours(self):
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.pagination import SparseFieldsMixin
 from .models import StaffProfile, Shift, LeaveRequest, TrainingCourse, TrainingRecord, AbsenceRecord, WorkingHours, TimesheetEntry, ProjectCode
 
 
-class StaffProfileSerializer(serializers.ModelSerializer):
+class StaffProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     role = serializers.CharField(source='user.role', read_only=True)
     email = serializers.EmailField(source='user.email', read_only=True)
 
@@ -38,7 +39,7 @@ class ShiftCreateSerializer(serializers.ModelSerializer):
         fields = ['staff', 'date', 'start_time', 'end_time', 'location', 'notes', 'is_published']
 
 
-class LeaveRequestSerializer(serializers.ModelSerializer):
+class LeaveRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     staff_name = serializers.CharField(source='staff.display_name', read_only=True)
     duration_days = serializers.IntegerField(read_only=True)
     reviewed_by_name = serializers.CharField(source='reviewed_by.display_name', read_only=True, default=None)
@@ -78,7 +79,7 @@ class TrainingCourseCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'provider', 'is_mandatory', 'renewal_months', 'reminder_days_before', 'description']
 
 
-class TrainingRecordSerializer(serializers.ModelSerializer):
+class TrainingRecordSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     staff_name = serializers.CharField(source='staff.display_name', read_only=True)
     course_name = serializers.CharField(source='course.name', read_only=True, default=None)
     is_mandatory = serializers.BooleanField(source='course.is_mandatory', read_only=True, default=False)
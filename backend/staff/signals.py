@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender='staff.StaffProfile')
+@receiver(post_save, sender='bookings.Staff')
+def link_new_staff(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    from .directory import link_staff_record
+    link_staff_record(instance)
+
+
+@receiver(post_save, sender='staff.AbsenceRecord')
+@receiver(post_delete, sender='staff.AbsenceRecord')
+@receiver(post_save, sender='staff.LeaveRequest')
+@receiver(post_delete, sender='staff.LeaveRequest')
+def invalidate_operational_events_on_absence(sender, instance, **kwargs):
+    from core.operational_events import invalidate_operational_events
+    from .models import StaffProfile
+    invalidate_operational_events(
+        StaffProfile.objects.filter(pk=instance.staff_id).values_list('tenant_id', flat=True).first()
+    )
@@ -8,6 +8,7 @@ from django.db import transaction
 from accounts.models import User
 from rest_framework.permissions import AllowAny
 from accounts.permissions import IsStaffOrAbove, IsManagerOrAbove, IsOwner
+from core.pagination import list_response
 from .models import StaffProfile, Shift, LeaveRequest, TrainingCourse, TrainingRecord, AbsenceRecord, WorkingHours, TimesheetEntry, ProjectCode
 from .serializers import (
     StaffProfileSerializer, ShiftSerializer, ShiftCreateSerializer,
@@ -29,7 +30,7 @@ def staff_list(request):
     profiles = StaffProfile.objects.select_related('user').filter(tenant=tenant)
     if request.query_params.get('include_inactive') != 'true':
         profiles = profiles.filter(is_active=True)
-    return Response(StaffProfileSerializer(profiles, many=True).data)
+    return list_response(request, profiles, lambda page: StaffProfileSerializer(page, many=True, context={'request': request}).data)
 
 
 @api_view(['GET'])
@@ -288,7 +289,7 @@ def leave_list(request):
     status_filter = request.query_params.get('status')
     if status_filter:
         leaves = leaves.filter(status=status_filter)
-    return Response(LeaveRequestSerializer(leaves, many=True).data)
+    return list_response(request, leaves, lambda page: LeaveRequestSerializer(page, many=True, context={'request': request}).data)
 
 
 @api_view(['GET'])
@@ -398,7 +399,7 @@ def training_list(request):
             records = records.filter(staff=profile)
         except StaffProfile.DoesNotExist:
             return Response([])
-    return Response(TrainingRecordSerializer(records, many=True).data)
+    return list_response(request, records, lambda page: TrainingRecordSerializer(page, many=True, context={'request': request}).data)
 
 
 @api_view(['POST'])
@@ -753,7 +754,7 @@ def timesheet_generate(request):
     Expects: { date_from: 'YYYY-MM-DD', date_to: 'YYYY-MM-DD', staff_id?: <id> }
     Skips dates that already have entries. Creates SCHEDULED entries from WorkingHours.
     """
-    from datetime import datetime, timedelta
+    from datetime import datetime
     date_from_str = request.data.get('date_from')
     date_to_str = request.data.get('date_to')
     if not date_from_str or not date_to_str:
@@ -774,49 +775,79 @@ def timesheet_generate(request):
         staff_filter['staff_id'] = staff_id
 
     tenant = getattr(request, 'tenant', None)
-    all_wh = WorkingHours.objects.filter(is_active=True, staff__tenant=tenant, **staff_filter).select_related('staff')
-    # Group by staff
-    wh_by_staff = {}
-    for wh in all_wh:
-        wh_by_staff.setdefault(wh.staff_id, []).append(wh)
+    all_wh = WorkingHours.objects.filter(is_active=True, staff__tenant=tenant, **staff_filter)
+    created_count, skipped_count = generate_timesheets(all_wh, date_from, date_to)
+    return Response({
+        'detail': f'{created_count} timesheet entries created.',
+        'created': created_count,
+        'skipped': skipped_count,
+    })
+
+
+def _scheduled_shape(day_entries):
+    """(earliest start, latest end, break minutes) for one day's WorkingHours segments.
+    Gaps between split-shift segments count as break."""
+    from datetime import date, datetime
+    segments = sorted(day_entries, key=lambda w: w.start_time)
+    total_break = sum(w.break_minutes for w in segments)
+    for before, after in zip(segments, segments[1:]):
+        gap = datetime.combine(date.min, after.start_time) - datetime.combine(date.min, before.end_time)
+        if gap.total_seconds() > 0:
+            total_break += int(gap.total_seconds() / 60)
+    return (
+        min(w.start_time for w in segments),
+        max(w.end_time for w in segments),
+        total_break,
+    )
+
 
-    created_count = 0
+def generate_timesheets(working_hours, date_from, date_to):
+    """Create SCHEDULED timesheet entries from working hours over a date range.
+    Days that already have an entry are left alone. Returns (created, skipped)."""
+    shapes = {}  # staff_id -> {day_of_week: (start, end, break)}
+    by_day = {}
+    for wh in working_hours:
+        by_day.setdefault((wh.staff_id, wh.day_of_week), []).append(wh)
+    for (sid, dow), day_entries in by_day.items():
+        shapes.setdefault(sid, {})[dow] = _scheduled_shape(day_entries)
+
+    with transaction.atomic():
+        # Concurrent generates for the same staff queue here, so the re-count below is ours alone
+        list(StaffProfile.objects.select_for_update().filter(id__in=shapes).values_list('id', flat=True))
+        return _insert_timesheets(shapes, date_from, date_to)
+
+
+def _insert_timesheets(shapes, date_from, date_to):
+    from datetime import timedelta
+    in_range = TimesheetEntry.objects.filter(staff_id__in=shapes, date__gte=date_from, date__lte=date_to)
+    existing = set(in_range.values_list('staff_id', 'date'))
+    skipped = 0
+    entries = []
     current = date_from
     while current <= date_to:
         dow = current.weekday()  # 0=Monday
-        for staff_id_key, wh_list in wh_by_staff.items():
-            day_entries = [w for w in wh_list if w.day_of_week == dow]
-            if not day_entries:
+        for sid, days in shapes.items():
+            if dow not in days:
+                continue
+            if (sid, current) in existing:
+                skipped += 1
                 continue
-            # Use the first entry for this day (primary shift)
-            wh = day_entries[0]
-            # Combine all segments: earliest start, latest end, sum breaks
-            earliest_start = min(w.start_time for w in day_entries)
-            latest_end = max(w.end_time for w in day_entries)
-            total_break = sum(w.break_minutes for w in day_entries)
-            # Calculate gap between segments as additional break
-            if len(day_entries) > 1:
-                sorted_entries = sorted(day_entries, key=lambda w: w.start_time)
-                for i in range(len(sorted_entries) - 1):
-                    gap_start = datetime.combine(current, sorted_entries[i].end_time)
-                    gap_end = datetime.combine(current, sorted_entries[i + 1].start_time)
-                    if gap_end > gap_start:
-                        total_break += int((gap_end - gap_start).total_seconds() / 60)
-
-            _, created = TimesheetEntry.objects.get_or_create(
-                staff_id=staff_id_key, date=current,
-                defaults={
-                    'scheduled_start': earliest_start,
-                    'scheduled_end': latest_end,
-                    'scheduled_break_minutes': total_break,
-                    'status': 'SCHEDULED',
-                }
-            )
-            if created:
-                created_count += 1
+            start, end, total_break = days[dow]
+            entries.append(TimesheetEntry(
+                staff_id=sid, date=current, scheduled_start=start, scheduled_end=end,
+                scheduled_break_minutes=total_break, status='SCHEDULED',
+            ))
         current += timedelta(days=1)
 
-    return Response({'detail': f'{created_count} timesheet entries created.', 'created': created_count})
+    # ignore_conflicts drops rows another writer (e.g. a clock-in) added meanwhile,
+    # so count what actually landed rather than what we attempted
+    TimesheetEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    created = max(0, in_range.count() - len(existing))
+    return created, skipped + len(entries) - created
+
+
+# Timesheet statuses that count as a day worked
+TIMESHEET_WORKED_STATUSES = ('WORKED', 'LATE', 'LEFT_EARLY', 'AMENDED')
 
 
 @api_view(['GET'])
@@ -856,40 +887,38 @@ def timesheet_summary(request):
     if staff_id:
         qs = qs.filter(staff_id=staff_id)
 
-    entries = qs.select_related('staff')
-    # Aggregate per staff
+    from core.timesheet_hours import to_hours
+
+    # Per-staff totals in one grouped query
+    totals = (
+        qs.with_hours().values('staff_id', 'staff__display_name')
+        .annotate(
+            scheduled=Sum('scheduled_span'),
+            actual=Sum('actual_span'),
+            days_worked=Count('id', filter=Q(status__in=TIMESHEET_WORKED_STATUSES)),
+            days_absent=Count('id', filter=Q(status='ABSENT')),
+            days_sick=Count('id', filter=Q(status='SICK')),
+            days_holiday=Count('id', filter=Q(status='HOLIDAY')),
+        )
+        .order_by('staff__display_name')
+    )
     summary = {}
-    for e in entries:
-        sid = e.staff_id
-        if sid not in summary:
-            summary[sid] = {
-                'staff_id': sid,
-                'staff_name': e.staff.display_name,
-                'scheduled_hours': 0,
-                'actual_hours': 0,
-                'days_worked': 0,
-                'days_absent': 0,
-                'days_sick': 0,
-                'days_holiday': 0,
-                'entries': [],
-            }
-        s = summary[sid]
-        s['scheduled_hours'] += e.scheduled_hours
-        s['actual_hours'] += e.actual_hours
-        if e.status == 'WORKED' or e.status == 'LATE' or e.status == 'LEFT_EARLY' or e.status == 'AMENDED':
-            s['days_worked'] += 1
-        elif e.status == 'ABSENT':
-            s['days_absent'] += 1
-        elif e.status == 'SICK':
-            s['days_sick'] += 1
-        elif e.status == 'HOLIDAY':
-            s['days_holiday'] += 1
-        s['entries'].append(TimesheetEntrySerializer(e).data)
-
-    for s in summary.values():
-        s['scheduled_hours'] = round(s['scheduled_hours'], 2)
-        s['actual_hours'] = round(s['actual_hours'], 2)
-        s['variance_hours'] = round(s['actual_hours'] - s['scheduled_hours'], 2)
+    for t in totals:
+        scheduled, actual = to_hours(t['scheduled']), to_hours(t['actual'])
+        summary[t['staff_id']] = {
+            'staff_id': t['staff_id'],
+            'staff_name': t['staff__display_name'],
+            'scheduled_hours': scheduled,
+            'actual_hours': actual,
+            'days_worked': t['days_worked'],
+            'days_absent': t['days_absent'],
+            'days_sick': t['days_sick'],
+            'days_holiday': t['days_holiday'],
+            'entries': [],
+            'variance_hours': round(actual - scheduled, 2),
+        }
+    for e in qs.select_related('staff'):
+        summary[e.staff_id]['entries'].append(TimesheetEntrySerializer(e).data)
 
     return Response({
         'period': period,
@@ -958,13 +987,62 @@ def project_code_delete(request, pc_id):
 
 # ── Payroll Export (CSV) ─────────────────────────────────────────────────────
 
+TIMESHEET_EXPORT_HEADER = [
+    'Staff Name', 'Date', 'Day', 'Project Code', 'Project Name',
+    'Scheduled Start', 'Scheduled End', 'Scheduled Hours',
+    'Actual Start', 'Actual End', 'Actual Hours',
+    'Variance', 'Status', 'Notes',
+]
+
+
+def timesheet_export_queryset(tenant, date_from, date_to, staff_id=None):
+    qs = TimesheetEntry.objects.filter(
+        staff__tenant=tenant, date__gte=date_from, date__lte=date_to
+    ).order_by('staff__display_name', 'date')
+    if staff_id:
+        qs = qs.filter(staff_id=staff_id)
+    return qs
+
+
+def timesheet_export_rows(qs):
+    """Yield one payroll export row (see TIMESHEET_EXPORT_HEADER) per entry, reading in chunks."""
+    from core.csv_export import EXPORT_CHUNK_SIZE
+
+    day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    status_labels = dict(TimesheetEntry.STATUS_CHOICES)
+    span_hours = TimesheetEntry.span_hours
+    for (staff_name, day, code, code_name, sched_start, sched_end, sched_break,
+         actual_start, actual_end, actual_break, entry_status, notes) in qs.values_list(
+        'staff__display_name', 'date', 'project_code__code', 'project_code__name',
+        'scheduled_start', 'scheduled_end', 'scheduled_break_minutes',
+        'actual_start', 'actual_end', 'actual_break_minutes', 'status', 'notes',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        scheduled = span_hours(day, sched_start, sched_end, sched_break)
+        actual = span_hours(day, actual_start, actual_end, actual_break)
+        yield [
+            staff_name,
+            day.strftime('%d/%m/%Y'),
+            day_names[day.weekday()],
+            code or '',
+            code_name or '',
+            str(sched_start or ''),
+            str(sched_end or ''),
+            f'{scheduled:.2f}',
+            str(actual_start or ''),
+            str(actual_end or ''),
+            f'{actual:.2f}',
+            f'{round(actual - scheduled, 2):+.2f}',
+            status_labels.get(entry_status, entry_status),
+            notes,
+        ]
+
+
 @api_view(['GET'])
 @permission_classes([IsManagerOrAbove])
 def timesheet_export_csv(request):
-    """Export timesheets as CSV for payroll. ?date_from=&date_to=&staff_id="""
-    import csv
-    from django.http import HttpResponse
+    """Export timesheets as CSV for payroll (streamed). ?date_from=&date_to=&staff_id="""
     from datetime import datetime
+    from core.csv_export import streaming_csv_response
 
     tenant = getattr(request, 'tenant', None)
     date_from_str = request.query_params.get('date_from')
@@ -978,46 +1056,11 @@ def timesheet_export_csv(request):
     except ValueError:
         return Response({'error': 'Invalid date format. Use YYYY-MM-DD.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    qs = TimesheetEntry.objects.filter(
-        staff__tenant=tenant, date__gte=date_from, date__lte=date_to
-    ).select_related('staff', 'project_code').order_by('staff__display_name', 'date')
-
-    staff_id = request.query_params.get('staff_id')
-    if staff_id:
-        qs = qs.filter(staff_id=staff_id)
-
-    response = HttpResponse(content_type='text/csv')
-    filename = f'timesheets_{date_from_str}_to_{date_to_str}.csv'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-    writer = csv.writer(response)
-    writer.writerow([
-        'Staff Name', 'Date', 'Day', 'Project Code', 'Project Name',
-        'Scheduled Start', 'Scheduled End', 'Scheduled Hours',
-        'Actual Start', 'Actual End', 'Actual Hours',
-        'Variance', 'Status', 'Notes',
-    ])
-
-    day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    for e in qs:
-        writer.writerow([
-            e.staff.display_name,
-            e.date.strftime('%d/%m/%Y'),
-            day_names[e.date.weekday()],
-            e.project_code.code if e.project_code else '',
-            e.project_code.name if e.project_code else '',
-            str(e.scheduled_start or ''),
-            str(e.scheduled_end or ''),
-            f'{e.scheduled_hours:.2f}',
-            str(e.actual_start or ''),
-            str(e.actual_end or ''),
-            f'{e.actual_hours:.2f}',
-            f'{e.variance_hours:+.2f}',
-            e.get_status_display(),
-            e.notes,
-        ])
-
-    return response
+    qs = timesheet_export_queryset(tenant, date_from, date_to, request.query_params.get('staff_id'))
+    return streaming_csv_response(
+        request, f'timesheets_{date_from_str}_to_{date_to_str}.csv',
+        TIMESHEET_EXPORT_HEADER, timesheet_export_rows(qs),
+    )
 
 
 # ── Payroll Summary (Monthly totals for dashboard) ───────────────────────────
@@ -1046,68 +1089,77 @@ def payroll_summary(request):
     last_day = calendar.monthrange(ref.year, ref.month)[1]
     date_to = ref.replace(day=last_day)
 
+    return Response({
+        'month': date_from.strftime('%Y-%m'),
+        'month_display': date_from.strftime('%B %Y'),
+        **payroll_summary_data(tenant, date_from, date_to),
+    })
+
+
+def payroll_summary_data(tenant, date_from, date_to):
+    """Per-staff totals, project breakdown and grand totals for a date range."""
+    from datetime import timedelta
+    from django.db.models import Case, Count, Q, Sum, When
+    from core.timesheet_hours import to_hours
+
     qs = TimesheetEntry.objects.filter(
         staff__tenant=tenant, date__gte=date_from, date__lte=date_to
-    ).select_related('staff', 'project_code')
+    ).with_hours()
 
     # Per-staff summary
-    staff_totals = {}
-    project_totals = {}
-    grand_scheduled = 0
-    grand_actual = 0
-
-    for e in qs:
-        sid = e.staff_id
-        if sid not in staff_totals:
-            staff_totals[sid] = {
-                'staff_id': sid,
-                'staff_name': e.staff.display_name,
-                'scheduled_hours': 0,
-                'actual_hours': 0,
-                'days_worked': 0,
-                'days_absent': 0,
-            }
-        st = staff_totals[sid]
-        st['scheduled_hours'] += e.scheduled_hours
-        st['actual_hours'] += e.actual_hours
-        if e.status in ('WORKED', 'LATE', 'LEFT_EARLY', 'AMENDED'):
-            st['days_worked'] += 1
-        elif e.status in ('ABSENT', 'SICK'):
-            st['days_absent'] += 1
-
-        grand_scheduled += e.scheduled_hours
-        grand_actual += e.actual_hours
-
-        # Project breakdown
-        pc_key = e.project_code.code if e.project_code else '(No project)'
-        if pc_key not in project_totals:
-            project_totals[pc_key] = {
-                'code': pc_key,
-                'name': e.project_code.name if e.project_code else 'Unassigned',
-                'is_billable': e.project_code.is_billable if e.project_code else False,
-                'total_hours': 0,
-            }
-        project_totals[pc_key]['total_hours'] += e.actual_hours or e.scheduled_hours
-
-    for st in staff_totals.values():
-        st['scheduled_hours'] = round(st['scheduled_hours'], 2)
-        st['actual_hours'] = round(st['actual_hours'], 2)
-        st['variance_hours'] = round(st['actual_hours'] - st['scheduled_hours'], 2)
-
-    for pt in project_totals.values():
-        pt['total_hours'] = round(pt['total_hours'], 2)
+    staff_rows = list(
+        qs.values('staff_id', 'staff__display_name')
+        .annotate(
+            scheduled=Sum('scheduled_span'),
+            actual=Sum('actual_span'),
+            days_worked=Count('id', filter=Q(status__in=TIMESHEET_WORKED_STATUSES)),
+            days_absent=Count('id', filter=Q(status__in=('ABSENT', 'SICK'))),
+        )
+        .order_by('staff__display_name')
+    )
+    staff_summaries = []
+    for r in staff_rows:
+        scheduled, actual = to_hours(r['scheduled']), to_hours(r['actual'])
+        staff_summaries.append({
+            'staff_id': r['staff_id'],
+            'staff_name': r['staff__display_name'],
+            'scheduled_hours': scheduled,
+            'actual_hours': actual,
+            'days_worked': r['days_worked'],
+            'days_absent': r['days_absent'],
+            'variance_hours': round(actual - scheduled, 2),
+        })
+    grand_scheduled = sum((r['scheduled'] for r in staff_rows if r['scheduled']), timedelta(0))
+    grand_actual = sum((r['actual'] for r in staff_rows if r['actual']), timedelta(0))
+
+    # Project breakdown: actual hours where worked, scheduled otherwise
+    project_rows = (
+        qs.annotate(billed_span=Case(
+            When(actual_span__gt=timedelta(0), then='actual_span'), default='scheduled_span',
+        ))
+        .values('project_code__code', 'project_code__name', 'project_code__is_billable')
+        .annotate(total=Sum('billed_span'))
+        .order_by()
+    )
+    project_breakdown = sorted((
+        {
+            'code': p['project_code__code'] or '(No project)',
+            'name': p['project_code__name'] or 'Unassigned',
+            'is_billable': bool(p['project_code__is_billable']),
+            'total_hours': to_hours(p['total']),
+        }
+        for p in project_rows
+    ), key=lambda p: p['code'])
 
-    return Response({
-        'month': date_from.strftime('%Y-%m'),
-        'month_display': date_from.strftime('%B %Y'),
+    return {
         'date_from': str(date_from),
         'date_to': str(date_to),
-        'grand_scheduled_hours': round(grand_scheduled, 2),
-        'grand_actual_hours': round(grand_actual, 2),
-        'staff_count': len(staff_totals),
-        'staff_summaries': sorted(staff_totals.values(), key=lambda s: s['staff_name']),
-        'project_breakdown': sorted(project_totals.values(), key=lambda p: p['code']),
-    })
+        'grand_scheduled_hours': to_hours(grand_scheduled),
+        'grand_actual_hours': to_hours(grand_actual),
+        'staff_count': len(staff_summaries),
+        'staff_summaries': staff_summaries,
+        'project_breakdown': project_breakdown,
+    }
 
 
 # ═══════════════════════════════════════════════════════════
@@ -1122,27 +1174,35 @@ def _week_bounds(ref_date):
     return monday, sunday
 
 
-def _compute_tally(staff_profile, period_start, period_end):
-    """Compute contracted vs actual hours for a staff member over a date range."""
+def _actual_durations(staff_ids, period_start, period_end):
+    """{staff_id: summed actual duration} over a date range, in one grouped query."""
+    from django.db.models import Sum
+    rows = (
+        TimesheetEntry.objects.filter(staff_id__in=staff_ids, date__gte=period_start, date__lte=period_end)
+        .with_hours()
+        .values('staff_id')
+        .annotate(actual=Sum('actual_span'))
+        .order_by()
+    )
+    return {r['staff_id']: r['actual'] for r in rows}
+
+
+def _compute_tally(staff_profile, period_start, period_end, actual=None):
+    """Compute contracted vs actual hours for a staff member over a date range.
+    Pass `actual` (from _actual_durations) when tallying many staff at once."""
+    from core.timesheet_hours import to_hours
     contracted_weekly = float(staff_profile.contracted_hours_per_week or 0)
     total_days = (period_end - period_start).days + 1
     contracted_total = round(contracted_weekly * total_days / 7, 2)
 
-    entries = TimesheetEntry.objects.filter(
-        staff=staff_profile,
-        date__gte=period_start,
-        date__lte=period_end,
-    )
-    actual_total = 0.0
-    for e in entries:
-        ah = e.actual_hours
-        if ah:
-            actual_total += ah
+    if actual is None:
+        actual = _actual_durations([staff_profile.id], period_start, period_end).get(staff_profile.id)
+    actual_total = to_hours(actual)
 
     variance = round(actual_total - contracted_total, 2)
     return {
         'contracted_hours': contracted_total,
-        'actual_hours': round(actual_total, 2),
+        'actual_hours': actual_total,
         'variance': variance,
         'status': 'credit' if variance > 0.25 else ('deficit' if variance < -0.25 else 'on_track'),
     }
@@ -1197,10 +1257,12 @@ def hours_tally(request):
             'tally': [tally],
         })
     else:
-        staff_qs = StaffProfile.objects.filter(tenant=tenant, is_active=True)
+        from datetime import timedelta as _td
+        staff_list = list(StaffProfile.objects.filter(tenant=tenant, is_active=True))
+        actuals = _actual_durations([s.id for s in staff_list], start, end)
         tallies = []
-        for s in staff_qs:
-            t = _compute_tally(s, start, end)
+        for s in staff_list:
+            t = _compute_tally(s, start, end, actual=actuals.get(s.id, _td(0)))
             t['staff_id'] = s.id
             t['staff_name'] = s.display_name
             t['pay_type'] = s.pay_type
@@ -55,8 +55,15 @@ echo "Backfilling Smart Booking Engine scores..."
 echo "Starting booking reminder worker (background)..."
 python manage.py send_booking_reminders --loop &
 
+echo "Starting report export worker (background)..."
+python manage.py run_export_jobs --loop &
+
 # echo "Starting compliance reminder worker (background, daily)..."
 # python manage.py send_compliance_reminders --loop &
 
+# Threaded workers: each /api/live/stream/ client holds a thread for up to a minute,
+# so sync workers would be tied up by open admin tabs. LIVE_STREAM_MAX_PER_PROCESS
+# (default 4) keeps streams to a share of GUNICORN_THREADS.
 echo "Starting Gunicorn..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:$PORT --timeout 120
+exec gunicorn config.wsgi:application --bind 0.0.0.0:$PORT --timeout 120 \
+  --worker-class gthread --workers "${WEB_CONCURRENCY:-2}" --threads "${GUNICORN_THREADS:-8}"
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0004_tenantsettings_business_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenantsettings',
+            name='content_version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
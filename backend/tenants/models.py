@@ -57,6 +57,10 @@ class TenantSettings(models.Model):
     pwa_background_colour = models.CharField(max_length=50, default='#ffffff')
     pwa_short_name = models.CharField(max_length=30, blank=True, default='')
 
+    # Bumped whenever public content outside this row changes (services, staff,
+    # CMS pages); part of the ETags in core.conditional
+    content_version = models.PositiveIntegerField(default=1, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -68,6 +72,11 @@ class TenantSettings(models.Model):
     def __str__(self):
         return self.business_name or 'Tenant Settings'
 
+    @classmethod
+    def bump_content_version(cls, **filters):
+        """Invalidate the public-content ETags of the tenants matching `filters`."""
+        cls.objects.filter(**filters).update(content_version=models.F('content_version') + 1)
+
     @classmethod
     def load(cls, slug=None):
         """Load tenant by slug, or return the first tenant as default."""
@@ -0,0 +1,44 @@
+"""
+Keep TenantSettings.content_version moving with the public content it
+versions, so the ETags built from it (core.conditional) change with it.
+"""
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import TenantSettings
+
+
+@receiver(post_save, sender='bookings.Service')
+@receiver(post_delete, sender='bookings.Service')
+@receiver(post_save, sender='bookings.Staff')
+@receiver(post_delete, sender='bookings.Staff')
+def bump_on_booking_content(sender, instance, raw=False, **kwargs):
+    if not raw:
+        TenantSettings.bump_content_version(pk=instance.tenant_id)
+
+
+@receiver(m2m_changed, sender='bookings.Staff_services')
+def bump_on_staff_services(sender, instance, action, **kwargs):
+    # instance is a Staff or a Service, depending on which side was edited
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        TenantSettings.bump_content_version(pk=instance.tenant_id)
+
+
+def bump_on_cms_page(sender, instance, raw=False, **kwargs):
+    if not raw:
+        TenantSettings.bump_content_version(pk=instance.tenant_id)
+
+
+def bump_on_cms_image(sender, instance, raw=False, **kwargs):
+    # Resolved in SQL: the page may already be gone when a cascade deletes its images
+    if not raw:
+        TenantSettings.bump_content_version(cms_pages=instance.page_id)
+
+
+# cms is only installed when CMS_MODULE_ENABLED, so its senders can't be lazy references
+if apps.is_installed('cms'):
+    post_save.connect(bump_on_cms_page, sender='cms.Page')
+    post_delete.connect(bump_on_cms_page, sender='cms.Page')
+    post_save.connect(bump_on_cms_image, sender='cms.PageImage')
+    post_delete.connect(bump_on_cms_image, sender='cms.PageImage')
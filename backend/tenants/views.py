@@ -2,6 +2,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from accounts.permissions import IsOwner
+from core.conditional import conditional_get
 from .models import TenantSettings
 from .serializers import TenantSettingsSerializer, TenantSettingsCSSVarsSerializer, TenantSettingsUpdateSerializer
 
@@ -17,6 +18,7 @@ def _get_tenant(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get('tenant_settings')
 def tenant_settings(request):
     """Return full tenant settings (public, read-only)."""
     obj = _get_tenant(request)
@@ -28,6 +30,7 @@ def tenant_settings(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get('tenant_branding')
 def tenant_branding(request):
     """Return minimal branding/CSS-variable data for the frontend."""
     obj = _get_tenant(request)